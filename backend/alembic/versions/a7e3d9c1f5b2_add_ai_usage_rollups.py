@@ -0,0 +1,121 @@
+"""add ai_usage_daily and ai_usage_monthly rollup tables
+
+Revision ID: a7e3d9c1f5b2
+Revises: f2c6a8e4b1d9
+Create Date: 2026-10-18 10:20:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7e3d9c1f5b2"
+down_revision: str | Sequence[str] | None = "f2c6a8e4b1d9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "ai_usage_daily",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "entity_type",
+            sa.String(length=20),
+            nullable=False,
+            comment="Entity type (user, organization)",
+        ),
+        sa.Column(
+            "entity_id",
+            sa.UUID(),
+            nullable=False,
+            comment="Entity ID (polymorphic)",
+        ),
+        sa.Column("usage_date", sa.Date(), nullable=False),
+        sa.Column("calls", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column(
+            "tokens_in", sa.BigInteger(), server_default=sa.text("0"), nullable=False
+        ),
+        sa.Column(
+            "tokens_out", sa.BigInteger(), server_default=sa.text("0"), nullable=False
+        ),
+        sa.Column(
+            "estimated_cost",
+            sa.DECIMAL(precision=12, scale=6),
+            server_default=sa.text("0"),
+            nullable=False,
+            comment="Estimated cost in USD",
+        ),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.CheckConstraint(
+            "entity_type IN ('user', 'organization')",
+            name="check_ai_usage_daily_entity_type",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "entity_type", "entity_id", "usage_date", name="uq_ai_usage_daily_entity"
+        ),
+    )
+    op.create_table(
+        "ai_usage_monthly",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "entity_type",
+            sa.String(length=20),
+            nullable=False,
+            comment="Entity type (user, organization)",
+        ),
+        sa.Column(
+            "entity_id",
+            sa.UUID(),
+            nullable=False,
+            comment="Entity ID (polymorphic)",
+        ),
+        sa.Column(
+            "usage_month", sa.Date(), nullable=False, comment="First day of the month"
+        ),
+        sa.Column("calls", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column(
+            "tokens_in", sa.BigInteger(), server_default=sa.text("0"), nullable=False
+        ),
+        sa.Column(
+            "tokens_out", sa.BigInteger(), server_default=sa.text("0"), nullable=False
+        ),
+        sa.Column(
+            "estimated_cost",
+            sa.DECIMAL(precision=12, scale=6),
+            server_default=sa.text("0"),
+            nullable=False,
+            comment="Estimated cost in USD",
+        ),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.CheckConstraint(
+            "entity_type IN ('user', 'organization')",
+            name="check_ai_usage_monthly_entity_type",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "entity_type", "entity_id", "usage_month", name="uq_ai_usage_monthly_entity"
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("ai_usage_monthly")
+    op.drop_table("ai_usage_daily")
@@ -0,0 +1,38 @@
+"""add user token_version
+
+Revision ID: c7d2e4f1a9b3
+Revises: b6f3a6c8b4aa
+Create Date: 2026-10-16 21:10:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d2e4f1a9b3"
+down_revision: str | Sequence[str] | None = "b6f3a6c8b4aa"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "user",
+        sa.Column(
+            "token_version",
+            sa.Integer(),
+            server_default=sa.text("0"),
+            nullable=False,
+            comment="Bumped on deactivation or system role change; stale tokens fail",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("user", "token_version")
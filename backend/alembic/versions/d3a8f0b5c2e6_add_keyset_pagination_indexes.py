@@ -0,0 +1,39 @@
+"""add keyset pagination indexes
+
+Revision ID: d3a8f0b5c2e6
+Revises: c7d2e4f1a9b3
+Create Date: 2026-10-16 21:40:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d3a8f0b5c2e6"
+down_revision: str | Sequence[str] | None = "c7d2e4f1a9b3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "idx_resource_project_name",
+        "resource",
+        ["project_id", "name", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_dependency_project_created",
+        "dependency",
+        ["project_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_dependency_project_created", table_name="dependency")
+    op.drop_index("idx_resource_project_name", table_name="resource")
@@ -0,0 +1,38 @@
+"""add project version
+
+Revision ID: e5b1c9d7a2f4
+Revises: d3a8f0b5c2e6
+Create Date: 2026-10-17 09:20:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b1c9d7a2f4"
+down_revision: str | Sequence[str] | None = "d3a8f0b5c2e6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "project",
+        sa.Column(
+            "version",
+            sa.Integer(),
+            server_default=sa.text("0"),
+            nullable=False,
+            comment="Bumped on each change to schedule data; keys derived caches",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("project", "version")
@@ -0,0 +1,67 @@
+"""add earned_value_snapshot table
+
+Revision ID: f2c6a8e4b1d9
+Revises: e5b1c9d7a2f4
+Create Date: 2026-10-17 14:05:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c6a8e4b1d9"
+down_revision: str | Sequence[str] | None = "e5b1c9d7a2f4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "earned_value_snapshot",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("project_id", sa.UUID(), nullable=False),
+        sa.Column(
+            "task_id",
+            sa.UUID(),
+            nullable=True,
+            comment="NULL for the project total",
+        ),
+        sa.Column("status_date", sa.Date(), nullable=False),
+        sa.Column(
+            "baseline_number", sa.Integer(), server_default=sa.text("0"), nullable=False
+        ),
+        sa.Column("bac", sa.DECIMAL(precision=15, scale=2), nullable=False),
+        sa.Column("bcws", sa.DECIMAL(precision=15, scale=2), nullable=False),
+        sa.Column("bcwp", sa.DECIMAL(precision=15, scale=2), nullable=False),
+        sa.Column("acwp", sa.DECIMAL(precision=15, scale=2), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["project_id"], ["project.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["task_id"], ["task.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "idx_earned_value_project_date",
+        "earned_value_snapshot",
+        ["project_id", "baseline_number", "status_date"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_earned_value_task", "earned_value_snapshot", ["task_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_earned_value_task", table_name="earned_value_snapshot")
+    op.drop_index("idx_earned_value_project_date", table_name="earned_value_snapshot")
+    op.drop_table("earned_value_snapshot")
@@ -5,20 +5,29 @@ FastAPI dependency injection for authentication.
 from typing import NamedTuple
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, Request, status
+from fastapi import (
+    Depends,
+    HTTPException,
+    Request,
+    WebSocket,
+    WebSocketException,
+    status,
+)
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
-from sqlalchemy import select
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from app.core import cache
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.security import decode_access_token
+from app.core.security import AuthUser, decode_access_token
 from app.models.assignment import Assignment
 from app.models.organization import Organization
 from app.models.organization_member import OrganizationMember
 from app.models.project import Project
 from app.models.project_member import ProjectMember
+from app.models.role import Role
 from app.models.task import Task
 from app.models.user import User
 from app.service.auth_service import get_user_by_id
@@ -26,35 +35,53 @@ from app.service.auth_service import get_user_by_id
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
 
-async def get_current_user(
-    request: Request,
-    token: str | None = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
-) -> User:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+async def get_token_payload(
+    request: Request,
+    token: str | None = Depends(oauth2_scheme),
+) -> dict:
+    """Decode the access token (header or cookie) without touching the database."""
     # If header token is missing, check cookie
     if not token:
         token = request.cookies.get("access_token")
+    return _decode_token(token)
+
 
+def _decode_token(token: str | None) -> dict:
     if not token:
-        raise credentials_exception
+        raise _credentials_exception()
 
     try:
         payload = decode_access_token(token)
-        user_id: str | None = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+        UUID(payload["sub"])
+    except (JWTError, KeyError, TypeError, ValueError):
+        raise _credentials_exception()
+    return payload
 
-    user = await get_user_by_id(db, user_id)
+
+async def get_current_user(
+    payload: dict = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    user = await get_user_by_id(db, UUID(payload["sub"]))
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+
+    # Tokens from before a deactivation or role change are stale. Inactive
+    # users still reach get_current_active_user and get its 403.
+    version = payload.get("ver")
+    if user.is_active and version is not None and version != user.token_version:
+        raise _credentials_exception()
+
+    if settings.STATELESS_AUTH:
+        await cache.set_token_version(user.id, user.token_version)
     return user
 
 
@@ -69,13 +96,38 @@ async def get_current_active_user(
     return user
 
 
+async def get_current_auth_user(
+    payload: dict = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_db),
+) -> AuthUser:
+    """
+    Identity of the caller, for endpoints that only need the user id.
+
+    With STATELESS_AUTH, a token whose `ver` claim matches the cached token
+    version is trusted as is. Cache misses, stale versions and old tokens
+    without claims fall back to loading the user.
+    """
+    version = payload.get("ver")
+    if settings.STATELESS_AUTH and version is not None and payload.get("act"):
+        user_id = UUID(payload["sub"])
+        current = await cache.get_token_version(user_id)
+        if current is not None and version < current:
+            raise _credentials_exception()
+        if current == version:
+            srl = payload.get("srl")
+            return AuthUser(id=user_id, system_role_id=UUID(srl) if srl else None)
+
+    user = await get_current_active_user(await get_current_user(payload, db))
+    return AuthUser(id=user.id, system_role_id=user.system_role_id)
+
+
 # ── Organization Access Dependencies ──
 
 
 async def get_org_membership_or_404(
     db: AsyncSession,
     org_id: UUID,
-    user: User,
+    user: User | AuthUser,
 ) -> tuple:
     """
     Load an organization and verify the user is a member.
@@ -118,6 +170,11 @@ async def get_org_membership_or_404(
 
 
 # ── Project Access Dependencies ──
+#
+# Each access check is a single query that starts from the user row and
+# outer-joins the target, its project and the user's membership role, so
+# "user gone", "user inactive", "not found" and "no access" all come from
+# one round trip. Errors are raised in that order.
 
 
 class ProjectAccess(NamedTuple):
@@ -141,10 +198,52 @@ def check_role(access: ProjectAccess, *allowed: str) -> None:
     check_role_name(access.role_name, *allowed)
 
 
+# Columns every access query selects alongside its target
+_USER_STATE = (User.is_active, User.token_version)
+_ROLE_NAME = Role.name.label("role_name")
+
+
+def _with_member_role(stmt, user_id: UUID):
+    """Outer-join the user's membership role in Project (already in stmt)."""
+    return stmt.outerjoin(
+        ProjectMember,
+        and_(
+            ProjectMember.project_id == Project.id,
+            ProjectMember.user_id == user_id,
+        ),
+    ).outerjoin(Role, Role.id == ProjectMember.role_id)
+
+
+def _check_user(row, payload: dict) -> None:
+    """Raise 401/403 for a missing, inactive or stale-token user (None = missing)."""
+    if row is None:
+        raise _credentials_exception()
+    if not row.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user",
+        )
+    version = payload.get("ver")
+    if version is not None and version != row.token_version:
+        raise _credentials_exception()
+
+
+def _resolve_role(project: Project, user_id: UUID, role_name: str | None) -> str:
+    """'owner' for the project owner, else the member role; 403 for neither."""
+    if project.owner_id == user_id:
+        return "owner"
+    if role_name is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have access to this project",
+        )
+    return role_name
+
+
 async def get_project_or_404(
     project_id: UUID,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_active_user),
+    payload: dict = Depends(get_token_payload),
 ) -> ProjectAccess:
     """
     Load a project and verify the user has access.
@@ -155,40 +254,67 @@ async def get_project_or_404(
 
     Raises 404 if project not found or deleted.
     Raises 403 if user has no access.
+
+    Member roles come from the access cache when present, which drops the
+    membership joins from the query.
     """
-    result = await db.execute(
-        select(Project).where(Project.id == project_id, Project.is_deleted.is_(False))
+    user_id = UUID(payload["sub"])
+    cached_role = await cache.get_project_role(project_id, user_id)
+
+    stmt = (
+        select(*_USER_STATE, Project)
+        .select_from(User)
+        .outerjoin(
+            Project,
+            and_(Project.id == project_id, Project.is_deleted.is_(False)),
+        )
+        .where(User.id == user_id)
     )
-    project = result.scalar_one_or_none()
+    if cached_role is None:
+        stmt = stmt.add_columns(_ROLE_NAME)
+        stmt = _with_member_role(stmt, user_id)
+    row = (await db.execute(stmt)).one_or_none()
+    _check_user(row, payload)
 
+    project = row.Project
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found",
         )
 
-    # Check if user is owner
-    if project.owner_id == user.id:
-        return ProjectAccess(project=project, role_name="owner")
-
-    # Check if user is a member
-    member_result = await db.execute(
-        select(ProjectMember)
-        .options(selectinload(ProjectMember.role))
-        .where(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == user.id,
+    if cached_role is not None:
+        return ProjectAccess(
+            project=project, role_name=_resolve_role(project, user_id, cached_role)
         )
-    )
-    member = member_result.scalar_one_or_none()
 
-    if not member:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have access to this project",
-        )
+    role_name = _resolve_role(project, user_id, row.role_name)
+    if role_name != "owner":
+        await cache.set_project_role(project.id, user_id, role_name)
+    return ProjectAccess(project=project, role_name=role_name)
 
-    return ProjectAccess(project=project, role_name=member.role.name)
+
+async def get_ws_project_access(
+    websocket: WebSocket,
+    project_id: UUID,
+    db: AsyncSession = Depends(get_db),
+) -> ProjectAccess:
+    """
+    get_project_or_404 for WebSocket routes.
+
+    Browsers cannot set headers on a WebSocket handshake, so the token comes
+    from the access_token cookie (scoped to /api, hence the route prefix) or
+    a ?token= query parameter. Any failure closes the socket with 1008
+    (policy violation).
+    """
+    cookie = websocket.cookies.get("access_token")
+    token = cookie or websocket.query_params.get("token")
+    try:
+        return await get_project_or_404(project_id, db, _decode_token(token))
+    except HTTPException as exc:
+        raise WebSocketException(
+            code=status.WS_1008_POLICY_VIOLATION, reason=exc.detail
+        )
 
 
 class TaskAccess(NamedTuple):
@@ -202,7 +328,7 @@ class TaskAccess(NamedTuple):
 async def get_task_with_project_access(
     task_id: UUID,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_active_user),
+    payload: dict = Depends(get_token_payload),
 ) -> TaskAccess:
     """
     Load a task and verify the user has access to its project.
@@ -212,48 +338,28 @@ async def get_task_with_project_access(
     Raises 404 if task not found or deleted.
     Raises 403 if user has no access to the task's project.
     """
-    result = await db.execute(
-        select(Task)
-        .options(selectinload(Task.project))
-        .where(Task.id == task_id, Task.is_deleted.is_(False))
-    )
-    task = result.scalar_one_or_none()
-
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found",
+    user_id = UUID(payload["sub"])
+    stmt = (
+        select(*_USER_STATE, Task, Project, _ROLE_NAME)
+        .select_from(User)
+        .outerjoin(Task, and_(Task.id == task_id, Task.is_deleted.is_(False)))
+        .outerjoin(
+            Project,
+            and_(Project.id == Task.project_id, Project.is_deleted.is_(False)),
         )
+        .where(User.id == user_id)
+    )
+    row = (await db.execute(_with_member_role(stmt, user_id))).one_or_none()
+    _check_user(row, payload)
 
-    project = task.project
-    if project.is_deleted:
+    if not row.Task or not row.Project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found",
         )
 
-    # Check if user is owner
-    if project.owner_id == user.id:
-        return TaskAccess(task=task, project=project, role_name="owner")
-
-    # Check if user is a member
-    member_result = await db.execute(
-        select(ProjectMember)
-        .options(selectinload(ProjectMember.role))
-        .where(
-            ProjectMember.project_id == project.id,
-            ProjectMember.user_id == user.id,
-        )
-    )
-    member = member_result.scalar_one_or_none()
-
-    if not member:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have access to this project",
-        )
-
-    return TaskAccess(task=task, project=project, role_name=member.role.name)
+    role_name = _resolve_role(row.Project, user_id, row.role_name)
+    return TaskAccess(task=row.Task, project=row.Project, role_name=role_name)
 
 
 class AssignmentAccess(NamedTuple):
@@ -267,7 +373,7 @@ class AssignmentAccess(NamedTuple):
 async def get_assignment_with_access(
     assignment_id: UUID,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_active_user),
+    payload: dict = Depends(get_token_payload),
 ) -> AssignmentAccess:
     """
     Load an assignment and verify the user has access to its project.
@@ -275,56 +381,31 @@ async def get_assignment_with_access(
     Checks if assignment, task, or project are deleted.
     Returns AssignmentAccess(assignment, project, role_name).
     """
-    result = await db.execute(
-        select(Assignment)
-        .options(selectinload(Assignment.task).selectinload(Task.project))
-        .where(Assignment.id == assignment_id)
-    )
-    assignment = result.scalar_one_or_none()
-
-    if not assignment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Assignment not found",
+    user_id = UUID(payload["sub"])
+    stmt = (
+        select(*_USER_STATE, Assignment, Task, Project, _ROLE_NAME)
+        .select_from(User)
+        .outerjoin(Assignment, Assignment.id == assignment_id)
+        .outerjoin(
+            Task,
+            and_(Task.id == Assignment.task_id, Task.is_deleted.is_(False)),
         )
-
-    task = assignment.task
-    if task.is_deleted:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Assignment not found",
+        .outerjoin(
+            Project,
+            and_(Project.id == Task.project_id, Project.is_deleted.is_(False)),
         )
+        .where(User.id == user_id)
+    )
+    row = (await db.execute(_with_member_role(stmt, user_id))).one_or_none()
+    _check_user(row, payload)
 
-    project = task.project
-    if project.is_deleted:
+    if not row.Assignment or not row.Task or not row.Project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Assignment not found",
         )
 
-    # Check if user is owner
-    if project.owner_id == user.id:
-        return AssignmentAccess(
-            assignment=assignment, project=project, role_name="owner"
-        )
-
-    # Check if user is a member
-    member_result = await db.execute(
-        select(ProjectMember)
-        .options(selectinload(ProjectMember.role))
-        .where(
-            ProjectMember.project_id == project.id,
-            ProjectMember.user_id == user.id,
-        )
-    )
-    member = member_result.scalar_one_or_none()
-
-    if not member:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have access to this project",
-        )
-
+    role_name = _resolve_role(row.Project, user_id, row.role_name)
     return AssignmentAccess(
-        assignment=assignment, project=project, role_name=member.role.name
+        assignment=row.Assignment, project=row.Project, role_name=role_name
     )
@@ -0,0 +1,94 @@
+"""
+AI chat endpoints.
+
+POST   /projects/{project_id}/ai/conversations                 - Start a conversation
+GET    /projects/{project_id}/ai/conversations                 - Caller's conversations
+GET    /projects/{project_id}/ai/conversations/{cid}/messages  - Messages, oldest first
+POST   /projects/{project_id}/ai/conversations/{cid}/messages  - Ask; stream reply (SSE)
+"""
+
+from uuid import UUID
+
+from fastapi import APIRouter, BackgroundTasks, Depends, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import ProjectAccess, get_current_auth_user, get_project_or_404
+from app.core.database import get_db
+from app.core.security import AuthUser
+from app.schema.ai import (
+    ConversationCreate,
+    ConversationResponse,
+    MessageCreate,
+    MessageResponse,
+)
+from app.service import ai_chat_service
+
+router = APIRouter(prefix="/projects/{project_id}/ai/conversations", tags=["ai"])
+
+
+@router.post(
+    "", response_model=ConversationResponse, status_code=status.HTTP_201_CREATED
+)
+async def create_conversation(
+    data: ConversationCreate,
+    access: ProjectAccess = Depends(get_project_or_404),
+    user: AuthUser = Depends(get_current_auth_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Start a conversation about the project (any project member)."""
+    return await ai_chat_service.create_conversation(db, access.project, user.id, data)
+
+
+@router.get("", response_model=list[ConversationResponse])
+async def list_conversations(
+    access: ProjectAccess = Depends(get_project_or_404),
+    user: AuthUser = Depends(get_current_auth_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """The caller's conversations in the project, most recently active first."""
+    return await ai_chat_service.list_conversations(db, access.project, user.id)
+
+
+@router.get("/{conversation_id}/messages", response_model=list[MessageResponse])
+async def list_messages(
+    conversation_id: UUID,
+    access: ProjectAccess = Depends(get_project_or_404),
+    user: AuthUser = Depends(get_current_auth_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Every message of one of the caller's conversations."""
+    conversation = await ai_chat_service.get_conversation(
+        db, access.project, conversation_id, user.id
+    )
+    return await ai_chat_service.list_messages(db, conversation)
+
+
+@router.post("/{conversation_id}/messages", response_class=StreamingResponse)
+async def send_message(
+    conversation_id: UUID,
+    data: MessageCreate,
+    background_tasks: BackgroundTasks,
+    access: ProjectAccess = Depends(get_project_or_404),
+    user: AuthUser = Depends(get_current_auth_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Ask a question and stream the reply as server-sent events.
+
+    Both messages are saved after the response (see ai_chat_service).
+    """
+    conversation = await ai_chat_service.get_conversation(
+        db, access.project, conversation_id, user.id
+    )
+    turn = await ai_chat_service.start_turn(
+        db, access.project, conversation, data.content
+    )
+    # The reply may stream for a minute; give the connection back now
+    await db.close()
+    background_tasks.add_task(turn.save)
+    return StreamingResponse(
+        turn.events(),
+        media_type=ai_chat_service.SSE_MEDIA_TYPE,
+        headers=ai_chat_service.SSE_HEADERS,
+    )
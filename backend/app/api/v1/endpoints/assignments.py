@@ -103,7 +103,9 @@ async def update_assignment(
 ):
     """Update an assignment."""
     check_role_name(access.role_name, "owner", "manager", "member")
-    assignment = await assignment_service.update_assignment(db, access.assignment, body)
+    assignment = await assignment_service.update_assignment(
+        db, access.project, access.assignment, body
+    )
     return AssignmentResponse.model_validate(assignment)
 
 
@@ -115,4 +117,4 @@ async def delete_assignment(
 ):
     """Delete an assignment."""
     check_role_name(access.role_name, "owner", "manager")
-    await assignment_service.delete_assignment(db, access.assignment)
+    await assignment_service.delete_assignment(db, access.project, access.assignment)
@@ -0,0 +1,42 @@
+"""
+Baseline endpoints.
+
+POST   /projects/{project_id}/baselines/{number}           - Save (overwrite) a baseline
+GET    /projects/{project_id}/baselines/{number}/variance  - Stream variance as NDJSON
+"""
+
+from fastapi import APIRouter, Depends, Path
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import ProjectAccess, check_role, get_project_or_404
+from app.core.database import get_db
+from app.schema.baseline import BaselineResponse
+from app.service import baseline_service
+
+router = APIRouter(prefix="/projects/{project_id}/baselines", tags=["baselines"])
+
+
+@router.post("/{baseline_number}", response_model=BaselineResponse)
+async def save_baseline(
+    baseline_number: int = Path(ge=0, le=10),
+    access: ProjectAccess = Depends(get_project_or_404),
+    db: AsyncSession = Depends(get_db),
+):
+    """Copy every task's and assignment's current plan into the baseline."""
+    check_role(access, "owner", "manager")
+    summary = await baseline_service.save_baseline(db, access.project, baseline_number)
+    return BaselineResponse(**summary._asdict())
+
+
+@router.get("/{baseline_number}/variance", response_class=StreamingResponse)
+async def stream_variance(
+    baseline_number: int = Path(ge=0, le=10),
+    access: ProjectAccess = Depends(get_project_or_404),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream each task against the baseline (see baseline_service)."""
+    return StreamingResponse(
+        baseline_service.stream_variance(db, access.project, baseline_number),
+        media_type=baseline_service.VARIANCE_MEDIA_TYPE,
+    )
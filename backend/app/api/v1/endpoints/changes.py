@@ -0,0 +1,69 @@
+"""
+Project change feed endpoint.
+
+WS     /ws/projects/{project_id}  - Task, dependency and assignment diffs (JSON)
+
+The first frame is {"type": "ready", "project_id": ..., "version": ...};
+later frames are described in app.core.changefeed. Client messages are
+read only to notice a disconnect.
+"""
+
+import asyncio
+
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import ProjectAccess, get_ws_project_access
+from app.core.changefeed import Subscriber, hub
+from app.core.database import get_db
+
+router = APIRouter(prefix="/ws/projects", tags=["changes"])
+
+
+async def _send(websocket: WebSocket, subscriber: Subscriber) -> None:
+    try:
+        while True:
+            await websocket.send_json(await subscriber.next())
+    except WebSocketDisconnect:
+        pass
+
+
+async def _receive(websocket: WebSocket) -> None:
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.websocket("/{project_id}")
+async def project_changes(
+    websocket: WebSocket,
+    access: ProjectAccess = Depends(get_ws_project_access),
+    db: AsyncSession = Depends(get_db),
+):
+    """Push the project's changes until the client disconnects."""
+    project = access.project
+    # The socket may stay open for hours; give the connection back now
+    await db.close()
+
+    await websocket.accept()
+    subscriber = await hub.subscribe(project.id)
+    try:
+        await websocket.send_json(
+            {"type": "ready", "project_id": str(project.id), "version": project.version}
+        )
+        tasks = [
+            asyncio.create_task(_send(websocket, subscriber)),
+            asyncio.create_task(_receive(websocket)),
+        ]
+        try:
+            # Either the client left or sending failed
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+        for task in done:
+            task.result()
+    finally:
+        await hub.unsubscribe(subscriber)
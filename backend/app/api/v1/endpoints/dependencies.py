@@ -3,6 +3,7 @@ Dependency CRUD endpoints.
 
 GET    /projects/{project_id}/dependencies                    - List dependencies
 POST   /projects/{project_id}/dependencies                    - Create dependency
+POST   /projects/{project_id}/dependencies/batch              - Create many dependencies
 PATCH  /projects/{project_id}/dependencies/{dependency_id}    - Update dependency
 DELETE /projects/{project_id}/dependencies/{dependency_id}    - Delete dependency
 """
@@ -15,7 +16,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import ProjectAccess, check_role, get_project_or_404
 from app.core.database import get_db
 from app.schema.common import PaginatedResponse
-from app.schema.dependency import DependencyCreate, DependencyResponse, DependencyUpdate
+from app.schema.dependency import (
+    DependencyBatchCreate,
+    DependencyCreate,
+    DependencyResponse,
+    DependencyUpdate,
+)
 from app.service import dependency_service
 
 router = APIRouter(prefix="/projects/{project_id}/dependencies", tags=["dependencies"])
@@ -25,18 +31,28 @@ router = APIRouter(prefix="/projects/{project_id}/dependencies", tags=["dependen
 async def list_dependencies(
     page: int = Query(default=1, ge=1),
     per_page: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(
+        default=None, description="Keyset cursor; empty for the first page"
+    ),
+    include_total: bool | None = Query(default=None),
     access: ProjectAccess = Depends(get_project_or_404),
     db: AsyncSession = Depends(get_db),
 ):
     """List all dependencies in the project."""
-    dependencies, total = await dependency_service.list_dependencies(
-        db, access.project, page=page, per_page=per_page
+    result = await dependency_service.list_dependencies(
+        db,
+        access.project,
+        page=page,
+        per_page=per_page,
+        cursor=cursor,
+        include_total=include_total,
     )
     return PaginatedResponse(
-        items=[DependencyResponse.model_validate(d) for d in dependencies],
-        total=total,
-        page=page,
+        items=[DependencyResponse.model_validate(d) for d in result.items],
+        total=result.total,
+        page=page if cursor is None else None,
         per_page=per_page,
+        next_cursor=result.next_cursor,
     )
 
 
@@ -56,6 +72,24 @@ async def create_dependency(
     return DependencyResponse.model_validate(dependency)
 
 
+@router.post(
+    "/batch",
+    response_model=list[DependencyResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_dependencies(
+    body: DependencyBatchCreate,
+    access: ProjectAccess = Depends(get_project_or_404),
+    db: AsyncSession = Depends(get_db),
+):
+    """Create many dependencies at once; all or nothing."""
+    check_role(access, "owner", "manager", "member")
+    dependencies = await dependency_service.create_dependencies(
+        db, access.project, body.items
+    )
+    return [DependencyResponse.model_validate(d) for d in dependencies]
+
+
 @router.patch("/{dependency_id}", response_model=DependencyResponse)
 async def update_dependency(
     dependency_id: UUID,
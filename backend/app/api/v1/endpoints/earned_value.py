@@ -0,0 +1,61 @@
+"""
+Earned value endpoints.
+
+POST   /projects/{project_id}/earned-value        - Analyse and store a status date
+GET    /projects/{project_id}/earned-value/trend  - Stored snapshots, oldest first
+"""
+
+from datetime import date
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import ProjectAccess, check_role, get_project_or_404
+from app.core.database import get_db
+from app.schema.earned_value import (
+    EarnedValueMetrics,
+    EarnedValuePoint,
+    EarnedValueResponse,
+)
+from app.service import evm_service
+
+router = APIRouter(prefix="/projects/{project_id}/earned-value", tags=["earned-value"])
+
+
+@router.post("", response_model=EarnedValueResponse)
+async def analyse_earned_value(
+    status_date: date | None = Query(
+        default=None, description="Defaults to the project status date, then today"
+    ),
+    baseline: int = Query(default=0, ge=0, le=10),
+    access: ProjectAccess = Depends(get_project_or_404),
+    db: AsyncSession = Depends(get_db),
+):
+    """Compute BCWS/BCWP/ACWP and indices for every task; keep a snapshot."""
+    check_role(access, "owner", "manager", "member")
+    report = await evm_service.analyse(db, access.project, status_date, baseline)
+    return EarnedValueResponse(
+        status_date=report.status_date,
+        baseline_number=report.baseline_number,
+        project=EarnedValueMetrics(**evm_service.metrics(None, report.project)),
+        tasks=[
+            EarnedValueMetrics(**evm_service.metrics(task_id, value))
+            for task_id, value in report.tasks.items()
+        ],
+    )
+
+
+@router.get("/trend", response_model=list[EarnedValuePoint])
+async def earned_value_trend(
+    baseline: int = Query(default=0, ge=0, le=10),
+    task_id: UUID | None = Query(default=None, description="Omit for the project"),
+    access: ProjectAccess = Depends(get_project_or_404),
+    db: AsyncSession = Depends(get_db),
+):
+    """Earned value at every analysed status date."""
+    points = await evm_service.trend(db, access.project, baseline, task_id)
+    return [
+        EarnedValuePoint(status_date=status_date, **values)
+        for status_date, values in points
+    ]
@@ -12,9 +12,9 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_user, get_org_membership_or_404
+from app.api.deps import get_current_auth_user, get_org_membership_or_404
 from app.core.database import get_db
-from app.models.user import User
+from app.core.security import AuthUser
 from app.schema.common import PaginatedResponse
 from app.schema.organization_member import (
     OrgMemberInvite,
@@ -33,7 +33,7 @@ router = APIRouter(
 async def get_my_membership(
     org_id: UUID,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_active_user),
+    user: AuthUser = Depends(get_current_auth_user),
 ):
     """Get my membership in the organization."""
     _org, membership = await get_org_membership_or_404(db, org_id, user)
@@ -46,7 +46,7 @@ async def list_members(
     page: int = Query(default=1, ge=1),
     per_page: int = Query(default=20, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_active_user),
+    user: AuthUser = Depends(get_current_auth_user),
 ):
     """List all members of an organization."""
     org, _membership = await get_org_membership_or_404(db, org_id, user)
@@ -71,7 +71,7 @@ async def invite_member(
     org_id: UUID,
     body: OrgMemberInvite,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_active_user),
+    user: AuthUser = Depends(get_current_auth_user),
 ):
     """
     Invite a user to the organization.
@@ -92,7 +92,7 @@ async def change_member_role(
     member_id: UUID,
     body: OrgMemberRoleUpdate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_active_user),
+    user: AuthUser = Depends(get_current_auth_user),
 ):
     """
     Change a member's role.
@@ -114,7 +114,7 @@ async def remove_member(
     org_id: UUID,
     member_id: UUID,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_active_user),
+    user: AuthUser = Depends(get_current_auth_user),
 ):
     """
     Remove a member from the organization.
@@ -13,9 +13,9 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_user, get_org_membership_or_404
+from app.api.deps import get_current_auth_user, get_org_membership_or_404
 from app.core.database import get_db
-from app.models.user import User
+from app.core.security import AuthUser
 from app.schema.common import PaginatedResponse
 from app.schema.organization import (
     OrganizationCreate,
@@ -33,7 +33,7 @@ async def list_organizations(
     page: int = Query(default=1, ge=1),
     per_page: int = Query(default=20, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_active_user),
+    user: AuthUser = Depends(get_current_auth_user),
 ):
     """List all organizations the user is a member of."""
     orgs, total = await organization_service.list_organizations(
@@ -55,7 +55,7 @@ async def list_organizations(
 async def create_organization(
     body: OrganizationCreate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_active_user),
+    user: AuthUser = Depends(get_current_auth_user),
 ):
     """Create a new organization."""
     org = await organization_service.create_organization(db, user, body)
@@ -66,7 +66,7 @@ async def create_organization(
 async def get_organization(
     org_id: UUID,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_active_user),
+    user: AuthUser = Depends(get_current_auth_user),
 ):
     """Get organization details."""
     org, _membership = await get_org_membership_or_404(db, org_id, user)
@@ -78,7 +78,7 @@ async def update_organization(
     org_id: UUID,
     body: OrganizationUpdate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_active_user),
+    user: AuthUser = Depends(get_current_auth_user),
 ):
     """
     Update an organization.
@@ -97,7 +97,7 @@ async def update_organization(
 async def delete_organization(
     org_id: UUID,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_active_user),
+    user: AuthUser = Depends(get_current_auth_user),
 ):
     """
     Soft delete an organization.
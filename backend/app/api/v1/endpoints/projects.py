@@ -4,22 +4,24 @@ Project CRUD endpoints.
 GET    /projects              - List user's projects
 POST   /projects              - Create a new project
 GET    /projects/{project_id} - Get project details
+GET    /projects/{project_id}/snapshot - Stream all tasks, dependencies and assignments
 PATCH  /projects/{project_id} - Update project (owner/manager only)
 DELETE /projects/{project_id} - Soft delete project (owner only)
 """
 
 from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import (
     ProjectAccess,
     check_role,
-    get_current_active_user,
+    get_current_auth_user,
     get_org_membership_or_404,
     get_project_or_404,
 )
 from app.core.database import get_db
-from app.models.user import User
+from app.core.security import AuthUser
 from app.schema.common import PaginatedResponse
 from app.schema.project import (
     ProjectCreate,
@@ -27,7 +29,7 @@ from app.schema.project import (
     ProjectListItem,
     ProjectUpdate,
 )
-from app.service import project_service
+from app.service import project_service, snapshot_service
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
@@ -36,31 +38,38 @@ router = APIRouter(prefix="/projects", tags=["projects"])
 async def list_projects(
     page: int = Query(default=1, ge=1),
     per_page: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(
+        default=None, description="Keyset cursor; empty for the first page"
+    ),
+    include_total: bool | None = Query(default=None),
     status: str | None = Query(default=None),
     search: str | None = Query(default=None),
     organization_id: str | None = Query(default=None),
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_active_user),
+    user: AuthUser = Depends(get_current_auth_user),
 ):
     """List all projects the user owns or is a member of."""
     # Verify org membership before listing (same pattern as create_project)
     if organization_id:
         await get_org_membership_or_404(db, organization_id, user)
 
-    projects, total = await project_service.list_projects(
+    result = await project_service.list_projects(
         db,
         user,
         page=page,
         per_page=per_page,
+        cursor=cursor,
+        include_total=include_total,
         status=status,
         search=search,
         organization_id=organization_id,
     )
     return PaginatedResponse(
-        items=[ProjectListItem.model_validate(p) for p in projects],
-        total=total,
-        page=page,
+        items=[ProjectListItem.model_validate(p) for p in result.items],
+        total=result.total,
+        page=page if cursor is None else None,
         per_page=per_page,
+        next_cursor=result.next_cursor,
     )
 
 
@@ -72,7 +81,7 @@ async def list_projects(
 async def create_project(
     body: ProjectCreate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_active_user),
+    user: AuthUser = Depends(get_current_auth_user),
 ):
     """Create a new project."""
     await get_org_membership_or_404(db, body.organization_id, user)
@@ -88,6 +97,18 @@ async def get_project(
     return ProjectDetail.model_validate(access.project)
 
 
+@router.get("/{project_id}/snapshot", response_class=StreamingResponse)
+async def get_project_snapshot(
+    access: ProjectAccess = Depends(get_project_or_404),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream the whole project as NDJSON (see snapshot_service)."""
+    return StreamingResponse(
+        snapshot_service.stream_snapshot(db, access.project),
+        media_type=snapshot_service.SNAPSHOT_MEDIA_TYPE,
+    )
+
+
 @router.patch("/{project_id}", response_model=ProjectDetail)
 async def update_project(
     body: ProjectUpdate,
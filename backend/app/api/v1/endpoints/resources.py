@@ -2,12 +2,15 @@
 Resource CRUD endpoints.
 
 GET    /projects/{project_id}/resources                  - List project resources
+GET    /projects/{project_id}/resources/utilization      - Allocated vs available time
 POST   /projects/{project_id}/resources                  - Create a new resource
 GET    /projects/{project_id}/resources/{resource_id}    - Get resource details
 PATCH  /projects/{project_id}/resources/{resource_id}    - Update resource
 DELETE /projects/{project_id}/resources/{resource_id}    - Delete resource (hard)
 """
 
+from datetime import date
+from typing import Literal
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -16,8 +19,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import ProjectAccess, check_role, get_project_or_404
 from app.core.database import get_db
 from app.schema.common import PaginatedResponse
-from app.schema.resource import ResourceCreate, ResourceResponse, ResourceUpdate
-from app.service import resource_service
+from app.schema.resource import (
+    ResourceCreate,
+    ResourceResponse,
+    ResourceUpdate,
+    ResourceUtilization,
+    UtilizationResponse,
+)
+from app.service import resource_service, utilization_service
 
 router = APIRouter(prefix="/projects/{project_id}/resources", tags=["resources"])
 
@@ -26,25 +35,32 @@ router = APIRouter(prefix="/projects/{project_id}/resources", tags=["resources"]
 async def list_resources(
     page: int = Query(default=1, ge=1),
     per_page: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(
+        default=None, description="Keyset cursor; empty for the first page"
+    ),
+    include_total: bool | None = Query(default=None),
     type: str | None = Query(default=None, alias="type"),
     include_inactive: bool = Query(default=False),
     access: ProjectAccess = Depends(get_project_or_404),
     db: AsyncSession = Depends(get_db),
 ):
     """List all resources in the project."""
-    resources, total = await resource_service.list_resources(
+    result = await resource_service.list_resources(
         db,
         access.project,
         page=page,
         per_page=per_page,
+        cursor=cursor,
+        include_total=include_total,
         resource_type=type,
         include_inactive=include_inactive,
     )
     return PaginatedResponse(
-        items=[ResourceResponse.model_validate(r) for r in resources],
-        total=total,
-        page=page,
+        items=[ResourceResponse.model_validate(r) for r in result.items],
+        total=result.total,
+        page=page if cursor is None else None,
         per_page=per_page,
+        next_cursor=result.next_cursor,
     )
 
 
@@ -64,6 +80,35 @@ async def create_resource(
     return ResourceResponse.model_validate(resource)
 
 
+@router.get("/utilization", response_model=UtilizationResponse)
+async def get_utilization(
+    start: date | None = Query(default=None, alias="from"),
+    end: date | None = Query(default=None, alias="to"),
+    bucket: Literal["day", "week"] = Query(default="day"),
+    access: ProjectAccess = Depends(get_project_or_404),
+    db: AsyncSession = Depends(get_db),
+):
+    """Allocated versus available working minutes per work resource."""
+    result = await utilization_service.project_utilization(
+        db, access.project, start, end, bucket
+    )
+    return UtilizationResponse(
+        bucket=bucket,
+        periods=result.periods,
+        resources=[
+            ResourceUtilization(
+                resource_id=resource_id,
+                name=name,
+                allocated=allocated,
+                available=available,
+            )
+            for resource_id, name, allocated, available in zip(
+                result.resource_ids, result.names, result.allocated, result.available
+            )
+        ],
+    )
+
+
 @router.get("/{resource_id}", response_model=ResourceResponse)
 async def get_resource(
     resource_id: UUID,
@@ -0,0 +1,58 @@
+"""
+Scheduling endpoints.
+
+POST   /projects/{project_id}/schedule        - Recalculate dates, slack, critical path
+POST   /projects/{project_id}/schedule/level  - Level resource overallocations
+POST   /projects/{project_id}/schedule/costs  - Recalculate assignment and task costs
+"""
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import ProjectAccess, check_role, get_project_or_404
+from app.core.database import get_db
+from app.schema.schedule import (
+    CostResponse,
+    LevelingResponse,
+    ScheduleResponse,
+)
+from app.service import cost_service, leveling_service, schedule_service
+
+router = APIRouter(prefix="/projects/{project_id}/schedule", tags=["schedule"])
+
+
+@router.post("", response_model=ScheduleResponse)
+async def reschedule_project(
+    access: ProjectAccess = Depends(get_project_or_404),
+    db: AsyncSession = Depends(get_db),
+):
+    """Run the CPM scheduler over the whole project."""
+    check_role(access, "owner", "manager", "member")
+    summary = await schedule_service.reschedule_project(db, access.project)
+    return ScheduleResponse(**summary._asdict())
+
+
+@router.post("/level", response_model=LevelingResponse)
+async def level_resources(
+    within_slack: bool = Query(default=True, description="Never delay past late start"),
+    apply: bool = Query(default=False, description="Write the leveled dates"),
+    access: ProjectAccess = Depends(get_project_or_404),
+    db: AsyncSession = Depends(get_db),
+):
+    """Delay tasks so no work resource is overallocated; returns the changes."""
+    check_role(access, "owner", "manager", "member")
+    summary = await leveling_service.level_project(
+        db, access.project, within_slack=within_slack, apply=apply
+    )
+    return LevelingResponse(**summary._asdict())
+
+
+@router.post("/costs", response_model=CostResponse)
+async def recalculate_costs(
+    access: ProjectAccess = Depends(get_project_or_404),
+    db: AsyncSession = Depends(get_db),
+):
+    """Cost every assignment from its rates and contour; total up the tasks."""
+    check_role(access, "owner", "manager", "member")
+    summary = await cost_service.recalculate_costs(db, access.project)
+    return CostResponse(**summary._asdict())
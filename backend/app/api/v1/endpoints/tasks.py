@@ -2,10 +2,14 @@
 Task CRUD endpoints.
 
 GET    /projects/{project_id}/tasks              - List project tasks
+GET    /projects/{project_id}/tasks/columns      - List task fields as column arrays
 POST   /projects/{project_id}/tasks              - Create a new task
+POST   /projects/{project_id}/tasks/batch        - Create, update, move and delete many tasks
 GET    /projects/{project_id}/tasks/{task_id}    - Get task details
 PATCH  /projects/{project_id}/tasks/{task_id}    - Update task
 DELETE /projects/{project_id}/tasks/{task_id}    - Soft delete task
+POST   /projects/{project_id}/tasks/{task_id}/indent   - Indent under the task above
+POST   /projects/{project_id}/tasks/{task_id}/outdent  - Outdent one level
 """
 
 from uuid import UUID
@@ -15,17 +19,46 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import ProjectAccess, check_role, get_project_or_404
 from app.core.database import get_db
-from app.schema.common import PaginatedResponse
-from app.schema.task import TaskCreate, TaskResponse, TaskUpdate
+from app.models.task import Task
+from app.schema.common import ColumnarResponse, PaginatedResponse
+from app.schema.task import (
+    TaskBatchRequest,
+    TaskBatchResponse,
+    TaskCreate,
+    TaskDateChange,
+    TaskOutlineChange,
+    TaskResponse,
+    TaskUpdate,
+    TaskUpdateResponse,
+)
 from app.service import task_service
 
 router = APIRouter(prefix="/projects/{project_id}/tasks", tags=["tasks"])
 
 
+async def _get_task_or_404(
+    db: AsyncSession,
+    task_id: UUID,
+    access: ProjectAccess,
+) -> Task:
+    """Get a live task within the project context."""
+    task = await task_service.get_task_by_id(db, task_id, access.project.id)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found",
+        )
+    return task
+
+
 @router.get("", response_model=PaginatedResponse[TaskResponse])
 async def list_tasks(
     page: int = Query(default=1, ge=1),
     per_page: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(
+        default=None, description="Keyset cursor; empty for the first page"
+    ),
+    include_total: bool | None = Query(default=None),
     include_deleted: bool = Query(default=False),
     access: ProjectAccess = Depends(get_project_or_404),
     db: AsyncSession = Depends(get_db),
@@ -34,18 +67,56 @@ async def list_tasks(
     if include_deleted:
         check_role(access, "owner", "manager")
 
-    tasks, total = await task_service.list_tasks(
+    result = await task_service.list_tasks(
         db,
         access.project,
         page=page,
         per_page=per_page,
+        cursor=cursor,
+        include_total=include_total,
         include_deleted=include_deleted,
     )
     return PaginatedResponse(
-        items=[TaskResponse.model_validate(t) for t in tasks],
-        total=total,
+        items=[TaskResponse.model_validate(t) for t in result.items],
+        total=result.total,
+        page=page if cursor is None else None,
+        per_page=per_page,
+        next_cursor=result.next_cursor,
+    )
+
+
+@router.get("/columns", response_model=ColumnarResponse)
+async def list_task_columns(
+    fields: str = Query(description="Comma-separated task fields, e.g. id,name"),
+    page: int = Query(default=1, ge=1),
+    per_page: int = Query(default=500, ge=1, le=5000),
+    cursor: str | None = Query(
+        default=None, description="Keyset cursor; empty for the first page"
+    ),
+    include_total: bool | None = Query(default=None),
+    access: ProjectAccess = Depends(get_project_or_404),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    List tasks in compact columnar form.
+
+    Only the named fields are loaded and sent, one array per field.
+    """
+    result, columns = await task_service.list_task_columns(
+        db,
+        access.project,
+        [f.strip() for f in fields.split(",") if f.strip()],
         page=page,
         per_page=per_page,
+        cursor=cursor,
+        include_total=include_total,
+    )
+    return ColumnarResponse(
+        columns=columns,
+        total=result.total,
+        page=page if cursor is None else None,
+        per_page=per_page,
+        next_cursor=result.next_cursor,
     )
 
 
@@ -65,6 +136,31 @@ async def create_task(
     return TaskResponse.model_validate(task)
 
 
+@router.post("/batch", response_model=TaskBatchResponse)
+async def apply_task_batch(
+    body: TaskBatchRequest,
+    access: ProjectAccess = Depends(get_project_or_404),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Apply many task changes in one transaction; all or nothing.
+
+    Deletes need owner or manager, like single deletes.
+    """
+    allowed = ("owner", "manager", "member")
+    if any(op.op == "delete" for op in body.operations):
+        allowed = ("owner", "manager")
+    check_role(access, *allowed)
+
+    result = await task_service.apply_task_batch(db, access.project, body.operations)
+    return TaskBatchResponse(
+        created=[TaskResponse.model_validate(t) for t in result.created],
+        updated=[TaskResponse.model_validate(t) for t in result.updated],
+        deleted=result.deleted,
+        rescheduled=[TaskDateChange(**row) for row in result.rescheduled],
+    )
+
+
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: UUID,
@@ -81,14 +177,18 @@ async def get_task(
     return TaskResponse.model_validate(task)
 
 
-@router.patch("/{task_id}", response_model=TaskResponse)
+@router.patch("/{task_id}", response_model=TaskUpdateResponse)
 async def update_task(
     task_id: UUID,
     body: TaskUpdate,
     access: ProjectAccess = Depends(get_project_or_404),
     db: AsyncSession = Depends(get_db),
 ):
-    """Update a task."""
+    """
+    Update a task.
+
+    The response lists any successor tasks whose dates moved as a result.
+    """
     check_role(access, "owner", "manager", "member")
     task = await task_service.get_task_by_id(db, task_id, access.project.id)
     if not task:
@@ -97,8 +197,10 @@ async def update_task(
             detail="Task not found",
         )
 
-    task = await task_service.update_task(db, task, body)
-    return TaskResponse.model_validate(task)
+    task, rescheduled = await task_service.update_task(db, access.project, task, body)
+    response = TaskUpdateResponse.model_validate(task)
+    response.rescheduled = [TaskDateChange(**row) for row in rescheduled]
+    return response
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -117,3 +219,27 @@ async def delete_task(
         )
 
     await task_service.soft_delete_task(db, task)
+
+
+@router.post("/{task_id}/indent", response_model=list[TaskOutlineChange])
+async def indent_task(
+    task_id: UUID,
+    access: ProjectAccess = Depends(get_project_or_404),
+    db: AsyncSession = Depends(get_db),
+):
+    """Indent a task; returns every task whose outline position changed."""
+    check_role(access, "owner", "manager", "member")
+    task = await _get_task_or_404(db, task_id, access)
+    return await task_service.indent_task(db, access.project, task)
+
+
+@router.post("/{task_id}/outdent", response_model=list[TaskOutlineChange])
+async def outdent_task(
+    task_id: UUID,
+    access: ProjectAccess = Depends(get_project_or_404),
+    db: AsyncSession = Depends(get_db),
+):
+    """Outdent a task; returns every task whose outline position changed."""
+    check_role(access, "owner", "manager", "member")
+    task = await _get_task_or_404(db, task_id, access)
+    return await task_service.outdent_task(db, access.project, task)
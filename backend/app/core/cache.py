@@ -0,0 +1,370 @@
+"""
+Redis-backed caches.
+
+Every cache here is an optimization only: Postgres stays the source of
+truth, and any Redis error is logged and treated as a miss.
+
+Project access cache
+--------------------
+Maps (project_id, user_id) -> project role name for project members.
+Entries for one project live in one Redis hash, so a whole project can be
+dropped at once. The hash expires ACCESS_CACHE_TTL_SECONDS after its first
+entry was written, which bounds how long any entry can be stale.
+
+ProjectMember and Role writes made through the ORM invalidate the affected
+entries after the transaction commits (see the session events below).
+
+Token versions
+--------------
+Maps user_id -> User.token_version for the stateless auth fast path. An
+access token is trusted without a user lookup only if its `ver` claim
+matches. Deactivating a user or changing their system role bumps the
+version (in the same flush) and overwrites the Redis value after commit,
+so older tokens stop being accepted. Lookups go through a small in-process
+LRU first, which bounds revocation delay to AUTH_CACHE_TTL_SECONDS.
+
+LLM responses
+-------------
+Maps a request key -> the JSON of a deterministic LLM response, shared by
+every worker for LLM_CACHE_TTL_SECONDS (see app.core.llm).
+
+AI usage counters
+-----------------
+Maps (user or organization, month) -> tokens used, for O(1) quota checks
+(see app.service.ai_usage_service). A counter is loaded from Postgres on a
+miss and only ever incremented while it exists, so an increment can never
+create a counter that starts from zero. Counters expire after
+AI_QUOTA_RECONCILE_SECONDS, which reconciles them with Postgres.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.project_member import ProjectMember
+from app.models.role import Role
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+_redis: Redis | None = None
+# Keep references so pending invalidations are not garbage collected
+_pending: set[asyncio.Task] = set()
+
+# user_id -> (token_version, expires_at)
+_TOKEN_VERSION_LRU_SIZE = 10_000
+_token_versions: OrderedDict[UUID, tuple[int, float]] = OrderedDict()
+
+
+def _get_redis() -> Redis | None:
+    """Shared client, or None when Redis is not configured."""
+    global _redis
+    if not settings.REDIS_URL:
+        return None
+    if _redis is None:
+        _redis = Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=0.1,
+            socket_connect_timeout=0.1,
+        )
+    return _redis
+
+
+def _access_key(project_id: UUID) -> str:
+    return f"access:{project_id}"
+
+
+# ── Project access ──
+
+
+def _access_redis() -> Redis | None:
+    return _get_redis() if settings.ACCESS_CACHE_TTL_SECONDS > 0 else None
+
+
+async def get_project_role(project_id: UUID, user_id: UUID) -> str | None:
+    """Cached role name of a project member, or None on a miss."""
+    redis = _access_redis()
+    if redis is None:
+        return None
+    try:
+        value = await redis.hget(_access_key(project_id), str(user_id))
+    except RedisError:
+        logger.warning("Access cache read failed", exc_info=True)
+        return None
+    return value.decode() if value is not None else None
+
+
+async def set_project_role(project_id: UUID, user_id: UUID, role_name: str) -> None:
+    """Remember a member's role until the project's hash expires."""
+    redis = _access_redis()
+    if redis is None:
+        return
+    key = _access_key(project_id)
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, str(user_id), role_name)
+            # Only a new hash gets a TTL, so entries never outlive it
+            pipe.expire(key, settings.ACCESS_CACHE_TTL_SECONDS, nx=True)
+            await pipe.execute()
+    except RedisError:
+        logger.warning("Access cache write failed", exc_info=True)
+
+
+async def invalidate_project_roles(
+    members: set[tuple[UUID, UUID]],
+    *,
+    everything: bool = False,
+) -> None:
+    """Drop cached roles for (project_id, user_id) pairs, or all of them."""
+    redis = _access_redis()
+    if redis is None:
+        return
+    try:
+        if everything:
+            keys = [key async for key in redis.scan_iter(match="access:*")]
+            if keys:
+                await redis.delete(*keys)
+            return
+        async with redis.pipeline(transaction=False) as pipe:
+            for project_id, user_id in members:
+                pipe.hdel(_access_key(project_id), str(user_id))
+            await pipe.execute()
+    except RedisError:
+        logger.warning("Access cache invalidation failed", exc_info=True)
+
+
+# ── Token versions ──
+
+
+def _token_version_key(user_id: UUID) -> str:
+    return f"auth:ver:{user_id}"
+
+
+def _remember_locally(user_id: UUID, version: int) -> None:
+    _token_versions[user_id] = (
+        version,
+        time.monotonic() + settings.AUTH_CACHE_TTL_SECONDS,
+    )
+    _token_versions.move_to_end(user_id)
+    if len(_token_versions) > _TOKEN_VERSION_LRU_SIZE:
+        _token_versions.popitem(last=False)
+
+
+async def get_token_version(user_id: UUID) -> int | None:
+    """Current token version of a user, or None if it must come from Postgres."""
+    cached = _token_versions.get(user_id)
+    if cached is not None and cached[1] > time.monotonic():
+        _token_versions.move_to_end(user_id)
+        return cached[0]
+
+    redis = _get_redis()
+    if redis is None:
+        return None
+    try:
+        value = await redis.get(_token_version_key(user_id))
+    except RedisError:
+        logger.warning("Token version read failed", exc_info=True)
+        return None
+    if value is None:
+        return None
+    _remember_locally(user_id, int(value))
+    return int(value)
+
+
+async def set_token_version(
+    user_id: UUID,
+    version: int,
+    *,
+    overwrite: bool = False,
+) -> None:
+    """
+    Publish a user's token version.
+
+    Values read from Postgres use overwrite=False, so they never replace a
+    newer version written by a concurrent bump.
+    """
+    _remember_locally(user_id, version)
+    redis = _get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.set(
+            _token_version_key(user_id),
+            version,
+            ex=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            nx=not overwrite,
+        )
+    except RedisError:
+        logger.warning("Token version write failed", exc_info=True)
+
+
+async def _publish_token_versions(versions: dict[UUID, int]) -> None:
+    for user_id, version in versions.items():
+        await set_token_version(user_id, version, overwrite=True)
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_token_versions(session: Session, flush_context, instances) -> None:
+    for obj in session.dirty:
+        if not isinstance(obj, User):
+            continue
+        attrs = inspect(obj).attrs
+        if not (
+            attrs.is_active.history.has_changes()
+            or attrs.system_role_id.history.has_changes()
+        ):
+            continue
+        obj.token_version = (obj.token_version or 0) + 1
+        session.info.setdefault("token_versions", {})[obj.id] = obj.token_version
+
+
+# ── LLM responses ──
+
+
+def _llm_key(key: str) -> str:
+    return f"llm:{key}"
+
+
+async def get_llm_response(key: str) -> dict | None:
+    """A cached LLM response, or None on a miss."""
+    redis = _get_redis()
+    if redis is None:
+        return None
+    try:
+        value = await redis.get(_llm_key(key))
+    except RedisError:
+        logger.warning("LLM cache read failed", exc_info=True)
+        return None
+    return json.loads(value) if value is not None else None
+
+
+async def set_llm_response(key: str, response: dict) -> None:
+    redis = _get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.set(
+            _llm_key(key), json.dumps(response), ex=settings.LLM_CACHE_TTL_SECONDS
+        )
+    except RedisError:
+        logger.warning("LLM cache write failed", exc_info=True)
+
+
+# ── AI usage counters ──
+
+# Increment only a counter that has been loaded
+_INCR_IF_EXISTS = """
+if redis.call("EXISTS", KEYS[1]) == 1 then
+    return redis.call("INCRBY", KEYS[1], ARGV[1])
+end
+return nil
+"""
+
+
+def _usage_key(key: str) -> str:
+    return f"ai:usage:{key}"
+
+
+async def get_usage_counter(key: str) -> int | None:
+    """A usage counter, or None when it must be loaded from Postgres."""
+    redis = _get_redis()
+    if redis is None:
+        return None
+    try:
+        value = await redis.get(_usage_key(key))
+    except RedisError:
+        logger.warning("Usage counter read failed", exc_info=True)
+        return None
+    return int(value) if value is not None else None
+
+
+async def set_usage_counter(key: str, value: int) -> None:
+    """Load a counter, unless another worker loaded it first."""
+    redis = _get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.set(
+            _usage_key(key), value, ex=settings.AI_QUOTA_RECONCILE_SECONDS, nx=True
+        )
+    except RedisError:
+        logger.warning("Usage counter write failed", exc_info=True)
+
+
+async def add_usage(amounts: dict[str, int]) -> None:
+    """Add to loaded counters; a missing one picks the usage up when loaded."""
+    redis = _get_redis()
+    if redis is None or not amounts:
+        return
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for key, amount in amounts.items():
+                pipe.eval(_INCR_IF_EXISTS, 1, _usage_key(key), amount)
+            await pipe.execute()
+    except RedisError:
+        logger.warning("Usage counter update failed", exc_info=True)
+
+
+# ── Invalidation on commit ──
+#
+# Membership and role rows are collected during flush and invalidated once
+# the transaction commits. Events are synchronous, so the Redis calls run as
+# a task on the running loop. Changes left over from a rolled-back flush only
+# cause a few extra cache misses at the next commit.
+
+
+def _track_member(session: Session, member: ProjectMember) -> None:
+    changes = session.info.setdefault("access_invalidations", set())
+    changes.add((member.project_id, member.user_id))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_access_changes(session: Session, flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, ProjectMember):
+            _track_member(session, obj)
+        elif isinstance(obj, Role) and obj not in session.new:
+            # Role renames can affect any project; drop the whole cache
+            session.info["access_invalidate_all"] = True
+
+
+def _run_after_commit(coro) -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        coro.close()
+        return  # Sync session outside the app (e.g. migrations)
+    task = loop.create_task(coro)
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    members = session.info.pop("access_invalidations", set())
+    everything = session.info.pop("access_invalidate_all", False)
+    if members or everything:
+        _run_after_commit(invalidate_project_roles(members, everything=everything))
+
+    versions = session.info.pop("token_versions", {})
+    if versions:
+        # Drop local copies now; other workers catch up within the LRU TTL
+        for user_id in versions:
+            _token_versions.pop(user_id, None)
+        _run_after_commit(_publish_token_versions(versions))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_token_versions(session: Session, previous_transaction) -> None:
+    # Bumps that never committed must not reach Redis
+    if not session.in_transaction():
+        session.info.pop("token_versions", None)
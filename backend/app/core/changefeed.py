@@ -0,0 +1,303 @@
+"""
+Project change feed.
+
+Clients connected to /api/v1/ws/projects/{id} receive compact diffs of the
+project's tasks, dependencies and assignments after every commit that
+changes them:
+
+    {"type": "changes", "project_id": ..., "version": 42,
+     "changes": {"task": {"<id>": {"name": "Pour slab"}, "<id>": null},
+                 "dependency": {...}, "assignment": {...}}}
+
+An entry holds the columns that changed (all of them for a new row), or
+null for a deleted row. version is Project.version after the commit; a
+gap tells the client it missed a frame (pub/sub delivers at most once)
+and should reload.
+
+Collecting
+----------
+ORM writes to Task, Dependency and Assignment are picked up after each
+flush. Set-based statements bypass the ORM, so code issuing them passes
+the rows it wrote to track(). Changes are merged per row for the whole
+transaction, published once it commits and dropped if it rolls back.
+
+Fan-out
+-------
+Frames are published to the Redis channel changes:{project_id}. Each
+worker has one listener, subscribed to the channels of projects it has
+connections for, so a commit on any worker reaches clients on all of
+them. Without Redis, frames reach this worker's clients only.
+
+Backpressure
+------------
+Each connection has a single pending frame, sent by its own task. New
+frames are merged into it (later values win), so a burst of commits
+becomes one frame and a slow client receives fewer, larger frames
+without holding back the listener or other clients. A pending frame
+touching more than MAX_PENDING_ROWS rows is replaced by
+{"type": "resync", ...}, which tells the client to reload.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import Iterable
+from uuid import UUID
+
+from redis.asyncio.client import PubSub
+from redis.exceptions import RedisError
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core import cache
+from app.core.versioning import bumped_versions
+from app.models.assignment import Assignment
+from app.models.dependency import Dependency
+from app.models.task import Task
+
+logger = logging.getLogger(__name__)
+
+KINDS = {Task: "task", Dependency: "dependency", Assignment: "assignment"}
+# Columns never sent (the id is the key)
+SKIPPED_COLUMNS = {"id", "created_at", "updated_at"}
+MAX_PENDING_ROWS = 5000
+RETRY_SECONDS = 1.0
+
+# session.info key: {project_id: {kind: {row id: columns | None}}}
+_CHANGES = "changefeed"
+
+
+def _channel(project_id: UUID) -> str:
+    return f"changes:{project_id}"
+
+
+def _merge(into: dict, changes: dict) -> None:
+    """Merge {kind: {id: columns | None}} into `into`; later values win."""
+    for kind, rows in changes.items():
+        target = into.setdefault(kind, {})
+        for row_id, columns in rows.items():
+            current = target.get(row_id)
+            if columns is None or current is None:
+                target[row_id] = None if columns is None else dict(columns)
+            else:
+                current.update(columns)
+
+
+def _pending(session: Session, project_id: UUID) -> dict:
+    return session.info.setdefault(_CHANGES, {}).setdefault(project_id, {})
+
+
+def track(
+    db: AsyncSession,
+    project_id: UUID,
+    kind: str,
+    rows: Iterable[dict] = (),
+    deleted: Iterable[UUID] = (),
+) -> None:
+    """
+    Report set-based writes: rows are {"id": ..., <column>: <new value>}.
+
+    ORM writes need no call; they are picked up after flush.
+    """
+    changes = {
+        str(row["id"]): {key: value for key, value in row.items() if key != "id"}
+        for row in rows
+    }
+    changes.update((str(row_id), None) for row_id in deleted)
+    if changes:
+        _merge(_pending(db.sync_session, project_id), {kind: changes})
+
+
+def _columns(obj, changed_only: bool) -> dict:
+    # Loaded values only: server defaults expired by the flush are left out
+    # rather than loaded again
+    state = inspect(obj)
+    values = state.dict
+    return {
+        key: values[key]
+        for key in state.mapper.columns.keys()
+        if key in values
+        and key not in SKIPPED_COLUMNS
+        and (not changed_only or state.attrs[key].history.has_changes())
+    }
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context) -> None:
+    # (project_id or task_id, kind, row id, columns or None)
+    found = []
+    for objects, changed_only in (
+        (session.new, False),
+        (session.dirty, True),
+        (session.deleted, None),
+    ):
+        for obj in objects:
+            kind = KINDS.get(type(obj))
+            if kind is None:
+                continue
+            columns = None if changed_only is None else _columns(obj, changed_only)
+            if columns == {}:
+                continue  # Only relationships or skipped columns changed
+            owner = obj.task_id if kind == "assignment" else obj.project_id
+            found.append((owner, kind, str(obj.id), columns))
+    if not found:
+        return
+
+    # Assignments only know their task
+    task_ids = {owner for owner, kind, _, _ in found if kind == "assignment"}
+    projects = {}
+    if task_ids:
+        projects = dict(
+            session.connection().execute(
+                select(Task.id, Task.project_id).where(Task.id.in_(task_ids))
+            )
+        )
+    for owner, kind, row_id, columns in found:
+        project_id = projects.get(owner) if kind == "assignment" else owner
+        if project_id is not None:
+            _merge(_pending(session, project_id), {kind: {row_id: columns}})
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session) -> None:
+    changes = session.info.pop(_CHANGES, None)
+    if not changes:
+        return
+    versions = bumped_versions(session)
+    for project_id, project_changes in changes.items():
+        frame = {
+            "type": "changes",
+            "project_id": project_id,
+            "version": versions.get(project_id),
+            "changes": project_changes,
+        }
+        cache._run_after_commit(publish(project_id, frame))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changes(session: Session, previous_transaction) -> None:
+    if not session.in_transaction():
+        session.info.pop(_CHANGES, None)
+
+
+async def publish(project_id: UUID, frame: dict) -> None:
+    """Send a frame to every worker's clients of the project."""
+    message = json.dumps(frame, default=str)
+    redis = cache._get_redis()
+    if redis is not None:
+        try:
+            await redis.publish(_channel(project_id), message)
+            return
+        except RedisError:
+            logger.warning("Change feed publish failed", exc_info=True)
+    # No Redis: this worker's clients only
+    hub.deliver(project_id, json.loads(message))
+
+
+# ── Connections ──
+
+
+class Subscriber:
+    """One connection's pending frame, merged until its sender takes it."""
+
+    def __init__(self, project_id: UUID) -> None:
+        self.project_id = project_id
+        self.pending: dict | None = None
+        self.ready = asyncio.Event()
+
+    def push(self, frame: dict) -> None:
+        pending = self.pending
+        if pending is None:
+            pending = self.pending = {**frame, "changes": {}}
+        pending["version"] = frame.get("version")
+        if pending["type"] == "changes":
+            _merge(pending["changes"], frame.get("changes", {}))
+            rows = sum(len(rows) for rows in pending["changes"].values())
+            if rows > MAX_PENDING_ROWS:
+                self.pending = {
+                    "type": "resync",
+                    "project_id": frame["project_id"],
+                    "version": frame.get("version"),
+                }
+        self.ready.set()
+
+    async def next(self) -> dict:
+        """Wait for and take the pending frame."""
+        await self.ready.wait()
+        self.ready.clear()
+        frame, self.pending = self.pending, None
+        return frame
+
+
+class ChangeHub:
+    """This worker's connections, by project, and its Redis listener."""
+
+    def __init__(self) -> None:
+        self._subscribers: dict[UUID, set[Subscriber]] = {}
+        self._pubsub: PubSub | None = None
+        self._listener: asyncio.Task | None = None
+
+    def deliver(self, project_id: UUID, frame: dict) -> None:
+        for subscriber in self._subscribers.get(project_id, ()):
+            subscriber.push(frame)
+
+    async def subscribe(self, project_id: UUID) -> Subscriber:
+        subscriber = Subscriber(project_id)
+        subscribers = self._subscribers.setdefault(project_id, set())
+        subscribers.add(subscriber)
+        if len(subscribers) == 1:
+            await self._redis_call("subscribe", _channel(project_id))
+        return subscriber
+
+    async def unsubscribe(self, subscriber: Subscriber) -> None:
+        project_id = subscriber.project_id
+        subscribers = self._subscribers.get(project_id, set())
+        subscribers.discard(subscriber)
+        if not subscribers:
+            self._subscribers.pop(project_id, None)
+            await self._redis_call("unsubscribe", _channel(project_id))
+
+    async def _redis_call(self, method: str, channel: str) -> None:
+        redis = cache._get_redis()
+        if redis is None:
+            return
+        if self._pubsub is None:
+            self._pubsub = redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            await getattr(self._pubsub, method)(channel)
+        except RedisError:
+            logger.warning("Change feed %s failed", method, exc_info=True)
+            return
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while self._subscribers:
+            try:
+                message = await self._pubsub.get_message(timeout=RETRY_SECONDS)
+            except RedisError:
+                logger.warning("Change feed listener failed", exc_info=True)
+                await asyncio.sleep(RETRY_SECONDS)
+                continue
+            if message is None or message["type"] != "message":
+                continue
+            project_id = UUID(message["channel"].decode().split(":", 1)[1])
+            self.deliver(project_id, json.loads(message["data"]))
+
+    def stats(self) -> dict:
+        return {
+            "projects": len(self._subscribers),
+            "connections": sum(len(subs) for subs in self._subscribers.values()),
+        }
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+
+
+hub = ChangeHub()
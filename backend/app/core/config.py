@@ -33,6 +33,15 @@ class Settings(BaseSettings):
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
+    ACCESS_CACHE_TTL_SECONDS: int = 60  # Project role cache; 0 disables it
+    # Trust access-token claims (checked against token versions in Redis)
+    # instead of loading the user on every request
+    STATELESS_AUTH: bool = False
+    AUTH_CACHE_TTL_SECONDS: int = 5  # In-process token version cache
+
+    # Password hashing (bcrypt) thread pool, per process
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # Waiting calls beyond this get 503
 
     # Rate Limiting (disabled in development by default)
     RATE_LIMIT_ENABLED: bool = True
@@ -50,6 +59,19 @@ class Settings(BaseSettings):
     # AI (optional for now)
     ANTHROPIC_API_KEY: str | None = None
     OPENAI_API_KEY: str | None = None
+    LLM_PROVIDER: str = "anthropic"  # "anthropic" or "openai"
+    ANTHROPIC_MODEL: str = "claude-sonnet-4-5-20250929"
+    OPENAI_MODEL: str = "gpt-4o"
+    LLM_TIMEOUT_SECONDS: float = 60.0
+    LLM_MAX_CONCURRENCY: int = 8  # Calls per provider at once, per process
+    LLM_MAX_QUEUE: int = 64  # Waiting calls beyond this get 503
+    LLM_CACHE_TTL_SECONDS: int = 86400  # Deterministic responses; 0 disables it
+    AI_CONTEXT_TOKEN_BUDGET: int = 4000  # Project context per chat prompt
+    AI_USAGE_FLUSH_SECONDS: float = 5.0  # How often buffered usage is written
+    AI_USAGE_FLUSH_BATCH: int = 500  # Buffered events that trigger an early flush
+    AI_MONTHLY_TOKENS_PER_USER: int = 0  # 0 means no quota
+    AI_MONTHLY_TOKENS_PER_ORGANIZATION: int = 0
+    AI_QUOTA_RECONCILE_SECONDS: int = 300  # Quota counters reload from Postgres
 
     # Tell pydantic to read values from a .env file
     model_config = SettingsConfigDict(
@@ -1,5 +1,6 @@
 from collections.abc import AsyncGenerator
 
+from sqlalchemy import ARRAY, Table, bindparam, func, update
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
@@ -34,3 +35,37 @@ class Base(DeclarativeBase):
 async def get_db() -> AsyncGenerator[AsyncSession]:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+# Update many rows by primary key with a single set-based UPDATE
+# - rows: dicts with the key column plus the columns to set (same keys in every row)
+# - Each column travels as one array parameter and is unpacked with unnest(),
+#   so the statement size does not grow with the number of rows
+async def bulk_update(
+    db: AsyncSession,
+    table: Table,
+    rows: list[dict],
+    *,
+    key: str = "id",
+) -> int:
+    if not rows:
+        return 0
+
+    names = list(rows[0])
+    arrays = [
+        bindparam(
+            f"{name}_values",
+            [row[name] for row in rows],
+            type_=ARRAY(table.c[name].type),
+        )
+        for name in names
+    ]
+    source = func.unnest(*arrays).table_valued(*names).render_derived(name="v")
+
+    stmt = (
+        update(table)
+        .where(table.c[key] == source.c[key])
+        .values({n: source.c[n] for n in names if n != key})
+    )
+    result = await db.execute(stmt)
+    return result.rowcount
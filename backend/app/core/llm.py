@@ -0,0 +1,543 @@
+"""
+LLM gateway.
+
+Every model call (chat, estimation, suggestions) goes through one
+LLMGateway per process:
+
+- Each provider (Anthropic, OpenAI) is called through one pooled
+  httpx.AsyncClient, kept for the life of the process and closed at
+  shutdown, so calls reuse open connections.
+- At most LLM_MAX_CONCURRENCY calls per provider run at once. Past
+  LLM_MAX_QUEUE waiting calls, new ones are turned away with 503, like the
+  password hashing pool.
+- Identical complete() calls in flight share one provider call.
+- Deterministic calls (temperature 0, e.g. task estimation) are cached in
+  process, then in Redis for LLM_CACHE_TTL_SECONDS (app.core.cache).
+
+Both share one key, built from the exact request: case and whitespace can
+change what a model answers (code, names), so no text is normalized.
+
+Streamed calls are neither coalesced nor cached. Provider failures are
+returned as 502 (504 on timeout).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import NamedTuple
+
+import httpx
+from fastapi import HTTPException, status
+
+from app.core import cache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_LOCAL_CACHE_SIZE = 1024
+
+
+class Message(NamedTuple):
+    role: str  # "user" or "assistant"
+    content: str
+
+
+class LLMRequest(NamedTuple):
+    messages: tuple[Message, ...]
+    system: str = ""
+    max_tokens: int = 1024
+    temperature: float = 1.0
+    provider: str | None = None  # Defaults to settings.LLM_PROVIDER
+    model: str | None = None  # Defaults to the provider's model
+
+    @property
+    def deterministic(self) -> bool:
+        return self.temperature == 0
+
+
+class LLMResponse(NamedTuple):
+    text: str
+    model: str
+    tokens_in: int
+    tokens_out: int
+    finish_reason: str | None
+    latency_ms: int
+    cached: bool = False
+
+
+class LLMChunk(NamedTuple):
+    """Streamed text; the last chunk is empty and carries the response."""
+
+    text: str
+    response: LLMResponse | None = None
+
+
+class Delta(NamedTuple):
+    """What one provider response or stream event adds to the reply."""
+
+    text: str = ""
+    model: str | None = None
+    tokens_in: int | None = None
+    tokens_out: int | None = None
+    finish_reason: str | None = None
+
+
+def _merge(state: Delta, delta: Delta) -> Delta:
+    fields = delta._asdict()
+    del fields["text"]
+    return state._replace(**{k: v for k, v in fields.items() if v is not None})
+
+
+# ── Providers ──
+
+
+class LLMProvider(ABC):
+    """Request and response formats of one provider's HTTP API."""
+
+    name: str
+    base_url: str
+    path: str
+
+    @property
+    @abstractmethod
+    def api_key(self) -> str | None: ...
+
+    @property
+    @abstractmethod
+    def default_model(self) -> str: ...
+
+    @abstractmethod
+    def headers(self) -> dict[str, str]: ...
+
+    @abstractmethod
+    def payload(self, request: LLMRequest, model: str, stream: bool) -> dict: ...
+
+    @abstractmethod
+    def parse(self, body: dict) -> Delta:
+        """A whole (non-streamed) response."""
+
+    @abstractmethod
+    def parse_event(self, data: dict) -> Delta:
+        """One server-sent event of a streamed response."""
+
+
+class AnthropicProvider(LLMProvider):
+    name = "anthropic"
+    base_url = "https://api.anthropic.com"
+    path = "/v1/messages"
+
+    @property
+    def api_key(self) -> str | None:
+        return settings.ANTHROPIC_API_KEY
+
+    @property
+    def default_model(self) -> str:
+        return settings.ANTHROPIC_MODEL
+
+    def headers(self) -> dict[str, str]:
+        return {"x-api-key": self.api_key or "", "anthropic-version": "2023-06-01"}
+
+    def payload(self, request: LLMRequest, model: str, stream: bool) -> dict:
+        body = {
+            "model": model,
+            "max_tokens": request.max_tokens,
+            "temperature": request.temperature,
+            "messages": [message._asdict() for message in request.messages],
+            "stream": stream,
+        }
+        if request.system:
+            body["system"] = request.system
+        return body
+
+    def parse(self, body: dict) -> Delta:
+        usage = body.get("usage") or {}
+        return Delta(
+            text="".join(
+                block.get("text", "")
+                for block in body.get("content") or ()
+                if block.get("type") == "text"
+            ),
+            model=body.get("model"),
+            tokens_in=usage.get("input_tokens"),
+            tokens_out=usage.get("output_tokens"),
+            finish_reason=body.get("stop_reason"),
+        )
+
+    def parse_event(self, data: dict) -> Delta:
+        kind = data.get("type")
+        if kind == "message_start":
+            return self.parse(data["message"])
+        if kind == "content_block_delta":
+            return Delta(text=data["delta"].get("text", ""))
+        if kind == "message_delta":
+            return Delta(
+                tokens_out=(data.get("usage") or {}).get("output_tokens"),
+                finish_reason=data["delta"].get("stop_reason"),
+            )
+        if kind == "error":
+            raise ValueError(data.get("error"))
+        return Delta()
+
+
+class OpenAIProvider(LLMProvider):
+    name = "openai"
+    base_url = "https://api.openai.com"
+    path = "/v1/chat/completions"
+
+    @property
+    def api_key(self) -> str | None:
+        return settings.OPENAI_API_KEY
+
+    @property
+    def default_model(self) -> str:
+        return settings.OPENAI_MODEL
+
+    def headers(self) -> dict[str, str]:
+        return {"authorization": f"Bearer {self.api_key or ''}"}
+
+    def payload(self, request: LLMRequest, model: str, stream: bool) -> dict:
+        messages = [message._asdict() for message in request.messages]
+        if request.system:
+            messages.insert(0, {"role": "system", "content": request.system})
+        body = {
+            "model": model,
+            "max_tokens": request.max_tokens,
+            "temperature": request.temperature,
+            "messages": messages,
+            "stream": stream,
+        }
+        if stream:
+            body["stream_options"] = {"include_usage": True}
+        return body
+
+    def _usage(self, body: dict) -> Delta:
+        usage = body.get("usage") or {}
+        return Delta(
+            model=body.get("model"),
+            tokens_in=usage.get("prompt_tokens"),
+            tokens_out=usage.get("completion_tokens"),
+        )
+
+    def parse(self, body: dict) -> Delta:
+        [choice, *_] = body["choices"]
+        return self._usage(body)._replace(
+            text=choice["message"].get("content") or "",
+            finish_reason=choice.get("finish_reason"),
+        )
+
+    def parse_event(self, data: dict) -> Delta:
+        delta = self._usage(data)
+        for choice in data.get("choices") or ():
+            delta = delta._replace(
+                text=delta.text + (choice["delta"].get("content") or ""),
+                finish_reason=choice.get("finish_reason") or delta.finish_reason,
+            )
+        return delta
+
+
+PROVIDERS: dict[str, LLMProvider] = {
+    provider.name: provider for provider in (AnthropicProvider(), OpenAIProvider())
+}
+
+
+# ── Gateway ──
+
+
+def request_key(provider: str, model: str, request: LLMRequest) -> str:
+    """Cache and coalescing key: the exact request."""
+    canonical = json.dumps(
+        [
+            provider,
+            model,
+            request.system,
+            [(m.role, m.content) for m in request.messages],
+            request.max_tokens,
+            request.temperature,
+        ]
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _ms_since(started: float) -> int:
+    return round((time.perf_counter() - started) * 1000)
+
+
+class GatewayStats(NamedTuple):
+    """Counters for the LLM gateway."""
+
+    calls: int  # Made to providers
+    coalesced: int
+    cache_hits: int
+    cache_misses: int
+    rejected: int
+    errors: int
+    running: int
+    waiting: int
+
+
+class LLMGateway:
+    def __init__(
+        self,
+        providers: dict[str, LLMProvider] | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.providers = providers or PROVIDERS
+        self._transport = transport  # Tests route calls to a local stub
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+        # key -> (response, expires_at)
+        self._cache: OrderedDict[str, tuple[LLMResponse, float]] = OrderedDict()
+        self._calls = self._coalesced = self._rejected = self._errors = 0
+        self._hits = self._misses = 0
+        self._running = self._waiting = 0
+
+    def _provider(self, request: LLMRequest) -> LLMProvider:
+        provider = self.providers.get(request.provider or settings.LLM_PROVIDER)
+        if provider is None or not provider.api_key:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="AI provider is not configured",
+            )
+        return provider
+
+    def _client(self, provider: LLMProvider) -> httpx.AsyncClient:
+        client = self._clients.get(provider.name)
+        if client is None:
+            size = settings.LLM_MAX_CONCURRENCY
+            client = self._clients[provider.name] = httpx.AsyncClient(
+                base_url=provider.base_url,
+                timeout=httpx.Timeout(settings.LLM_TIMEOUT_SECONDS, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=size, max_keepalive_connections=size
+                ),
+                transport=self._transport,
+            )
+        return client
+
+    @asynccontextmanager
+    async def _slot(self, provider: LLMProvider):
+        if self._waiting >= settings.LLM_MAX_QUEUE:
+            self._rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many AI requests in progress, try again shortly",
+                headers={"Retry-After": "1"},
+            )
+        slots = self._slots.get(provider.name)
+        if slots is None:
+            slots = self._slots[provider.name] = asyncio.Semaphore(
+                settings.LLM_MAX_CONCURRENCY
+            )
+        self._waiting += 1
+        try:
+            await slots.acquire()
+        finally:
+            self._waiting -= 1
+        self._running += 1
+        self._calls += 1
+        try:
+            yield self._client(provider)
+        finally:
+            self._running -= 1
+            slots.release()
+
+    def _failed(self, provider: LLMProvider, exc: Exception) -> HTTPException:
+        self._errors += 1
+        logger.warning("LLM call to %s failed: %r", provider.name, exc)
+        if isinstance(exc, httpx.TimeoutException):
+            return HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="AI provider timed out",
+            )
+        return HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="AI provider request failed",
+        )
+
+    # ── Cache ──
+
+    async def _cached(self, key: str) -> LLMResponse | None:
+        entry = self._cache.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            self._cache.move_to_end(key)
+            return entry[0]
+        found = await cache.get_llm_response(key)
+        if found is None:
+            return None
+        response = LLMResponse(**found)
+        self._remember(key, response)
+        return response
+
+    def _remember(self, key: str, response: LLMResponse) -> None:
+        self._cache[key] = (
+            response,
+            time.monotonic() + settings.LLM_CACHE_TTL_SECONDS,
+        )
+        self._cache.move_to_end(key)
+        if len(self._cache) > _LOCAL_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    # ── Calls ──
+
+    async def complete(self, request: LLMRequest) -> LLMResponse:
+        """A whole reply, coalesced with identical calls in flight."""
+        started = time.perf_counter()
+        provider = self._provider(request)
+        model = request.model or provider.default_model
+        key = request_key(provider.name, model, request)
+        caching = request.deterministic and settings.LLM_CACHE_TTL_SECONDS > 0
+
+        if caching:
+            found = await self._cached(key)
+            if found is not None:
+                self._hits += 1
+                return found._replace(cached=True, latency_ms=_ms_since(started))
+            self._misses += 1
+
+        while (pending := self._inflight.get(key)) is not None:
+            self._coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # This caller was cancelled
+                # The call we joined was cancelled; make our own
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await self._complete(provider, model, request, started)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # Retrieved here even if nobody joined
+            raise
+        finally:
+            del self._inflight[key]
+        future.set_result(response)
+
+        if caching:
+            self._remember(key, response)
+            await cache.set_llm_response(key, response._asdict())
+        return response
+
+    async def _complete(
+        self,
+        provider: LLMProvider,
+        model: str,
+        request: LLMRequest,
+        started: float,
+    ) -> LLMResponse:
+        async with self._slot(provider) as client:
+            try:
+                reply = await client.post(
+                    provider.path,
+                    headers=provider.headers(),
+                    json=provider.payload(request, model, stream=False),
+                )
+                reply.raise_for_status()
+                delta = provider.parse(reply.json())
+            except (httpx.HTTPError, ValueError, KeyError) as exc:
+                raise self._failed(provider, exc) from exc
+        return LLMResponse(
+            text=delta.text,
+            model=delta.model or model,
+            tokens_in=delta.tokens_in or 0,
+            tokens_out=delta.tokens_out or 0,
+            finish_reason=delta.finish_reason,
+            latency_ms=_ms_since(started),
+        )
+
+    def model_for(self, request: LLMRequest) -> str:
+        """The model a request is sent to."""
+        return request.model or self._provider(request).default_model
+
+    async def stream(self, request: LLMRequest) -> AsyncIterator[LLMChunk]:
+        """
+        A reply as it is generated.
+
+        Yields text chunks as the provider sends them, then an empty chunk
+        carrying the whole LLMResponse.
+        """
+        started = time.perf_counter()
+        provider = self._provider(request)
+        model = request.model or provider.default_model
+        state = Delta(model=model)
+        parts = []
+        async with self._slot(provider) as client:
+            try:
+                async with client.stream(
+                    "POST",
+                    provider.path,
+                    headers=provider.headers(),
+                    json=provider.payload(request, model, stream=True),
+                ) as reply:
+                    reply.raise_for_status()
+                    async for line in reply.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[5:].strip()
+                        if data == "[DONE]":
+                            break
+                        delta = provider.parse_event(json.loads(data))
+                        state = _merge(state, delta)
+                        if delta.text:
+                            parts.append(delta.text)
+                            yield LLMChunk(delta.text)
+            except (httpx.HTTPError, ValueError, KeyError) as exc:
+                raise self._failed(provider, exc) from exc
+        yield LLMChunk(
+            "",
+            LLMResponse(
+                text="".join(parts),
+                model=state.model or model,
+                tokens_in=state.tokens_in or 0,
+                tokens_out=state.tokens_out or 0,
+                finish_reason=state.finish_reason,
+                latency_ms=_ms_since(started),
+            ),
+        )
+
+    def stats(self) -> GatewayStats:
+        return GatewayStats(
+            calls=self._calls,
+            coalesced=self._coalesced,
+            cache_hits=self._hits,
+            cache_misses=self._misses,
+            rejected=self._rejected,
+            errors=self._errors,
+            running=self._running,
+            waiting=self._waiting,
+        )
+
+    async def aclose(self) -> None:
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+_gateway: LLMGateway | None = None
+
+
+def get_gateway() -> LLMGateway:
+    """The process-wide gateway."""
+    global _gateway
+    if _gateway is None:
+        _gateway = LLMGateway()
+    return _gateway
+
+
+async def close_gateway() -> None:
+    global _gateway
+    if _gateway is not None:
+        await _gateway.aclose()
+        _gateway = None
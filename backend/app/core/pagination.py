@@ -0,0 +1,127 @@
+"""
+Offset and keyset (cursor) pagination for list queries.
+
+Offset mode (page/per_page) is kept for compatibility. Cursor mode seeks
+past the last row of the previous page with a row-value comparison on the
+sort key, e.g. (order_index, id) > (41, '...'), so deep pages cost the same
+as the first one when an index covers the key. The id column always ends
+the key, so rows with equal sort values are never skipped or repeated.
+
+A cursor is the sort key of the last row, JSON-encoded and base64url'd.
+Clients treat it as opaque.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import NamedTuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, func, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class Page(NamedTuple):
+    """One page of results."""
+
+    items: list
+    total: int | None  # None when the count was skipped
+    next_cursor: str | None  # None on the last page and in offset mode
+
+
+def encode_cursor(values: list) -> str:
+    """Opaque cursor for a sort key."""
+    plain = [
+        v.isoformat() if isinstance(v, date) else str(v) if isinstance(v, UUID) else v
+        for v in values
+    ]
+    raw = json.dumps(plain, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: tuple) -> list:
+    """Sort key from a cursor, typed like `columns`. Raises 400 if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        plain = json.loads(raw)
+        if not isinstance(plain, list) or len(plain) != len(columns):
+            raise ValueError("cursor length")
+        return [_parse(column, value) for column, value in zip(columns, plain)]
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def _parse(column, value):
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is UUID:
+        return UUID(value)
+    if not isinstance(value, python_type):
+        raise TypeError("cursor value type")
+    return value
+
+
+async def _fetch(db: AsyncSession, stmt: Select, rows: bool) -> list:
+    result = await db.execute(stmt)
+    return list(result.all() if rows else result.scalars().all())
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    order: tuple,
+    *,
+    descending: bool = False,
+    page: int = 1,
+    per_page: int = 50,
+    cursor: str | None = None,
+    include_total: bool | None = None,
+    rows: bool = False,
+) -> Page:
+    """
+    Run `query` ordered by the `order` columns (ending with the id column).
+
+    cursor=None uses offset mode; any other value (including "" for the
+    first page) uses keyset mode. include_total defaults to True in offset
+    mode and False in cursor mode, where the count is usually the most
+    expensive part of the request.
+
+    rows=True returns Row tuples instead of scalars, for column selects. The
+    order columns must then be among the selected columns.
+    """
+    if include_total is None:
+        include_total = cursor is None
+
+    total = None
+    if include_total:
+        count_query = select(func.count()).select_from(query.subquery())
+        total = (await db.execute(count_query)).scalar() or 0
+
+    stmt = query.order_by(*(c.desc() if descending else c.asc() for c in order))
+
+    if cursor is None:
+        stmt = stmt.offset((page - 1) * per_page).limit(per_page)
+        items = await _fetch(db, stmt, rows)
+        return Page(items, total, None)
+
+    if cursor:
+        values = decode_cursor(cursor, order)
+        key = tuple_(*order)
+        bound = tuple_(*(literal(v, c.type) for c, v in zip(order, values)))
+        stmt = stmt.where(key < bound if descending else key > bound)
+
+    # One extra row tells us whether another page exists
+    items = await _fetch(db, stmt.limit(per_page + 1), rows)
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, c.key) for c in order])
+    return Page(items, total, next_cursor)
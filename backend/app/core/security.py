@@ -4,29 +4,164 @@ Cryptographic utilities for authentication.
 Password hashing (bcrypt), JWT access tokens, and refresh token management.
 """
 
+import asyncio
 import hashlib
 import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
+from typing import NamedTuple
+from uuid import UUID
 
 import bcrypt
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 
 from app.core.config import settings
 
-
-def hash_password(plain: str) -> str:
+# ── Password hashing ──
+#
+# A bcrypt call takes 100-300 ms of CPU. Run inline it would stall the event
+# loop and every other request on the worker, so it runs on a small thread
+# pool instead (bcrypt releases the GIL while hashing). PASSWORD_HASH_WORKERS
+# bounds how many hashes run at once; past PASSWORD_HASH_MAX_QUEUE waiting
+# calls, new ones are turned away with 503 rather than queueing without end.
+
+
+class PasswordPoolStats(NamedTuple):
+    """Counters for the password hashing pool."""
+
+    workers: int
+    running: int
+    waiting: int
+    completed: int
+    rejected: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+
+class _PasswordPool:
+    def __init__(self) -> None:
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._started = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="bcrypt",
+            )
+        return self._executor
+
+    async def run(self, fn, *args):
+        with self._lock:
+            waiting = self._submitted - self._started
+            if waiting >= settings.PASSWORD_HASH_MAX_QUEUE:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many sign-in attempts in progress, try again shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._submitted += 1
+        queued_at = time.perf_counter()
+        # Set under the lock: whether the job started, or was given up first
+        state = {"started": False, "abandoned": False}
+
+        def job():
+            wait = time.perf_counter() - queued_at
+            with self._lock:
+                if state["abandoned"]:
+                    return None
+                state["started"] = True
+                self._started += 1
+                self._wait_total += wait
+                self._wait_max = max(self._wait_max, wait)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._completed += 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), job)
+        except asyncio.CancelledError:
+            # The caller left while queued: give its place back, and make
+            # sure the job does nothing if the executor still runs it
+            with self._lock:
+                if not state["started"]:
+                    state["abandoned"] = True
+                    self._submitted -= 1
+            raise
+
+    def stats(self) -> PasswordPoolStats:
+        with self._lock:
+            return PasswordPoolStats(
+                workers=settings.PASSWORD_HASH_WORKERS,
+                running=self._started - self._completed,
+                waiting=self._submitted - self._started,
+                completed=self._completed,
+                rejected=self._rejected,
+                wait_seconds_total=self._wait_total,
+                wait_seconds_max=self._wait_max,
+            )
+
+
+_password_pool = _PasswordPool()
+
+
+def _hash_password(plain: str) -> str:
     return bcrypt.hashpw(plain.encode(), bcrypt.gensalt()).decode()
 
 
-def verify_password(plain: str, hashed: str) -> bool:
+def _verify_password(plain: str, hashed: str) -> bool:
     return bcrypt.checkpw(plain.encode(), hashed.encode())
 
 
-def create_access_token(subject: str, expires_delta: timedelta | None = None) -> str:
+async def hash_password(plain: str) -> str:
+    return await _password_pool.run(_hash_password, plain)
+
+
+async def verify_password(plain: str, hashed: str) -> bool:
+    return await _password_pool.run(_verify_password, plain, hashed)
+
+
+def password_pool_stats() -> PasswordPoolStats:
+    """Current counters of the password hashing pool."""
+    return _password_pool.stats()
+
+
+class AuthUser(NamedTuple):
+    """Caller identity, from verified token claims or the user row."""
+
+    id: UUID
+    system_role_id: UUID | None
+
+
+def create_access_token(
+    subject: str,
+    expires_delta: timedelta | None = None,
+    claims: dict | None = None,
+) -> str:
+    """
+    Signed access token for `subject`.
+
+    `claims` adds extra fields, e.g. act (is_active), srl (system role id)
+    and ver (token version) for the stateless auth fast path.
+    """
     expire = datetime.now(UTC) + (
         expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
     payload = {
+        **(claims or {}),
         "sub": subject,
         "exp": expire,
         "iat": datetime.now(UTC),
@@ -0,0 +1,110 @@
+"""
+Project data versions.
+
+Project.version goes up with every transaction that changes a project's
+schedule data: the project row itself, its tasks, dependencies, resources,
+assignments and resource availability. Views derived from that data are
+cached under (project_id, version), so a write makes older entries
+unreachable without any explicit invalidation.
+
+Writers call lock_project() before changing any of that data, ORM or
+set-based: it locks the project row first, so concurrent writers queue on
+it rather than deadlock on the rows below it, and bumps the version. A
+flush that changes a project's rows without the lock raises. Edits to the
+project row itself are bumped after the flush. A project is bumped at
+most once per transaction; bumped_versions() gives the new versions until
+the transaction ends.
+"""
+
+from uuid import UUID
+
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.models.assignment import Assignment
+from app.models.dependency import Dependency
+from app.models.project import Project
+from app.models.resource import Resource
+from app.models.resource_availability import ResourceAvailability
+from app.models.task import Task
+
+_project = Project.__table__
+
+# session.info key: {project id: new version} for this transaction
+_BUMPED = "bumped_project_versions"
+
+
+def _bump(project_filter):
+    # Keep updated_at as is; it tracks edits to the project itself
+    return (
+        update(_project)
+        .where(project_filter)
+        .values(version=_project.c.version + 1, updated_at=_project.c.updated_at)
+        .returning(_project.c.id, _project.c.version)
+    )
+
+
+def bumped_versions(session: Session) -> dict[UUID, int]:
+    """Projects bumped in the session's transaction, with their new version."""
+    return session.info.get(_BUMPED, {})
+
+
+async def lock_project(db: AsyncSession, project_id: UUID) -> None:
+    """
+    Lock the project row for the rest of the transaction and bump its version.
+
+    Serializes writers of one project (outline edits, reschedules, link
+    cycle checks) so data loaded under the lock stays current.
+    """
+    result = await db.execute(_bump(_project.c.id == project_id))
+    db.sync_session.info.setdefault(_BUMPED, {}).update(result.tuples())
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_changed_projects(session: Session, flush_context) -> None:
+    project_ids, owner_ids, task_ids, resource_ids = set(), set(), set(), set()
+    dirty = [obj for obj in session.dirty if session.is_modified(obj)]
+    for obj in (*session.new, *dirty, *session.deleted):
+        if isinstance(obj, Project):
+            project_ids.add(obj.id)
+        elif isinstance(obj, (Task, Dependency, Resource)):
+            owner_ids.add(obj.project_id)
+        elif isinstance(obj, Assignment):
+            task_ids.add(obj.task_id)
+        elif isinstance(obj, ResourceAvailability):
+            resource_ids.add(obj.resource_id)
+
+    bumped = session.info.setdefault(_BUMPED, {})
+    # The flush has just written (and so locked) these project rows
+    project_ids -= bumped.keys()
+    if project_ids:
+        result = session.connection().execute(_bump(_project.c.id.in_(project_ids)))
+        bumped.update(result.tuples())
+
+    connection = session.connection()
+    if task_ids:
+        owner_ids.update(
+            connection.execute(
+                select(Task.project_id).where(Task.id.in_(task_ids))
+            ).scalars()
+        )
+    if resource_ids:
+        owner_ids.update(
+            connection.execute(
+                select(Resource.project_id).where(Resource.id.in_(resource_ids))
+            ).scalars()
+        )
+    # Locking the project here, after its rows, would invert the order
+    # lock_project() takes and deadlock against it
+    unlocked = owner_ids - bumped.keys()
+    if unlocked:
+        raise RuntimeError(
+            f"Project data changed without lock_project(): {sorted(map(str, unlocked))}"
+        )
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_bumped(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_BUMPED, None)
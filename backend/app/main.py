@@ -8,20 +8,29 @@ from fastapi.responses import JSONResponse
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
+from app.api.v1.endpoints.ai import router as ai_router
 from app.api.v1.endpoints.assignments import (
     assignments_router,
     task_assignments_router,
 )
 from app.api.v1.endpoints.auth import router as auth_router
+from app.api.v1.endpoints.baselines import router as baselines_router
+from app.api.v1.endpoints.changes import router as changes_router
 from app.api.v1.endpoints.dependencies import router as dependencies_router
+from app.api.v1.endpoints.earned_value import router as earned_value_router
 from app.api.v1.endpoints.organization_members import router as org_members_router
 from app.api.v1.endpoints.organizations import router as orgs_router
 from app.api.v1.endpoints.projects import router as projects_router
 from app.api.v1.endpoints.resources import router as resources_router
+from app.api.v1.endpoints.schedule import router as schedule_router
 from app.api.v1.endpoints.tasks import router as tasks_router
+from app.core import changefeed
 from app.core.config import settings
 from app.core.database import engine
+from app.core.llm import close_gateway, get_gateway
 from app.core.rate_limit import limiter, rate_limit_exceeded_handler
+from app.core.security import password_pool_stats
+from app.service import ai_usage_service
 
 
 @asynccontextmanager
@@ -29,13 +38,19 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
     """
     Manage application lifecycle.
 
-    Startup: Resources are ready (DB pool already created by engine)
-    Shutdown: Close database connections gracefully
+    Startup: Resources are ready (DB pool already created by engine);
+             start the AI usage flusher
+    Shutdown: Flush AI usage, close database, LLM provider and change feed
+              connections
     """
     # Startup - engine pool is already created on import
+    ai_usage_service.start_flusher()
     yield
-    # Shutdown - dispose of connection pool
+    # Shutdown - write buffered usage, then dispose of connection pools
+    await ai_usage_service.stop_flusher()
     await engine.dispose()
+    await close_gateway()
+    await changefeed.hub.close()
 
 
 # Initialize the FastAPI application
@@ -92,9 +107,26 @@ app.include_router(resources_router, prefix="/api/v1")
 app.include_router(dependencies_router, prefix="/api/v1")
 app.include_router(task_assignments_router, prefix="/api/v1")
 app.include_router(assignments_router, prefix="/api/v1")
+app.include_router(schedule_router, prefix="/api/v1")
+app.include_router(baselines_router, prefix="/api/v1")
+app.include_router(earned_value_router, prefix="/api/v1")
+app.include_router(ai_router, prefix="/api/v1")
+app.include_router(changes_router, prefix="/api/v1")
 
 
 # Health check endpoint
 @app.get("/")
 def read_root():
     return {"message": "Welcome to Sophikon!"}
+
+
+@app.get("/health")
+def health():
+    """Liveness plus worker metrics (password hashing, LLM, metering, feeds)."""
+    return {
+        "status": "ok",
+        "password_pool": password_pool_stats()._asdict(),
+        "llm_gateway": get_gateway().stats()._asdict(),
+        "ai_usage_buffered": ai_usage_service.buffered(),
+        "change_feed": changefeed.hub.stats(),
+    }
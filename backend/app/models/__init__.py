@@ -6,6 +6,8 @@ from app.models.activity_log import ActivityLog
 from app.models.ai_conversation import AIConversation
 from app.models.ai_message import AIMessage
 from app.models.ai_usage import AIUsage
+from app.models.ai_usage_daily import AIUsageDaily
+from app.models.ai_usage_monthly import AIUsageMonthly
 from app.models.assignment import Assignment
 from app.models.assignment_baseline import AssignmentBaseline
 from app.models.attachment import Attachment
@@ -13,6 +15,7 @@ from app.models.calendar import Calendar
 from app.models.calendar_exception import CalendarException
 from app.models.comment import Comment
 from app.models.dependency import Dependency
+from app.models.earned_value_snapshot import EarnedValueSnapshot
 from app.models.email_verification import EmailVerification
 from app.models.notification import Notification
 from app.models.organization import Organization
@@ -51,6 +54,7 @@ __all__ = [
     "ResourceAvailability",
     "Assignment",
     "AssignmentBaseline",
+    "EarnedValueSnapshot",
     "Dependency",
     "TimeEntry",
     "Comment",
@@ -59,5 +63,7 @@ __all__ = [
     "AIConversation",
     "AIMessage",
     "AIUsage",
+    "AIUsageDaily",
+    "AIUsageMonthly",
     "ActivityLog",
 ]
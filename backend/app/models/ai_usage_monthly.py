@@ -0,0 +1,112 @@
+"""
+AIUsageMonthly model for monthly AI usage totals.
+"""
+
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import (
+    DECIMAL,
+    TIMESTAMP,
+    BigInteger,
+    CheckConstraint,
+    Date,
+    Integer,
+    String,
+    UniqueConstraint,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from uuid_utils import uuid7
+
+from app.core.database import Base
+
+
+class AIUsageMonthly(Base):
+    """
+    AI usage per user and organization per calendar month.
+
+    One row per user and per organization per month, kept up to date by
+    the usage flusher (see ai_usage_service). Quota counters are loaded
+    from these totals.
+    """
+
+    __tablename__ = "ai_usage_monthly"
+
+    # Primary Key (app-generated)
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid7,
+    )
+
+    # Polymorphic Entity Reference
+    entity_type: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        comment="Entity type (user, organization)",
+    )
+    entity_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=False,
+        comment="Entity ID (polymorphic)",
+    )
+
+    # Period
+    usage_month: Mapped[date] = mapped_column(
+        Date,
+        nullable=False,
+        comment="First day of the month",
+    )
+
+    # Totals
+    calls: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default=text("0"),
+    )
+    tokens_in: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        server_default=text("0"),
+    )
+    tokens_out: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        server_default=text("0"),
+    )
+    estimated_cost: Mapped[float] = mapped_column(
+        DECIMAL(12, 6),
+        nullable=False,
+        server_default=text("0"),
+        comment="Estimated cost in USD",
+    )
+
+    # Timestamps
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint(
+            "entity_type",
+            "entity_id",
+            "usage_month",
+            name="uq_ai_usage_monthly_entity",
+        ),
+        CheckConstraint(
+            "entity_type IN ('user', 'organization')",
+            name="check_ai_usage_monthly_entity_type",
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<AIUsageMonthly(entity_type='{self.entity_type}', "
+            f"entity_id={self.entity_id}, usage_month={self.usage_month})>"
+        )
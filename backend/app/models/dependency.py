@@ -121,6 +121,12 @@ class Dependency(Base):
             "idx_dependency_project",
             project_id,
         ),
+        Index(
+            "idx_dependency_project_created",
+            project_id,
+            created_at,
+            id,
+        ),
         Index(
             "idx_dependency_predecessor",
             predecessor_id,
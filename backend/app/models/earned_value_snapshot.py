@@ -0,0 +1,104 @@
+"""
+EarnedValueSnapshot model for earned value trends.
+"""
+
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import (
+    DECIMAL,
+    TIMESTAMP,
+    Date,
+    ForeignKey,
+    Index,
+    Integer,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from uuid_utils import uuid7
+
+from app.core.database import Base
+
+
+class EarnedValueSnapshot(Base):
+    """
+    Earned value of a task, or of the whole project, at a status date.
+
+    One row per task (task_id NULL for the project total) for each status
+    date and baseline analysed, so trends are read back rather than
+    recomputed. Ratios (SPI, CPI, EAC, VAC) derive from the stored values.
+    """
+
+    __tablename__ = "earned_value_snapshot"
+
+    # Primary Key (app-generated)
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid7,
+    )
+
+    # Foreign Keys
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("project.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    task_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("task.id", ondelete="CASCADE"),
+        nullable=True,
+        comment="NULL for the project total",
+    )
+
+    # Analysis Point
+    status_date: Mapped[date] = mapped_column(
+        Date,
+        nullable=False,
+    )
+    baseline_number: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default=text("0"),
+    )
+
+    # Earned Value
+    bac: Mapped[float] = mapped_column(
+        DECIMAL(15, 2),  # Budget at Completion
+        nullable=False,
+    )
+    bcws: Mapped[float] = mapped_column(
+        DECIMAL(15, 2),  # Budgeted Cost of Work Scheduled
+        nullable=False,
+    )
+    bcwp: Mapped[float] = mapped_column(
+        DECIMAL(15, 2),  # Budgeted Cost of Work Performed
+        nullable=False,
+    )
+    acwp: Mapped[float] = mapped_column(
+        DECIMAL(15, 2),  # Actual Cost of Work Performed
+        nullable=False,
+    )
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+    # Indexes
+    __table_args__ = (
+        Index(
+            "idx_earned_value_project_date", project_id, baseline_number, status_date
+        ),
+        Index("idx_earned_value_task", task_id),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<EarnedValueSnapshot(project_id={self.project_id}, "
+            f"task_id={self.task_id}, status_date={self.status_date})>"
+        )
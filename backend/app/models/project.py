@@ -14,6 +14,7 @@ from sqlalchemy import (
     Date,
     ForeignKey,
     Index,
+    Integer,
     String,
     Text,
     func,
@@ -138,6 +139,14 @@ class Project(Base):
         }'::jsonb"""),
     )
 
+    # Bumped by every transaction that changes tasks, links or resources
+    version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default=text("0"),
+        comment="Bumped on each change to schedule data; keys derived caches",
+    )
+
     # Soft delete
     is_deleted: Mapped[bool] = mapped_column(
         Boolean,
@@ -184,6 +184,12 @@ class Resource(Base):
             project_id,
             postgresql_where=text("is_active"),
         ),
+        Index(
+            "idx_resource_project_name",
+            project_id,
+            name,
+            id,
+        ),
         Index(
             "idx_resource_user",
             user_id,
@@ -0,0 +1,55 @@
+"""
+Pydantic schemas for AI chat endpoints.
+"""
+
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from app.models.enums import AIMessageRole
+
+# ── Request Schemas ──
+
+
+class ConversationCreate(BaseModel):
+    """Start a conversation about a project."""
+
+    title: str | None = Field(default=None, max_length=255)
+
+
+class MessageCreate(BaseModel):
+    """A question for the assistant."""
+
+    content: str = Field(min_length=1, max_length=10_000)
+
+
+# ── Response Schemas ──
+
+
+class ConversationResponse(BaseModel):
+    """A conversation (its messages are listed separately)."""
+
+    model_config = {"from_attributes": True}
+
+    id: uuid.UUID
+    project_id: uuid.UUID
+    title: str | None
+    created_at: datetime
+    updated_at: datetime
+
+
+class MessageResponse(BaseModel):
+    """A message; model, token and latency fields are set on replies."""
+
+    model_config = {"from_attributes": True}
+
+    id: uuid.UUID
+    role: AIMessageRole
+    content: str
+    model: str | None
+    tokens_in: int | None
+    tokens_out: int | None
+    latency_ms: int | None
+    finish_reason: str | None
+    created_at: datetime
@@ -6,13 +6,34 @@ import uuid
 from datetime import date, datetime
 from decimal import Decimal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 from app.models.enums import RateTable, WorkContour
 
 # ── Request Schemas ──
 
 
+class WorkContourData(BaseModel):
+    """
+    Custom contour for work_contour CONTOURED.
+
+    weights[i] is the relative work in slice i of the assignment's working
+    days, all slices equally long; [1, 2, 1] puts half the work in the
+    middle third.
+    """
+
+    weights: list[float] = Field(min_length=1, max_length=100)
+
+    @field_validator("weights")
+    @classmethod
+    def validate_weights(cls, weights: list[float]) -> list[float]:
+        if min(weights) < 0:
+            raise ValueError("Contour weights cannot be negative")
+        if sum(weights) <= 0:
+            raise ValueError("At least one contour weight must be positive")
+        return weights
+
+
 class AssignmentCreate(BaseModel):
     """Create a new assignment."""
 
@@ -22,6 +43,7 @@ class AssignmentCreate(BaseModel):
     finish_date: date
     work: int = Field(default=0, ge=0, description="Work in minutes")
     work_contour: WorkContour = WorkContour.FLAT
+    contour_data: WorkContourData | None = None
     rate_table: RateTable = RateTable.A
 
 
@@ -40,6 +62,7 @@ class AssignmentUpdate(BaseModel):
     actual_work: int = Field(default=None, ge=0)
     remaining_work: int = Field(default=None, ge=0)
     work_contour: WorkContour = None
+    contour_data: WorkContourData | None = None
     rate_table: RateTable = None
     percent_work_complete: Decimal = Field(default=None, ge=0, le=100)
     is_confirmed: bool = None
@@ -65,6 +88,7 @@ class AssignmentResponse(BaseModel):
     actual_start: date | None
     actual_finish: date | None
     work_contour: WorkContour
+    contour_data: WorkContourData | None
     cost: Decimal
     actual_cost: Decimal
     remaining_cost: Decimal
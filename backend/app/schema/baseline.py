@@ -0,0 +1,45 @@
+"""
+Pydantic schemas for Baseline endpoints.
+"""
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+# ── Response Schemas ──
+
+
+class BaselineResponse(BaseModel):
+    """Outcome of saving a baseline."""
+
+    baseline_number: int
+    task_count: int
+    assignment_count: int
+
+
+class TaskVariance(BaseModel):
+    """A task against a baseline (one NDJSON line of the variance stream)."""
+
+    model_config = {"from_attributes": True}
+
+    task_id: uuid.UUID
+    wbs_code: str
+    name: str
+    start_date: date
+    finish_date: date
+    duration: int
+    work: int
+    cost: Decimal
+    # Null when the task was added after the baseline
+    baseline_start: date | None
+    baseline_finish: date | None
+    baseline_duration: int | None
+    baseline_work: int | None
+    baseline_cost: Decimal | None
+    start_variance: int | None  # Calendar days, current - baseline
+    finish_variance: int | None  # Calendar days
+    duration_variance: int | None  # Minutes
+    work_variance: int | None  # Minutes
+    cost_variance: Decimal | None
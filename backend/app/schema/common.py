@@ -2,20 +2,46 @@
 Common Pydantic schemas shared across endpoints.
 """
 
+from typing import Any
+
 from pydantic import BaseModel, computed_field
 
 
-class PaginatedResponse[T](BaseModel):
-    """Generic paginated response wrapper."""
+class PageInfo(BaseModel):
+    """
+    Pagination fields shared by list responses.
 
-    items: list[T]
-    total: int
-    page: int
+    Offset mode fills page and total. Cursor mode fills next_cursor (None on
+    the last page); page is None and total is only set when requested.
+    """
+
+    total: int | None
+    page: int | None
     per_page: int
+    next_cursor: str | None = None
 
     @computed_field
     @property
-    def total_pages(self) -> int:
+    def total_pages(self) -> int | None:
+        if self.total is None:
+            return None
         if self.per_page <= 0:
             return 0
         return (self.total + self.per_page - 1) // self.per_page
+
+
+class PaginatedResponse[T](PageInfo):
+    """Generic paginated response wrapper."""
+
+    items: list[T]
+
+
+class ColumnarResponse(PageInfo):
+    """
+    Paginated response laid out by column instead of by row.
+
+    columns maps each requested field to one value per row, so field names
+    are sent once per page rather than once per item.
+    """
+
+    columns: dict[str, list[Any]]
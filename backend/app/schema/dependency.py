@@ -28,6 +28,12 @@ class DependencyCreate(BaseModel):
         return self
 
 
+class DependencyBatchCreate(BaseModel):
+    """Create many dependencies in one request (e.g. an import)."""
+
+    items: list[DependencyCreate] = Field(min_length=1, max_length=5000)
+
+
 class DependencyUpdate(BaseModel):
     """
     Update an existing dependency (all fields optional).
@@ -0,0 +1,40 @@
+"""
+Pydantic schemas for Earned Value endpoints.
+"""
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+# ── Response Schemas ──
+
+
+class EarnedValueMetrics(BaseModel):
+    """Earned value of a task, or of the project when task_id is null."""
+
+    task_id: uuid.UUID | None
+    bac: Decimal  # Budget at completion (baseline cost)
+    bcws: Decimal  # Planned value
+    bcwp: Decimal  # Earned value
+    acwp: Decimal  # Actual cost
+    spi: Decimal | None  # Schedule performance index, BCWP / BCWS
+    cpi: Decimal | None  # Cost performance index, BCWP / ACWP
+    eac: Decimal  # Estimate at completion
+    vac: Decimal  # Variance at completion
+
+
+class EarnedValueResponse(BaseModel):
+    """Earned value of a project and each of its tasks at a status date."""
+
+    status_date: date
+    baseline_number: int
+    project: EarnedValueMetrics
+    tasks: list[EarnedValueMetrics]
+
+
+class EarnedValuePoint(EarnedValueMetrics):
+    """One stored snapshot in an earned value trend."""
+
+    status_date: date
@@ -3,8 +3,9 @@ Pydantic schemas for Resource endpoints.
 """
 
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
+from typing import Literal
 
 from pydantic import BaseModel, EmailStr, Field
 
@@ -84,3 +85,20 @@ class ResourceResponse(BaseModel):
     user_id: uuid.UUID | None
     created_at: datetime
     updated_at: datetime
+
+
+class ResourceUtilization(BaseModel):
+    """Allocated and available working minutes of one resource per period."""
+
+    resource_id: uuid.UUID
+    name: str
+    allocated: list[int]
+    available: list[int]
+
+
+class UtilizationResponse(BaseModel):
+    """Resource histogram data; periods are the bucket start dates."""
+
+    bucket: Literal["day", "week"]
+    periods: list[date]
+    resources: list[ResourceUtilization]
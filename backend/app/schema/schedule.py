@@ -0,0 +1,58 @@
+"""
+Pydantic schemas for Schedule endpoints.
+"""
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+# ── Response Schemas ──
+
+
+class ScheduleResponse(BaseModel):
+    """Outcome of a project reschedule."""
+
+    task_count: int
+    changed_task_ids: list[uuid.UUID]
+    critical_count: int
+    finish_date: date | None
+
+
+class TaskLevelingChange(BaseModel):
+    """New dates of a task after leveling."""
+
+    id: uuid.UUID
+    start_date: date
+    finish_date: date
+    leveling_delay: int  # Working minutes added by leveling
+
+
+class ResourceOverallocation(BaseModel):
+    """A period in which a resource stays booked beyond its capacity."""
+
+    resource_id: uuid.UUID
+    start_date: date
+    finish_date: date
+    peak_units: Decimal
+
+
+class LevelingResponse(BaseModel):
+    """Outcome of a leveling run (a proposal unless applied)."""
+
+    task_count: int
+    resource_count: int
+    changes: list[TaskLevelingChange]
+    unresolved_task_ids: list[uuid.UUID]
+    overallocations: list[ResourceOverallocation]
+    applied: bool
+
+
+class CostResponse(BaseModel):
+    """Outcome of a cost recalculation."""
+
+    assignment_count: int
+    task_count: int
+    changed_task_ids: list[uuid.UUID]
+    total_cost: Decimal
@@ -5,8 +5,9 @@ Pydantic schemas for Task endpoints.
 import uuid
 from datetime import date, datetime
 from decimal import Decimal
+from typing import Annotated, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from app.models.enums import ConstraintType, TaskType
 
@@ -58,6 +59,74 @@ class TaskUpdate(BaseModel):
     deadline: date | None = None
 
 
+# ── Batch Request Schemas ──
+
+
+class TaskBatchCreate(TaskCreate):
+    """
+    Create a task as part of a batch.
+
+    `ref` names the new task so later creates in the same batch can nest
+    under it with `parent_ref`.
+    """
+
+    op: Literal["create"]
+    ref: str | None = Field(default=None, max_length=100)
+    parent_ref: str | None = Field(default=None, max_length=100)
+
+    @model_validator(mode="after")
+    def validate_single_parent(self):
+        if self.parent_ref is not None and self.parent_task_id is not None:
+            raise ValueError("Set parent_task_id or parent_ref, not both")
+        return self
+
+
+class TaskBatchUpdate(TaskUpdate):
+    """Update a task as part of a batch. A new parent_task_id moves it last."""
+
+    op: Literal["update"]
+    id: uuid.UUID
+
+
+class TaskBatchMove(BaseModel):
+    """Move a task (with its subtree) under a parent, before a sibling or last."""
+
+    op: Literal["move"]
+    id: uuid.UUID
+    parent_task_id: uuid.UUID | None = None
+    before_id: uuid.UUID | None = None
+
+
+class TaskBatchIndent(BaseModel):
+    """Indent or outdent a task as part of a batch."""
+
+    op: Literal["indent", "outdent"]
+    id: uuid.UUID
+
+
+class TaskBatchDelete(BaseModel):
+    """Soft delete a task and its subtree as part of a batch."""
+
+    op: Literal["delete"]
+    id: uuid.UUID
+
+
+TaskBatchOperation = Annotated[
+    TaskBatchCreate
+    | TaskBatchUpdate
+    | TaskBatchMove
+    | TaskBatchIndent
+    | TaskBatchDelete,
+    Field(discriminator="op"),
+]
+
+
+class TaskBatchRequest(BaseModel):
+    """Apply many task changes in one transaction, in order."""
+
+    operations: list[TaskBatchOperation] = Field(min_length=1, max_length=5000)
+
+
 # ── Response Schemas ──
 
 
@@ -96,5 +165,42 @@ class TaskResponse(BaseModel):
     fixed_cost: Decimal
     total_cost: Decimal
     actual_cost: Decimal
+    bcws: Decimal
+    bcwp: Decimal
+    acwp: Decimal
     created_at: datetime
     updated_at: datetime
+
+
+class TaskDateChange(BaseModel):
+    """New dates of a task moved by the scheduler."""
+
+    id: uuid.UUID
+    start_date: date
+    finish_date: date
+
+
+class TaskOutlineChange(BaseModel):
+    """New outline position of a task after a structural edit."""
+
+    id: uuid.UUID
+    parent_task_id: uuid.UUID | None
+    order_index: int
+    wbs_code: str
+    outline_level: int
+    is_summary: bool
+
+
+class TaskUpdateResponse(TaskResponse):
+    """Updated task plus every task the scheduler moved as a result."""
+
+    rescheduled: list[TaskDateChange] = []
+
+
+class TaskBatchResponse(BaseModel):
+    """Result of a batch: created (in request order), updated and deleted tasks."""
+
+    created: list[TaskResponse]
+    updated: list[TaskResponse]
+    deleted: list[uuid.UUID]
+    rescheduled: list[TaskDateChange] = []
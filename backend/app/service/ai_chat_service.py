@@ -0,0 +1,312 @@
+"""
+AI chat.
+
+Conversations belong to the user who started them, within a project. A
+question is answered from the project context (ai_context_service) and
+the conversation's recent messages, and the reply is streamed to the
+client as server-sent events while the provider generates it:
+
+    event: start   data: {"message_id": ...}
+    event: delta   data: {"text": ...}          (repeated)
+    event: done    data: {"message_id": ..., "tokens_in": ..., ...}
+    event: error   data: {"detail": ...}        (instead of done)
+
+start is sent before the provider is called, so the first byte waits for
+neither the reply nor the database. Provider chunks pass through a
+bounded queue (SSE_BUFFER_CHUNKS). When the client reads slower than the
+provider writes, new text is merged into one pending chunk rather than
+queued without end, so a slow client never holds the provider connection
+(and its gateway slot) open longer than the reply takes.
+
+Nothing is written while streaming: the question and the reply are saved
+together by ChatTurn.save(), run as a background task after the
+response. The request's session is released before the stream starts,
+so a long reply holds no database connection; save() opens its own. A
+client that disconnects cancels the provider call, and what was received
+is saved with finish_reason "cancelled".
+
+Each turn is metered by ai_usage_service (estimated from the text when
+the reply was cut short), and questions past the monthly quota get 429
+before anything is streamed.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import AsyncIterator
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid_utils import uuid7
+
+from app.core.database import AsyncSessionLocal
+from app.core.llm import LLMRequest, LLMResponse, Message, get_gateway
+from app.models.ai_conversation import AIConversation
+from app.models.ai_message import AIMessage
+from app.models.enums import AIMessageRole
+from app.models.project import Project
+from app.schema.ai import ConversationCreate
+from app.service import ai_context_service, ai_usage_service
+
+logger = logging.getLogger(__name__)
+
+SSE_MEDIA_TYPE = "text/event-stream"
+# Proxies (nginx) must pass events through as they come
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+SSE_BUFFER_CHUNKS = 32
+# Earlier messages sent with each question
+HISTORY_MESSAGES = 20
+CHAT_MAX_TOKENS = 1024
+TITLE_LENGTH = 80
+USAGE_FEATURE = "chat"
+
+SYSTEM_PROMPT = (
+    "You are an AI assistant for a project management tool. Answer questions "
+    "about the project based on the context provided. Be concise.\n\n"
+    "Project context:\n"
+)
+
+
+def _event(name: str, data: dict) -> bytes:
+    return f"event: {name}\ndata: {json.dumps(data, default=str)}\n\n".encode()
+
+
+async def create_conversation(
+    db: AsyncSession,
+    project: Project,
+    user_id: UUID,
+    data: ConversationCreate,
+) -> AIConversation:
+    conversation = AIConversation(
+        project_id=project.id, user_id=user_id, title=data.title
+    )
+    db.add(conversation)
+    await db.commit()
+    await db.refresh(conversation)
+    return conversation
+
+
+async def list_conversations(
+    db: AsyncSession,
+    project: Project,
+    user_id: UUID,
+) -> list[AIConversation]:
+    """The user's conversations in a project, most recently active first."""
+    result = await db.execute(
+        select(AIConversation)
+        .where(
+            AIConversation.project_id == project.id,
+            AIConversation.user_id == user_id,
+        )
+        .order_by(AIConversation.updated_at.desc(), AIConversation.id.desc())
+    )
+    return list(result.scalars().all())
+
+
+async def get_conversation(
+    db: AsyncSession,
+    project: Project,
+    conversation_id: UUID,
+    user_id: UUID,
+) -> AIConversation:
+    """One of the user's conversations in a project, or 404."""
+    conversation = await db.scalar(
+        select(AIConversation).where(
+            AIConversation.id == conversation_id,
+            AIConversation.project_id == project.id,
+            AIConversation.user_id == user_id,
+        )
+    )
+    if conversation is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Conversation not found",
+        )
+    return conversation
+
+
+async def list_messages(
+    db: AsyncSession,
+    conversation: AIConversation,
+    limit: int | None = None,
+) -> list[AIMessage]:
+    """Messages oldest first; with limit, only the latest ones."""
+    query = (
+        select(AIMessage)
+        .where(AIMessage.conversation_id == conversation.id)
+        .order_by(AIMessage.created_at.desc(), AIMessage.id.desc())
+        .limit(limit)
+    )
+    messages = list((await db.execute(query)).scalars().all())
+    messages.reverse()
+    return messages
+
+
+class ChatTurn:
+    """A question, its streamed reply, and how both are saved."""
+
+    def __init__(
+        self,
+        conversation: AIConversation,
+        content: str,
+        request: LLMRequest,
+        context: ai_context_service.ProjectContext,
+        organization_id: UUID | None = None,
+    ) -> None:
+        self.conversation = conversation
+        self.organization_id = organization_id
+        self.content = content
+        self.request = request
+        self.context = context
+        # Ids in creation order, so the question sorts before the reply
+        self.question_id = uuid7()
+        self.message_id = uuid7()
+        self.parts: list[str] = []
+        self.response: LLMResponse | None = None
+        self.error: str | None = None
+        self.started = time.perf_counter()
+
+    @property
+    def finish_reason(self) -> str:
+        if self.response is not None:
+            return self.response.finish_reason or "end_turn"
+        return "error" if self.error else "cancelled"
+
+    async def _produce(self, queue: asyncio.Queue) -> None:
+        pending = ""
+        try:
+            async for chunk in get_gateway().stream(self.request):
+                if chunk.response is not None:
+                    self.response = chunk.response
+                self.parts.append(chunk.text)
+                pending += chunk.text
+                # A full queue means a slow client: merge instead of waiting
+                if pending and not queue.full():
+                    queue.put_nowait(pending)
+                    pending = ""
+            if pending:
+                await queue.put(pending)
+        except HTTPException as exc:
+            self.error = exc.detail
+        except Exception:
+            logger.exception("AI reply failed")
+            self.error = "AI reply failed"
+        await queue.put(None)
+
+    async def events(self) -> AsyncIterator[bytes]:
+        """The reply as server-sent events."""
+        yield _event("start", {"message_id": self.message_id})
+        queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=SSE_BUFFER_CHUNKS)
+        producer = asyncio.create_task(self._produce(queue))
+        try:
+            while (text := await queue.get()) is not None:
+                yield _event("delta", {"text": text})
+        except BaseException:
+            producer.cancel()  # The client went away
+            raise
+
+        if self.error:
+            yield _event("error", {"detail": self.error})
+            return
+        yield _event(
+            "done",
+            {
+                "message_id": self.message_id,
+                "model": self.response.model,
+                "tokens_in": self.response.tokens_in,
+                "tokens_out": self.response.tokens_out,
+                "latency_ms": self.response.latency_ms,
+                "finish_reason": self.finish_reason,
+            },
+        )
+
+    async def _meter(self) -> None:
+        response = self.response
+        if response is not None:
+            model = response.model
+            tokens_in, tokens_out = response.tokens_in, response.tokens_out
+        else:
+            # Cut short: the provider still bills what it generated
+            prompt = self.request.system + "".join(
+                message.content for message in self.request.messages
+            )
+            model = get_gateway().model_for(self.request)
+            tokens_in = ai_context_service.estimate_tokens(prompt)
+            tokens_out = ai_context_service.estimate_tokens("".join(self.parts))
+        await ai_usage_service.record(
+            self.conversation.user_id,
+            self.organization_id,
+            USAGE_FEATURE,
+            model,
+            tokens_in,
+            tokens_out,
+        )
+
+    async def save(self) -> None:
+        """Store the question and the reply (run after the response)."""
+        response = self.response
+        if response is not None or self.parts:
+            await self._meter()
+        conversation_id = self.conversation.id
+        if response is not None:
+            latency_ms = response.latency_ms
+        else:
+            latency_ms = round((time.perf_counter() - self.started) * 1000)
+        messages = [
+            AIMessage(
+                id=self.question_id,
+                conversation_id=conversation_id,
+                role=AIMessageRole.USER,
+                content=self.content,
+            ),
+            AIMessage(
+                id=self.message_id,
+                conversation_id=conversation_id,
+                role=AIMessageRole.ASSISTANT,
+                content="".join(self.parts),
+                model=response.model if response else self.request.model,
+                tokens_in=response.tokens_in if response else None,
+                tokens_out=response.tokens_out if response else None,
+                latency_ms=latency_ms,
+                finish_reason=self.finish_reason,
+            ),
+        ]
+        values = {"context_snapshot": ai_context_service.snapshot_record(self.context)}
+        if not self.conversation.title:
+            values["title"] = self.content[:TITLE_LENGTH]
+        async with AsyncSessionLocal() as db:
+            db.add_all(messages)
+            await db.execute(
+                update(AIConversation)
+                .where(AIConversation.id == conversation_id)
+                .values(**values)
+            )
+            await db.commit()
+
+
+async def start_turn(
+    db: AsyncSession,
+    project: Project,
+    conversation: AIConversation,
+    content: str,
+) -> ChatTurn:
+    """Build the prompt for a question: context, recent history, question."""
+    await ai_usage_service.check_quota(
+        db, conversation.user_id, project.organization_id
+    )
+    context = await ai_context_service.build_context(db, project, content)
+    history = await list_messages(db, conversation, HISTORY_MESSAGES)
+    messages = tuple(
+        Message(message.role, message.content)
+        for message in history
+        if message.content and message.role != AIMessageRole.SYSTEM
+    )
+    request = LLMRequest(
+        messages=(*messages, Message(AIMessageRole.USER, content)),
+        system=SYSTEM_PROMPT + context.text,
+        max_tokens=CHAT_MAX_TOKENS,
+    )
+    return ChatTurn(conversation, content, request, context, project.organization_id)
@@ -0,0 +1,286 @@
+"""
+Project context for AI prompts.
+
+A 10k-task project does not fit in a prompt, and most of it is irrelevant
+to any one question. The context is a short project summary followed by
+the most relevant tasks, one compact line each, packed into a token
+budget (settings.AI_CONTEXT_TOKEN_BUDGET):
+
+- tasks the question mentions, by WBS code or name, always come first
+- then overdue, critical, in-progress and soon-due tasks, milestones and
+  top-level phases, by score (RELEVANCE), in outline order within a score
+
+Chosen lines are printed in outline order, with a note of how many tasks
+were left out. Tokens are estimated at about four characters each; the
+provider reports the real count.
+
+Tasks are streamed from the database and reduced to their lines once per
+project version and status date. The compressed snapshot is cached in
+process, so repeat questions only rerun the mention matching and packing
+(see app.core.versioning).
+"""
+
+import re
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.project import Project
+from app.models.task import Task
+
+# Score of each reason for a task to be in the context
+RELEVANCE = {
+    "overdue": 8,
+    "critical": 5,
+    "in_progress": 3,
+    "due_soon": 2,
+    "milestone": 1,
+    "phase": 1,
+}
+# Starts or finishes within this many days of the status date
+DUE_SOON_DAYS = 14
+# Longest task name printed; longer names are cut
+NAME_LIMIT = 80
+# Shortest task name matched against a question
+MENTION_MIN_LENGTH = 4
+CONTEXT_BATCH_SIZE = 2000
+CHARS_PER_TOKEN = 4
+
+_CACHE_SIZE = 16
+_cache: OrderedDict[tuple, "ContextSnapshot"] = OrderedDict()
+
+# "1.2.3", or a bare "3" after "task" or "wbs"
+_WBS_PATTERN = re.compile(r"\b\d+(?:\.\d+)+\b|(?<=task )\d+\b|(?<=wbs )\d+\b")
+_WORD_PATTERN = re.compile(r"\w+(?:\.\w+)*")
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _words(text: str) -> str:
+    # Lowercased words between spaces, so names only match whole words
+    return f" {' '.join(_WORD_PATTERN.findall(text.lower()))} "
+
+
+class TaskLine(NamedTuple):
+    score: int
+    position: int  # Outline order
+    wbs_code: str
+    key: str  # Name as _words(), for mentions
+    text: str
+    tokens: int
+
+
+class ContextSnapshot(NamedTuple):
+    """A project reduced to its summary and one line per task, best first."""
+
+    version: int
+    as_of: date
+    header: str
+    lines: list[TaskLine]
+
+
+class ProjectContext(NamedTuple):
+    text: str
+    tokens: int
+    task_count: int
+    included_count: int
+    mentioned_count: int
+    version: int
+
+
+class SnapshotBuilder:
+    """Reduces task rows, fed in outline order, to a ContextSnapshot."""
+
+    def __init__(self, project, as_of: date):
+        self.project = project
+        self.as_of = as_of
+        self.lines: list[TaskLine] = []
+        self.completed = self.in_progress = self.overdue = self.critical = 0
+        self.done = self.duration = 0.0
+
+    def add(self, rows) -> None:
+        as_of = self.as_of
+        soon = as_of + timedelta(days=DUE_SOON_DAYS)
+        for row in rows:
+            percent = float(row.percent_complete)
+            flags = []
+            score = 0
+            if percent >= 100:
+                self.completed += 1
+            else:
+                if row.finish_date < as_of:
+                    flags.append("overdue")
+                    score += RELEVANCE["overdue"]
+                    self.overdue += 1
+                if percent > 0:
+                    score += RELEVANCE["in_progress"]
+                    self.in_progress += 1
+                if as_of <= row.start_date <= soon or as_of <= row.finish_date <= soon:
+                    score += RELEVANCE["due_soon"]
+            if row.is_critical:
+                flags.append("critical")
+                score += RELEVANCE["critical"]
+                self.critical += 1
+            if row.is_milestone:
+                flags.append("milestone")
+                score += RELEVANCE["milestone"]
+            if row.is_summary:
+                flags.append("summary")
+                if row.outline_level == 1:
+                    score += RELEVANCE["phase"]
+            else:
+                self.done += percent * row.duration
+                self.duration += row.duration
+
+            name = row.name[:NAME_LIMIT]
+            text = (
+                f"{row.wbs_code} {name} [{row.start_date}..{row.finish_date}] "
+                f"{percent:g}%"
+            )
+            if flags:
+                text += " " + ",".join(flags)
+            self.lines.append(
+                TaskLine(
+                    score,
+                    len(self.lines),
+                    row.wbs_code,
+                    _words(row.name),
+                    text,
+                    estimate_tokens(text) + 1,  # Newline
+                )
+            )
+
+    def snapshot(self, version: int) -> ContextSnapshot:
+        project = self.project
+        progress = self.done / self.duration if self.duration else 0.0
+        header = "\n".join(
+            (
+                f"Project: {project.name} ({project.status})",
+                f"Dates: {project.start_date} - {project.finish_date or 'unscheduled'}"
+                f"; status date {self.as_of}",
+                f"Tasks: {len(self.lines)} total, {self.completed} completed, "
+                f"{self.in_progress} in progress, {self.overdue} overdue, "
+                f"{self.critical} critical",
+                f"Progress: {progress:.0f}%",
+            )
+        )
+        lines = sorted(self.lines, key=lambda line: -line.score)
+        return ContextSnapshot(version, self.as_of, header, lines)
+
+
+def mentioned(snapshot: ContextSnapshot, question: str) -> set[int]:
+    """Positions of the tasks a question names by WBS code or full name."""
+    text = _words(question)
+    shortest = MENTION_MIN_LENGTH + 2  # Keys are padded with spaces
+    codes = set(_WBS_PATTERN.findall(text))
+    return {
+        line.position
+        for line in snapshot.lines
+        if line.wbs_code in codes or (len(line.key) >= shortest and line.key in text)
+    }
+
+
+def pack(
+    snapshot: ContextSnapshot,
+    question: str = "",
+    budget: int | None = None,
+) -> ProjectContext:
+    """The snapshot's header and most relevant task lines within budget tokens."""
+    budget = budget or settings.AI_CONTEXT_TOKEN_BUDGET
+    named = mentioned(snapshot, question) if question else set()
+    ranked = [line for line in snapshot.lines if line.position in named]
+    ranked += [line for line in snapshot.lines if line.position not in named]
+
+    total = len(snapshot.lines)
+    # Room for the section heading and the omitted note
+    used = estimate_tokens(snapshot.header) + 24
+    chosen = []
+    for line in ranked:
+        if used + line.tokens <= budget:
+            chosen.append(line)
+            used += line.tokens
+    chosen.sort(key=lambda line: line.position)
+
+    parts = [snapshot.header]
+    if total:
+        parts.append(f"Tasks ({len(chosen)} of {total}, most relevant):")
+        parts.extend(line.text for line in chosen)
+    if len(chosen) < total:
+        parts.append(f"({total - len(chosen)} more tasks not shown)")
+    text = "\n".join(parts)
+    return ProjectContext(
+        text=text,
+        tokens=estimate_tokens(text),
+        task_count=total,
+        included_count=len(chosen),
+        mentioned_count=len(named),
+        version=snapshot.version,
+    )
+
+
+async def project_snapshot(db: AsyncSession, project: Project) -> ContextSnapshot:
+    """The project's context snapshot, cached per (project, version, as of)."""
+    version = await db.scalar(select(Project.version).where(Project.id == project.id))
+    as_of = project.status_date or date.today()
+    key = (project.id, version, as_of)
+    cached = _cache.get(key)
+    if cached is not None:
+        _cache.move_to_end(key)
+        return cached
+
+    builder = SnapshotBuilder(project, as_of)
+    result = await db.stream(
+        select(
+            Task.wbs_code,
+            Task.name,
+            Task.outline_level,
+            Task.start_date,
+            Task.finish_date,
+            Task.duration,
+            Task.percent_complete,
+            Task.is_critical,
+            Task.is_milestone,
+            Task.is_summary,
+        )
+        .where(
+            Task.project_id == project.id,
+            Task.is_deleted == False,  # noqa: E712
+        )
+        .order_by(Task.order_index, Task.id)
+        .execution_options(yield_per=CONTEXT_BATCH_SIZE)
+    )
+    async for rows in result.partitions():
+        builder.add(rows)
+
+    snapshot = builder.snapshot(version)
+    _cache[key] = snapshot
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return snapshot
+
+
+async def build_context(
+    db: AsyncSession,
+    project: Project,
+    question: str = "",
+    budget: int | None = None,
+) -> ProjectContext:
+    """Project context for a question, within budget tokens."""
+    return pack(await project_snapshot(db, project), question, budget)
+
+
+def snapshot_record(context: ProjectContext) -> dict:
+    """What AIConversation.context_snapshot keeps of a context."""
+    return {
+        "version": context.version,
+        "tokens": context.tokens,
+        "task_count": context.task_count,
+        "included_count": context.included_count,
+        "text": context.text,
+    }
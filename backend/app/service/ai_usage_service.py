@@ -0,0 +1,318 @@
+"""
+AI usage metering.
+
+Recording a call appends a UsageEvent to an in-process buffer; nothing is
+written to Postgres on the request path. A background flusher drains the
+buffer every AI_USAGE_FLUSH_SECONDS (sooner once AI_USAGE_FLUSH_BATCH
+events are waiting) and writes each batch in one transaction:
+
+- ai_usage: one row per (user, feature, model, day) in the batch
+- ai_usage_daily / ai_usage_monthly: running totals per user and per
+  organization, upserted with ON CONFLICT DO UPDATE SET total = total + new
+
+Events still in the buffer when a worker dies are lost; the flusher makes
+a last flush on shutdown.
+
+Quota checks never sum usage rows. Tokens used this month by each user
+and organization are kept in Redis counters (app.core.cache), incremented
+as events are recorded. A missing counter is loaded from ai_usage_monthly
+plus this worker's unflushed events, and counters expire after
+AI_QUOTA_RECONCILE_SECONDS, so any drift (a lost increment, a Redis
+restart) is corrected from Postgres that often. Without Redis the check
+reads the one ai_usage_monthly row.
+"""
+
+import asyncio
+import logging
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from typing import NamedTuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid_utils import uuid7
+
+from app.core import cache
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.ai_usage import AIUsage
+from app.models.ai_usage_daily import AIUsageDaily
+from app.models.ai_usage_monthly import AIUsageMonthly
+
+logger = logging.getLogger(__name__)
+
+USER = "user"
+ORGANIZATION = "organization"
+
+# USD per million tokens (input, output), by model name prefix; the first
+# matching prefix wins, so longer prefixes come first
+MODEL_PRICES = {
+    "claude-opus-4": (Decimal("15"), Decimal("75")),
+    "claude-sonnet-4": (Decimal("3"), Decimal("15")),
+    "claude-haiku-4": (Decimal("1"), Decimal("5")),
+    "gpt-4o-mini": (Decimal("0.15"), Decimal("0.6")),
+    "gpt-4o": (Decimal("2.5"), Decimal("10")),
+}
+# Events kept when flushes keep failing; older ones are dropped
+MAX_BUFFERED_EVENTS = 100_000
+
+
+class UsageEvent(NamedTuple):
+    user_id: UUID
+    organization_id: UUID | None
+    feature: str
+    model: str
+    tokens_in: int
+    tokens_out: int
+    usage_date: date
+
+    @property
+    def tokens(self) -> int:
+        return self.tokens_in + self.tokens_out
+
+    def entities(self) -> list[tuple[str, UUID]]:
+        """Who the usage counts against."""
+        entities = [(USER, self.user_id)]
+        if self.organization_id is not None:
+            entities.append((ORGANIZATION, self.organization_id))
+        return entities
+
+
+class Totals(NamedTuple):
+    calls: int = 0
+    tokens_in: int = 0
+    tokens_out: int = 0
+    estimated_cost: Decimal = Decimal(0)
+
+    def add(self, event: UsageEvent) -> "Totals":
+        return Totals(
+            self.calls + 1,
+            self.tokens_in + event.tokens_in,
+            self.tokens_out + event.tokens_out,
+            self.estimated_cost
+            + estimate_cost(event.model, event.tokens_in, event.tokens_out),
+        )
+
+
+_buffer: list[UsageEvent] = []
+# The batch being written, still counted as pending by quota loads
+_flushing: list[UsageEvent] = []
+_flush_lock = asyncio.Lock()
+_wakeup = asyncio.Event()
+_flusher: asyncio.Task | None = None
+
+
+def _today() -> date:
+    return datetime.now(UTC).date()
+
+
+def _month(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _counter_key(entity_type: str, entity_id: UUID, month: date) -> str:
+    return f"{entity_type}:{entity_id}:{month:%Y-%m}"
+
+
+def estimate_cost(model: str, tokens_in: int, tokens_out: int) -> Decimal:
+    """Cost in USD at list prices; unknown models cost nothing."""
+    for prefix, (price_in, price_out) in MODEL_PRICES.items():
+        if model.startswith(prefix):
+            return (tokens_in * price_in + tokens_out * price_out) / 1_000_000
+    return Decimal(0)
+
+
+async def record(
+    user_id: UUID,
+    organization_id: UUID | None,
+    feature: str,
+    model: str,
+    tokens_in: int,
+    tokens_out: int,
+) -> None:
+    """Meter one LLM call (buffered; written by the flusher)."""
+    event = UsageEvent(
+        user_id, organization_id, feature, model, tokens_in, tokens_out, _today()
+    )
+    _buffer.append(event)
+    if len(_buffer) >= settings.AI_USAGE_FLUSH_BATCH:
+        _wakeup.set()
+    month = _month(event.usage_date)
+    await cache.add_usage(
+        {
+            _counter_key(entity_type, entity_id, month): event.tokens
+            for entity_type, entity_id in event.entities()
+        }
+    )
+
+
+def _pending_tokens(entity_type: str, entity_id: UUID, month: date) -> int:
+    return sum(
+        event.tokens
+        for event in (*_flushing, *_buffer)
+        if _month(event.usage_date) == month
+        and (entity_type, entity_id) in event.entities()
+    )
+
+
+async def monthly_tokens(
+    db: AsyncSession,
+    entity_type: str,
+    entity_id: UUID,
+    month: date | None = None,
+) -> int:
+    """Tokens a user or organization has used in a month (default: this one)."""
+    month = month or _month(_today())
+    key = _counter_key(entity_type, entity_id, month)
+    used = await cache.get_usage_counter(key)
+    if used is not None:
+        return used
+
+    stored = await db.scalar(
+        select(AIUsageMonthly.tokens_in + AIUsageMonthly.tokens_out).where(
+            AIUsageMonthly.entity_type == entity_type,
+            AIUsageMonthly.entity_id == entity_id,
+            AIUsageMonthly.usage_month == month,
+        )
+    )
+    used = (stored or 0) + _pending_tokens(entity_type, entity_id, month)
+    await cache.set_usage_counter(key, used)
+    return used
+
+
+async def check_quota(
+    db: AsyncSession,
+    user_id: UUID,
+    organization_id: UUID | None,
+) -> None:
+    """Raise 429 once the user or organization has used this month's tokens."""
+    limits = [
+        (USER, user_id, settings.AI_MONTHLY_TOKENS_PER_USER),
+        (ORGANIZATION, organization_id, settings.AI_MONTHLY_TOKENS_PER_ORGANIZATION),
+    ]
+    for entity_type, entity_id, limit in limits:
+        if not limit or entity_id is None:
+            continue
+        if await monthly_tokens(db, entity_type, entity_id) >= limit:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Monthly AI usage quota reached for this {entity_type}",
+            )
+
+
+# ── Flushing ──
+
+
+def _upsert(model, period: str, totals: dict[tuple, Totals]):
+    # Sorted so concurrent flushes lock rows in the same order
+    rows = [
+        {
+            "id": uuid7(),
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            period: day,
+            **values._asdict(),
+        }
+        for (entity_type, entity_id, day), values in sorted(totals.items())
+    ]
+    stmt = insert(model).values(rows)
+    table = model.__table__
+    return stmt.on_conflict_do_update(
+        constraint=f"uq_{table.name}_entity",
+        set_={
+            **{name: table.c[name] + stmt.excluded[name] for name in Totals._fields},
+            "updated_at": func.now(),
+        },
+    )
+
+
+async def _write(db: AsyncSession, events: list[UsageEvent]) -> None:
+    calls: dict[tuple, Totals] = {}
+    daily: dict[tuple, Totals] = {}
+    monthly: dict[tuple, Totals] = {}
+    for event in events:
+        key = (event.user_id, event.feature, event.model, event.usage_date)
+        calls[key] = calls.get(key, Totals()).add(event)
+        for entity_type, entity_id in event.entities():
+            key = (entity_type, entity_id, event.usage_date)
+            daily[key] = daily.get(key, Totals()).add(event)
+            key = (entity_type, entity_id, _month(event.usage_date))
+            monthly[key] = monthly.get(key, Totals()).add(event)
+
+    await db.execute(
+        insert(AIUsage),
+        [
+            {
+                "user_id": user_id,
+                "feature": feature,
+                "model": model,
+                "usage_date": usage_date,
+                "tokens_in": values.tokens_in,
+                "tokens_out": values.tokens_out,
+                "estimated_cost": values.estimated_cost,
+            }
+            for (user_id, feature, model, usage_date), values in calls.items()
+        ],
+    )
+    await db.execute(_upsert(AIUsageDaily, "usage_date", daily))
+    await db.execute(_upsert(AIUsageMonthly, "usage_month", monthly))
+
+
+async def flush(db: AsyncSession) -> int:
+    """Write the buffered events in one transaction; returns how many."""
+    global _buffer, _flushing
+    async with _flush_lock:
+        if not _buffer:
+            return 0
+        _flushing, _buffer = _buffer, []
+        try:
+            await _write(db, _flushing)
+            await db.commit()
+        except Exception:
+            # Keep the events for the next flush
+            _buffer = [*_flushing, *_buffer][-MAX_BUFFERED_EVENTS:]
+            raise
+        finally:
+            count, _flushing = len(_flushing), []
+        return count
+
+
+async def _run_flusher() -> None:
+    while True:
+        try:
+            await asyncio.wait_for(_wakeup.wait(), settings.AI_USAGE_FLUSH_SECONDS)
+        except TimeoutError:
+            pass
+        _wakeup.clear()
+        try:
+            async with AsyncSessionLocal() as db:
+                await flush(db)
+        except Exception:
+            logger.exception("AI usage flush failed")
+
+
+def start_flusher() -> None:
+    global _flusher
+    if _flusher is None:
+        _flusher = asyncio.create_task(_run_flusher())
+
+
+async def stop_flusher() -> None:
+    """Stop the flusher and write what is left."""
+    global _flusher
+    if _flusher is not None:
+        _flusher.cancel()
+        _flusher = None
+    try:
+        async with AsyncSessionLocal() as db:
+            await flush(db)
+    except Exception:
+        logger.exception("AI usage flush failed")
+
+
+def buffered() -> int:
+    """Events waiting to be written."""
+    return len(_buffer)
@@ -12,7 +12,9 @@ from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.versioning import lock_project
 from app.models.assignment import Assignment
+from app.models.project import Project
 from app.models.resource import Resource
 from app.models.task import Task
 from app.schema.assignment import AssignmentCreate, AssignmentUpdate
@@ -58,6 +60,7 @@ async def create_assignment(
     """Create a new assignment for a task."""
     # Validate resource is in the same project
     await _validate_resource_in_project(db, data.resource_id, task.project_id)
+    await lock_project(db, task.project_id)
 
     assignment = Assignment(
         task_id=task.id,
@@ -68,6 +71,7 @@ async def create_assignment(
         work=data.work,
         remaining_work=data.work,
         work_contour=data.work_contour,
+        contour_data=data.contour_data and data.contour_data.model_dump(),
         rate_table=data.rate_table,
     )
 
@@ -95,10 +99,12 @@ async def get_assignment_by_id(
 
 async def update_assignment(
     db: AsyncSession,
+    project: Project,
     assignment: Assignment,
     data: AssignmentUpdate,
 ) -> Assignment:
     """Update an assignment with partial data."""
+    await lock_project(db, project.id)
     update_data = data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(assignment, field, value)
@@ -110,8 +116,10 @@ async def update_assignment(
 
 async def delete_assignment(
     db: AsyncSession,
+    project: Project,
     assignment: Assignment,
 ) -> None:
     """Hard delete an assignment."""
+    await lock_project(db, project.id)
     await db.delete(assignment)
     await db.commit()
@@ -56,7 +56,14 @@ async def _create_token_pair(
     ip: str | None = None,
 ) -> tuple[str, str]:
     """Create an access + refresh token pair and persist the refresh token."""
-    access_token = create_access_token(subject=str(user.id))
+    access_token = create_access_token(
+        subject=str(user.id),
+        claims={
+            "act": user.is_active,
+            "srl": str(user.system_role_id),
+            "ver": user.token_version,
+        },
+    )
     raw_refresh = create_refresh_token()
 
     db_token = RefreshToken(
@@ -94,7 +101,7 @@ async def register_user(
 
     user = User(
         email=email,
-        password_hash=hash_password(password),
+        password_hash=await hash_password(password),
         full_name=full_name,
         system_role_id=role.id,
     )
@@ -122,7 +129,7 @@ async def login_user(
     if (
         not user
         or not user.password_hash
-        or not verify_password(password, user.password_hash)
+        or not await verify_password(password, user.password_hash)
     ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,182 @@
+"""
+Baselines.
+
+A baseline (0-10) freezes each task's dates, duration, work and cost, and
+each assignment's dates, work and cost, for variance and earned value
+analysis. Saving copies the rows server-side with INSERT ... SELECT ...
+ON CONFLICT DO UPDATE, so a 20k-task project never passes through ORM
+objects; saving the same number again overwrites it. Baseline ids come
+from gen_random_uuid() since no row is built in Python.
+
+Variance compares a baseline with the current schedule in SQL and is
+streamed as NDJSON, one task per line, like the project snapshot.
+"""
+
+from collections.abc import AsyncIterator
+from typing import NamedTuple
+
+from sqlalchemy import Integer, and_, delete, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.versioning import lock_project
+from app.models.assignment import Assignment
+from app.models.assignment_baseline import AssignmentBaseline
+from app.models.project import Project
+from app.models.task import Task
+from app.models.task_baseline import TaskBaseline
+from app.schema.baseline import TaskVariance
+
+VARIANCE_MEDIA_TYPE = "application/x-ndjson"
+VARIANCE_BATCH_SIZE = 1000
+
+
+class BaselineSummary(NamedTuple):
+    baseline_number: int
+    task_count: int
+    assignment_count: int
+
+
+def _upsert(model, source, columns: list[str], constraint: str):
+    stmt = insert(model).from_select(["id", *columns], source)
+    return stmt.on_conflict_do_update(
+        constraint=constraint,
+        set_={
+            **{name: stmt.excluded[name] for name in columns},
+            "created_at": func.now(),
+        },
+    )
+
+
+async def save_baseline(
+    db: AsyncSession,
+    project: Project,
+    baseline_number: int,
+) -> BaselineSummary:
+    """Capture (or overwrite) a baseline of every live task and assignment."""
+    await lock_project(db, project.id)
+    number = literal(baseline_number, Integer)
+    live = (
+        Task.project_id == project.id,
+        Task.is_deleted == False,  # noqa: E712
+    )
+
+    # Deleted tasks drop out of the baseline (their assignments are gone)
+    await db.execute(
+        delete(TaskBaseline)
+        .where(
+            TaskBaseline.baseline_number == baseline_number,
+            TaskBaseline.task_id.in_(
+                select(Task.id).where(
+                    Task.project_id == project.id,
+                    Task.is_deleted == True,  # noqa: E712
+                )
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    tasks = await db.execute(
+        _upsert(
+            TaskBaseline,
+            select(
+                func.gen_random_uuid(),
+                Task.id,
+                number,
+                Task.duration,
+                Task.work,
+                Task.start_date,
+                Task.finish_date,
+                Task.total_cost,
+            ).where(*live),
+            [
+                "task_id",
+                "baseline_number",
+                "duration",
+                "work",
+                "start_date",
+                "finish_date",
+                "cost",
+            ],
+            "uq_task_baseline_task_number",
+        )
+    )
+    assignments = await db.execute(
+        _upsert(
+            AssignmentBaseline,
+            select(
+                func.gen_random_uuid(),
+                Assignment.id,
+                number,
+                Assignment.work,
+                Assignment.start_date,
+                Assignment.finish_date,
+                Assignment.cost,
+            )
+            .join(Task, Task.id == Assignment.task_id)
+            .where(*live),
+            [
+                "assignment_id",
+                "baseline_number",
+                "work",
+                "start_date",
+                "finish_date",
+                "cost",
+            ],
+            "uq_assignment_baseline_number",
+        )
+    )
+    await db.commit()
+    return BaselineSummary(baseline_number, tasks.rowcount, assignments.rowcount)
+
+
+async def stream_variance(
+    db: AsyncSession,
+    project: Project,
+    baseline_number: int,
+) -> AsyncIterator[bytes]:
+    """
+    NDJSON lines comparing every live task with a baseline, in outline order.
+
+    Date variances are in calendar days, duration and work in minutes.
+    Tasks added after the baseline have null baseline and variance fields.
+    """
+    base = TaskBaseline
+    query = (
+        select(
+            Task.id.label("task_id"),
+            Task.wbs_code,
+            Task.name,
+            Task.start_date,
+            Task.finish_date,
+            Task.duration,
+            Task.work,
+            Task.total_cost.label("cost"),
+            base.start_date.label("baseline_start"),
+            base.finish_date.label("baseline_finish"),
+            base.duration.label("baseline_duration"),
+            base.work.label("baseline_work"),
+            base.cost.label("baseline_cost"),
+            (Task.start_date - base.start_date).label("start_variance"),
+            (Task.finish_date - base.finish_date).label("finish_variance"),
+            (Task.duration - base.duration).label("duration_variance"),
+            (Task.work - base.work).label("work_variance"),
+            (Task.total_cost - base.cost).label("cost_variance"),
+        )
+        .outerjoin(
+            base,
+            and_(base.task_id == Task.id, base.baseline_number == baseline_number),
+        )
+        .where(
+            Task.project_id == project.id,
+            Task.is_deleted == False,  # noqa: E712
+        )
+        .order_by(Task.order_index, Task.id)
+        .execution_options(yield_per=VARIANCE_BATCH_SIZE)
+    )
+    result = await db.stream(query)
+    async for rows in result.partitions():
+        yield b"".join(
+            TaskVariance.model_validate(row._mapping).model_dump_json().encode() + b"\n"
+            for row in rows
+        )
@@ -0,0 +1,315 @@
+"""
+Working-time calendar logic.
+
+Compiles a calendar (its base chain, work week and exceptions) into a
+sorted cumulative-working-minutes index, one entry per day. Adding or
+diffing working minutes is then a binary search instead of a day-by-day
+walk over JSONB.
+
+Dates are the finest unit the schema stores, so breaks and shift hours
+are folded into each day's total working minutes.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import date, timedelta
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.calendar import Calendar
+from app.models.calendar_exception import CalendarException
+
+# How many days to compile at a time when a lookup runs past the index
+CHUNK_DAYS = 366
+# Refuse to search further than this for working time (~100 years)
+MAX_DAYS = 36_600
+
+# Compiled calendars keyed by ((calendar_id, updated_at), ...) over the base chain
+_CACHE_SIZE = 128
+_cache: OrderedDict[tuple, "CompiledCalendar"] = OrderedDict()
+
+
+# ── Parsing ──
+
+
+def _parse_time(value: str) -> int:
+    """Minutes since midnight for 'HH:MM' ('24:00' allowed)."""
+    hours, minutes = value.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def day_minutes(day: dict | None) -> int:
+    """
+    Working minutes in one work_week entry.
+
+    Entry shape: {"start": "09:00", "end": "17:00", "breaks": [{"start", "end"}]}.
+    None (or an empty dict) means a non-working day.
+    """
+    if not day:
+        return 0
+    start = _parse_time(day["start"])
+    end = _parse_time(day["end"])
+    total = max(0, end - start)
+    for brk in day.get("breaks") or []:
+        # Only the part of a break inside the shift counts
+        b_start = max(start, _parse_time(brk["start"]))
+        b_end = min(end, _parse_time(brk["end"]))
+        total -= max(0, b_end - b_start)
+    return total
+
+
+# ── Compiled calendar ──
+
+
+class CompiledCalendar:
+    """
+    Cumulative working minutes per day.
+
+    cum[k] is the number of working minutes between the anchor day and the
+    start of day first_day + k (negative before the anchor). The index
+    grows in CHUNK_DAYS steps in either direction; values already computed
+    never change, so offsets stay valid as it grows.
+    """
+
+    def __init__(
+        self,
+        weekly: list[int],
+        overrides: dict[date, int],
+        yearly: dict[tuple[int, int], tuple[int, int]],
+        anchor: date,
+    ):
+        if not any(weekly) and not any(overrides.values()):
+            if not any(minutes for minutes, _ in yearly.values()):
+                raise ValueError("Calendar has no working time")
+        self.weekly = weekly  # Monday=0, as date.weekday()
+        self.overrides = overrides
+        self.yearly = yearly  # (month, day) -> (minutes, first_year)
+        self.anchor = anchor
+        self.first_day = anchor
+        self.cum = [0]
+        self._extend_forward(CHUNK_DAYS)
+
+    def minutes_on(self, day: date) -> int:
+        """Working minutes on a single day after exceptions."""
+        minutes = self.overrides.get(day)
+        if minutes is not None:
+            return minutes
+        recurring = self.yearly.get((day.month, day.day))
+        if recurring is not None and day.year >= recurring[1]:
+            return recurring[0]
+        return self.weekly[day.weekday()]
+
+    @property
+    def last_day(self) -> date:
+        """First day past the compiled range."""
+        return self.first_day + timedelta(days=len(self.cum) - 1)
+
+    def _extend_forward(self, days: int) -> None:
+        day = self.last_day
+        total = self.cum[-1]
+        for _ in range(days):
+            total += self.minutes_on(day)
+            self.cum.append(total)
+            day += timedelta(days=1)
+
+    def _extend_backward(self, days: int) -> None:
+        head = []
+        day = self.first_day
+        total = self.cum[0]
+        for _ in range(days):
+            day -= timedelta(days=1)
+            total -= self.minutes_on(day)
+            head.append(total)
+        head.reverse()
+        self.cum[:0] = head
+        self.first_day = day
+
+    def _cover_day(self, day: date) -> None:
+        while day >= self.last_day:
+            self._check_span()
+            self._extend_forward(CHUNK_DAYS)
+        while day < self.first_day:
+            self._check_span()
+            self._extend_backward(CHUNK_DAYS)
+
+    def _cover_offset(self, offset: int) -> None:
+        while offset >= self.cum[-1]:
+            self._check_span()
+            self._extend_forward(CHUNK_DAYS)
+        while offset < self.cum[0]:
+            self._check_span()
+            self._extend_backward(CHUNK_DAYS)
+
+    def _check_span(self) -> None:
+        if len(self.cum) > MAX_DAYS:
+            raise ValueError("Date is too far from the calendar anchor")
+
+    # ── Lookups (all O(log n) once the range is compiled) ──
+
+    def offset_of(self, day: date) -> int:
+        """Working minutes from the anchor to the start of `day`."""
+        self._cover_day(day)
+        return self.cum[(day - self.first_day).days]
+
+    def start_date_at(self, offset: int) -> date:
+        """Day on which work resumes `offset` minutes after the anchor."""
+        self._cover_offset(offset)
+        k = bisect_right(self.cum, offset) - 1
+        return self.first_day + timedelta(days=k)
+
+    def finish_date_at(self, offset: int) -> date:
+        """
+        Exclusive finish for work ending `offset` minutes after the anchor.
+
+        Work ending mid-day finishes on the next working day, like a
+        successor would start; work ending on a day boundary finishes where
+        the next working period begins.
+        """
+        self._cover_offset(offset)
+        k = bisect_left(self.cum, offset)
+        return self.start_date_at(self.cum[k])
+
+    def add_minutes(self, day: date, minutes: int) -> date:
+        """Finish date of `minutes` of work starting on `day`."""
+        return self.finish_date_at(self.offset_of(day) + minutes)
+
+    def diff_minutes(self, start: date, end: date) -> int:
+        """Working minutes from the start of `start` to the start of `end`."""
+        return self.offset_of(end) - self.offset_of(start)
+
+    def timeline(self, origin: date) -> "CalendarTimeline":
+        """View with offsets measured from `origin` (e.g. the project start)."""
+        return CalendarTimeline(self, origin)
+
+
+class CalendarTimeline:
+    """Scheduler timeline backed by a compiled calendar."""
+
+    def __init__(self, calendar: CompiledCalendar, origin: date):
+        self.calendar = calendar
+        self.origin = origin
+        self.base = calendar.offset_of(origin)
+
+    def offset_of(self, day: date) -> int:
+        return self.calendar.offset_of(day) - self.base
+
+    def start_date_at(self, offset: int) -> date:
+        return self.calendar.start_date_at(offset + self.base)
+
+    def finish_date_at(self, offset: int) -> date:
+        return self.calendar.finish_date_at(offset + self.base)
+
+
+def compile_calendar(
+    chain: list[tuple[list, list]],
+    anchor: date,
+) -> CompiledCalendar:
+    """
+    Compile a calendar from its base chain.
+
+    chain: [(work_week, exceptions), ...] from the root base calendar down to
+    the calendar itself. exceptions are (start_date, end_date, is_working,
+    work_times, recurrence) tuples. The calendar's own work week is used;
+    exceptions accumulate down the chain, with derived calendars winning.
+    """
+    work_week = chain[-1][0]
+    # work_week is Sunday=0, date.weekday() is Monday=0
+    by_sunday = [day_minutes(day) for day in (list(work_week) + [None] * 7)[:7]]
+    weekly = by_sunday[1:] + by_sunday[:1]
+    default_day = max(weekly) or 480
+
+    overrides: dict[date, int] = {}
+    yearly: dict[tuple[int, int], tuple[int, int]] = {}
+    for _, exceptions in chain:
+        for start, end, is_working, work_times, recurrence in exceptions:
+            minutes = (day_minutes(work_times) or default_day) if is_working else 0
+            span = (end - start).days + 1
+            if recurrence and recurrence.get("type") == "yearly":
+                first = date(2000, recurrence["month"], recurrence["day"])
+                for k in range(span):
+                    day = first + timedelta(days=k)
+                    yearly[(day.month, day.day)] = (minutes, start.year)
+            else:
+                for k in range(span):
+                    overrides[start + timedelta(days=k)] = minutes
+
+    return CompiledCalendar(weekly, overrides, yearly, anchor)
+
+
+# ── Database ──
+
+
+async def get_compiled_calendar(
+    db: AsyncSession,
+    calendar_id: UUID,
+) -> CompiledCalendar | None:
+    """
+    Load and compile a calendar, reusing the cached copy when unchanged.
+
+    The cache key is (id, updated_at) of every calendar in the base chain,
+    so code that edits a calendar's exceptions must also touch its
+    updated_at. Returns None if the calendar does not exist.
+    """
+    # Walk base_calendar_id upwards; UNION stops on a (corrupt) cyclic chain
+    chain = (
+        select(Calendar.id, Calendar.base_calendar_id, Calendar.updated_at)
+        .where(Calendar.id == calendar_id)
+        .cte("chain", recursive=True)
+    )
+    chain = chain.union(
+        select(Calendar.id, Calendar.base_calendar_id, Calendar.updated_at).join(
+            chain, Calendar.id == chain.c.base_calendar_id
+        )
+    )
+    rows = {row.id: row for row in (await db.execute(select(chain))).all()}
+    if not rows:
+        return None
+
+    # Root first, the calendar itself last
+    order = [calendar_id]
+    while rows[order[-1]].base_calendar_id in rows:
+        base_id = rows[order[-1]].base_calendar_id
+        if base_id in order:
+            break
+        order.append(base_id)
+    order.reverse()
+
+    key = tuple((cid, rows[cid].updated_at) for cid in order)
+    compiled = _cache.get(key)
+    if compiled is not None:
+        _cache.move_to_end(key)
+        return compiled
+
+    work_weeks = dict(
+        (
+            await db.execute(
+                select(Calendar.id, Calendar.work_week).where(Calendar.id.in_(order))
+            )
+        ).all()
+    )
+    exception_rows = (
+        await db.execute(
+            select(
+                CalendarException.calendar_id,
+                CalendarException.start_date,
+                CalendarException.end_date,
+                CalendarException.is_working,
+                CalendarException.work_times,
+                CalendarException.recurrence,
+            ).where(CalendarException.calendar_id.in_(order))
+        )
+    ).all()
+    exceptions: dict[UUID, list] = {cid: [] for cid in order}
+    for cid, *fields in exception_rows:
+        exceptions[cid].append(tuple(fields))
+
+    compiled = compile_calendar(
+        [(work_weeks[cid], exceptions[cid]) for cid in order],
+        anchor=date(date.today().year, 1, 1),
+    )
+    _cache[key] = compiled
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return compiled
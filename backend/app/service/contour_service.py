@@ -0,0 +1,150 @@
+"""
+Work contours and timephased work.
+
+A contour shapes how an assignment's work is spread over its working days.
+Each built-in shape is given, as in desktop schedulers, as the percentage
+of peak units worked in each tenth of the assignment; FLAT is 100%
+throughout. A CONTOURED assignment brings its own shape in contour_data
+({"weights": [...]}: relative work for equal slices of the assignment).
+
+shape_weights() turns a shape into per-day fractions that sum to 1 by
+integrating the step function over each working day's share of the span.
+Tables are cached per (shape, days), so spreading thousands of
+assignments reuses a small number of them.
+
+WorkingDays holds the working minutes of every day in a date range, taken
+from the project timeline (calendar or hours_per_day), and timephase()
+spreads many assignments over it at once. Utilization, cost and earned
+value all build on these two.
+"""
+
+from bisect import bisect_left
+from datetime import date, timedelta
+from functools import lru_cache
+from itertools import accumulate
+from typing import NamedTuple
+
+from app.models.enums import WorkContour
+
+# Percent of peak units per tenth of the assignment
+CONTOUR_SHAPES: dict[str, tuple[int, ...]] = {
+    WorkContour.FLAT: (100,) * 10,
+    WorkContour.BACK_LOADED: (10, 15, 25, 50, 50, 75, 75, 100, 100, 100),
+    WorkContour.FRONT_LOADED: (100, 100, 100, 75, 75, 50, 50, 25, 15, 10),
+    WorkContour.DOUBLE_PEAK: (25, 50, 100, 50, 25, 25, 50, 100, 50, 25),
+    WorkContour.EARLY_PEAK: (25, 50, 100, 100, 75, 50, 35, 25, 15, 10),
+    WorkContour.LATE_PEAK: (10, 15, 25, 35, 50, 75, 100, 100, 50, 25),
+    WorkContour.BELL: (10, 20, 40, 80, 100, 100, 80, 40, 20, 10),
+    WorkContour.TURTLE: (25, 50, 75, 100, 100, 100, 100, 75, 50, 25),
+}
+_FLAT = CONTOUR_SHAPES[WorkContour.FLAT]
+
+
+def contour_shape(contour: str, contour_data: dict | None = None) -> tuple:
+    """
+    Shape of an assignment's contour.
+
+    CONTOURED uses the weights in contour_data; without usable weights, and
+    for unknown contours, the shape is FLAT.
+    """
+    if contour == WorkContour.CONTOURED and contour_data:
+        custom = tuple(float(weight) for weight in contour_data.get("weights") or ())
+        if custom and min(custom) >= 0 and sum(custom) > 0:
+            return custom
+    return CONTOUR_SHAPES.get(contour, _FLAT)
+
+
+@lru_cache(maxsize=4096)
+def shape_weights(shape: tuple, days: int) -> tuple[float, ...]:
+    """Fraction of the work on each of `days` working days, for a shape."""
+    if days <= 0:
+        return ()
+    segments = len(shape)
+    prefix = tuple(accumulate(shape, initial=0))
+
+    def done(j: int) -> float:
+        # Share of the total work done after j of the days
+        position = j * segments / days
+        whole = min(int(position), segments - 1)
+        return (prefix[whole] + (position - whole) * shape[whole]) / prefix[-1]
+
+    edges = [done(j) for j in range(days + 1)]
+    return tuple(b - a for a, b in zip(edges, edges[1:]))
+
+
+def weights(
+    contour: str,
+    days: int,
+    contour_data: dict | None = None,
+) -> tuple[float, ...]:
+    """Fraction of an assignment's work on each of its `days` working days."""
+    return shape_weights(contour_shape(contour, contour_data), days)
+
+
+class WorkingDays:
+    """
+    Working minutes of each day in [first, last).
+
+    Days are addressed by their index from `first`. `working` lists the
+    indexes of days with working time, in order; spans are returned as
+    positions in it.
+    """
+
+    def __init__(self, timeline, first: date, last: date):
+        self.first = first
+        count = max(0, (last - first).days)
+        self.offsets = [
+            timeline.offset_of(first + timedelta(days=d)) for d in range(count + 1)
+        ]
+        self.minutes = [b - a for a, b in zip(self.offsets, self.offsets[1:])]
+        self.working = [d for d, minutes in enumerate(self.minutes) if minutes > 0]
+
+    def index(self, day: date) -> int:
+        return (day - self.first).days
+
+    def position(self, day: date) -> int:
+        """Position in `working` of the first working day on or after day."""
+        return bisect_left(self.working, self.index(day))
+
+    def span(self, start: date, finish: date) -> tuple[int, int, int]:
+        """
+        Working days of an assignment, as positions [lo, hi) in `working`,
+        and its working minutes. The finish is exclusive but a span covers
+        at least its start day.
+        """
+        s = self.index(start)
+        f = max(self.index(finish), s + 1)
+        lo, hi = bisect_left(self.working, s), bisect_left(self.working, f)
+        return lo, hi, self.offsets[f] - self.offsets[s]
+
+
+class ContourWork(NamedTuple):
+    """What timephase() reads from an assignment."""
+
+    units: float
+    work: int
+    start_date: date
+    finish_date: date
+    work_contour: str
+    contour_data: dict | None
+
+
+def timephase(days: WorkingDays, assignments) -> list[tuple[int, list[float]]]:
+    """
+    Spread the work of each assignment over its working days.
+
+    Returns, per assignment, the position in days.working of its first
+    working day and its work in minutes on each working day. Assignments
+    without work book their units for every working minute of their span;
+    those without working days get no entries. days must cover every span.
+    """
+    phased = []
+    for units, work, start, finish, contour, contour_data in assignments:
+        lo, hi, minutes = days.span(start, finish)
+        if lo == hi:
+            phased.append((lo, []))
+            continue
+        total = work or float(units) * minutes
+        table = shape_weights(contour_shape(contour, contour_data), hi - lo)
+        phased.append((lo, [total * weight for weight in table]))
+    return phased
@@ -0,0 +1,345 @@
+"""
+Cost engine.
+
+Costs assignments from their work and their resource's rates:
+
+- WORK resources: hours worked each day x the standard rate in effect
+  that day, plus the cost per use
+- MATERIAL resources: units (the quantity) spread like work x the
+  per-unit standard rate, plus the cost per use
+- COST resources: the amount already on the assignment
+
+Rates come from the assignment's rate table (A-E): the resource_rate row
+with the latest effective date on or before the day, or the resource's own
+rates before the table's first entry. RateIndex keeps each table sorted,
+so rates are resolved with bisect and a forward walk rather than per-day
+queries.
+
+Daily amounts follow the assignment's contour over its working days
+(contour_service). The resource's accrue_at then decides when the cost is
+incurred: all on the first working day, all on the last, or prorated with
+the work. Cost per use is incurred on the first day. Task fixed costs
+accrue by fixed_cost_accrual over the task's working days.
+
+A task's total cost is its fixed cost plus its assignments' costs;
+summaries are left to rollup_service.
+"""
+
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import NamedTuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import bulk_update
+from app.core.versioning import lock_project
+from app.models.assignment import Assignment
+from app.models.enums import CostAccrual, ResourceType
+from app.models.project import Project
+from app.models.resource import Resource
+from app.models.resource_rate import ResourceRate
+from app.models.task import Task
+from app.service import contour_service, rollup_service, schedule_service
+
+_CENT = Decimal("0.01")
+
+
+class Rate(NamedTuple):
+    standard: float  # Per hour of work, or per unit of material
+    per_use: float
+
+
+class RateIndex:
+    """Rates of every resource and rate table, sorted by effective date."""
+
+    def __init__(self, defaults: dict[UUID, Rate], rows):
+        # rows: (resource_id, rate_table, effective_date, standard, per_use)
+        self.defaults = defaults
+        self._tables: dict[tuple, tuple[list[int], list[Rate]]] = {}
+        for resource_id, table, effective, standard, per_use in sorted(
+            rows, key=lambda row: row[2]
+        ):
+            starts, rates = self.table(resource_id, table)
+            starts.append(effective.toordinal())
+            rates.append(Rate(float(standard), float(per_use)))
+
+    def table(
+        self,
+        resource_id: UUID,
+        rate_table: str,
+    ) -> tuple[list[int], list[Rate]]:
+        """
+        Effective dates (as ordinals) and rates of one rate table.
+
+        The first entry is the resource's own rates, in effect from the
+        start of time.
+        """
+        key = (resource_id, rate_table)
+        found = self._tables.get(key)
+        if found is None:
+            default = self.defaults.get(resource_id, Rate(0.0, 0.0))
+            found = self._tables[key] = ([0], [default])
+        return found
+
+    def rate_at(self, resource_id: UUID, rate_table: str, day: date) -> Rate:
+        starts, rates = self.table(resource_id, rate_table)
+        return rates[bisect_right(starts, day.toordinal()) - 1]
+
+
+class CostInput(NamedTuple):
+    """What the engine reads from an assignment and its resource."""
+
+    resource_id: UUID
+    resource_type: str
+    accrue_at: str
+    rate_table: str
+    units: float
+    work: int
+    cost: float  # Used as is for COST resources
+    start_date: date
+    finish_date: date
+    work_contour: str
+    contour_data: dict | None
+
+
+def accrue(total: float, days: int, accrual: str) -> list[float]:
+    """An amount over `days` working days, all at the start or end, or evenly."""
+    if days <= 0:
+        return []
+    if accrual == CostAccrual.START:
+        return [total] + [0.0] * (days - 1)
+    if accrual == CostAccrual.END:
+        return [0.0] * (days - 1) + [total]
+    return [total / days] * days
+
+
+def assignment_costs(
+    days: contour_service.WorkingDays,
+    rates: RateIndex,
+    assignments,
+) -> list[tuple[int, list[float]]]:
+    """
+    Timephased cost of each assignment.
+
+    Returns, per assignment, the position in days.working of its first
+    working day and its cost on each working day from there. An assignment
+    without working days only carries its cost per use, on that position.
+    days must cover every span.
+    """
+    first = days.first.toordinal()
+    working = days.working
+    phased = []
+    for row in assignments:
+        lo, hi, minutes = days.span(row.start_date, row.finish_date)
+        starts, table = rates.table(row.resource_id, row.rate_table)
+        k = bisect_right(starts, row.start_date.toordinal()) - 1
+        per_use = table[k].per_use
+        weights = contour_service.weights(row.work_contour, hi - lo, row.contour_data)
+
+        if row.resource_type == ResourceType.COST:
+            costs = [float(row.cost) * weight for weight in weights]
+            per_use = 0.0
+        else:
+            if row.resource_type == ResourceType.WORK:
+                total = (row.work or float(row.units) * minutes) / 60
+            else:
+                total = float(row.units)
+            costs = []
+            last = len(starts) - 1
+            for j, weight in zip(range(lo, hi), weights):
+                day = first + working[j]
+                while k < last and starts[k + 1] <= day:
+                    k += 1
+                costs.append(total * weight * table[k].standard)
+
+        if row.accrue_at != CostAccrual.PRORATED and costs:
+            costs = accrue(sum(costs), len(costs), row.accrue_at)
+        if per_use:
+            costs = costs or [0.0]
+            costs[0] += per_use
+        phased.append((lo, costs))
+    return phased
+
+
+def fixed_costs(
+    days: contour_service.WorkingDays,
+    tasks,
+) -> list[tuple[int, list[float]]]:
+    """
+    Timephased fixed cost of each task, like assignment_costs().
+
+    tasks yield (fixed_cost, fixed_cost_accrual, start_date, finish_date).
+    A task without working days incurs its fixed cost on that position.
+    """
+    phased = []
+    for fixed_cost, accrual, start, finish in tasks:
+        lo, hi, _ = days.span(start, finish)
+        amount = float(fixed_cost)
+        phased.append((lo, accrue(amount, max(hi - lo, 1), accrual) if amount else []))
+    return phased
+
+
+class CostSummary(NamedTuple):
+    assignment_count: int
+    task_count: int
+    changed_task_ids: list[UUID]
+    total_cost: Decimal
+
+
+def _cents(value: float) -> Decimal:
+    return Decimal(value).quantize(_CENT)
+
+
+async def load_rates(db: AsyncSession, project_id: UUID) -> RateIndex:
+    """Rate tables of every resource in a project."""
+    resources = await db.execute(
+        select(Resource.id, Resource.standard_rate, Resource.cost_per_use).where(
+            Resource.project_id == project_id
+        )
+    )
+    defaults = {
+        resource_id: Rate(float(standard), float(per_use))
+        for resource_id, standard, per_use in resources
+    }
+    rows = await db.execute(
+        select(
+            ResourceRate.resource_id,
+            ResourceRate.rate_table,
+            ResourceRate.effective_date,
+            ResourceRate.standard_rate,
+            ResourceRate.cost_per_use,
+        )
+        .join(Resource, Resource.id == ResourceRate.resource_id)
+        .where(Resource.project_id == project_id)
+    )
+    return RateIndex(defaults, rows.all())
+
+
+async def load_cost_inputs(db: AsyncSession, project_id: UUID) -> list:
+    """Assignments of live tasks, with id, task_id and the CostInput fields."""
+    result = await db.execute(
+        select(
+            Assignment.id,
+            Assignment.task_id,
+            Assignment.actual_cost,
+            Assignment.remaining_cost,
+            Assignment.resource_id,
+            Resource.type.label("resource_type"),
+            Resource.accrue_at,
+            Assignment.rate_table,
+            Assignment.units,
+            Assignment.work,
+            Assignment.cost,
+            Assignment.start_date,
+            Assignment.finish_date,
+            Assignment.work_contour,
+            Assignment.contour_data,
+        )
+        .join(Task, Task.id == Assignment.task_id)
+        .join(Resource, Resource.id == Assignment.resource_id)
+        .where(
+            Task.project_id == project_id,
+            Task.is_deleted == False,  # noqa: E712
+        )
+    )
+    return result.all()
+
+
+def cost_input(row) -> CostInput:
+    return CostInput(*(getattr(row, field) for field in CostInput._fields))
+
+
+async def working_days(
+    db: AsyncSession,
+    project: Project,
+    spans,
+) -> contour_service.WorkingDays:
+    """Working days covering every (start, finish) in spans."""
+    timeline = await schedule_service.project_timeline(db, project)
+    spans = list(spans)
+    first = min((start for start, _ in spans), default=project.start_date)
+    last = max((finish for _, finish in spans), default=first)
+    # A same-day finish still covers its start day
+    return contour_service.WorkingDays(
+        timeline, first, max(first, last) + timedelta(days=1)
+    )
+
+
+async def recalculate_costs(db: AsyncSession, project: Project) -> CostSummary:
+    """
+    Recompute assignment costs and task total costs, then roll up summaries.
+
+    Writes only the rows whose cost changed, and commits.
+    """
+    # Set-based writes below; also keeps costs consistent with one snapshot
+    await lock_project(db, project.id)
+
+    rates = await load_rates(db, project.id)
+    rows = await load_cost_inputs(db, project.id)
+    inputs = [cost_input(row) for row in rows]
+    days = await working_days(
+        db, project, ((row.start_date, row.finish_date) for row in inputs)
+    )
+    phased = assignment_costs(days, rates, inputs)
+
+    assignment_changes = []
+    task_costs: defaultdict[UUID, Decimal] = defaultdict(Decimal)
+    for row, (_, costs) in zip(rows, phased):
+        if row.resource_type == ResourceType.COST:
+            cost = row.cost
+        else:
+            cost = _cents(sum(costs))
+        task_costs[row.task_id] += cost
+        remaining = max(cost - row.actual_cost, Decimal(0))
+        if (cost, remaining) != (row.cost, row.remaining_cost):
+            assignment_changes.append(
+                {"id": row.id, "cost": cost, "remaining_cost": remaining}
+            )
+    await bulk_update(db, Assignment.__table__, assignment_changes)
+
+    tasks = (
+        await db.execute(
+            select(
+                Task.id,
+                Task.parent_task_id,
+                Task.fixed_cost,
+                Task.total_cost,
+                Task.actual_cost,
+                Task.remaining_cost,
+            ).where(
+                Task.project_id == project.id,
+                Task.is_deleted == False,  # noqa: E712
+            )
+        )
+    ).all()
+    parents = {task.parent_task_id for task in tasks}
+    task_changes = []
+    for task in tasks:
+        if task.id in parents:
+            continue  # Summaries are rolled up below
+        total = task.fixed_cost + task_costs.get(task.id, Decimal(0))
+        remaining = max(total - task.actual_cost, Decimal(0))
+        if (total, remaining) != (task.total_cost, task.remaining_cost):
+            task_changes.append(
+                {"id": task.id, "total_cost": total, "remaining_cost": remaining}
+            )
+    await bulk_update(db, Task.__table__, task_changes)
+    rolled = await rollup_service.rollup_project(db, project.id)
+    await db.commit()
+
+    totals = {task.id: task.total_cost for task in tasks}
+    totals.update((row["id"], row["total_cost"]) for row in (*task_changes, *rolled))
+    changed = {row["id"] for row in task_changes} | {row["id"] for row in rolled}
+    return CostSummary(
+        assignment_count=len(rows),
+        task_count=len(tasks),
+        changed_task_ids=sorted(changed),
+        total_cost=sum(
+            (totals[task.id] for task in tasks if task.parent_task_id is None),
+            Decimal(0),
+        ),
+    )
@@ -3,15 +3,22 @@ Dependency business logic.
 
 Handles listing, creating, updating, and deleting task dependencies.
 Note: Dependencies use hard delete.
+
+New links are checked for cycles before insert. Only the part of the graph
+reachable from the new successors is loaded, so the check does not grow
+with the size of the project.
 """
 
+from collections import defaultdict
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import Page, paginate
+from app.core.versioning import lock_project
 from app.models.dependency import Dependency
 from app.models.project import Project
 from app.models.task import Task
@@ -23,23 +30,24 @@ async def list_dependencies(
     project: Project,
     page: int = 1,
     per_page: int = 50,
-) -> tuple[list[Dependency], int]:
-    """List dependencies with pagination."""
-    # Count total
-    count_result = await db.execute(
-        select(func.count()).where(Dependency.project_id == project.id)
-    )
-    total = count_result.scalar() or 0
+    cursor: str | None = None,
+    include_total: bool | None = None,
+) -> Page:
+    """
+    List dependencies in creation order.
 
-    # Get page of items
-    result = await db.execute(
-        select(Dependency)
-        .where(Dependency.project_id == project.id)
-        .order_by(Dependency.created_at.asc())
-        .offset((page - 1) * per_page)
-        .limit(per_page)
+    Cursor mode seeks on (created_at, id), backed by
+    idx_dependency_project_created.
+    """
+    return await paginate(
+        db,
+        select(Dependency).where(Dependency.project_id == project.id),
+        (Dependency.created_at, Dependency.id),
+        page=page,
+        per_page=per_page,
+        cursor=cursor,
+        include_total=include_total,
     )
-    return list(result.scalars().all()), total
 
 
 async def _validate_tasks_in_project(
@@ -67,6 +75,70 @@ async def _validate_tasks_in_project(
             )
 
 
+def find_cycle(edges: list[tuple[UUID, UUID]]) -> list[UUID]:
+    """
+    Tasks that sit on (or behind) a cycle in `edges`.
+
+    Kahn's algorithm over (predecessor_id, successor_id) pairs. Returns an
+    empty list when the edges are acyclic.
+    """
+    successors = defaultdict(list)
+    indegree = defaultdict(int)
+    for pred_id, succ_id in edges:
+        successors[pred_id].append(succ_id)
+        indegree[succ_id] += 1
+        indegree.setdefault(pred_id, 0)
+
+    ready = [task_id for task_id, count in indegree.items() if count == 0]
+    while ready:
+        task_id = ready.pop()
+        for succ_id in successors[task_id]:
+            indegree[succ_id] -= 1
+            if indegree[succ_id] == 0:
+                ready.append(succ_id)
+
+    return [task_id for task_id, count in indegree.items() if count > 0]
+
+
+async def _validate_acyclic(
+    db: AsyncSession,
+    project_id: UUID,
+    new_edges: list[tuple[UUID, UUID]],
+) -> None:
+    """
+    Reject new edges that would close a cycle.
+
+    Any such cycle runs from a new successor back to a new predecessor, so
+    it lies within the downstream cone of the new successors. One recursive
+    CTE loads the existing edges of that cone; the cone plus the new edges
+    is then checked in memory. Disabled links count too, so re-enabling a
+    link can never create a cycle.
+    """
+    cone = (
+        select(Task.id.label("id"))
+        .where(Task.id.in_({succ_id for _, succ_id in new_edges}))
+        .cte("cone", recursive=True)
+    )
+    cone = cone.union(
+        select(Dependency.successor_id)
+        .join(cone, Dependency.predecessor_id == cone.c.id)
+        .where(Dependency.project_id == project_id)
+    )
+    existing = (
+        await db.execute(
+            select(Dependency.predecessor_id, Dependency.successor_id).where(
+                Dependency.predecessor_id.in_(select(cone.c.id))
+            )
+        )
+    ).all()
+
+    if find_cycle([*existing, *new_edges]):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This dependency would create a cycle",
+        )
+
+
 async def create_dependency(
     db: AsyncSession,
     project: Project,
@@ -78,6 +150,9 @@ async def create_dependency(
         db, project.id, data.predecessor_id, data.successor_id
     )
 
+    await lock_project(db, project.id)
+    await _validate_acyclic(db, project.id, [(data.predecessor_id, data.successor_id)])
+
     dependency = Dependency(
         project_id=project.id,
         predecessor_id=data.predecessor_id,
@@ -100,6 +175,68 @@ async def create_dependency(
         )
 
 
+async def create_dependencies(
+    db: AsyncSession,
+    project: Project,
+    items: list[DependencyCreate],
+) -> list[Dependency]:
+    """
+    Create many dependencies at once (e.g. an import).
+
+    All-or-nothing: one task lookup and one cycle check for the whole batch,
+    then a single commit.
+    """
+    task_ids = {t for d in items for t in (d.predecessor_id, d.successor_id)}
+    result = await db.execute(
+        select(Task.id).where(
+            Task.id.in_(task_ids),
+            Task.project_id == project.id,
+            Task.is_deleted == False,  # noqa: E712
+        )
+    )
+    if len(result.all()) != len(task_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Task not found in this project",
+        )
+
+    await lock_project(db, project.id)
+    await _validate_acyclic(
+        db, project.id, [(d.predecessor_id, d.successor_id) for d in items]
+    )
+
+    dependencies = [
+        Dependency(
+            project_id=project.id,
+            predecessor_id=d.predecessor_id,
+            successor_id=d.successor_id,
+            type=d.type,
+            lag=d.lag,
+            lag_format=d.lag_format,
+        )
+        for d in items
+    ]
+
+    try:
+        db.add_all(dependencies)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="One or more dependencies already exist",
+        )
+
+    # One SELECT to load server defaults for the whole batch
+    result = await db.execute(
+        select(Dependency)
+        .where(Dependency.id.in_([d.id for d in dependencies]))
+        .execution_options(populate_existing=True)
+    )
+    by_id = {d.id: d for d in result.scalars().all()}
+    return [by_id[d.id] for d in dependencies]
+
+
 async def get_dependency_by_id(
     db: AsyncSession,
     dependency_id: UUID,
@@ -121,6 +258,7 @@ async def update_dependency(
     data: DependencyUpdate,
 ) -> Dependency:
     """Update a dependency with partial data."""
+    await lock_project(db, dependency.project_id)
     update_data = data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(dependency, field, value)
@@ -135,5 +273,6 @@ async def delete_dependency(
     dependency: Dependency,
 ) -> None:
     """Hard delete a dependency."""
+    await lock_project(db, dependency.project_id)
     await db.delete(dependency)
     await db.commit()
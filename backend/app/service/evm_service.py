@@ -0,0 +1,409 @@
+"""
+Earned value.
+
+Measures progress against a baseline at a status date, per task:
+
+- BAC: the baseline cost
+- BCWS (planned value): the part of BAC scheduled up to and including
+  the status date
+- BCWP (earned value): BAC x percent complete
+- ACWP (actual cost): what the work done so far cost
+
+Planned cost is phased the way current cost is (cost_service): each
+assignment baseline's cost over its baseline dates by the assignment's
+contour and its resource's accrual, and the rest of the task baseline (the
+fixed cost) by fixed_cost_accrual. Actual cost is each assignment's
+actual_cost where recorded, else its cost times the share of its work
+done, plus the task's fixed cost as accrued by percent complete.
+
+SPI, CPI, EAC and VAC derive from those four (indices()). Summary tasks
+sum their children plus their own fixed cost, like total_cost in
+rollup_service; the project total sums the top-level tasks. analyse()
+writes bcws, bcwp and acwp to the tasks and keeps one snapshot per task,
+status date and baseline, so trends are read back instead of recomputed.
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import NamedTuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import bulk_update
+from app.core.versioning import lock_project
+from app.models.assignment import Assignment
+from app.models.assignment_baseline import AssignmentBaseline
+from app.models.earned_value_snapshot import EarnedValueSnapshot
+from app.models.enums import CostAccrual, ResourceType
+from app.models.project import Project
+from app.models.resource import Resource
+from app.models.task import Task
+from app.models.task_baseline import TaskBaseline
+from app.service import contour_service, cost_service, schedule_service
+
+_CENT = Decimal("0.01")
+_RATIO = Decimal("0.0001")
+_ZERO = Decimal(0)
+# Furthest a status date may lie from the project (about ten years)
+MAX_STATUS_DAYS = 3660
+
+
+class EarnedValue(NamedTuple):
+    bac: Decimal
+    bcws: Decimal
+    bcwp: Decimal
+    acwp: Decimal
+
+
+NO_VALUE = EarnedValue(_ZERO, _ZERO, _ZERO, _ZERO)
+
+
+class Indices(NamedTuple):
+    spi: Decimal | None  # BCWP / BCWS
+    cpi: Decimal | None  # BCWP / ACWP
+    eac: Decimal  # Estimate at completion
+    vac: Decimal  # Variance at completion, BAC - EAC
+
+
+def indices(value: EarnedValue) -> Indices:
+    """
+    Performance indices of an earned value.
+
+    EAC assumes the remaining work keeps the cost performance so far
+    (BAC / CPI); before any cost is incurred it is BAC.
+    """
+    bac, bcws, bcwp, acwp = value
+    spi = (bcwp / bcws).quantize(_RATIO) if bcws else None
+    cpi = (bcwp / acwp).quantize(_RATIO) if acwp else None
+    if bcwp and acwp:
+        eac = (bac * acwp / bcwp).quantize(_CENT)
+    else:
+        eac = acwp + bac - bcwp
+    return Indices(spi, cpi, eac, bac - eac)
+
+
+def metrics(task_id: UUID | None, value: EarnedValue) -> dict:
+    """Earned value and its indices as one record."""
+    return {"task_id": task_id, **value._asdict(), **indices(value)._asdict()}
+
+
+def _cents(value: float) -> Decimal:
+    return Decimal(value).quantize(_CENT)
+
+
+def _accrued(amount: Decimal, accrual: str, percent_complete: Decimal) -> Decimal:
+    """Part of a fixed cost incurred at some percent complete."""
+    if accrual == CostAccrual.START:
+        return amount if percent_complete > 0 else _ZERO
+    if accrual == CostAccrual.END:
+        return amount if percent_complete >= 100 else _ZERO
+    return (amount * percent_complete / 100).quantize(_CENT)
+
+
+def _work_done(row) -> Decimal:
+    """Share of an assignment's work that is done (0-1)."""
+    if row.work and row.actual_work:
+        return min(Decimal(row.actual_work) / row.work, Decimal(1))
+    if row.percent_work_complete:
+        return row.percent_work_complete / 100
+    return row.percent_complete / 100
+
+
+def earned_value(
+    days: contour_service.WorkingDays,
+    status_date: date,
+    tasks,
+    assignments,
+) -> dict[UUID, EarnedValue]:
+    """
+    Earned value of every task at the end of status_date.
+
+    tasks need id, parent_task_id, percent_complete, fixed_cost,
+    fixed_cost_accrual and baseline_cost/start/finish (None without a
+    baseline). assignments need task_id, accrue_at, work_contour,
+    contour_data, cost, actual_cost, work, actual_work,
+    percent_work_complete, percent_complete (their task's) and baseline
+    cost/start/finish. days must cover every baseline span.
+    """
+    cut = days.position(status_date + timedelta(days=1))
+    parents = {task.id: task.parent_task_id for task in tasks}
+    summaries = set(parents.values())
+    # Summaries count their children's work, as in rollup_service
+    assignments = [row for row in assignments if row.task_id not in summaries]
+
+    def planned(phased) -> list[float]:
+        return [sum(costs[: cut - lo]) if cut > lo else 0.0 for lo, costs in phased]
+
+    baselined = [row for row in assignments if row.baseline_start is not None]
+    assignment_plan = planned(
+        cost_service.assignment_costs(
+            days,
+            cost_service.RateIndex({}, []),
+            [
+                cost_service.CostInput(
+                    resource_id=None,
+                    resource_type=ResourceType.COST,
+                    accrue_at=row.accrue_at,
+                    rate_table="A",
+                    units=0,
+                    work=0,
+                    cost=row.baseline_cost,
+                    start_date=row.baseline_start,
+                    finish_date=row.baseline_finish,
+                    work_contour=row.work_contour,
+                    contour_data=row.contour_data,
+                )
+                for row in baselined
+            ],
+        )
+    )
+
+    bac = defaultdict(Decimal)
+    bcws = defaultdict(float)
+    acwp = defaultdict(Decimal)
+    for row, scheduled in zip(baselined, assignment_plan):
+        bac[row.task_id] += row.baseline_cost
+        bcws[row.task_id] += scheduled
+    for row in assignments:
+        if row.actual_cost:
+            acwp[row.task_id] += row.actual_cost
+        else:
+            acwp[row.task_id] += (row.cost * _work_done(row)).quantize(_CENT)
+
+    # A summary's baseline covers its subtree
+    children = defaultdict(Decimal)
+    for task in tasks:
+        if task.baseline_start is not None and task.parent_task_id is not None:
+            children[task.parent_task_id] += task.baseline_cost
+
+    # The rest of each task baseline is its own fixed cost
+    fixed = [
+        (task, max(task.baseline_cost - bac[task.id] - children[task.id], _ZERO))
+        for task in tasks
+        if task.baseline_start is not None
+    ]
+    fixed_plan = planned(
+        cost_service.fixed_costs(
+            days,
+            [
+                (
+                    amount,
+                    task.fixed_cost_accrual,
+                    task.baseline_start,
+                    task.baseline_finish,
+                )
+                for task, amount in fixed
+            ],
+        )
+    )
+    for (task, amount), scheduled in zip(fixed, fixed_plan):
+        bac[task.id] += amount
+        bcws[task.id] += scheduled
+
+    values: dict[UUID, list[Decimal]] = defaultdict(lambda: [_ZERO] * 4)
+    for task in tasks:
+        own = (
+            bac[task.id],
+            _cents(bcws[task.id]),
+            (bac[task.id] * task.percent_complete / 100).quantize(_CENT),
+            acwp[task.id]
+            + _accrued(task.fixed_cost, task.fixed_cost_accrual, task.percent_complete),
+        )
+        # Add to the task and every summary above it
+        task_id = task.id
+        while task_id is not None:
+            totals = values[task_id]
+            for k in range(4):
+                totals[k] += own[k]
+            task_id = parents.get(task_id)
+    return {task.id: EarnedValue(*values[task.id]) for task in tasks}
+
+
+def project_total(tasks, values: dict[UUID, EarnedValue]) -> EarnedValue:
+    """Sum of the top-level tasks."""
+    roots = [values[task.id] for task in tasks if task.parent_task_id is None]
+    if not roots:
+        return NO_VALUE
+    return EarnedValue(*(sum(column, _ZERO) for column in zip(*roots)))
+
+
+class EarnedValueReport(NamedTuple):
+    status_date: date
+    baseline_number: int
+    project: EarnedValue
+    tasks: dict[UUID, EarnedValue]
+
+
+async def _load(db: AsyncSession, project_id: UUID, baseline_number: int):
+    tasks = await db.execute(
+        select(
+            Task.id,
+            Task.parent_task_id,
+            Task.percent_complete,
+            Task.fixed_cost,
+            Task.fixed_cost_accrual,
+            Task.bcws,
+            Task.bcwp,
+            Task.acwp,
+            TaskBaseline.cost.label("baseline_cost"),
+            TaskBaseline.start_date.label("baseline_start"),
+            TaskBaseline.finish_date.label("baseline_finish"),
+        )
+        .outerjoin(
+            TaskBaseline,
+            and_(
+                TaskBaseline.task_id == Task.id,
+                TaskBaseline.baseline_number == baseline_number,
+            ),
+        )
+        .where(
+            Task.project_id == project_id,
+            Task.is_deleted == False,  # noqa: E712
+        )
+        .order_by(Task.order_index, Task.id)
+    )
+    assignments = await db.execute(
+        select(
+            Assignment.task_id,
+            Resource.accrue_at,
+            Assignment.work_contour,
+            Assignment.contour_data,
+            Assignment.cost,
+            Assignment.actual_cost,
+            Assignment.work,
+            Assignment.actual_work,
+            Assignment.percent_work_complete,
+            Task.percent_complete,
+            AssignmentBaseline.cost.label("baseline_cost"),
+            AssignmentBaseline.start_date.label("baseline_start"),
+            AssignmentBaseline.finish_date.label("baseline_finish"),
+        )
+        .join(Task, Task.id == Assignment.task_id)
+        .join(Resource, Resource.id == Assignment.resource_id)
+        .outerjoin(
+            AssignmentBaseline,
+            and_(
+                AssignmentBaseline.assignment_id == Assignment.id,
+                AssignmentBaseline.baseline_number == baseline_number,
+            ),
+        )
+        .where(
+            Task.project_id == project_id,
+            Task.is_deleted == False,  # noqa: E712
+        )
+    )
+    return tasks.all(), assignments.all()
+
+
+async def analyse(
+    db: AsyncSession,
+    project: Project,
+    status_date: date | None = None,
+    baseline_number: int = 0,
+) -> EarnedValueReport:
+    """
+    Earned value of every task at status_date (default: the project's).
+
+    Writes the task bcws/bcwp/acwp columns, replaces the snapshot of this
+    status date and baseline, and commits.
+    """
+    status_date = status_date or project.status_date or date.today()
+    # Set-based writes to tasks
+    await lock_project(db, project.id)
+
+    tasks, assignments = await _load(db, project.id, baseline_number)
+    spans = [
+        (row.baseline_start, row.baseline_finish)
+        for row in (*tasks, *assignments)
+        if row.baseline_start is not None
+    ]
+    earliest = min([project.start_date, *(start for start, _ in spans)])
+    latest = max([project.start_date, *(finish for _, finish in spans)])
+    window = timedelta(days=MAX_STATUS_DAYS)
+    if not earliest - window <= status_date <= latest + window:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"status_date must be within {MAX_STATUS_DAYS} days "
+            "of the project start and baseline",
+        )
+    timeline = await schedule_service.project_timeline(db, project)
+    first = min([status_date, *(start for start, _ in spans)])
+    last = max([status_date, *(finish for _, finish in spans)])
+    days = contour_service.WorkingDays(timeline, first, last + timedelta(days=1))
+
+    values = earned_value(days, status_date, tasks, assignments)
+    total = project_total(tasks, values)
+
+    changes = []
+    for task in tasks:
+        value = values[task.id]
+        if (value.bcws, value.bcwp, value.acwp) != (task.bcws, task.bcwp, task.acwp):
+            changes.append(
+                {
+                    "id": task.id,
+                    "bcws": value.bcws,
+                    "bcwp": value.bcwp,
+                    "acwp": value.acwp,
+                }
+            )
+    await bulk_update(db, Task.__table__, changes)
+
+    await db.execute(
+        delete(EarnedValueSnapshot).where(
+            EarnedValueSnapshot.project_id == project.id,
+            EarnedValueSnapshot.status_date == status_date,
+            EarnedValueSnapshot.baseline_number == baseline_number,
+        )
+    )
+    await db.execute(
+        insert(EarnedValueSnapshot),
+        [
+            {
+                "project_id": project.id,
+                "task_id": task_id,
+                "status_date": status_date,
+                "baseline_number": baseline_number,
+                **value._asdict(),
+            }
+            for task_id, value in ((None, total), *values.items())
+        ],
+    )
+    await db.commit()
+    return EarnedValueReport(status_date, baseline_number, total, values)
+
+
+async def trend(
+    db: AsyncSession,
+    project: Project,
+    baseline_number: int = 0,
+    task_id: UUID | None = None,
+) -> list[tuple[date, dict]]:
+    """Stored snapshots of the project total (or one task), oldest first."""
+    task_filter = (
+        EarnedValueSnapshot.task_id.is_(None)
+        if task_id is None
+        else EarnedValueSnapshot.task_id == task_id
+    )
+    result = await db.execute(
+        select(
+            EarnedValueSnapshot.status_date,
+            EarnedValueSnapshot.bac,
+            EarnedValueSnapshot.bcws,
+            EarnedValueSnapshot.bcwp,
+            EarnedValueSnapshot.acwp,
+        )
+        .where(
+            EarnedValueSnapshot.project_id == project.id,
+            EarnedValueSnapshot.baseline_number == baseline_number,
+            task_filter,
+        )
+        .order_by(EarnedValueSnapshot.status_date)
+    )
+    return [
+        (status_date, metrics(task_id, EarnedValue(*value)))
+        for status_date, *value in result
+    ]
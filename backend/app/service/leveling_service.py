@@ -0,0 +1,422 @@
+"""
+Resource leveling.
+
+Delays tasks so that no work resource is booked beyond its capacity, and
+returns the resulting date changes as a proposal.
+
+Time is cut into slots of one nominal working day (hours_per_day of
+working minutes) on the scheduler's working-minute axis. Each work
+resource gets a capacity timeline per slot: max_units, overridden by its
+availability periods. Units are kept in hundredths (1.00 = 100 = 100%)
+so the hot loops compare ints.
+
+Tasks are placed with a serial schedule-generation scheme: a task becomes
+eligible once all its predecessors are placed, and among eligible tasks
+the one with the highest priority, then the earliest late start, goes
+first. It starts at the earliest slot at or after its precedence-feasible
+start where every resource it uses has room. With within_slack, a task is
+never pushed past its CPM late start, so the project finish does not
+move; tasks that cannot fit keep their earliest start and are reported as
+unresolved.
+
+Started tasks, priority 1000 ("do not level") and must-start/finish-on
+constraints are never delayed, though they still book capacity.
+Resource calendars are not applied; the project timeline is used.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+from heapq import heappop, heappush
+from typing import NamedTuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import bulk_update
+from app.core.versioning import lock_project
+from app.models.assignment import Assignment
+from app.models.enums import ResourceType
+from app.models.project import Project
+from app.models.resource import Resource
+from app.models.resource_availability import ResourceAvailability
+from app.models.task import Task
+from app.service import rollup_service, schedule_service
+from app.service.schedule_service import (
+    ALAP,
+    MFO,
+    MSO,
+    DependencyCycleError,
+    ScheduleGraph,
+    ScheduleResult,
+    Timeline,
+)
+
+# Task.priority at which a task is never delayed
+DO_NOT_LEVEL = 1000
+# Furthest a task is pushed when leveling beyond slack (five working years)
+MAX_DELAY_SLOTS = 5 * 260
+
+
+class CapacityTimeline:
+    """
+    Capacity and booked units of one resource per slot, in hundredths.
+
+    Slots are materialized on demand as leveling reaches further out.
+    """
+
+    __slots__ = ("default", "periods", "capacity", "usage")
+
+    def __init__(self, max_units: int, periods: list[tuple[int, int, int]] = ()):
+        self.default = max_units
+        # (first slot, end slot (exclusive), units) from availability periods
+        self.periods = sorted(periods)
+        self.capacity: list[int] = []
+        self.usage: list[int] = []
+
+    def _extend(self, end: int) -> None:
+        size = len(self.capacity)
+        if end <= size:
+            return
+        end = max(end, 2 * size, 64)
+        self.capacity.extend([self.default] * (end - size))
+        self.usage.extend([0] * (end - size))
+        for first, last, units in self.periods:
+            lo, hi = max(first, size), min(last, end)
+            if lo < hi:
+                self.capacity[lo:hi] = [units] * (hi - lo)
+
+    def conflict(self, first: int, end: int, units: int) -> int:
+        """Last slot in [first, end) without room for units, or -1."""
+        self._extend(end)
+        capacity, usage = self.capacity, self.usage
+        for slot in range(end - 1, first - 1, -1):
+            booked = usage[slot]
+            if booked + units > capacity[slot]:
+                # A lone assignment above max units may still take an idle slot
+                if booked or not capacity[slot]:
+                    return slot
+        return -1
+
+    def book(self, first: int, end: int, units: int) -> None:
+        self._extend(end)
+        usage = self.usage
+        for slot in range(first, end):
+            usage[slot] += units
+
+    def overloaded(self) -> list[tuple[int, int, int]]:
+        """(first slot, end slot, peak units) for each run of overbooked slots."""
+        runs = []
+        first = peak = None
+        for slot, (booked, capacity) in enumerate(zip(self.usage, self.capacity)):
+            if booked > capacity:
+                if first is None:
+                    first, peak = slot, booked
+                peak = max(peak, booked)
+            elif first is not None:
+                runs.append((first, slot, peak))
+                first = None
+        if first is not None:
+            runs.append((first, len(self.usage), peak))
+        return runs
+
+
+class LevelingResult(NamedTuple):
+    """Leveled offsets per node, in working minutes."""
+
+    early_start: list[int]
+    early_finish: list[int]
+    unresolved: list[int]  # Nodes left overallocating a resource
+
+
+def level(
+    graph: ScheduleGraph,
+    cpm: ScheduleResult,
+    priority: list[int],
+    demands: list[list[tuple[int, int]]],
+    resources: list[CapacityTimeline],
+    slot: int,
+    within_slack: bool = True,
+) -> LevelingResult:
+    """
+    Serial schedule generation over a CPM-scheduled graph.
+
+    demands[i] lists (resource index, units) booked by node i. Slot numbers
+    must be non-negative, so offsets are expected to start at 0 or later.
+    Books every node on its resource timeline as a side effect.
+    """
+    n = graph.size
+    duration = graph.duration
+    pred_start = graph.pred_start
+    succ_start, succ_node = graph.succ_start, graph.succ_node
+    late_start = cpm.late_start
+
+    es = list(cpm.early_start)
+    ef = list(cpm.early_finish)
+    unresolved = []
+
+    def slots(i: int) -> tuple[int, int]:
+        return es[i] // slot, -(-ef[i] // slot)
+
+    # Started tasks keep their dates; book them before anything else
+    placed = [False] * n
+    for i in range(n):
+        if graph.pinned[i] and duration[i]:
+            first, end = slots(i)
+            for r, units in demands[i]:
+                resources[r].book(first, end, units)
+            placed[i] = True
+
+    indegree = [pred_start[i + 1] - pred_start[i] for i in range(n)]
+    eligible = [
+        (-priority[i], late_start[i], es[i], i) for i in range(n) if not indegree[i]
+    ]
+    eligible.sort()
+    while eligible:
+        i = heappop(eligible)[3]
+        for k in range(succ_start[i], succ_start[i + 1]):
+            j = succ_node[k]
+            indegree[j] -= 1
+            if not indegree[j]:
+                heappush(eligible, (-priority[j], late_start[j], es[j], j))
+        if placed[i]:
+            continue
+
+        start = schedule_service.earliest_start(graph, i, es, ef)
+        if graph.constraint[i] == ALAP:
+            start = max(start, cpm.early_start[i])
+        es[i], ef[i] = start, start + duration[i]
+        if not duration[i] or not demands[i]:
+            continue
+
+        if priority[i] >= DO_NOT_LEVEL or graph.constraint[i] in (MSO, MFO):
+            room = 0
+        elif within_slack:
+            room = max(0, (late_start[i] - start) // slot)
+        else:
+            room = MAX_DELAY_SLOTS
+        first, end = slots(i)
+        delay = _first_fit(demands[i], resources, first, end, room)
+        if delay is None:
+            unresolved.append(i)
+            delay = 0
+        es[i] += delay * slot
+        ef[i] += delay * slot
+        for r, units in demands[i]:
+            resources[r].book(first + delay, end + delay, units)
+
+    return LevelingResult(es, ef, unresolved)
+
+
+def _first_fit(
+    demand: list[tuple[int, int]],
+    resources: list[CapacityTimeline],
+    first: int,
+    end: int,
+    room: int,
+) -> int | None:
+    """Smallest delay in slots (up to room) at which the demand fits."""
+    delay = 0
+    while delay <= room:
+        blocked = -1
+        for r, units in demand:
+            blocked = resources[r].conflict(first + delay, end + delay, units)
+            if blocked >= 0:
+                break
+        if blocked < 0:
+            return delay
+        # Jump past the blocking slot instead of trying every slot
+        delay = blocked - first + 1
+    return None
+
+
+# ── Database ──
+
+
+class LevelingSummary(NamedTuple):
+    """Outcome of a leveling run."""
+
+    task_count: int
+    resource_count: int
+    changes: list[dict]
+    unresolved_task_ids: list[UUID]
+    overallocations: list[dict]
+    applied: bool
+
+
+class _Resources(NamedTuple):
+    ids: list[UUID]
+    index: dict[UUID, int]
+    timelines: list[CapacityTimeline]
+
+
+def _hundredths(units) -> int:
+    return int(Decimal(units) * 100)
+
+
+async def _load_resources(
+    db: AsyncSession,
+    project: Project,
+    timeline: Timeline,
+    slot: int,
+    base: int,
+) -> _Resources:
+    """Work resources of the project with their capacity timelines."""
+    rows = (
+        await db.execute(
+            select(Resource.id, Resource.max_units).where(
+                Resource.project_id == project.id,
+                Resource.type == ResourceType.WORK,
+            )
+        )
+    ).all()
+    index = {resource_id: r for r, (resource_id, _) in enumerate(rows)}
+
+    periods = [[] for _ in rows]
+    availability = await db.execute(
+        select(
+            ResourceAvailability.resource_id,
+            ResourceAvailability.start_date,
+            ResourceAvailability.end_date,
+            ResourceAvailability.units,
+        )
+        .join(Resource, Resource.id == ResourceAvailability.resource_id)
+        .where(
+            Resource.project_id == project.id,
+            Resource.type == ResourceType.WORK,
+        )
+    )
+    for resource_id, start_date, end_date, units in availability:
+        first = max(0, timeline.offset_of(start_date) // slot - base)
+        if end_date is None:
+            end = 1 << 30
+        else:
+            end = timeline.offset_of(end_date + timedelta(days=1)) // slot - base
+        if first < end:
+            periods[index[resource_id]].append((first, end, _hundredths(units)))
+
+    return _Resources(
+        ids=[resource_id for resource_id, _ in rows],
+        index=index,
+        timelines=[
+            CapacityTimeline(_hundredths(max_units), periods[r])
+            for r, (_, max_units) in enumerate(rows)
+        ],
+    )
+
+
+async def level_project(
+    db: AsyncSession,
+    project: Project,
+    *,
+    within_slack: bool = True,
+    apply: bool = False,
+) -> LevelingSummary:
+    """
+    Level work resources of a project and return the proposed date changes.
+
+    Changes are {id, start_date, finish_date, leveling_delay} for every task
+    whose dates differ from the stored ones; leveling_delay is the slip in
+    working minutes caused by leveling. With apply, the new dates are
+    written (slack and critical flags are left to the next reschedule).
+    """
+    if apply:
+        # Same lock as reschedule_project
+        await lock_project(db, project.id)
+
+    timeline = await schedule_service.project_timeline(db, project)
+    loaded = await schedule_service.load_schedule(db, project, timeline)
+    graph = loaded.graph
+    try:
+        cpm = schedule_service.compute_schedule(graph)
+    except DependencyCycleError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Task dependencies contain a cycle",
+        )
+
+    slot = int((project.settings or {}).get("hours_per_day", 8) * 60)
+    # Slots count from the earliest task so they are never negative
+    base = min(0, min(cpm.early_start, default=0)) // slot
+    shift = base * slot
+    resources = await _load_resources(db, project, timeline, slot, base)
+
+    priority = [0] * graph.size
+    demands = [[] for _ in range(graph.size)]
+    task_rows = await db.execute(
+        select(Task.id, Task.priority).where(
+            Task.project_id == project.id,
+            Task.is_deleted == False,  # noqa: E712
+        )
+    )
+    for task_id, task_priority in task_rows:
+        if task_id in loaded.index:
+            priority[loaded.index[task_id]] = task_priority
+    assignments = await db.execute(
+        select(Assignment.task_id, Assignment.resource_id, Assignment.units)
+        .join(Task, Task.id == Assignment.task_id)
+        .where(
+            Task.project_id == project.id,
+            Task.is_deleted == False,  # noqa: E712
+        )
+    )
+    for task_id, resource_id, units in assignments:
+        r = resources.index.get(resource_id)
+        if r is not None and task_id in loaded.index:
+            demands[loaded.index[task_id]].append((r, _hundredths(units)))
+
+    shifted = cpm._replace(
+        early_start=[offset - shift for offset in cpm.early_start],
+        early_finish=[offset - shift for offset in cpm.early_finish],
+        late_start=[offset - shift for offset in cpm.late_start],
+    )
+    result = level(
+        graph, shifted, priority, demands, resources.timelines, slot, within_slack
+    )
+
+    changes = []
+    for i in range(graph.size):
+        start_date = timeline.start_date_at(result.early_start[i] + shift)
+        finish_date = timeline.finish_date_at(result.early_finish[i] + shift)
+        if (start_date, finish_date) != loaded.stored[i][:2]:
+            changes.append(
+                {
+                    "id": graph.ids[i],
+                    "start_date": start_date,
+                    "finish_date": finish_date,
+                    "leveling_delay": result.early_start[i] - shifted.early_start[i],
+                }
+            )
+
+    overallocations = [
+        {
+            "resource_id": resources.ids[r],
+            "start_date": timeline.start_date_at((first + base) * slot),
+            "finish_date": timeline.start_date_at((end + base) * slot),
+            "peak_units": Decimal(peak) / 100,
+        }
+        for r, capacity in enumerate(resources.timelines)
+        for first, end, peak in capacity.overloaded()
+    ]
+
+    if apply:
+        await bulk_update(
+            db,
+            Task.__table__,
+            [
+                {key: row[key] for key in ("id", "start_date", "finish_date")}
+                for row in changes
+            ],
+        )
+        await rollup_service.rollup_project(db, project.id)
+        await db.commit()
+
+    return LevelingSummary(
+        task_count=graph.size,
+        resource_count=len(resources.ids),
+        changes=changes,
+        unresolved_task_ids=[graph.ids[i] for i in result.unresolved],
+        overallocations=overallocations,
+        applied=apply,
+    )
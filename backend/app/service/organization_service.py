@@ -11,6 +11,7 @@ from fastapi import HTTPException
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.security import AuthUser
 from app.models.organization import Organization
 from app.models.organization_member import OrganizationMember
 from app.models.user import User
@@ -19,7 +20,7 @@ from app.schema.organization import OrganizationCreate, OrganizationUpdate
 
 async def list_organizations(
     db: AsyncSession,
-    user: User,
+    user: User | AuthUser,
     *,
     page: int = 1,
     per_page: int = 20,
@@ -59,7 +60,7 @@ async def list_organizations(
 
 async def create_organization(
     db: AsyncSession,
-    user: User,
+    user: User | AuthUser,
     data: OrganizationCreate,
 ) -> Organization:
     """Create a new organization and make the user the owner."""
@@ -116,7 +117,7 @@ async def create_personal_organization(
 
 async def _create_org_internal(
     db: AsyncSession,
-    user: User,
+    user: User | AuthUser,
     name: str,
     slug: str,
     is_personal: bool,
@@ -7,9 +7,11 @@ Handles listing, creating, updating, and soft-deleting projects.
 from datetime import UTC, datetime
 from uuid import UUID
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import Page, paginate
+from app.core.security import AuthUser
 from app.models.project import Project
 from app.models.project_member import ProjectMember
 from app.models.user import User
@@ -28,14 +30,16 @@ def escape_like(value: str) -> str:
 
 async def list_projects(
     db: AsyncSession,
-    user: User,
+    user: User | AuthUser,
     *,
     page: int = 1,
     per_page: int = 20,
+    cursor: str | None = None,
+    include_total: bool | None = None,
     status: str | None = None,
     search: str | None = None,
     organization_id: UUID | None = None,
-) -> tuple[list[Project], int]:
+) -> Page:
     """
     List projects the user owns or is a member of.
 
@@ -43,7 +47,7 @@ async def list_projects(
     organization. Caller must verify org membership before calling.
     Otherwise, returns all projects the user can see across orgs.
 
-    Returns (projects, total_count).
+    Most recently updated first; cursor mode seeks on (updated_at, id).
     """
     if organization_id:
         # Scoped to a specific organization
@@ -76,26 +80,21 @@ async def list_projects(
             Project.name.ilike(f"%{escaped_search}%", escape="\\")
         )
 
-    # Get total count
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Apply pagination and ordering
-    offset = (page - 1) * per_page
-    paginated_query = (
-        base_query.order_by(Project.updated_at.desc()).offset(offset).limit(per_page)
+    return await paginate(
+        db,
+        base_query,
+        (Project.updated_at, Project.id),
+        descending=True,
+        page=page,
+        per_page=per_page,
+        cursor=cursor,
+        include_total=include_total,
     )
 
-    result = await db.execute(paginated_query)
-    projects = list(result.scalars().all())
-
-    return projects, total
-
 
 async def create_project(
     db: AsyncSession,
-    user: User,
+    user: User | AuthUser,
     data: ProjectCreate,
 ) -> Project:
     """Create a new project owned by the user."""
@@ -7,9 +7,11 @@ Note: Resources use hard delete (no soft delete columns on model).
 
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import Page, paginate
+from app.core.versioning import lock_project
 from app.models.project import Project
 from app.models.resource import Resource
 from app.schema.resource import ResourceCreate, ResourceUpdate
@@ -21,13 +23,15 @@ async def list_resources(
     *,
     page: int = 1,
     per_page: int = 50,
+    cursor: str | None = None,
+    include_total: bool | None = None,
     resource_type: str | None = None,
     include_inactive: bool = False,
-) -> tuple[list[Resource], int]:
+) -> Page:
     """
-    List resources for a project.
+    List resources for a project, ordered by name.
 
-    Returns (resources, total_count).
+    Cursor mode seeks on (name, id), backed by idx_resource_project_name.
     """
     base_query = select(Resource).where(Resource.project_id == project.id)
 
@@ -37,22 +41,16 @@ async def list_resources(
     if resource_type:
         base_query = base_query.where(Resource.type == resource_type)
 
-    # Get total count
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Apply pagination and ordering
-    offset = (page - 1) * per_page
-    paginated_query = (
-        base_query.order_by(Resource.name.asc()).offset(offset).limit(per_page)
+    return await paginate(
+        db,
+        base_query,
+        (Resource.name, Resource.id),
+        page=page,
+        per_page=per_page,
+        cursor=cursor,
+        include_total=include_total,
     )
 
-    result = await db.execute(paginated_query)
-    resources = list(result.scalars().all())
-
-    return resources, total
-
 
 async def create_resource(
     db: AsyncSession,
@@ -60,6 +58,7 @@ async def create_resource(
     data: ResourceCreate,
 ) -> Resource:
     """Create a new resource in the project."""
+    await lock_project(db, project.id)
     resource = Resource(
         project_id=project.id,
         name=data.name,
@@ -103,6 +102,7 @@ async def update_resource(
     data: ResourceUpdate,
 ) -> Resource:
     """Update a resource with partial data."""
+    await lock_project(db, resource.project_id)
     update_data = data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(resource, field, value)
@@ -117,5 +117,6 @@ async def delete_resource(
     resource: Resource,
 ) -> None:
     """Hard delete a resource."""
+    await lock_project(db, resource.project_id)
     await db.delete(resource)
     await db.commit()
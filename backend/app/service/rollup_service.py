@@ -0,0 +1,171 @@
+"""
+Summary task rollups.
+
+A summary task (one with children) shows the aggregate of its subtree:
+
+- start_date / finish_date: earliest child start, latest child finish
+- work, actual_work, bcws, bcwp, acwp: sums over the children
+- total_cost: the children's total plus the summary's own fixed cost
+- percent_complete: children's percent complete weighted by duration
+
+Children are rolled up before their parents, so each summary only reads
+its direct children. rollup_project does the whole project with one load
+and one bulk write. rollup_ancestors recomputes only the ancestor chains
+of some tasks, reading the chain and the chain's direct children, so a
+leaf edit costs O(depth) summaries rather than O(project).
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import bulk_update
+from app.models.task import Task
+
+# Columns a summary derives from its children
+SUM_FIELDS = ("work", "actual_work", "bcws", "bcwp", "acwp")
+ROLLUP_FIELDS = frozenset(
+    {"start_date", "finish_date", "total_cost", "percent_complete", *SUM_FIELDS}
+)
+# Leaf fields whose change affects the summaries above
+SOURCE_FIELDS = ROLLUP_FIELDS | {"duration", "fixed_cost"}
+
+_COLUMNS = (
+    Task.id,
+    Task.parent_task_id,
+    Task.start_date,
+    Task.finish_date,
+    Task.duration,
+    Task.fixed_cost,
+    Task.total_cost,
+    Task.percent_complete,
+    *(getattr(Task, field) for field in SUM_FIELDS),
+)
+
+_CENT = Decimal("0.01")
+
+
+def roll_up(
+    rows: dict[UUID, dict],
+    children: dict[UUID, list[UUID]],
+    summary_ids: list[UUID],
+) -> list[dict]:
+    """
+    Recompute summary_ids (children before parents) in place.
+
+    rows holds every summary and each of its direct children. Returns
+    {id, <rollup fields>} for the summaries whose values changed.
+    """
+    changed = []
+    for summary_id in summary_ids:
+        kids = [rows[child] for child in children.get(summary_id, ())]
+        if not kids:
+            continue
+        row = rows[summary_id]
+        values = {
+            "start_date": min(kid["start_date"] for kid in kids),
+            "finish_date": max(kid["finish_date"] for kid in kids),
+            "total_cost": row["fixed_cost"] + sum(kid["total_cost"] for kid in kids),
+            "percent_complete": _weighted_percent(kids),
+        }
+        for field in SUM_FIELDS:
+            values[field] = sum(kid[field] for kid in kids)
+
+        if any(row[field] != value for field, value in values.items()):
+            row.update(values)
+            changed.append({"id": summary_id, **values})
+    return changed
+
+
+def _weighted_percent(kids: list[dict]) -> Decimal:
+    total = sum(kid["duration"] for kid in kids)
+    if total:
+        done = sum(kid["percent_complete"] * kid["duration"] for kid in kids)
+        return (done / total).quantize(_CENT)
+    return (sum(kid["percent_complete"] for kid in kids) / len(kids)).quantize(_CENT)
+
+
+def _children_first(
+    parents: dict[UUID, UUID | None],
+    summary_ids: set[UUID],
+) -> list[UUID]:
+    """summary_ids ordered deepest first, from a child -> parent map."""
+
+    def depth(task_id: UUID) -> int:
+        level = 0
+        while (task_id := parents.get(task_id)) is not None:
+            level += 1
+        return level
+
+    return sorted(summary_ids, key=depth, reverse=True)
+
+
+def _index(rows) -> tuple[dict, dict, dict]:
+    by_id = {}
+    children = defaultdict(list)
+    parents = {}
+    for row in rows:
+        values = row._asdict()
+        by_id[row.id] = values
+        parents[row.id] = row.parent_task_id
+        if row.parent_task_id is not None:
+            children[row.parent_task_id].append(row.id)
+    return by_id, children, parents
+
+
+async def rollup_project(db: AsyncSession, project_id: UUID) -> list[dict]:
+    """Recompute every summary task of a project. Does not commit."""
+    result = await db.execute(
+        select(*_COLUMNS).where(
+            Task.project_id == project_id,
+            Task.is_deleted == False,  # noqa: E712
+        )
+    )
+    rows, children, parents = _index(result.all())
+    order = _children_first(parents, set(children) & rows.keys())
+    changed = roll_up(rows, children, order)
+    await bulk_update(db, Task.__table__, changed)
+    return changed
+
+
+async def rollup_ancestors(db: AsyncSession, task_ids) -> list[dict]:
+    """
+    Recompute the summaries among task_ids and all of their ancestors.
+
+    Pass the edited tasks themselves; leaves are skipped. Does not commit.
+    """
+    task_ids = set(task_ids)
+    if not task_ids:
+        return []
+
+    chain = (
+        select(Task.id.label("id"), Task.parent_task_id.label("parent_id"))
+        .where(Task.id.in_(list(task_ids)))
+        .cte("chain", recursive=True)
+    )
+    chain = chain.union(
+        select(Task.id, Task.parent_task_id).join(chain, Task.id == chain.c.parent_id)
+    )
+    chain_ids = select(chain.c.id)
+
+    # The chain plus the direct children of every task on it
+    result = await db.execute(
+        select(*_COLUMNS).where(
+            or_(Task.id.in_(chain_ids), Task.parent_task_id.in_(chain_ids)),
+            Task.is_deleted == False,  # noqa: E712
+        )
+    )
+    rows, children, parents = _index(result.all())
+
+    summaries = set()
+    for task_id in task_ids:
+        while task_id is not None and task_id in rows:
+            summaries.add(task_id)
+            task_id = parents[task_id]
+    order = _children_first(parents, summaries & children.keys())
+    changed = roll_up(rows, children, order)
+    await bulk_update(db, Task.__table__, changed)
+    return changed
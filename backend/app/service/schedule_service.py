@@ -0,0 +1,693 @@
+"""
+Scheduling business logic (Critical Path Method).
+
+Loads a project's tasks and dependencies in one query each, packs them into
+integer-indexed parallel arrays, runs the forward and backward passes, and
+writes dates, slack and critical flags back with one bulk UPDATE.
+
+All scheduling math happens in working minutes from the project start.
+A timeline object converts between those offsets and calendar dates, either
+one working day per calendar day or the project's compiled calendar.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import NamedTuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import bulk_update
+from app.core.versioning import lock_project
+from app.models.dependency import Dependency
+from app.models.enums import ConstraintType, DependencyType, LagFormat
+from app.models.project import Project
+from app.models.task import Task
+from app.service import calendar_service, rollup_service
+from app.service.calendar_service import CalendarTimeline
+
+# Link types as small ints so the hot loops compare ints, not strings
+FS, SS, FF, SF = 0, 1, 2, 3
+LINK_CODES = {
+    DependencyType.FS: FS,
+    DependencyType.SS: SS,
+    DependencyType.FF: FF,
+    DependencyType.SF: SF,
+}
+
+# Constraint types as small ints
+ASAP, ALAP, MSO, MFO, SNET, SNLT, FNET, FNLT = range(8)
+CONSTRAINT_CODES = {
+    ConstraintType.ASAP: ASAP,
+    ConstraintType.ALAP: ALAP,
+    ConstraintType.MSO: MSO,
+    ConstraintType.MFO: MFO,
+    ConstraintType.SNET: SNET,
+    ConstraintType.SNLT: SNLT,
+    ConstraintType.FNET: FNET,
+    ConstraintType.FNLT: FNLT,
+}
+
+
+class DependencyCycleError(ValueError):
+    """Raised when the dependency graph contains a cycle."""
+
+    def __init__(self, task_ids: list):
+        super().__init__("Dependency graph contains a cycle")
+        self.task_ids = task_ids
+
+
+# ── Timeline ──
+
+
+class DayTimeline:
+    """
+    Maps working-minute offsets to dates, one working day per calendar day.
+
+    Start dates are the day the offset falls in. Finish dates round up, so a
+    one-day task starting on Jan 1 finishes on Jan 2 (same rule as create_task).
+    """
+
+    def __init__(self, origin: date, minutes_per_day: int):
+        self.origin = origin
+        self.minutes_per_day = minutes_per_day
+
+    def offset_of(self, day: date) -> int:
+        return (day - self.origin).days * self.minutes_per_day
+
+    def start_date_at(self, offset: int) -> date:
+        return self.origin + timedelta(days=offset // self.minutes_per_day)
+
+    def finish_date_at(self, offset: int) -> date:
+        return self.origin + timedelta(days=-(-offset // self.minutes_per_day))
+
+
+Timeline = DayTimeline | CalendarTimeline
+
+
+async def project_timeline(db: AsyncSession, project: Project) -> Timeline:
+    """
+    Build the timeline for a project.
+
+    Uses the project's default calendar when it has one, otherwise one
+    working day of settings.hours_per_day per calendar day.
+    """
+    if project.default_calendar_id:
+        calendar = await calendar_service.get_compiled_calendar(
+            db, project.default_calendar_id
+        )
+        if calendar:
+            return calendar.timeline(project.start_date)
+    hours_per_day = (project.settings or {}).get("hours_per_day", 8)
+    return DayTimeline(project.start_date, int(hours_per_day * 60))
+
+
+# ── Graph ──
+
+
+@dataclass(slots=True)
+class ScheduleGraph:
+    """
+    Task network packed into parallel arrays.
+
+    Node i is ids[i]. Edges are stored twice in CSR form: pred_* lists the
+    incoming edges of each node (forward pass), succ_* the outgoing ones
+    (backward pass). Edges of node i live in [start[i], start[i + 1]).
+    """
+
+    ids: list
+    duration: list[int]
+    anchor: list[int]  # Earliest allowed start before links are applied
+    constraint: list[int]
+    constraint_at: list[int]
+    pinned: list[bool]  # Started tasks keep their actual start
+    pred_start: list[int]
+    pred_node: list[int]
+    pred_kind: list[int]
+    pred_lag: list[int]
+    succ_start: list[int]
+    succ_node: list[int]
+    succ_kind: list[int]
+    succ_lag: list[int]
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(
+        cls,
+        ids: list,
+        duration: list[int],
+        anchor: list[int],
+        constraint: list[int],
+        constraint_at: list[int],
+        pinned: list[bool],
+        edges: list[tuple[int, int, int, int]],
+    ) -> "ScheduleGraph":
+        """Build the graph from node arrays and (pred, succ, kind, lag) edges."""
+        n = len(ids)
+        pred_start = _csr_offsets(n, (e[1] for e in edges))
+        succ_start = _csr_offsets(n, (e[0] for e in edges))
+
+        m = len(edges)
+        pred_node, pred_kind, pred_lag = [0] * m, [0] * m, [0] * m
+        succ_node, succ_kind, succ_lag = [0] * m, [0] * m, [0] * m
+        pred_fill = pred_start[:-1]
+        succ_fill = succ_start[:-1]
+        for p, s, kind, lag in edges:
+            k = pred_fill[s]
+            pred_node[k], pred_kind[k], pred_lag[k] = p, kind, lag
+            pred_fill[s] = k + 1
+            k = succ_fill[p]
+            succ_node[k], succ_kind[k], succ_lag[k] = s, kind, lag
+            succ_fill[p] = k + 1
+
+        return cls(
+            ids=ids,
+            duration=duration,
+            anchor=anchor,
+            constraint=constraint,
+            constraint_at=constraint_at,
+            pinned=pinned,
+            pred_start=pred_start,
+            pred_node=pred_node,
+            pred_kind=pred_kind,
+            pred_lag=pred_lag,
+            succ_start=succ_start,
+            succ_node=succ_node,
+            succ_kind=succ_kind,
+            succ_lag=succ_lag,
+        )
+
+    def topological_order(self) -> list[int]:
+        """Kahn's algorithm. Raises DependencyCycleError on a cycle."""
+        n = self.size
+        pred_start = self.pred_start
+        succ_start, succ_node = self.succ_start, self.succ_node
+
+        indegree = [pred_start[i + 1] - pred_start[i] for i in range(n)]
+        order = [i for i in range(n) if indegree[i] == 0]
+        head = 0
+        while head < len(order):
+            i = order[head]
+            head += 1
+            for k in range(succ_start[i], succ_start[i + 1]):
+                j = succ_node[k]
+                indegree[j] -= 1
+                if indegree[j] == 0:
+                    order.append(j)
+
+        if len(order) < n:
+            raise DependencyCycleError(
+                [self.ids[i] for i in range(n) if indegree[i] > 0]
+            )
+        return order
+
+
+def _csr_offsets(n: int, heads) -> list[int]:
+    """Prefix sums of per-node edge counts (length n + 1)."""
+    offsets = [0] * (n + 1)
+    for i in heads:
+        offsets[i + 1] += 1
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+    return offsets
+
+
+# ── CPM passes ──
+
+
+class ScheduleResult(NamedTuple):
+    """Early/late dates and slack per node, all in working minutes."""
+
+    early_start: list[int]
+    early_finish: list[int]
+    late_start: list[int]
+    late_finish: list[int]
+    total_slack: list[int]
+    free_slack: list[int]
+    finish: int
+
+    def is_critical(self, i: int) -> bool:
+        return self.total_slack[i] <= 0
+
+
+def compute_schedule(graph: ScheduleGraph) -> ScheduleResult:
+    """Run the forward and backward passes over the whole graph."""
+    n = graph.size
+    order = graph.topological_order()
+    duration = graph.duration
+
+    es = [0] * n
+    ef = [0] * n
+    for i in order:
+        es[i] = earliest_start(graph, i, es, ef)
+        ef[i] = es[i] + duration[i]
+
+    finish = max(ef, default=0)
+
+    ls = [0] * n
+    lf = [0] * n
+    for i in reversed(order):
+        lf[i] = _late_finish(graph, i, ls, lf, finish)
+        ls[i] = lf[i] - duration[i]
+
+    total_slack = [ls[i] - es[i] for i in range(n)]
+    free_slack = [_free_slack(graph, i, es, ef, finish) for i in range(n)]
+
+    # ALAP tasks sit on their late dates once slack is known
+    for i in range(n):
+        if graph.constraint[i] == ALAP and not graph.pinned[i]:
+            es[i], ef[i] = ls[i], lf[i]
+
+    return ScheduleResult(es, ef, ls, lf, total_slack, free_slack, finish)
+
+
+def earliest_start(graph: ScheduleGraph, i: int, es: list[int], ef: list[int]) -> int:
+    """Earliest start of node i given its scheduled predecessors."""
+    if graph.pinned[i]:
+        return graph.anchor[i]
+
+    d = graph.duration[i]
+    start = graph.anchor[i]
+    kinds, nodes, lags = graph.pred_kind, graph.pred_node, graph.pred_lag
+    for k in range(graph.pred_start[i], graph.pred_start[i + 1]):
+        p, kind, lag = nodes[k], kinds[k], lags[k]
+        if kind == FS:
+            bound = ef[p] + lag
+        elif kind == SS:
+            bound = es[p] + lag
+        elif kind == FF:
+            bound = ef[p] + lag - d
+        else:
+            bound = es[p] + lag - d
+        if bound > start:
+            start = bound
+
+    c, at = graph.constraint[i], graph.constraint_at[i]
+    if c == SNET:
+        start = max(start, at)
+    elif c == FNET:
+        start = max(start, at - d)
+    elif c == MSO:
+        start = at
+    elif c == MFO:
+        start = at - d
+    return start
+
+
+def _late_finish(
+    graph: ScheduleGraph,
+    i: int,
+    ls: list[int],
+    lf: list[int],
+    finish: int,
+) -> int:
+    """Latest finish of node i given its scheduled successors."""
+    d = graph.duration[i]
+    late = finish
+    kinds, nodes, lags = graph.succ_kind, graph.succ_node, graph.succ_lag
+    for k in range(graph.succ_start[i], graph.succ_start[i + 1]):
+        s, kind, lag = nodes[k], kinds[k], lags[k]
+        if kind == FS:
+            bound = ls[s] - lag
+        elif kind == SS:
+            bound = ls[s] - lag + d
+        elif kind == FF:
+            bound = lf[s] - lag
+        else:
+            bound = lf[s] - lag + d
+        if bound < late:
+            late = bound
+
+    c, at = graph.constraint[i], graph.constraint_at[i]
+    if c in (SNLT, MSO):
+        late = min(late, at + d)
+    elif c in (FNLT, MFO):
+        late = min(late, at)
+    return late
+
+
+def _free_slack(
+    graph: ScheduleGraph,
+    i: int,
+    es: list[int],
+    ef: list[int],
+    finish: int,
+) -> int:
+    """How far node i can slip without moving any successor."""
+    start, end = graph.succ_start[i], graph.succ_start[i + 1]
+    if start == end:
+        return finish - ef[i]
+
+    slack = None
+    kinds, nodes, lags = graph.succ_kind, graph.succ_node, graph.succ_lag
+    for k in range(start, end):
+        s, kind, lag = nodes[k], kinds[k], lags[k]
+        if kind == FS:
+            gap = es[s] - lag - ef[i]
+        elif kind == SS:
+            gap = es[s] - lag - es[i]
+        elif kind == FF:
+            gap = ef[s] - lag - ef[i]
+        else:
+            gap = ef[s] - lag - es[i]
+        if slack is None or gap < slack:
+            slack = gap
+    return max(0, slack)
+
+
+def propagate(
+    graph: ScheduleGraph,
+    early_start: list[int],
+    early_finish: list[int],
+    seeds: list[int],
+) -> list[int]:
+    """
+    Forward pass limited to the nodes downstream of `seeds`.
+
+    early_start/early_finish hold the current offsets and are updated in
+    place. A node is recomputed only when a seed or a moved predecessor
+    marks it dirty, so propagation stops where dates stop changing.
+    Returns the nodes that were recomputed and moved (seeds always count).
+    """
+    duration = graph.duration
+    succ_start, succ_node = graph.succ_start, graph.succ_node
+
+    dirty = [False] * graph.size
+    for i in seeds:
+        dirty[i] = True
+    seed_set = set(seeds)
+
+    moved = []
+    for i in graph.topological_order():
+        if not dirty[i]:
+            continue
+        start = earliest_start(graph, i, early_start, early_finish)
+        finish = start + duration[i]
+        if i not in seed_set and (start, finish) == (early_start[i], early_finish[i]):
+            continue
+        early_start[i], early_finish[i] = start, finish
+        moved.append(i)
+        for k in range(succ_start[i], succ_start[i + 1]):
+            dirty[succ_node[k]] = True
+    return moved
+
+
+# ── Database ──
+
+
+class LoadedSchedule(NamedTuple):
+    """Graph plus the stored values it was built from."""
+
+    graph: ScheduleGraph
+    index: dict  # task id -> node
+    # (start_date, finish_date, total_slack, free_slack, is_critical) per node
+    stored: list[tuple]
+
+
+class ScheduleSummary(NamedTuple):
+    """Outcome of a reschedule."""
+
+    task_count: int
+    changed_task_ids: list[UUID]
+    critical_count: int
+    finish_date: date | None
+
+
+# Columns build_schedule expects, in order
+_TASK_COLUMNS = (
+    Task.id,
+    Task.duration,
+    Task.is_milestone,
+    Task.start_date,
+    Task.finish_date,
+    Task.actual_start,
+    Task.constraint_type,
+    Task.constraint_date,
+    Task.total_slack,
+    Task.free_slack,
+    Task.is_critical,
+)
+_DEPENDENCY_COLUMNS = (
+    Dependency.predecessor_id,
+    Dependency.successor_id,
+    Dependency.type,
+    Dependency.lag,
+    Dependency.lag_format,
+)
+
+
+async def load_schedule(
+    db: AsyncSession,
+    project: Project,
+    timeline: Timeline,
+) -> LoadedSchedule:
+    """Load non-deleted tasks and enabled dependencies as plain rows."""
+    task_rows = (
+        await db.execute(
+            select(*_TASK_COLUMNS).where(
+                Task.project_id == project.id,
+                Task.is_deleted == False,  # noqa: E712
+            )
+        )
+    ).all()
+
+    dep_rows = (
+        await db.execute(
+            select(*_DEPENDENCY_COLUMNS).where(
+                Dependency.project_id == project.id,
+                Dependency.is_disabled == False,  # noqa: E712
+            )
+        )
+    ).all()
+
+    return build_schedule(task_rows, dep_rows, timeline)
+
+
+async def load_downstream(
+    db: AsyncSession,
+    project: Project,
+    task_ids: list[UUID],
+    timeline: Timeline,
+) -> LoadedSchedule:
+    """
+    Load only the tasks that can move when `task_ids` change.
+
+    One recursive CTE walks successor edges to find the downstream cone.
+    The graph holds the cone plus every direct predecessor of a cone task,
+    since their dates bound the cone's start dates.
+    """
+    cone = (
+        select(Task.id.label("id"))
+        .where(Task.id.in_(task_ids))
+        .cte("cone", recursive=True)
+    )
+    cone = cone.union(
+        select(Dependency.successor_id)
+        .join(cone, Dependency.predecessor_id == cone.c.id)
+        .where(
+            Dependency.project_id == project.id,
+            Dependency.is_disabled == False,  # noqa: E712
+        )
+    )
+
+    dep_rows = (
+        await db.execute(
+            select(*_DEPENDENCY_COLUMNS).where(
+                Dependency.successor_id.in_(select(cone.c.id)),
+                Dependency.is_disabled == False,  # noqa: E712
+            )
+        )
+    ).all()
+
+    ids = set(task_ids)
+    for pred_id, succ_id, *_ in dep_rows:
+        ids.add(pred_id)
+        ids.add(succ_id)
+
+    task_rows = (
+        await db.execute(
+            select(*_TASK_COLUMNS).where(
+                Task.id.in_(ids),
+                Task.is_deleted == False,  # noqa: E712
+            )
+        )
+    ).all()
+
+    return build_schedule(task_rows, dep_rows, timeline)
+
+
+def build_schedule(task_rows, dep_rows, timeline: Timeline) -> LoadedSchedule:
+    """Pack task and dependency rows (as selected by load_schedule) into a graph."""
+    n = len(task_rows)
+    index = {row[0]: i for i, row in enumerate(task_rows)}
+
+    ids = [None] * n
+    duration = [0] * n
+    anchor = [0] * n
+    constraint = [ASAP] * n
+    constraint_at = [0] * n
+    pinned = [False] * n
+    stored = [None] * n
+    for i, row in enumerate(task_rows):
+        (
+            task_id,
+            task_duration,
+            is_milestone,
+            start_date,
+            finish_date,
+            actual_start,
+            constraint_type,
+            constraint_date,
+            total_slack,
+            free_slack,
+            is_critical,
+        ) = row
+        ids[i] = task_id
+        duration[i] = 0 if is_milestone else task_duration
+        constraint[i] = CONSTRAINT_CODES.get(constraint_type, ASAP)
+        if constraint_date is not None:
+            constraint_at[i] = timeline.offset_of(constraint_date)
+        elif constraint[i] != ALAP:
+            constraint[i] = ASAP
+        if actual_start is not None:
+            anchor[i] = timeline.offset_of(actual_start)
+            pinned[i] = True
+        else:
+            anchor[i] = timeline.offset_of(start_date)
+        stored[i] = (start_date, finish_date, total_slack, free_slack, is_critical)
+
+    edges = []
+    has_pred = [False] * n
+    for pred_id, succ_id, dep_type, lag, lag_format in dep_rows:
+        p = index.get(pred_id)
+        s = index.get(succ_id)
+        if p is None or s is None:
+            continue
+        if lag_format == LagFormat.PERCENT:
+            lag = duration[p] * lag // 100
+        edges.append((p, s, LINK_CODES[dep_type], lag))
+        has_pred[s] = True
+
+    # Linked tasks are driven by their predecessors; unlinked ones keep their start
+    for i in range(n):
+        if has_pred[i] and not pinned[i]:
+            anchor[i] = 0
+
+    graph = ScheduleGraph.build(
+        ids, duration, anchor, constraint, constraint_at, pinned, edges
+    )
+    return LoadedSchedule(graph, index, stored)
+
+
+def diff_schedule(
+    loaded: LoadedSchedule,
+    result: ScheduleResult,
+    timeline: Timeline,
+) -> list[dict]:
+    """Rows for every node whose scheduled values changed."""
+    graph = loaded.graph
+    rows = []
+    for i in range(graph.size):
+        values = (
+            timeline.start_date_at(result.early_start[i]),
+            timeline.finish_date_at(result.early_finish[i]),
+            result.total_slack[i],
+            result.free_slack[i],
+            result.is_critical(i),
+        )
+        if values != loaded.stored[i]:
+            rows.append(
+                {
+                    "id": graph.ids[i],
+                    "start_date": values[0],
+                    "finish_date": values[1],
+                    "total_slack": values[2],
+                    "free_slack": values[3],
+                    "is_critical": values[4],
+                }
+            )
+    return rows
+
+
+async def reschedule_project(
+    db: AsyncSession,
+    project: Project,
+) -> ScheduleSummary:
+    """Recalculate every task in the project and persist the changes."""
+    # Same lock as create_task — no task inserts while the graph is in memory
+    await lock_project(db, project.id)
+
+    timeline = await project_timeline(db, project)
+    loaded = await load_schedule(db, project, timeline)
+    try:
+        result = compute_schedule(loaded.graph)
+    except DependencyCycleError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Task dependencies contain a cycle",
+        )
+
+    rows = diff_schedule(loaded, result, timeline)
+    await bulk_update(db, Task.__table__, rows)
+    await rollup_service.rollup_project(db, project.id)
+
+    finish_date = timeline.finish_date_at(result.finish) if loaded.graph.size else None
+    project.finish_date = finish_date
+    await db.commit()
+
+    return ScheduleSummary(
+        task_count=loaded.graph.size,
+        changed_task_ids=[row["id"] for row in rows],
+        critical_count=sum(1 for s in result.total_slack if s <= 0),
+        finish_date=finish_date,
+    )
+
+
+async def reschedule_downstream(
+    db: AsyncSession,
+    project: Project,
+    task_ids: list[UUID],
+) -> list[dict]:
+    """
+    Move only the tasks downstream of `task_ids` after they changed.
+
+    Propagation stops at tasks whose dates come out the same, and only
+    start/finish dates are written. Slack and critical flags are left to
+    the next full reschedule. Does not commit.
+
+    Returns {id, start_date, finish_date} for every task that moved.
+    """
+    timeline = await project_timeline(db, project)
+    loaded = await load_downstream(db, project, task_ids, timeline)
+    graph = loaded.graph
+
+    early_start = [timeline.offset_of(stored[0]) for stored in loaded.stored]
+    early_finish = [early_start[i] + graph.duration[i] for i in range(graph.size)]
+    seeds = [loaded.index[task_id] for task_id in task_ids if task_id in loaded.index]
+    try:
+        moved = propagate(graph, early_start, early_finish, seeds)
+    except DependencyCycleError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Task dependencies contain a cycle",
+        )
+
+    rows = []
+    for i in moved:
+        start_date = timeline.start_date_at(early_start[i])
+        finish_date = timeline.finish_date_at(early_finish[i])
+        if (start_date, finish_date) != loaded.stored[i][:2]:
+            rows.append(
+                {
+                    "id": graph.ids[i],
+                    "start_date": start_date,
+                    "finish_date": finish_date,
+                }
+            )
+    await bulk_update(db, Task.__table__, rows)
+    return rows
@@ -0,0 +1,85 @@
+"""
+Project snapshot: every task, dependency and assignment in one response.
+
+The Gantt chart needs the whole project at once. Instead of paging through
+three list endpoints, the snapshot is streamed as NDJSON, one record per
+line:
+
+    {"type":"task","data":{...TaskResponse...}}
+    {"type":"dependency","data":{...DependencyResponse...}}
+    {"type":"assignment","data":{...AssignmentResponse...}}
+
+Records are grouped by type in that order. Rows are read through
+server-side cursors (stream_scalars with yield_per), so memory depends on
+SNAPSHOT_BATCH_SIZE and not on the size of the project. Each batch is
+written as a single chunk.
+"""
+
+from collections.abc import AsyncIterator
+
+from pydantic import BaseModel
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.assignment import Assignment
+from app.models.dependency import Dependency
+from app.models.project import Project
+from app.models.task import Task
+from app.schema.assignment import AssignmentResponse
+from app.schema.dependency import DependencyResponse
+from app.schema.task import TaskResponse
+
+SNAPSHOT_MEDIA_TYPE = "application/x-ndjson"
+SNAPSHOT_BATCH_SIZE = 1000
+
+
+async def _stream_records(
+    db: AsyncSession,
+    query: Select,
+    record_type: str,
+    schema: type[BaseModel],
+) -> AsyncIterator[bytes]:
+    prefix = f'{{"type":"{record_type}","data":'.encode()
+    result = await db.stream_scalars(
+        query.execution_options(yield_per=SNAPSHOT_BATCH_SIZE)
+    )
+    async for rows in result.partitions():
+        yield b"".join(
+            prefix + schema.model_validate(row).model_dump_json().encode() + b"}\n"
+            for row in rows
+        )
+
+
+async def stream_snapshot(db: AsyncSession, project: Project) -> AsyncIterator[bytes]:
+    """NDJSON chunks for every live task, dependency and assignment of a project."""
+    tasks = (
+        select(Task)
+        .where(
+            Task.project_id == project.id,
+            Task.is_deleted == False,  # noqa: E712
+        )
+        .order_by(Task.order_index, Task.id)
+    )
+    # Dependencies of deleted tasks are removed with the task
+    dependencies = (
+        select(Dependency)
+        .where(Dependency.project_id == project.id)
+        .order_by(Dependency.created_at, Dependency.id)
+    )
+    assignments = (
+        select(Assignment)
+        .join(Task, Task.id == Assignment.task_id)
+        .where(
+            Task.project_id == project.id,
+            Task.is_deleted == False,  # noqa: E712
+        )
+        .order_by(Assignment.task_id, Assignment.created_at)
+    )
+
+    for query, record_type, schema in (
+        (tasks, "task", TaskResponse),
+        (dependencies, "dependency", DependencyResponse),
+        (assignments, "assignment", AssignmentResponse),
+    ):
+        async for chunk in _stream_records(db, query, record_type, schema):
+            yield chunk
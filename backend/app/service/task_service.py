@@ -2,20 +2,57 @@
 Task business logic.
 
 Handles listing, creating, updating, and soft-deleting tasks.
+
+Set-based writes (outline renumbering, rescheduling, rollups, deletes)
+are reported to the project change feed with changefeed.track(); ORM
+writes reach it on their own.
 """
 
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, datetime
+from typing import NamedTuple
 from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy import delete, func, select
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from uuid_utils.compat import uuid7
 
+from app.core import changefeed
+from app.core.pagination import Page, paginate
+from app.core.versioning import lock_project
 from app.models.assignment import Assignment
 from app.models.dependency import Dependency
 from app.models.project import Project
 from app.models.task import Task
-from app.schema.task import TaskCreate, TaskUpdate
+from app.schema.task import (
+    TaskBatchCreate,
+    TaskBatchDelete,
+    TaskBatchIndent,
+    TaskBatchMove,
+    TaskBatchOperation,
+    TaskBatchUpdate,
+    TaskCreate,
+    TaskResponse,
+    TaskUpdate,
+)
+from app.service import rollup_service, schedule_service
+from app.service.wbs_service import Outline, save_outline
+
+# Fields that move a task's dates and so trigger downstream rescheduling
+SCHEDULE_FIELDS = {
+    "start_date",
+    "duration",
+    "is_milestone",
+    "constraint_type",
+    "constraint_date",
+}
+
+# Fields a columnar listing may ask for: the public TaskResponse fields
+COLUMN_FIELDS = frozenset(TaskResponse.model_fields)
+
+
+def _track(db: AsyncSession, project_id: UUID, rows: list[dict]) -> None:
+    changefeed.track(db, project_id, "task", rows)
 
 
 async def list_tasks(
@@ -24,33 +61,76 @@ async def list_tasks(
     *,
     page: int = 1,
     per_page: int = 50,
+    cursor: str | None = None,
+    include_total: bool | None = None,
     include_deleted: bool = False,
-) -> tuple[list[Task], int]:
+) -> Page:
     """
     List tasks for a project, ordered by order_index.
 
-    Returns (tasks, total_count).
+    Cursor mode seeks on (order_index, id), backed by idx_task_project_order.
     """
     base_query = select(Task).where(Task.project_id == project.id)
 
     if not include_deleted:
         base_query = base_query.where(Task.is_deleted == False)  # noqa: E712
 
-    # Get total count
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Apply pagination and ordering
-    offset = (page - 1) * per_page
-    paginated_query = (
-        base_query.order_by(Task.order_index.asc()).offset(offset).limit(per_page)
+    return await paginate(
+        db,
+        base_query,
+        (Task.order_index, Task.id),
+        page=page,
+        per_page=per_page,
+        cursor=cursor,
+        include_total=include_total,
     )
 
-    result = await db.execute(paginated_query)
-    tasks = list(result.scalars().all())
 
-    return tasks, total
+async def list_task_columns(
+    db: AsyncSession,
+    project: Project,
+    fields: list[str],
+    *,
+    page: int = 1,
+    per_page: int = 50,
+    cursor: str | None = None,
+    include_total: bool | None = None,
+) -> tuple[Page, dict[str, list]]:
+    """
+    List tasks as column arrays of the requested fields.
+
+    Selects only those columns and skips ORM objects and per-row response
+    models altogether. Returns the page (items are rows) and the columns.
+    """
+    if not fields:
+        raise HTTPException(status_code=400, detail="No task fields requested")
+    unknown = [f for f in fields if f not in COLUMN_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown task fields: {', '.join(unknown)}",
+        )
+
+    fields = list(dict.fromkeys(fields))
+    # The sort key rides along for the next cursor
+    selected = list(dict.fromkeys([*fields, "order_index", "id"]))
+    query = select(*(getattr(Task, f) for f in selected)).where(
+        Task.project_id == project.id,
+        Task.is_deleted == False,  # noqa: E712
+    )
+    result = await paginate(
+        db,
+        query,
+        (Task.order_index, Task.id),
+        page=page,
+        per_page=per_page,
+        cursor=cursor,
+        include_total=include_total,
+        rows=True,
+    )
+    values = list(zip(*result.items)) or [()] * len(selected)
+    columns = {f: list(values[selected.index(f)]) for f in fields}
+    return result, columns
 
 
 async def create_task(
@@ -60,70 +140,30 @@ async def create_task(
 ) -> Task:
     """Create a new task in the project."""
 
-    # Lock the project row — serializes concurrent task creates for this project
-    await db.execute(
-        select(Project.id).where(Project.id == project.id).with_for_update()
-    )
+    await lock_project(db, project.id)
 
     # Now safe — no other transaction can be here for the same project
-    result = await db.execute(
-        select(func.coalesce(func.max(Task.order_index), 0) + 1).where(
-            Task.project_id == project.id,
-            Task.is_deleted == False,  # noqa: E712
+    outline = await Outline.load(db, project.id)
+    if data.parent_task_id and data.parent_task_id not in outline:
+        raise HTTPException(
+            status_code=400,
+            detail="Parent task not found in this project",
         )
-    )
-    order_index = result.scalar() or 1
-
-    # Calculate outline_level and wbs_code
-    outline_level = 1
-    wbs_code = str(order_index)
 
-    if data.parent_task_id:
-        parent_result = await db.execute(
-            select(Task).where(
-                Task.id == data.parent_task_id,
-                Task.project_id == project.id,
-                Task.is_deleted == False,  # noqa: E712
-            )
+    # Finish date from the project's working time (calendar or hours_per_day)
+    if data.is_milestone:
+        finish_date = data.start_date
+    else:
+        timeline = await schedule_service.project_timeline(db, project)
+        finish_date = timeline.finish_date_at(
+            timeline.offset_of(data.start_date) + max(1, data.duration)
         )
-        parent = parent_result.scalar_one_or_none()
-        if not parent:
-            raise HTTPException(
-                status_code=400,
-                detail="Parent task not found in this project",
-            )
-
-        outline_level = parent.outline_level + 1
-        # Count siblings under this parent
-        sibling_count_result = await db.execute(
-            select(func.count()).where(
-                Task.parent_task_id == data.parent_task_id,
-                Task.project_id == project.id,
-                Task.is_deleted == False,  # noqa: E712
-            )
-        )
-        sibling_count = sibling_count_result.scalar() or 0
-        wbs_code = f"{parent.wbs_code}.{sibling_count + 1}"
-
-        # Mark parent as summary
-        parent.is_summary = True
-
-    # Calculate finish_date based on duration (simple: 1 day = 480 minutes)
-    hours_per_day = project.settings.get("hours_per_day", 8)
-    minutes_per_day = hours_per_day * 60
-    duration_days = (
-        max(1, data.duration // minutes_per_day) if not data.is_milestone else 0
-    )
-    finish_date = data.start_date + timedelta(days=duration_days)
 
     task = Task(
+        id=uuid7(),
         project_id=project.id,
-        parent_task_id=data.parent_task_id,
         name=data.name,
         notes=data.notes,
-        wbs_code=wbs_code,
-        outline_level=outline_level,
-        order_index=order_index,
         start_date=data.start_date,
         finish_date=finish_date,
         duration=data.duration,
@@ -137,7 +177,14 @@ async def create_task(
         priority=data.priority,
         fixed_cost=data.fixed_cost,
     )
-    db.add(task)
+    # Appended last under its parent; later tasks shift down one place
+    outline.insert(task.id, data.parent_task_id)
+    changed = outline.renumber()
+    await save_outline(db, changed, [task])
+    _track(db, project.id, [node.row() for node in changed])
+    if task.parent_task_id:
+        rolled = await rollup_service.rollup_ancestors(db, [task.parent_task_id])
+        _track(db, project.id, rolled)
     await db.commit()
     await db.refresh(task)
     return task
@@ -161,48 +208,337 @@ async def get_task_by_id(
 
 async def update_task(
     db: AsyncSession,
+    project: Project,
     task: Task,
     data: TaskUpdate,
-) -> Task:
-    """Update a task with partial data."""
+) -> tuple[Task, list[dict]]:
+    """
+    Update a task with partial data.
+
+    When a scheduling field changes and the project auto-calculates,
+    successors are rescheduled in the same transaction.
+
+    Returns (task, rescheduled) where rescheduled lists the
+    {id, start_date, finish_date} of every task that moved.
+    """
+    await lock_project(db, project.id)
     update_data = data.model_dump(exclude_unset=True)
+    # Summaries whose children may have changed
+    rollup_ids = set()
+    if "parent_task_id" in update_data:
+        parent_id = update_data.pop("parent_task_id")
+        if parent_id != task.parent_task_id:
+            outline = await Outline.load(db, project.id)
+            rollup_ids.add(task.parent_task_id)
+            _move(outline, task.id, parent_id, None)
+            changed = outline.renumber()
+            await save_outline(db, changed)
+            _track(db, project.id, [node.row() for node in changed])
+            rollup_ids.add(task.id)
     for field, value in update_data.items():
         setattr(task, field, value)
+    if rollup_service.SOURCE_FIELDS & update_data.keys():
+        rollup_ids.add(task.id)
+
+    rescheduled = []
+    auto_calculate = (project.settings or {}).get("auto_calculate", True)
+    if auto_calculate and SCHEDULE_FIELDS & update_data.keys():
+        rescheduled = await schedule_service.reschedule_downstream(
+            db, project, [task.id]
+        )
+    rollup_ids.update(row["id"] for row in rescheduled)
+    rollup_ids.discard(None)
+    _track(db, project.id, rescheduled)
+    rolled = await rollup_service.rollup_ancestors(db, rollup_ids)
+    _track(db, project.id, rolled)
 
     await db.commit()
     await db.refresh(task)
-    return task
+    return task, rescheduled
+
+
+async def indent_task(db: AsyncSession, project: Project, task: Task) -> list[dict]:
+    """Make a task the last child of the task above it; returns outline changes."""
+    return await _reshape(db, project, task, Outline.indent)
+
+
+async def outdent_task(db: AsyncSession, project: Project, task: Task) -> list[dict]:
+    """Move a task up one level (siblings below become its children)."""
+    return await _reshape(db, project, task, Outline.outdent)
+
+
+async def _reshape(db: AsyncSession, project: Project, task: Task, edit) -> list[dict]:
+    await lock_project(db, project.id)
+    outline = await Outline.load(db, project.id)
+    old_parent_id = outline.nodes[task.id].parent_id
+    try:
+        edit(outline, task.id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    changed = outline.renumber()
+    await save_outline(db, changed)
+    _track(db, project.id, [node.row() for node in changed])
+    # Parents before and after; outdent also moves the siblings below
+    rolled = await rollup_service.rollup_ancestors(
+        db, {task.id, old_parent_id, *(node.id for node in changed)} - {None}
+    )
+    _track(db, project.id, rolled)
+    await db.commit()
+    return [node.row() for node in changed]
+
+
+async def _delete_task_ids(
+    db: AsyncSession, project_id: UUID, task_ids: list[UUID]
+) -> None:
+    """Soft delete tasks and hard delete their assignments and dependencies."""
+    assignments = await db.execute(
+        delete(Assignment)
+        .where(Assignment.task_id.in_(task_ids))
+        .returning(Assignment.id)
+    )
+    changefeed.track(db, project_id, "assignment", deleted=assignments.scalars())
+    dependencies = await db.execute(
+        delete(Dependency)
+        .where(
+            Dependency.predecessor_id.in_(task_ids)
+            | Dependency.successor_id.in_(task_ids)
+        )
+        .returning(Dependency.id)
+    )
+    changefeed.track(db, project_id, "dependency", deleted=dependencies.scalars())
+    await db.execute(
+        update(Task)
+        .where(Task.id.in_(task_ids))
+        .values(is_deleted=True, deleted_at=datetime.now(UTC))
+        .execution_options(synchronize_session=False)
+    )
+    changefeed.track(db, project_id, "task", deleted=task_ids)
 
 
 async def soft_delete_task(
     db: AsyncSession,
     task: Task,
-) -> None:
+) -> list[UUID]:
     """
-    Soft delete a task and cascade to children, assignments (hard), dependencies (hard).
+    Soft delete a task and its whole subtree in one transaction.
+
+    Assignments and dependencies of every deleted task are hard deleted.
+    The subtree comes from the project outline (one query), each table is
+    then written with a single statement however large or deep the subtree
+    is, and the tasks after it are renumbered. Returns the deleted ids.
     """
-    # 1. Soft delete children recursively
-    children_result = await db.execute(
-        select(Task).where(Task.parent_task_id == task.id, Task.is_deleted == False)  # noqa: E712
+    await lock_project(db, task.project_id)
+    outline = await Outline.load(db, task.project_id)
+    parent_id = outline.nodes[task.id].parent_id
+    task_ids = outline.remove(task.id)
+
+    await _delete_task_ids(db, task.project_id, task_ids)
+    changed = outline.renumber()
+    await save_outline(db, changed)
+    _track(db, task.project_id, [node.row() for node in changed])
+    if parent_id:
+        rolled = await rollup_service.rollup_ancestors(db, [parent_id])
+        _track(db, task.project_id, rolled)
+    await db.commit()
+    return task_ids
+
+
+# ── Batch ──
+
+
+class TaskBatchResult(NamedTuple):
+    """Outcome of apply_task_batch."""
+
+    created: list[Task]
+    updated: list[Task]
+    deleted: list[UUID]
+    rescheduled: list[dict]
+
+
+def _not_found(task_id: UUID) -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail=f"Task {task_id} not found in this project",
     )
-    children = children_result.scalars().all()
-    for child in children:
-        await soft_delete_task(db, child)
 
-    # 2. Hard delete assignments (Assignments belong to task -> remove)
-    # Using CORE delete for efficiency
 
-    await db.execute(delete(Assignment).where(Assignment.task_id == task.id))
+async def apply_task_batch(
+    db: AsyncSession,
+    project: Project,
+    operations: list[TaskBatchOperation],
+) -> TaskBatchResult:
+    """
+    Apply creates, updates, moves and deletes in order, all or nothing.
 
-    # 3. Hard delete dependencies (Predecessor/Successor relationships involving this task)
-    await db.execute(
-        delete(Dependency).where(
-            (Dependency.predecessor_id == task.id)
-            | (Dependency.successor_id == task.id)
+    The project is locked once and its outline is loaded once; order_index,
+    wbs_code, outline_level and is_summary are worked out in memory and
+    written back together with the new tasks. Successors of tasks whose
+    schedule fields changed are rescheduled once, at the end.
+    """
+    await lock_project(db, project.id)
+    outline = await Outline.load(db, project.id)
+
+    update_ids = {op.id for op in operations if isinstance(op, TaskBatchUpdate)}
+    loaded = {}
+    if update_ids:
+        result = await db.execute(
+            select(Task).where(
+                Task.id.in_(update_ids),
+                Task.project_id == project.id,
+                Task.is_deleted == False,  # noqa: E712
+            )
         )
-    )
+        loaded = {task.id: task for task in result.scalars()}
+
+    timeline = None
+    refs: dict[str, UUID] = {}
+    new_tasks: list[Task] = []
+    updated: dict[UUID, Task] = {}
+    deleted: list[UUID] = []
+    seeds: set[UUID] = set()
+
+    for op in operations:
+        if isinstance(op, TaskBatchCreate):
+            parent_id = op.parent_task_id
+            if op.parent_ref is not None:
+                if op.parent_ref not in refs:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Unknown parent_ref: {op.parent_ref}",
+                    )
+                parent_id = refs[op.parent_ref]
+            elif parent_id is not None and parent_id not in outline:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Parent task not found in this project",
+                )
+
+            if op.is_milestone:
+                finish_date = op.start_date
+            else:
+                if timeline is None:
+                    timeline = await schedule_service.project_timeline(db, project)
+                finish_date = timeline.finish_date_at(
+                    timeline.offset_of(op.start_date) + max(1, op.duration)
+                )
+
+            # Ids up front (stdlib UUIDs) so the outline and refs can use them
+            task = Task(
+                id=uuid7(),
+                project_id=project.id,
+                name=op.name,
+                notes=op.notes,
+                start_date=op.start_date,
+                finish_date=finish_date,
+                duration=op.duration,
+                remaining_duration=op.duration,
+                is_milestone=op.is_milestone,
+                task_type=op.task_type,
+                effort_driven=op.effort_driven,
+                constraint_type=op.constraint_type,
+                constraint_date=op.constraint_date,
+                deadline=op.deadline,
+                priority=op.priority,
+                fixed_cost=op.fixed_cost,
+            )
+            outline.insert(task.id, parent_id)
+            new_tasks.append(task)
+            if op.ref is not None:
+                refs[op.ref] = task.id
+
+        elif isinstance(op, TaskBatchUpdate):
+            task = loaded.get(op.id)
+            if task is None or op.id not in outline:
+                raise _not_found(op.id)
+            update_data = op.model_dump(exclude_unset=True, exclude={"op", "id"})
+            if "parent_task_id" in update_data:
+                parent_id = update_data.pop("parent_task_id")
+                _move(outline, op.id, parent_id, None)
+            for field, value in update_data.items():
+                setattr(task, field, value)
+            updated[op.id] = task
+            if SCHEDULE_FIELDS & update_data.keys():
+                seeds.add(op.id)
+
+        elif isinstance(op, TaskBatchMove):
+            if op.id not in outline:
+                raise _not_found(op.id)
+            _move(outline, op.id, op.parent_task_id, op.before_id)
+
+        elif isinstance(op, TaskBatchIndent):
+            if op.id not in outline:
+                raise _not_found(op.id)
+            edit = outline.indent if op.op == "indent" else outline.outdent
+            try:
+                edit(op.id)
+            except ValueError as exc:
+                raise HTTPException(status_code=400, detail=str(exc))
+
+        elif isinstance(op, TaskBatchDelete):
+            if op.id not in outline:
+                raise _not_found(op.id)
+            deleted.extend(outline.remove(op.id))
+
+    # Tasks created and deleted in the same batch are never written
+    new_ids = {task.id for task in new_tasks}
+    gone = set(deleted)
+    new_tasks = [task for task in new_tasks if task.id not in gone]
+    deleted = [task_id for task_id in deleted if task_id not in new_ids]
+    for task_id in gone & updated.keys():
+        del updated[task_id]
+
+    await db.flush()  # Field updates, before the outline is rewritten
+    if deleted:
+        await _delete_task_ids(db, project.id, deleted)
+    changed = outline.renumber()
+    await save_outline(db, changed, new_tasks)
+    _track(db, project.id, [node.row() for node in changed])
+
+    rescheduled = []
+    auto_calculate = (project.settings or {}).get("auto_calculate", True)
+    seeds -= gone
+    if auto_calculate and seeds:
+        rescheduled = await schedule_service.reschedule_downstream(
+            db, project, list(seeds)
+        )
+    _track(db, project.id, rescheduled)
+    # Any summary may be affected; one load and one write for the project
+    rolled = await rollup_service.rollup_project(db, project.id)
+    _track(db, project.id, rolled)
 
-    # 4. Soft delete the task itself
-    task.is_deleted = True
-    task.deleted_at = datetime.now(UTC)
     await db.commit()
+
+    # One read for everything returned, with the rows as committed
+    ids = [task.id for task in new_tasks] + list(updated)
+    tasks = {}
+    if ids:
+        result = await db.execute(
+            select(Task)
+            .where(Task.id.in_(ids))
+            .execution_options(populate_existing=True)
+        )
+        tasks = {task.id: task for task in result.scalars()}
+
+    return TaskBatchResult(
+        created=[tasks[task.id] for task in new_tasks],
+        updated=[tasks[task_id] for task_id in updated],
+        deleted=deleted,
+        rescheduled=rescheduled,
+    )
+
+
+def _move(
+    outline: Outline,
+    task_id: UUID,
+    parent_id: UUID | None,
+    before_id: UUID | None,
+) -> None:
+    if parent_id is not None and parent_id not in outline:
+        raise HTTPException(
+            status_code=400,
+            detail="Parent task not found in this project",
+        )
+    try:
+        outline.move(task_id, parent_id, before_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
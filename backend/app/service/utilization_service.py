@@ -0,0 +1,247 @@
+"""
+Resource utilization.
+
+Allocated versus available working minutes per work resource and per day
+or week, for resource histograms.
+
+Everything is computed on one resource x day matrix over the requested
+window:
+
+- available: the resource's units for the day (max_units, overridden by
+  availability periods) times the day's working minutes
+- allocated: each assignment's work spread over its working days by
+  contour_service.timephase(); assignments without work book their units
+  for every working minute of their span
+
+Working days come from the project timeline (calendar or hours_per_day).
+Weeks start on settings.first_day_of_week. Results are cached in process
+per (project, version, calendar), see app.core.versioning.
+"""
+
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import NamedTuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.assignment import Assignment
+from app.models.enums import ResourceType
+from app.models.project import Project
+from app.models.resource import Resource
+from app.models.resource_availability import ResourceAvailability
+from app.models.task import Task
+from app.service import contour_service, schedule_service
+
+BUCKETS = ("day", "week")
+# Widest window one request may cover (about five years)
+MAX_UTILIZATION_DAYS = 1830
+# Window used when the project has no finish date
+DEFAULT_WINDOW_DAYS = 90
+
+_CACHE_SIZE = 64
+_cache: OrderedDict[tuple, "Utilization"] = OrderedDict()
+
+
+class Utilization(NamedTuple):
+    """Per-resource minutes for each period (bucket start dates)."""
+
+    periods: list[date]
+    resource_ids: list[UUID]
+    names: list[str]
+    allocated: list[list[int]]
+    available: list[list[int]]
+
+
+async def project_utilization(
+    db: AsyncSession,
+    project: Project,
+    start: date | None = None,
+    end: date | None = None,
+    bucket: str = "day",
+) -> Utilization:
+    """
+    Utilization of every work resource from start to end (inclusive).
+
+    start defaults to the project start, end to the project finish (or
+    DEFAULT_WINDOW_DAYS later).
+    """
+    start = start or project.start_date
+    end = end or project.finish_date or start + timedelta(days=DEFAULT_WINDOW_DAYS)
+    if bucket not in BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"bucket must be one of: {', '.join(BUCKETS)}",
+        )
+    if end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must not be before 'from'",
+        )
+    if (end - start).days >= MAX_UTILIZATION_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range cannot exceed {MAX_UTILIZATION_DAYS} days",
+        )
+
+    version = await db.scalar(select(Project.version).where(Project.id == project.id))
+    timeline = await schedule_service.project_timeline(db, project)
+    # Calendar edits do not bump project versions; compiled calendars do change
+    key = (
+        project.id,
+        version,
+        getattr(timeline, "calendar", None),
+        start,
+        end,
+        bucket,
+    )
+    cached = _cache.get(key)
+    if cached is not None:
+        _cache.move_to_end(key)
+        return cached
+
+    result = await _compute(db, project, timeline, start, end, bucket)
+    _cache[key] = result
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return result
+
+
+async def _compute(
+    db: AsyncSession,
+    project: Project,
+    timeline: schedule_service.Timeline,
+    start: date,
+    end: date,
+    bucket: str,
+) -> Utilization:
+    resources = (
+        await db.execute(
+            select(Resource.id, Resource.name, Resource.max_units)
+            .where(
+                Resource.project_id == project.id,
+                Resource.type == ResourceType.WORK,
+            )
+            .order_by(Resource.name, Resource.id)
+        )
+    ).all()
+    index = {row.id: r for r, row in enumerate(resources)}
+
+    window_end = end + timedelta(days=1)
+    assignments = (
+        await db.execute(
+            select(
+                Assignment.resource_id,
+                Assignment.units,
+                Assignment.work,
+                Assignment.start_date,
+                Assignment.finish_date,
+                Assignment.work_contour,
+                Assignment.contour_data,
+            )
+            .join(Task, Task.id == Assignment.task_id)
+            .where(
+                Task.project_id == project.id,
+                Task.is_deleted == False,  # noqa: E712
+                Assignment.resource_id.in_(list(index)),
+                Assignment.start_date < window_end,
+                Assignment.finish_date >= start,
+            )
+        )
+    ).all()
+
+    # Working days over the window and every assignment's span
+    first = min([start, *(row.start_date for row in assignments)])
+    last = max([window_end, *(row.finish_date for row in assignments)])
+    days = contour_service.WorkingDays(timeline, first, last + timedelta(days=1))
+    phased = contour_service.timephase(days, (row[1:] for row in assignments))
+
+    w0 = days.index(start)
+    width = (end - start).days + 1
+    # Only the working days inside the window
+    p_lo, p_hi = days.position(start), days.position(window_end)
+    allocated = [[0.0] * width for _ in resources]
+    for row, (lo, work) in zip(assignments, phased):
+        allocated_row = allocated[index[row.resource_id]]
+        for j in range(max(lo, p_lo), min(lo + len(work), p_hi)):
+            allocated_row[days.working[j] - w0] += work[j - lo]
+
+    window_minutes = days.minutes[w0 : w0 + width]
+    units_by_day = await _units_by_day(db, resources, index, start, width)
+    available = [
+        [u * m for u, m in zip(row_units, window_minutes)] for row_units in units_by_day
+    ]
+
+    periods, groups = _buckets(project, start, width, bucket)
+    return Utilization(
+        periods=periods,
+        resource_ids=[row.id for row in resources],
+        names=[row.name for row in resources],
+        allocated=[_sum_groups(row, groups) for row in allocated],
+        available=[_sum_groups(row, groups) for row in available],
+    )
+
+
+async def _units_by_day(
+    db: AsyncSession,
+    resources: list,
+    index: dict[UUID, int],
+    start: date,
+    width: int,
+) -> list[list[float]]:
+    """Available units per resource per window day (1.0 = 100%)."""
+    rows = [[float(row.max_units)] * width for row in resources]
+    if not resources:
+        return rows
+    periods = await db.execute(
+        select(
+            ResourceAvailability.resource_id,
+            ResourceAvailability.start_date,
+            ResourceAvailability.end_date,
+            ResourceAvailability.units,
+        )
+        .where(ResourceAvailability.resource_id.in_(list(index)))
+        .order_by(ResourceAvailability.start_date)
+    )
+    for resource_id, p_start, p_end, units in periods:
+        lo = max(0, (p_start - start).days)
+        hi = width if p_end is None else min(width, (p_end - start).days + 1)
+        if lo < hi:
+            rows[index[resource_id]][lo:hi] = [float(units)] * (hi - lo)
+    return rows
+
+
+def _buckets(
+    project: Project,
+    start: date,
+    width: int,
+    bucket: str,
+) -> tuple[list[date], list[int]]:
+    """Period start dates and, per period, the end index of its days."""
+    if bucket == "day":
+        periods = [start + timedelta(days=d) for d in range(width)]
+        return periods, list(range(1, width + 1))
+
+    # isoweekday() is 1-7 from Monday; Sunday-first settings may use 0 or 7
+    first_day = (project.settings or {}).get("first_day_of_week", 1)
+    into_week = (start.isoweekday() - first_day) % 7
+    periods = [start]
+    ends = []
+    boundary = 7 - into_week
+    while boundary < width:
+        ends.append(boundary)
+        periods.append(start + timedelta(days=boundary))
+        boundary += 7
+    ends.append(width)
+    return periods, ends
+
+
+def _sum_groups(row: list[float], ends: list[int]) -> list[int]:
+    sums = []
+    begin = 0
+    for stop in ends:
+        sums.append(round(sum(row[begin:stop])))
+        begin = stop
+    return sums
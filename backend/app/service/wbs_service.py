@@ -0,0 +1,299 @@
+"""
+Work breakdown structure (outline) maintenance.
+
+The outline is the task tree (parent_task_id) in display order. A task's
+place in it determines four stored columns:
+
+- order_index: 1-based position in a preorder walk of the whole project
+- wbs_code: the parent's code plus the position among siblings ("1.2.3")
+- outline_level: depth, 1 for top-level tasks
+- is_summary: whether the task has children
+
+Outline loads those columns for a project in one query, applies structural
+edits in memory and reports only the rows whose values changed, which
+save_outline writes back with set-based UPDATEs.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import bulk_update
+from app.models.task import Task
+
+
+@dataclass(slots=True)
+class OutlineNode:
+    """Outline columns of one task."""
+
+    id: UUID
+    parent_id: UUID | None
+    order_index: int
+    wbs_code: str
+    outline_level: int
+    is_summary: bool
+
+    def values(self) -> tuple:
+        return (
+            self.parent_id,
+            self.order_index,
+            self.wbs_code,
+            self.outline_level,
+            self.is_summary,
+        )
+
+    def row(self) -> dict:
+        return {
+            "id": self.id,
+            "parent_task_id": self.parent_id,
+            "order_index": self.order_index,
+            "wbs_code": self.wbs_code,
+            "outline_level": self.outline_level,
+            "is_summary": self.is_summary,
+        }
+
+
+class Outline:
+    """
+    In-memory task tree of one project.
+
+    Siblings are kept in display order. Edits only touch the tree and note
+    which parents' child lists changed; renumber() then recomputes the
+    stored columns for the affected range only.
+    """
+
+    def __init__(self, nodes: list[OutlineNode]):
+        self.nodes = {node.id: node for node in nodes}
+        self._stored = {node.id: node.values() for node in nodes}
+        self.children: dict[UUID | None, list[UUID]] = defaultdict(list)
+        for node in sorted(nodes, key=lambda n: n.order_index):
+            if node.parent_id not in self.nodes:
+                node.parent_id = None  # Parent gone; treat as top level
+            self.children[node.parent_id].append(node.id)
+        # Parents whose child list changed since the last renumber()
+        self._dirty: set[UUID | None] = set()
+        # Subtree sizes (the task itself included), to skip untouched branches
+        self._size: dict[UUID, int] = {}
+        for task_id in reversed(self.subtree(None)[1:]):
+            self._size[task_id] = 1 + sum(
+                self._size[child] for child in self.children.get(task_id, ())
+            )
+
+    @classmethod
+    async def load(cls, db: AsyncSession, project_id: UUID) -> "Outline":
+        """Outline of every live task in a project."""
+        result = await db.execute(
+            select(
+                Task.id,
+                Task.parent_task_id,
+                Task.order_index,
+                Task.wbs_code,
+                Task.outline_level,
+                Task.is_summary,
+            ).where(
+                Task.project_id == project_id,
+                Task.is_deleted == False,  # noqa: E712
+            )
+        )
+        return cls([OutlineNode(*row) for row in result.all()])
+
+    def __contains__(self, task_id: UUID) -> bool:
+        return task_id in self.nodes
+
+    def subtree(self, task_id: UUID | None) -> list[UUID | None]:
+        """task_id and all its descendants, parents first."""
+        ids = [task_id]
+        for current in ids:
+            ids.extend(self.children.get(current, ()))
+        return ids
+
+    def ancestors(self, task_id: UUID | None) -> list[UUID]:
+        """Parent, grandparent, ... of task_id (task_id itself first)."""
+        chain = []
+        while task_id is not None:
+            chain.append(task_id)
+            task_id = self.nodes[task_id].parent_id
+        return chain
+
+    def insert(
+        self,
+        task_id: UUID,
+        parent_id: UUID | None,
+        before_id: UUID | None = None,
+    ) -> OutlineNode:
+        """Add a new task under parent_id, before a sibling or last."""
+        node = OutlineNode(task_id, parent_id, 0, "", 0, False)
+        self.nodes[task_id] = node
+        self._size[task_id] = 1
+        self._place(task_id, parent_id, before_id)
+        return node
+
+    def move(
+        self,
+        task_id: UUID,
+        parent_id: UUID | None,
+        before_id: UUID | None = None,
+    ) -> None:
+        """Move a task and its subtree. Raises ValueError on a bad target."""
+        if task_id in self.ancestors(parent_id):
+            raise ValueError("Cannot move a task under itself")
+        if before_id == task_id:
+            raise ValueError("Cannot move a task before itself")
+        self._detach(task_id)
+        self.nodes[task_id].parent_id = parent_id
+        self._place(task_id, parent_id, before_id)
+
+    def remove(self, task_id: UUID) -> list[UUID]:
+        """Drop a task and its subtree; returns the removed ids."""
+        ids = self.subtree(task_id)
+        self._detach(task_id)
+        for removed in ids:
+            del self.nodes[removed]
+            del self._size[removed]
+            self.children.pop(removed, None)
+            self._dirty.discard(removed)
+        return ids
+
+    def indent(self, task_id: UUID) -> None:
+        """Make a task the last child of the sibling above it."""
+        siblings = self.children[self.nodes[task_id].parent_id]
+        position = siblings.index(task_id)
+        if position == 0:
+            raise ValueError("Task has no sibling above it to indent under")
+        self.move(task_id, siblings[position - 1])
+
+    def outdent(self, task_id: UUID) -> None:
+        """
+        Move a task up one level, right after its parent.
+
+        Siblings below it become its children, so display order is kept.
+        """
+        parent_id = self.nodes[task_id].parent_id
+        if parent_id is None:
+            raise ValueError("Task is already at the top level")
+        siblings = self.children[parent_id]
+        below = siblings[siblings.index(task_id) + 1 :]
+        for sibling in below:
+            self.move(sibling, task_id)
+
+        grandparent_id = self.nodes[parent_id].parent_id
+        uncles = self.children[grandparent_id]
+        after = uncles.index(parent_id) + 1
+        before_id = uncles[after] if after < len(uncles) else None
+        self.move(task_id, grandparent_id, before_id)
+
+    def _detach(self, task_id: UUID) -> None:
+        parent_id = self.nodes[task_id].parent_id
+        self.children[parent_id].remove(task_id)
+        self._dirty.add(parent_id)
+        for ancestor in self.ancestors(parent_id):
+            self._size[ancestor] -= self._size[task_id]
+
+    def _place(
+        self,
+        task_id: UUID,
+        parent_id: UUID | None,
+        before_id: UUID | None,
+    ) -> None:
+        siblings = self.children[parent_id]
+        if before_id is None:
+            siblings.append(task_id)
+        elif before_id in siblings:
+            siblings.insert(siblings.index(before_id), task_id)
+        else:
+            raise ValueError("before_id must be a child of the target parent")
+        self._dirty.add(parent_id)
+        for ancestor in self.ancestors(parent_id):
+            self._size[ancestor] += self._size[task_id]
+
+    def renumber(self, everything: bool = False) -> list[OutlineNode]:
+        """
+        Recompute columns after edits; return the nodes that differ from storage.
+
+        Only branches that contain an edit, or whose position shifted, are
+        walked. A subtree whose root keeps its order_index, wbs_code and
+        level and holds no edit is skipped as a whole. everything=True
+        walks the full tree, e.g. to repair codes written by older code.
+        """
+        if not (self._dirty or everything):
+            return []
+
+        # Tasks on the path from the root to an edit must be descended into
+        descend: set[UUID | None] = {None}
+        for parent_id in self._dirty:
+            descend.update(self.ancestors(parent_id))
+
+        changed = []
+        order_index = 0
+
+        def walk(parent_id: UUID | None, prefix: str, level: int) -> None:
+            nonlocal order_index
+            for position, task_id in enumerate(self.children.get(parent_id, ()), 1):
+                node = self.nodes[task_id]
+                wbs_code = f"{prefix}{position}"
+                order_index += 1
+                if (
+                    not everything
+                    and task_id not in descend
+                    and self._stored.get(task_id) == node.values()
+                    and node.order_index == order_index
+                    and node.wbs_code == wbs_code
+                    and node.outline_level == level
+                ):
+                    order_index += self._size[task_id] - 1
+                    continue
+
+                node.order_index = order_index
+                node.wbs_code = wbs_code
+                node.outline_level = level
+                node.is_summary = bool(self.children.get(task_id))
+                if self._stored.get(task_id) != node.values():
+                    changed.append(node)
+                    self._stored[task_id] = node.values()
+                walk(task_id, f"{wbs_code}.", level + 1)
+
+        walk(None, "", 1)
+        self._dirty.clear()
+        return changed
+
+
+async def save_outline(
+    db: AsyncSession,
+    changed: list[OutlineNode],
+    new_tasks: list[Task] = (),
+) -> None:
+    """
+    Write renumbered outline columns, inserting new_tasks along the way.
+
+    order_index is unique per project and Postgres checks it row by row, so
+    changed rows are first parked on negative values. New tasks are inserted
+    parked as well, then every changed row gets its final values in one
+    UPDATE. Tasks removed from the outline must already be marked deleted.
+    """
+    new_ids = {task.id for task in new_tasks}
+    await bulk_update(
+        db,
+        Task.__table__,
+        [
+            {"id": node.id, "order_index": -node.order_index}
+            for node in changed
+            if node.id not in new_ids
+        ],
+    )
+
+    if new_tasks:
+        nodes = {node.id: node for node in changed}
+        for task in new_tasks:
+            node = nodes[task.id]
+            task.parent_task_id = node.parent_id
+            task.order_index = -node.order_index
+            task.wbs_code = node.wbs_code
+            task.outline_level = node.outline_level
+            task.is_summary = node.is_summary
+        db.add_all(new_tasks)
+        await db.flush()
+
+    await bulk_update(db, Task.__table__, [node.row() for node in changed])
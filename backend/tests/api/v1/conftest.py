@@ -1,4 +1,5 @@
 import pytest
+from httpx import AsyncClient
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -31,3 +32,27 @@ async def add_project_member(session: AsyncSession, project_id, user_email, role
     member = ProjectMember(project_id=project_id, user_id=user.id, role_id=role.id)
     session.add(member)
     await session.commit()
+
+
+async def setup_project(client: AsyncClient, slug: str) -> str:
+    """Helper: register a user and create an org + project. Returns project id."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": f"{slug}@x.com",
+            "password": "StrongPassword123!",
+            "full_name": f"User {slug}",
+        },
+    )
+    org_resp = await client.post(
+        "/api/v1/organizations", json={"name": f"Org {slug}", "slug": f"org-{slug}"}
+    )
+    proj_resp = await client.post(
+        "/api/v1/projects",
+        json={
+            "name": f"Proj {slug}",
+            "organization_id": org_resp.json()["id"],
+            "start_date": "2024-01-01",
+        },
+    )
+    return proj_resp.json()["id"]
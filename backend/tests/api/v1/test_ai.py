@@ -0,0 +1,154 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.ai_usage import AIUsage
+from app.models.ai_usage_monthly import AIUsageMonthly
+from app.service import ai_usage_service
+from tests.api.v1.conftest import setup_project
+
+
+def _events(body: str) -> list[tuple[str, dict]]:
+    """(event, data) pairs of a server-sent event stream."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        name, data = block.split("\n")
+        events.append((name.removeprefix("event: "), json.loads(data[len("data: ") :])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_chat_streams_reply_and_saves_messages(client: AsyncClient, stub_llm):
+    """Chat — reply streams as SSE; both messages are saved afterwards."""
+    proj_id = await setup_project(client, "ai-chat")
+    await client.post(
+        f"/api/v1/projects/{proj_id}/tasks",
+        json={"name": "Design", "start_date": "2024-01-01", "duration": 480},
+    )
+    resp = await client.post(f"/api/v1/projects/{proj_id}/ai/conversations", json={})
+    assert resp.status_code == 201
+    cid = resp.json()["id"]
+    base = f"/api/v1/projects/{proj_id}/ai/conversations/{cid}/messages"
+
+    resp = await client.post(base, json={"content": "Is Design late?"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = _events(resp.text)
+    assert events[0][0] == "start"
+    reply = "".join(data["text"] for name, data in events if name == "delta")
+    assert reply == "echo: Is Design late?"
+    name, done = events[-1]
+    assert name == "done"
+    assert done["message_id"] == events[0][1]["message_id"]
+    assert (done["tokens_in"], done["tokens_out"], done["finish_reason"]) == (
+        3,
+        4,
+        "end_turn",
+    )
+    # The prompt carries the project context
+    [body] = stub_llm.requests
+    assert "Project: Proj ai-chat" in body["system"]
+    assert "1 Design" in body["system"]
+
+    messages = (await client.get(base)).json()
+    assert [(m["role"], m["content"]) for m in messages] == [
+        ("user", "Is Design late?"),
+        ("assistant", "echo: Is Design late?"),
+    ]
+    assert messages[1]["id"] == done["message_id"]
+    assert messages[1]["tokens_in"] == 3
+    assert messages[1]["latency_ms"] is not None
+
+    # The next question carries the history, and the conversation got a title
+    await client.post(base, json={"content": "And Build?"})
+    assert [m["role"] for m in stub_llm.requests[-1]["messages"]] == [
+        "user",
+        "assistant",
+        "user",
+    ]
+    [conversation] = (
+        await client.get(f"/api/v1/projects/{proj_id}/ai/conversations")
+    ).json()
+    assert conversation["title"] == "Is Design late?"
+
+
+@pytest.mark.asyncio
+async def test_chat_provider_error(client: AsyncClient, stub_llm):
+    """Chat — provider failure ends the stream with an error event."""
+    proj_id = await setup_project(client, "ai-err")
+    cid = (
+        await client.post(f"/api/v1/projects/{proj_id}/ai/conversations", json={})
+    ).json()["id"]
+    base = f"/api/v1/projects/{proj_id}/ai/conversations/{cid}/messages"
+    stub_llm.status_code = 500
+
+    resp = await client.post(base, json={"content": "Hello"})
+    assert resp.status_code == 200
+    assert _events(resp.text)[-1] == ("error", {"detail": "AI provider request failed"})
+
+    messages = (await client.get(base)).json()
+    assert messages[1]["finish_reason"] == "error"
+
+
+@pytest.mark.asyncio
+async def test_chat_other_users_conversation_not_found(client: AsyncClient, stub_llm):
+    """Chat — conversations are private to their user within the project."""
+    proj_id = await setup_project(client, "ai-own")
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/ai/conversations",
+        json={"title": "Planning"},
+    )
+    cid = resp.json()["id"]
+    other_proj = await setup_project(client, "ai-other")
+
+    resp = await client.post(
+        f"/api/v1/projects/{other_proj}/ai/conversations/{cid}/messages",
+        json={"content": "Hello"},
+    )
+    assert resp.status_code == 404
+    assert stub_llm.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_chat_usage_metered_and_quota_enforced(
+    client: AsyncClient, session, stub_llm, monkeypatch
+):
+    """Chat — usage rolls up per user and organization; quota gives 429."""
+    monkeypatch.setattr(settings, "AI_MONTHLY_TOKENS_PER_USER", 10)
+    proj_id = await setup_project(client, "ai-quota")
+    cid = (
+        await client.post(f"/api/v1/projects/{proj_id}/ai/conversations", json={})
+    ).json()["id"]
+    base = f"/api/v1/projects/{proj_id}/ai/conversations/{cid}/messages"
+
+    resp = await client.post(base, json={"content": "Is Design late?"})
+    assert _events(resp.text)[-1][0] == "done"
+    # 3 + 4 tokens used, still under the quota
+    resp = await client.post(base, json={"content": "And Build?"})
+    assert _events(resp.text)[-1][0] == "done"
+
+    # Unflushed usage already counts
+    resp = await client.post(base, json={"content": "Anything else?"})
+    assert resp.status_code == 429
+    assert stub_llm.calls == 2
+
+    assert await ai_usage_service.flush(session) == 2
+    user_id = (await client.get("/api/v1/auth/me")).json()["id"]
+    [user_total] = (
+        await session.execute(
+            select(AIUsageMonthly).where(AIUsageMonthly.entity_id == user_id)
+        )
+    ).scalars()
+    assert (user_total.calls, user_total.tokens_in, user_total.tokens_out) == (
+        2,
+        5,
+        7,
+    )
+    [usage] = (
+        await session.execute(select(AIUsage).where(AIUsage.user_id == user_id))
+    ).scalars()
+    assert (usage.feature, usage.model) == ("chat", settings.ANTHROPIC_MODEL)
+    assert (usage.tokens_in, usage.tokens_out) == (5, 7)
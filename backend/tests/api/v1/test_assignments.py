@@ -402,6 +402,68 @@ async def test_create_assignment_invalid_units(client: AsyncClient):
     assert resp.status_code == 422
 
 
+@pytest.mark.asyncio
+async def test_create_assignment_custom_contour(client: AsyncClient):
+    """Create — CONTOURED with custom weights round-trips; bad weights 422."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "cr_asn_ct@x.com",
+            "password": "StrongPassword123!",
+            "full_name": "Cr Asn Ct",
+        },
+    )
+    org_resp = await client.post(
+        "/api/v1/organizations", json={"name": "Org Asn Ct", "slug": "org-asn-ct"}
+    )
+    org_id = org_resp.json()["id"]
+    proj_resp = await client.post(
+        "/api/v1/projects",
+        json={
+            "name": "Proj Asn Ct",
+            "organization_id": org_id,
+            "start_date": "2024-01-01",
+        },
+    )
+    proj_id = proj_resp.json()["id"]
+
+    t_resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks",
+        json={"name": "Task 1", "start_date": "2024-01-01", "duration": 480},
+    )
+    tid = t_resp.json()["id"]
+    r_resp = await client.post(
+        f"/api/v1/projects/{proj_id}/resources", json={"name": "Res 1", "type": "WORK"}
+    )
+    rid = r_resp.json()["id"]
+
+    payload = {
+        "resource_id": rid,
+        "start_date": "2024-01-01",
+        "finish_date": "2024-01-05",
+        "work_contour": "CONTOURED",
+    }
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks/{tid}/assignments",
+        json={**payload, "contour_data": {"weights": [-1, 2]}},
+    )
+    assert resp.status_code == 422
+
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks/{tid}/assignments",
+        json={**payload, "contour_data": {"weights": [1, 3]}},
+    )
+    assert resp.status_code == 201
+    assert resp.json()["contour_data"] == {"weights": [1.0, 3.0]}
+
+    resp = await client.patch(
+        f"/api/v1/assignments/{resp.json()['id']}",
+        json={"contour_data": {"weights": [2, 1]}},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["contour_data"] == {"weights": [2.0, 1.0]}
+
+
 @pytest.mark.asyncio
 async def test_update_assignment_success(client: AsyncClient):
     """Update — partial update — returns 200."""
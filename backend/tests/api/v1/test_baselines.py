@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from tests.api.v1.conftest import setup_project
+
+
+async def _create_task(client: AsyncClient, proj_id: str, name: str, duration: int):
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks",
+        json={"name": name, "start_date": "2024-01-01", "duration": duration},
+    )
+    return resp.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_save_baseline_and_variance(client: AsyncClient):
+    """Baseline — save, change the plan, stream variance, save again."""
+    proj_id = await setup_project(client, "bl-ok")
+    design = await _create_task(client, proj_id, "Design", 960)
+    build = await _create_task(client, proj_id, "Build", 480)
+    r_resp = await client.post(
+        f"/api/v1/projects/{proj_id}/resources", json={"name": "Ann", "type": "WORK"}
+    )
+    await client.post(
+        f"/api/v1/projects/{proj_id}/tasks/{design}/assignments",
+        json={
+            "resource_id": r_resp.json()["id"],
+            "start_date": "2024-01-01",
+            "finish_date": "2024-01-03",
+        },
+    )
+
+    resp = await client.post(f"/api/v1/projects/{proj_id}/baselines/0")
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "baseline_number": 0,
+        "task_count": 2,
+        "assignment_count": 1,
+    }
+
+    await client.patch(
+        f"/api/v1/projects/{proj_id}/tasks/{build}", json={"duration": 960}
+    )
+    added = await _create_task(client, proj_id, "Docs", 480)
+
+    resp = await client.get(f"/api/v1/projects/{proj_id}/baselines/0/variance")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = {row["task_id"]: row for row in map(json.loads, resp.text.splitlines())}
+    assert list(rows) == [design, build, added]
+    assert rows[design]["duration_variance"] == 0
+    assert rows[design]["start_variance"] == 0
+    assert rows[build]["baseline_duration"] == 480
+    assert rows[build]["duration_variance"] == 480
+    assert rows[added]["baseline_start"] is None
+    assert rows[added]["duration_variance"] is None
+
+    # Saving the same number again overwrites it
+    resp = await client.post(f"/api/v1/projects/{proj_id}/baselines/0")
+    assert resp.json()["task_count"] == 3
+    resp = await client.get(f"/api/v1/projects/{proj_id}/baselines/0/variance")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [row["duration_variance"] for row in rows] == [0, 0, 0]
+
+
+@pytest.mark.asyncio
+async def test_save_baseline_invalid_number(client: AsyncClient):
+    """Baseline — number outside 0-10 — returns 422."""
+    proj_id = await setup_project(client, "bl-bad")
+    resp = await client.post(f"/api/v1/projects/{proj_id}/baselines/11")
+    assert resp.status_code == 422
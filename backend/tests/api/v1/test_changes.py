@@ -0,0 +1,181 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from starlette.websockets import WebSocketDisconnect
+
+from app.core.changefeed import hub
+from app.core.config import settings
+from app.core.database import get_db
+from app.main import app
+from tests.api.v1.conftest import setup_project
+
+
+async def _next(subscriber) -> dict:
+    # Frames are published by a task started after commit
+    return await asyncio.wait_for(subscriber.next(), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_commits_reach_subscribers(client: AsyncClient):
+    """Feed — task, dependency and delete commits arrive as compact diffs."""
+    proj_id = await setup_project(client, "feed")
+    subscriber = await hub.subscribe(uuid.UUID(proj_id))
+    try:
+        t1 = await client.post(
+            f"/api/v1/projects/{proj_id}/tasks",
+            json={"name": "Dig", "start_date": "2024-01-01", "duration": 480},
+        )
+        tid1 = t1.json()["id"]
+        frame = await _next(subscriber)
+        assert frame["type"] == "changes"
+        assert frame["project_id"] == proj_id
+        first_version = frame["version"]
+        created = frame["changes"]["task"][tid1]
+        assert (created["name"], created["wbs_code"]) == ("Dig", "1")
+
+        t2 = await client.post(
+            f"/api/v1/projects/{proj_id}/tasks",
+            json={"name": "Pour", "start_date": "2024-01-01", "duration": 480},
+        )
+        tid2 = t2.json()["id"]
+        await _next(subscriber)
+
+        resp = await client.post(
+            f"/api/v1/projects/{proj_id}/dependencies",
+            json={"predecessor_id": tid1, "successor_id": tid2, "type": "FS"},
+        )
+        dep_id = resp.json()["id"]
+        frame = await _next(subscriber)
+        assert frame["changes"]["dependency"][dep_id]["successor_id"] == tid2
+
+        # Only the changed columns of an update
+        await client.patch(
+            f"/api/v1/projects/{proj_id}/tasks/{tid2}", json={"priority": 900}
+        )
+        frame = await _next(subscriber)
+        assert frame["changes"]["task"][tid2] == {"priority": 900}
+
+        await client.delete(f"/api/v1/projects/{proj_id}/tasks/{tid1}")
+        frame = await _next(subscriber)
+        assert frame["changes"]["task"][tid1] is None
+        assert frame["changes"]["dependency"] == {dep_id: None}
+        assert frame["changes"]["task"][tid2]["wbs_code"] == "1"
+        assert frame["version"] > first_version
+    finally:
+        await hub.unsubscribe(subscriber)
+
+
+@pytest.fixture
+def ws_client():
+    """
+    A TestClient for the WebSocket route.
+
+    TestClient runs the app on its own event loop, which cannot share the
+    test connection; this one opens its own there and rolls it back after.
+    """
+    state = {}
+
+    async def _override_get_db():
+        if not state:
+            state["engine"] = create_async_engine(settings.DATABASE_URL)
+            state["connection"] = await state["engine"].connect()
+            await state["connection"].begin()
+        async with AsyncSession(
+            bind=state["connection"],
+            join_transaction_mode="create_savepoint",
+            expire_on_commit=False,
+        ) as session:
+            yield session
+
+    async def _rollback():
+        if state:
+            await state["connection"].rollback()
+            await state["connection"].close()
+            await state["engine"].dispose()
+
+    app.dependency_overrides[get_db] = _override_get_db
+    with TestClient(app) as client:
+        yield client
+        client.portal.call(_rollback)
+    app.dependency_overrides.clear()
+
+
+def _ws_project(client: TestClient, slug: str) -> str:
+    """setup_project for a TestClient, which keeps the access cookie."""
+    client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": f"{slug}@x.com",
+            "password": "StrongPassword123!",
+            "full_name": f"User {slug}",
+        },
+    )
+    org_resp = client.post(
+        "/api/v1/organizations", json={"name": f"Org {slug}", "slug": f"org-{slug}"}
+    )
+    proj_resp = client.post(
+        "/api/v1/projects",
+        json={
+            "name": f"Proj {slug}",
+            "organization_id": org_resp.json()["id"],
+            "start_date": "2024-01-01",
+        },
+    )
+    return proj_resp.json()["id"]
+
+
+def test_ws_pushes_changes(ws_client: TestClient):
+    """WS — cookie auth, ready frame, then a commit arrives as a diff."""
+    proj_id = _ws_project(ws_client, "ws-feed")
+    url = f"/api/v1/ws/projects/{proj_id}"
+
+    with ws_client.websocket_connect(url) as websocket:
+        ready = websocket.receive_json()
+        assert (ready["type"], ready["project_id"]) == ("ready", proj_id)
+
+        resp = ws_client.post(
+            f"/api/v1/projects/{proj_id}/tasks",
+            json={"name": "Dig", "start_date": "2024-01-01", "duration": 480},
+        )
+        frame = websocket.receive_json()
+        assert frame["type"] == "changes"
+        assert frame["version"] > ready["version"]
+        assert frame["changes"]["task"][resp.json()["id"]]["name"] == "Dig"
+
+    # Closing the socket ends the connection's subscription
+    assert hub.stats() == {"projects": 0, "connections": 0}
+
+
+def test_ws_query_token(ws_client: TestClient):
+    """WS — ?token= works without the cookie."""
+    proj_id = _ws_project(ws_client, "ws-token")
+    token = ws_client.cookies.get("access_token")
+    ws_client.cookies.clear()
+
+    url = f"/api/v1/ws/projects/{proj_id}?token={token}"
+    with ws_client.websocket_connect(url) as websocket:
+        assert websocket.receive_json()["type"] == "ready"
+
+
+def test_ws_rejects_bad_token_and_non_members(ws_client: TestClient):
+    """WS — no token, a bad token or a non-member — closed with 1008."""
+    proj_id = _ws_project(ws_client, "ws-owner")
+    url = f"/api/v1/ws/projects/{proj_id}"
+
+    # Another user, not a member of the project
+    _ws_project(ws_client, "ws-stranger")
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with ws_client.websocket_connect(url):
+            pass
+    assert exc.value.code == 1008
+
+    ws_client.cookies.clear()
+    for suffix in ("", "?token=not-a-token"):
+        with pytest.raises(WebSocketDisconnect) as exc:
+            with ws_client.websocket_connect(url + suffix):
+                pass
+        assert exc.value.code == 1008
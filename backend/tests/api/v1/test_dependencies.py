@@ -292,6 +292,105 @@ async def test_create_dependency_self_reference(client: AsyncClient):
     assert resp.status_code == 422
 
 
+async def _setup_chain(client: AsyncClient, slug: str, count: int):
+    """Helper: project with `count` tasks. Returns (project id, task ids)."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": f"{slug}@x.com",
+            "password": "StrongPassword123!",
+            "full_name": "Dep Chain",
+        },
+    )
+    org_resp = await client.post(
+        "/api/v1/organizations", json={"name": f"Org {slug}", "slug": f"org-{slug}"}
+    )
+    proj_resp = await client.post(
+        "/api/v1/projects",
+        json={
+            "name": f"Proj {slug}",
+            "organization_id": org_resp.json()["id"],
+            "start_date": "2024-01-01",
+        },
+    )
+    proj_id = proj_resp.json()["id"]
+    task_ids = []
+    for i in range(count):
+        resp = await client.post(
+            f"/api/v1/projects/{proj_id}/tasks",
+            json={"name": f"T{i}", "start_date": "2024-01-01", "duration": 480},
+        )
+        task_ids.append(resp.json()["id"])
+    return proj_id, task_ids
+
+
+@pytest.mark.asyncio
+async def test_create_dependency_cycle(client: AsyncClient):
+    """Create — link closes a cycle through other tasks — returns 409."""
+    proj_id, (a, b, c) = await _setup_chain(client, "cr-dep-cyc", 3)
+    for pred, succ in [(a, b), (b, c)]:
+        resp = await client.post(
+            f"/api/v1/projects/{proj_id}/dependencies",
+            json={"predecessor_id": pred, "successor_id": succ, "type": "FS"},
+        )
+        assert resp.status_code == 201
+
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/dependencies",
+        json={"predecessor_id": c, "successor_id": a, "type": "SS"},
+    )
+    assert resp.status_code == 409
+    assert "cycle" in resp.json()["detail"]
+
+    # A parallel link that does not close a loop is still fine
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/dependencies",
+        json={"predecessor_id": a, "successor_id": c, "type": "FS"},
+    )
+    assert resp.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_create_dependencies_batch(client: AsyncClient):
+    """Batch — acyclic links — all created (201)."""
+    proj_id, (a, b, c) = await _setup_chain(client, "cr-dep-batch", 3)
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/dependencies/batch",
+        json={
+            "items": [
+                {"predecessor_id": a, "successor_id": b},
+                {"predecessor_id": b, "successor_id": c},
+            ]
+        },
+    )
+    assert resp.status_code == 201
+    assert [d["successor_id"] for d in resp.json()] == [b, c]
+
+
+@pytest.mark.asyncio
+async def test_create_dependencies_batch_cycle(client: AsyncClient):
+    """Batch — cycle across existing and new links — nothing is created (409)."""
+    proj_id, (a, b, c) = await _setup_chain(client, "cr-dep-batch-cyc", 3)
+    await client.post(
+        f"/api/v1/projects/{proj_id}/dependencies",
+        json={"predecessor_id": a, "successor_id": b, "type": "FS"},
+    )
+
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/dependencies/batch",
+        json={
+            "items": [
+                {"predecessor_id": b, "successor_id": c},
+                {"predecessor_id": c, "successor_id": a},
+            ]
+        },
+    )
+    assert resp.status_code == 409
+
+    resp = await client.get(f"/api/v1/projects/{proj_id}/dependencies")
+    assert resp.json()["total"] == 1
+
+
 @pytest.mark.asyncio
 async def test_create_dependency_forbidden_viewer(
     client: AsyncClient, session: AsyncSession, setup_roles
@@ -1,11 +1,80 @@
+import asyncio
+
 import pytest
 from httpx import AsyncClient
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import cache
+from app.core.config import settings
+from app.core.security import decode_access_token
 from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.role import Role
 from app.models.task import Task
 from app.models.user import User
+from tests.api.v1.conftest import add_project_member
+
+
+class FakeRedis:
+    """The handful of Redis hash commands the access cache uses."""
+
+    def __init__(self):
+        self.hashes: dict[str, dict[str, bytes]] = {}
+        self.values: dict[str, bytes] = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = str(value).encode()
+        return True
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    async def scan_iter(self, match):
+        for key in list(self.hashes):
+            yield key
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.hashes.pop(key, None)
+
+
+class _FakePipeline:
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def hset(self, key, field, value):
+        self.redis.hashes.setdefault(key, {})[field] = value.encode()
+
+    def hdel(self, key, field):
+        self.redis.hashes.get(key, {}).pop(field, None)
+
+    def expire(self, key, seconds, nx=False):
+        pass
+
+    async def execute(self):
+        pass
+
+
+@pytest.fixture
+def fake_redis(monkeypatch) -> FakeRedis:
+    redis = FakeRedis()
+    monkeypatch.setattr("app.core.cache._get_redis", lambda: redis)
+    return redis
 
 
 @pytest.mark.asyncio
@@ -146,3 +215,182 @@ async def test_assignment_with_deleted_project_returns_404(
     resp = await client.patch(f"/api/v1/assignments/{aid}", json={"units": 0.5})
     assert resp.status_code == 404
     assert resp.json()["detail"] == "Assignment not found"
+
+
+async def _setup_member_project(
+    client: AsyncClient, session: AsyncSession, slug: str, role_name: str
+) -> str:
+    """Helper: owner creates a project, then a member with `role_name` logs in."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": f"{slug}-o@x.com",
+            "password": "StrongPassword123!",
+            "full_name": "Cache Owner",
+        },
+    )
+    org_resp = await client.post(
+        "/api/v1/organizations", json={"name": f"Org {slug}", "slug": f"org-{slug}"}
+    )
+    proj_resp = await client.post(
+        "/api/v1/projects",
+        json={
+            "name": f"Proj {slug}",
+            "organization_id": org_resp.json()["id"],
+            "start_date": "2024-01-01",
+        },
+    )
+    proj_id = proj_resp.json()["id"]
+
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": f"{slug}-m@x.com",
+            "password": "StrongPassword123!",
+            "full_name": "Cache Member",
+        },
+    )
+    await add_project_member(session, proj_id, f"{slug}-m@x.com", role_name)
+    await client.post(
+        "/api/v1/auth/login",
+        json={"email": f"{slug}-m@x.com", "password": "StrongPassword123!"},
+    )
+    return proj_id
+
+
+@pytest.mark.asyncio
+async def test_access_cache_stores_member_role(
+    client: AsyncClient, session: AsyncSession, setup_roles, fake_redis: FakeRedis
+):
+    """Access cache — a member's role is cached after the first check."""
+    proj_id = await _setup_member_project(client, session, "acc-cache", "viewer")
+
+    resp = await client.get(f"/api/v1/projects/{proj_id}/tasks")
+    assert resp.status_code == 200
+    assert list(fake_redis.hashes[f"access:{proj_id}"].values()) == [b"viewer"]
+
+    # Cached role is enforced on the next request
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks",
+        json={"name": "T1", "start_date": "2024-01-01", "duration": 480},
+    )
+    assert resp.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_access_cache_invalidated_on_role_change(
+    client: AsyncClient, session: AsyncSession, setup_roles, fake_redis: FakeRedis
+):
+    """Access cache — changing a membership drops the cached role."""
+    proj_id = await _setup_member_project(client, session, "acc-inval", "viewer")
+    await client.get(f"/api/v1/projects/{proj_id}/tasks")
+
+    member = (
+        await session.execute(
+            select(ProjectMember).where(ProjectMember.project_id == proj_id)
+        )
+    ).scalar_one()
+    manager = (
+        await session.execute(select(Role).where(Role.name == "manager"))
+    ).scalar_one()
+    member.role_id = manager.id
+    await session.commit()
+    await asyncio.sleep(0)  # Let the post-commit invalidation run
+
+    assert fake_redis.hashes[f"access:{proj_id}"] == {}
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks",
+        json={"name": "T1", "start_date": "2024-01-01", "duration": 480},
+    )
+    assert resp.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_project_access_inactive_user_returns_403(
+    client: AsyncClient, session: AsyncSession
+):
+    """Project access — inactive user — 403 before the project is looked up."""
+    email = "inactive-proj@x.com"
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": email,
+            "password": "StrongPassword123!",
+            "full_name": "Inactive Proj",
+        },
+    )
+    user = (await session.execute(select(User).where(User.email == email))).scalar_one()
+    user.is_active = False
+    await session.commit()
+
+    resp = await client.get(f"/api/v1/projects/{user.id}/tasks")
+    assert resp.status_code == 403
+    assert resp.json()["detail"] == "Inactive user"
+
+
+async def _register(client: AsyncClient, email: str) -> str:
+    """Helper: register a user and return their access token."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": email,
+            "password": "StrongPassword123!",
+            "full_name": "Token User",
+        },
+    )
+    return client.cookies["access_token"]
+
+
+async def _set_active(session: AsyncSession, email: str, active: bool) -> User:
+    user = (await session.execute(select(User).where(User.email == email))).scalar_one()
+    user.is_active = active
+    await session.commit()
+    await asyncio.sleep(0)  # Let the post-commit cache update run
+    return user
+
+
+@pytest.mark.asyncio
+async def test_access_token_carries_auth_claims(client: AsyncClient):
+    """Tokens — access token embeds active flag, system role and version."""
+    payload = decode_access_token(await _register(client, "claims@x.com"))
+    assert payload["act"] is True
+    assert payload["ver"] == 0
+    assert payload["srl"]
+
+
+@pytest.mark.asyncio
+async def test_token_from_before_deactivation_is_rejected(
+    client: AsyncClient, session: AsyncSession
+):
+    """Tokens — deactivate then reactivate — the old token no longer works."""
+    email = "reactivated@x.com"
+    await _register(client, email)
+    user = await _set_active(session, email, False)
+    user = await _set_active(session, email, True)
+    assert user.token_version == 2
+
+    resp = await client.get("/api/v1/organizations")
+    assert resp.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_stateless_auth_uses_cached_token_version(
+    client: AsyncClient, session: AsyncSession, fake_redis: FakeRedis, monkeypatch
+):
+    """Stateless auth — versions are cached; a bump revokes older tokens."""
+    monkeypatch.setattr(settings, "STATELESS_AUTH", True)
+    cache._token_versions.clear()
+    email = "stateless@x.com"
+    await _register(client, email)
+
+    resp = await client.get("/api/v1/organizations")
+    assert resp.status_code == 200
+    user = (await session.execute(select(User).where(User.email == email))).scalar_one()
+    assert fake_redis.values[f"auth:ver:{user.id}"] == b"0"
+
+    # Trusted from the cache, then rejected once the version moves on
+    assert (await client.get("/api/v1/organizations")).status_code == 200
+    await _set_active(session, email, False)
+    assert fake_redis.values[f"auth:ver:{user.id}"] == b"1"
+    resp = await client.get("/api/v1/organizations")
+    assert resp.status_code == 401
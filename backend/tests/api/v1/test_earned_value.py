@@ -0,0 +1,110 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task_baseline import TaskBaseline
+from tests.api.v1.conftest import setup_project
+
+
+@pytest.mark.asyncio
+async def test_earned_value_snapshots(client: AsyncClient, session: AsyncSession):
+    """Analyse — planned, earned and actual cost per status date, then the trend."""
+    proj_id = await setup_project(client, "ev-ok")
+    t_resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks",
+        json={
+            "name": "Build",
+            "start_date": "2024-01-01",
+            "duration": 1920,
+            "fixed_cost": "400",
+        },
+    )
+    tid = t_resp.json()["id"]
+    session.add(
+        TaskBaseline(
+            task_id=tid,
+            baseline_number=0,
+            duration=1920,
+            work=0,
+            start_date=date(2024, 1, 1),
+            finish_date=date(2024, 1, 5),
+            cost=Decimal("400"),
+        )
+    )
+    await session.commit()
+    await client.patch(
+        f"/api/v1/projects/{proj_id}/tasks/{tid}", json={"percent_complete": 25}
+    )
+
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/earned-value",
+        params={"status_date": "2024-01-02"},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["status_date"] == "2024-01-02"
+    # Two of four baseline days planned, a quarter earned and spent
+    assert data["project"] == {
+        "task_id": None,
+        "bac": "400.00",
+        "bcws": "200.00",
+        "bcwp": "100.00",
+        "acwp": "100.00",
+        "spi": "0.5000",
+        "cpi": "1.0000",
+        "eac": "400.00",
+        "vac": "0.00",
+    }
+    assert [task["task_id"] for task in data["tasks"]] == [tid]
+
+    await client.post(
+        f"/api/v1/projects/{proj_id}/earned-value",
+        params={"status_date": "2024-01-03"},
+    )
+    task = await client.get(f"/api/v1/projects/{proj_id}/tasks/{tid}")
+    assert task.json()["bcws"] == "300.00"
+
+    resp = await client.get(f"/api/v1/projects/{proj_id}/earned-value/trend")
+    assert resp.status_code == 200
+    assert [(p["status_date"], p["bcws"]) for p in resp.json()] == [
+        ("2024-01-02", "200.00"),
+        ("2024-01-03", "300.00"),
+    ]
+
+    # Re-analysing a status date replaces its snapshot
+    await client.post(
+        f"/api/v1/projects/{proj_id}/earned-value",
+        params={"status_date": "2024-01-03"},
+    )
+    resp = await client.get(
+        f"/api/v1/projects/{proj_id}/earned-value/trend", params={"task_id": tid}
+    )
+    assert len(resp.json()) == 2
+
+
+@pytest.mark.asyncio
+async def test_earned_value_without_baseline(client: AsyncClient):
+    """Analyse — no baseline saved — everything is zero, indices are null."""
+    proj_id = await setup_project(client, "ev-none")
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/earned-value",
+        params={"status_date": "2024-01-02", "baseline": 3},
+    )
+    assert resp.status_code == 200
+    project = resp.json()["project"]
+    assert project["bac"] == "0"
+    assert project["spi"] is None
+
+
+@pytest.mark.asyncio
+async def test_earned_value_status_date_out_of_range(client: AsyncClient):
+    """Analyse — a status date decades from the project — 400."""
+    proj_id = await setup_project(client, "ev-far")
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/earned-value",
+        params={"status_date": "2999-01-01"},
+    )
+    assert resp.status_code == 400
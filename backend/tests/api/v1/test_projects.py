@@ -1,3 +1,4 @@
+import json
 import uuid
 
 import pytest
@@ -424,6 +425,48 @@ async def test_list_projects_pagination(client: AsyncClient):
     assert len(resp2.json()["items"]) == 1
 
 
+@pytest.mark.asyncio
+async def test_list_projects_cursor_pagination(client: AsyncClient):
+    """List — cursor mode — newest first, each project exactly once."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "list_cur_o@x.com",
+            "password": "StrongPassword123!",
+            "full_name": "List Cur O",
+        },
+    )
+    org_resp = await client.post(
+        "/api/v1/organizations", json={"name": "Org Cur", "slug": "org-cur"}
+    )
+    org_id = org_resp.json()["id"]
+    for i in range(3):
+        await client.post(
+            "/api/v1/projects",
+            json={
+                "name": f"Proj {i}",
+                "organization_id": org_id,
+                "start_date": "2024-01-01",
+            },
+        )
+
+    resp1 = await client.get("/api/v1/projects", params={"cursor": "", "per_page": 2})
+    assert resp1.status_code == 200
+    body1 = resp1.json()
+    assert len(body1["items"]) == 2
+    assert body1["total"] is None
+    assert body1["next_cursor"]
+
+    resp2 = await client.get(
+        "/api/v1/projects", params={"cursor": body1["next_cursor"], "per_page": 2}
+    )
+    body2 = resp2.json()
+    assert len(body2["items"]) == 1
+    assert body2["next_cursor"] is None
+    ids = {p["id"] for p in body1["items"] + body2["items"]}
+    assert len(ids) == 3
+
+
 @pytest.mark.asyncio
 async def test_create_project_missing_fields(client: AsyncClient):
     """Create — missing fields — returns 422."""
@@ -854,3 +897,78 @@ async def test_update_project_invalid_fields(client: AsyncClient):
         f"/api/v1/projects/{proj_id}", json={"start_date": "invalid-date"}
     )
     assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_project_snapshot(client: AsyncClient):
+    """Snapshot — streams tasks, dependencies and assignments as NDJSON."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "snap_o@x.com",
+            "password": "StrongPassword123!",
+            "full_name": "Snap O",
+        },
+    )
+    org_resp = await client.post(
+        "/api/v1/organizations", json={"name": "Org Snap", "slug": "org-snap"}
+    )
+    proj_resp = await client.post(
+        "/api/v1/projects",
+        json={
+            "name": "Proj Snap",
+            "organization_id": org_resp.json()["id"],
+            "start_date": "2024-01-01",
+        },
+    )
+    proj_id = proj_resp.json()["id"]
+
+    task_ids = []
+    for i in range(3):
+        t_resp = await client.post(
+            f"/api/v1/projects/{proj_id}/tasks",
+            json={"name": f"Task {i}", "start_date": "2024-01-01", "duration": 480},
+        )
+        task_ids.append(t_resp.json()["id"])
+    await client.post(
+        f"/api/v1/projects/{proj_id}/dependencies",
+        json={"predecessor_id": task_ids[0], "successor_id": task_ids[1]},
+    )
+    r_resp = await client.post(
+        f"/api/v1/projects/{proj_id}/resources", json={"name": "Res 1", "type": "WORK"}
+    )
+    await client.post(
+        f"/api/v1/projects/{proj_id}/tasks/{task_ids[0]}/assignments",
+        json={
+            "resource_id": r_resp.json()["id"],
+            "start_date": "2024-01-01",
+            "finish_date": "2024-01-02",
+        },
+    )
+    # Deleted tasks are left out
+    await client.delete(f"/api/v1/projects/{proj_id}/tasks/{task_ids[2]}")
+
+    resp = await client.get(f"/api/v1/projects/{proj_id}/snapshot")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+
+    records = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["type"] for r in records] == ["task", "task", "dependency", "assignment"]
+    assert [r["data"]["id"] for r in records[:2]] == task_ids[:2]
+    assert records[2]["data"]["successor_id"] == task_ids[1]
+    assert records[3]["data"]["task_id"] == task_ids[0]
+
+
+@pytest.mark.asyncio
+async def test_project_snapshot_no_access(client: AsyncClient):
+    """Snapshot — unknown project — returns 404 before streaming."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "snap_nf@x.com",
+            "password": "StrongPassword123!",
+            "full_name": "Snap NF",
+        },
+    )
+    resp = await client.get(f"/api/v1/projects/{uuid.uuid4()}/snapshot")
+    assert resp.status_code == 404
@@ -4,7 +4,10 @@ import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from tests.api.v1.conftest import add_project_member
+from app.core.versioning import lock_project
+from app.models.enums import ResourceType
+from app.models.resource import Resource
+from tests.api.v1.conftest import add_project_member, setup_project
 
 
 @pytest.mark.asyncio
@@ -154,6 +157,48 @@ async def test_list_resources_pagination(client: AsyncClient):
     assert len(resp2.json()["items"]) == 1
 
 
+@pytest.mark.asyncio
+async def test_list_resources_cursor_pagination(client: AsyncClient):
+    """List — cursor mode — seeks on (name, id)."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "cur_res_o@x.com",
+            "password": "StrongPassword123!",
+            "full_name": "Cur Res O",
+        },
+    )
+    org_resp = await client.post(
+        "/api/v1/organizations", json={"name": "Org Cur Res", "slug": "org-cur-res"}
+    )
+    proj_resp = await client.post(
+        "/api/v1/projects",
+        json={
+            "name": "Proj Cur Res",
+            "organization_id": org_resp.json()["id"],
+            "start_date": "2024-01-01",
+        },
+    )
+    proj_id = proj_resp.json()["id"]
+    # Duplicate names are ordered by id, never skipped
+    for name in ["Beta", "Alpha", "Beta", "Gamma"]:
+        await client.post(f"/api/v1/projects/{proj_id}/resources", json={"name": name})
+
+    resp = await client.get(
+        f"/api/v1/projects/{proj_id}/resources", params={"cursor": "", "per_page": 2}
+    )
+    first = resp.json()
+    resp = await client.get(
+        f"/api/v1/projects/{proj_id}/resources",
+        params={"cursor": first["next_cursor"], "per_page": 2},
+    )
+    second = resp.json()
+
+    names = [r["name"] for r in first["items"] + second["items"]]
+    assert names == ["Alpha", "Beta", "Beta", "Gamma"]
+    assert second["next_cursor"] is None
+
+
 @pytest.mark.asyncio
 async def test_create_resource_success(client: AsyncClient):
     """Create — success (201)."""
@@ -713,3 +758,90 @@ async def test_delete_resource_not_found(client: AsyncClient):
     rand_id = str(uuid.uuid4())
     resp = await client.delete(f"/api/v1/projects/{proj_id}/resources/{rand_id}")
     assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_resource_utilization(client: AsyncClient):
+    """Utilization — allocated vs available minutes, by day and by week."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "util_o@x.com",
+            "password": "StrongPassword123!",
+            "full_name": "Util O",
+        },
+    )
+    org_resp = await client.post(
+        "/api/v1/organizations", json={"name": "Org Util", "slug": "org-util"}
+    )
+    proj_resp = await client.post(
+        "/api/v1/projects",
+        json={
+            "name": "Proj Util",
+            "organization_id": org_resp.json()["id"],
+            "start_date": "2024-01-01",
+        },
+    )
+    proj_id = proj_resp.json()["id"]
+    t_resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks",
+        json={"name": "Build", "start_date": "2024-01-01", "duration": 960},
+    )
+    r_resp = await client.post(
+        f"/api/v1/projects/{proj_id}/resources", json={"name": "Ann", "type": "WORK"}
+    )
+    rid = r_resp.json()["id"]
+    a_resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks/{t_resp.json()['id']}/assignments",
+        json={
+            "resource_id": rid,
+            "units": 1.0,
+            "start_date": "2024-01-01",
+            "finish_date": "2024-01-03",
+        },
+    )
+
+    params = {"from": "2024-01-01", "to": "2024-01-07"}
+    url = f"/api/v1/projects/{proj_id}/resources/utilization"
+    resp = await client.get(url, params=params)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["periods"][0] == "2024-01-01"
+    assert len(data["periods"]) == 7
+    [row] = data["resources"]
+    assert row["resource_id"] == rid
+    assert row["allocated"] == [480, 480, 0, 0, 0, 0, 0]
+    assert row["available"] == [480] * 7
+
+    resp = await client.get(url, params={**params, "bucket": "week"})
+    [row] = resp.json()["resources"]
+    assert resp.json()["periods"] == ["2024-01-01"]
+    assert row["allocated"] == [960]
+
+    # An edit bumps the project version, so the cached result is not reused
+    await client.patch(
+        f"/api/v1/assignments/{a_resp.json()['id']}", json={"units": 0.5}
+    )
+    resp = await client.get(url, params=params)
+    [row] = resp.json()["resources"]
+    assert row["allocated"][:2] == [240, 240]
+
+    resp = await client.get(url, params={"from": "2024-01-07", "to": "2024-01-01"})
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_resource_write_requires_project_lock(
+    client: AsyncClient, session: AsyncSession
+):
+    """Versioning — ORM writes to project data must hold lock_project()."""
+    proj_id = uuid.UUID(await setup_project(client, "res-lock"))
+
+    session.add(Resource(project_id=proj_id, name="Crane", type=ResourceType.WORK))
+    with pytest.raises(RuntimeError, match="lock_project"):
+        await session.flush()
+    await session.rollback()
+
+    await lock_project(session, proj_id)
+    session.add(Resource(project_id=proj_id, name="Crane", type=ResourceType.WORK))
+    await session.commit()
@@ -0,0 +1,263 @@
+import uuid
+from datetime import date
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.versioning import lock_project
+from app.models.calendar import Calendar
+from app.models.calendar_exception import CalendarException
+from app.models.dependency import Dependency
+from tests.api.v1.conftest import add_project_member, setup_project
+
+
+async def _create_task(client: AsyncClient, proj_id: str, name: str, duration: int):
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks",
+        json={"name": name, "start_date": "2024-01-01", "duration": duration},
+    )
+    return resp.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_reschedule_success(client: AsyncClient):
+    """Reschedule — success — FS links push dates and mark the critical path."""
+    proj_id = await setup_project(client, "sched-ok")
+    t1 = await _create_task(client, proj_id, "Design", 960)
+    t2 = await _create_task(client, proj_id, "Build", 1440)
+    t3 = await _create_task(client, proj_id, "Docs", 480)
+    for pred, succ in [(t1, t2), (t1, t3)]:
+        await client.post(
+            f"/api/v1/projects/{proj_id}/dependencies",
+            json={"predecessor_id": pred, "successor_id": succ, "type": "FS"},
+        )
+
+    resp = await client.post(f"/api/v1/projects/{proj_id}/schedule")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["task_count"] == 3
+    assert data["finish_date"] == "2024-01-06"
+    assert data["critical_count"] == 2
+    assert set(data["changed_task_ids"]) == {t1, t2, t3}
+
+    tasks = {
+        t["id"]: t
+        for t in (await client.get(f"/api/v1/projects/{proj_id}/tasks")).json()["items"]
+    }
+    assert tasks[t2]["start_date"] == "2024-01-03"
+    assert tasks[t2]["finish_date"] == "2024-01-06"
+    assert tasks[t2]["is_critical"] is True
+    assert tasks[t3]["is_critical"] is False
+    assert tasks[t3]["total_slack"] == 960
+
+    # Second run has nothing left to change
+    resp = await client.post(f"/api/v1/projects/{proj_id}/schedule")
+    assert resp.json()["changed_task_ids"] == []
+
+
+@pytest.mark.asyncio
+async def test_reschedule_updates_project_finish(client: AsyncClient):
+    """Reschedule — project finish_date follows the last task."""
+    proj_id = await setup_project(client, "sched-fin")
+    await _create_task(client, proj_id, "Only", 2400)
+
+    await client.post(f"/api/v1/projects/{proj_id}/schedule")
+
+    resp = await client.get(f"/api/v1/projects/{proj_id}")
+    assert resp.json()["finish_date"] == "2024-01-06"
+
+
+@pytest.mark.asyncio
+async def test_reschedule_uses_project_calendar(
+    client: AsyncClient, session: AsyncSession
+):
+    """Reschedule — project calendar — weekends and holidays hold no work."""
+    proj_id = await setup_project(client, "sched-cal")
+    eight_hours = {"start": "09:00", "end": "17:00"}
+    calendar = Calendar(name="Standard", work_week=[None] + [eight_hours] * 5 + [None])
+    session.add(calendar)
+    await session.commit()
+    session.add(
+        CalendarException(
+            calendar_id=calendar.id,
+            name="Holiday",
+            start_date=date(2024, 1, 3),
+            end_date=date(2024, 1, 3),
+        )
+    )
+    await session.commit()
+    await client.patch(
+        f"/api/v1/projects/{proj_id}",
+        json={"default_calendar_id": str(calendar.id)},
+    )
+
+    t1 = await _create_task(client, proj_id, "Design", 960)
+    t2 = await _create_task(client, proj_id, "Build", 1440)
+    await client.post(
+        f"/api/v1/projects/{proj_id}/dependencies",
+        json={"predecessor_id": t1, "successor_id": t2, "type": "FS"},
+    )
+
+    resp = await client.post(f"/api/v1/projects/{proj_id}/schedule")
+    # Build runs Thu, Fri and the following Mon, so the project ends on Tue
+    assert resp.json()["finish_date"] == "2024-01-09"
+
+    tasks = {
+        t["id"]: t
+        for t in (await client.get(f"/api/v1/projects/{proj_id}/tasks")).json()["items"]
+    }
+    assert tasks[t2]["start_date"] == "2024-01-04"
+
+
+@pytest.mark.asyncio
+async def test_reschedule_cycle_conflict(client: AsyncClient, session: AsyncSession):
+    """Reschedule — dependency cycle — returns 409."""
+    proj_id = await setup_project(client, "sched-cyc")
+    t1 = await _create_task(client, proj_id, "A", 480)
+    t2 = await _create_task(client, proj_id, "B", 480)
+    for pred, succ in [(t1, t2), (t2, t1)]:
+        await lock_project(session, uuid.UUID(proj_id))
+        session.add(
+            Dependency(
+                project_id=uuid.UUID(proj_id),
+                predecessor_id=uuid.UUID(pred),
+                successor_id=uuid.UUID(succ),
+            )
+        )
+        await session.commit()
+
+    resp = await client.post(f"/api/v1/projects/{proj_id}/schedule")
+    assert resp.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_reschedule_viewer_forbidden(
+    client: AsyncClient, session: AsyncSession, setup_roles
+):
+    """Reschedule — viewer — returns 403."""
+    proj_id = await setup_project(client, "sched-view")
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "sched-viewer@x.com",
+            "password": "StrongPassword123!",
+            "full_name": "Sched Viewer",
+        },
+    )
+    await add_project_member(session, proj_id, "sched-viewer@x.com", "viewer")
+
+    # Login Viewer
+    await client.post(
+        "/api/v1/auth/login",
+        json={"email": "sched-viewer@x.com", "password": "StrongPassword123!"},
+    )
+
+    resp = await client.post(f"/api/v1/projects/{proj_id}/schedule")
+    assert resp.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_level_resources(client: AsyncClient):
+    """Level — two full-time tasks on one resource — proposes, then applies."""
+    proj_id = await setup_project(client, "sched-level")
+    t1 = await _create_task(client, proj_id, "Design", 480)
+    t2 = await _create_task(client, proj_id, "Review", 480)
+    r_resp = await client.post(
+        f"/api/v1/projects/{proj_id}/resources", json={"name": "Ann", "type": "WORK"}
+    )
+    rid = r_resp.json()["id"]
+    for tid in (t1, t2):
+        await client.post(
+            f"/api/v1/projects/{proj_id}/tasks/{tid}/assignments",
+            json={
+                "resource_id": rid,
+                "units": 1.0,
+                "start_date": "2024-01-01",
+                "finish_date": "2024-01-02",
+            },
+        )
+
+    # Both tasks are critical, so nothing can move within slack
+    resp = await client.post(f"/api/v1/projects/{proj_id}/schedule/level")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["changes"] == []
+    assert len(data["unresolved_task_ids"]) == 1
+    assert data["overallocations"] == [
+        {
+            "resource_id": rid,
+            "start_date": "2024-01-01",
+            "finish_date": "2024-01-02",
+            "peak_units": "2",
+        }
+    ]
+
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/schedule/level",
+        params={"within_slack": "false", "apply": "true"},
+    )
+    data = resp.json()
+    assert data["applied"] is True
+    assert data["overallocations"] == []
+    [change] = data["changes"]
+    assert change["start_date"] == "2024-01-02"
+    assert change["leveling_delay"] == 480
+
+    task = await client.get(f"/api/v1/projects/{proj_id}/tasks/{change['id']}")
+    assert task.json()["finish_date"] == "2024-01-03"
+
+
+@pytest.mark.asyncio
+async def test_recalculate_costs(client: AsyncClient):
+    """Costs — hours x rate + per use + fixed cost, rolled up to the summary."""
+    proj_id = await setup_project(client, "sched-cost")
+    parent = await _create_task(client, proj_id, "Phase", 960)
+    t_resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks",
+        json={
+            "name": "Build",
+            "start_date": "2024-01-01",
+            "duration": 960,
+            "fixed_cost": "100",
+            "parent_task_id": parent,
+        },
+    )
+    tid = t_resp.json()["id"]
+    r_resp = await client.post(
+        f"/api/v1/projects/{proj_id}/resources",
+        json={
+            "name": "Ann",
+            "type": "WORK",
+            "standard_rate": "50",
+            "cost_per_use": "10",
+        },
+    )
+    await client.post(
+        f"/api/v1/projects/{proj_id}/tasks/{tid}/assignments",
+        json={
+            "resource_id": r_resp.json()["id"],
+            "units": 1.0,
+            "start_date": "2024-01-01",
+            "finish_date": "2024-01-03",
+        },
+    )
+
+    resp = await client.post(f"/api/v1/projects/{proj_id}/schedule/costs")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["assignment_count"] == 1
+    assert data["total_cost"] == "910.00"
+    assert set(data["changed_task_ids"]) == {parent, tid}
+
+    # 16 hours at 50 plus 10 per use
+    resp = await client.get(f"/api/v1/projects/{proj_id}/tasks/{tid}/assignments")
+    assert resp.json()[0]["cost"] == "810.00"
+    task = await client.get(f"/api/v1/projects/{proj_id}/tasks/{tid}")
+    assert task.json()["total_cost"] == "910.00"
+    summary = await client.get(f"/api/v1/projects/{proj_id}/tasks/{parent}")
+    assert summary.json()["total_cost"] == "910.00"
+
+    # Nothing changed since
+    resp = await client.post(f"/api/v1/projects/{proj_id}/schedule/costs")
+    assert resp.json()["changed_task_ids"] == []
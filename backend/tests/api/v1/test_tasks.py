@@ -1,4 +1,5 @@
 import uuid
+from decimal import Decimal
 
 import pytest
 from httpx import AsyncClient
@@ -214,6 +215,64 @@ async def test_list_tasks_pagination(client: AsyncClient):
     assert len(resp2.json()["items"]) == 1
 
 
+@pytest.mark.asyncio
+async def test_list_tasks_cursor_pagination(client: AsyncClient):
+    """List — cursor mode — walks every task once, in order, without totals."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "list_cur_t@x.com",
+            "password": "StrongPassword123!",
+            "full_name": "List Cur T",
+        },
+    )
+    org_resp = await client.post(
+        "/api/v1/organizations", json={"name": "Org Cur T", "slug": "org-cur-t"}
+    )
+    proj_resp = await client.post(
+        "/api/v1/projects",
+        json={
+            "name": "Proj Cur T",
+            "organization_id": org_resp.json()["id"],
+            "start_date": "2024-01-01",
+        },
+    )
+    proj_id = proj_resp.json()["id"]
+    for i in range(5):
+        await client.post(
+            f"/api/v1/projects/{proj_id}/tasks",
+            json={"name": f"Task {i}", "start_date": "2024-01-01", "duration": 480},
+        )
+
+    names = []
+    cursor = ""
+    while cursor is not None:
+        resp = await client.get(
+            f"/api/v1/projects/{proj_id}/tasks",
+            params={"cursor": cursor, "per_page": 2},
+        )
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["total"] is None
+        assert body["page"] is None
+        names += [t["name"] for t in body["items"]]
+        cursor = body["next_cursor"]
+    assert names == [f"Task {i}" for i in range(5)]
+
+    # Totals on request
+    resp = await client.get(
+        f"/api/v1/projects/{proj_id}/tasks",
+        params={"cursor": "", "per_page": 2, "include_total": True},
+    )
+    assert resp.json()["total"] == 5
+    assert resp.json()["total_pages"] == 3
+
+    resp = await client.get(
+        f"/api/v1/projects/{proj_id}/tasks", params={"cursor": "not-a-cursor"}
+    )
+    assert resp.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_create_task_success(client: AsyncClient):
     """Create — success — auto WBS and order_index."""
@@ -633,6 +692,66 @@ async def test_update_task_success(client: AsyncClient):
     )
     assert resp.status_code == 200
     assert resp.json()["name"] == "Updated Name"
+    assert resp.json()["rescheduled"] == []
+
+
+@pytest.mark.asyncio
+async def test_update_task_duration_reschedules_successors(client: AsyncClient):
+    """Update — duration change — moves only downstream tasks and reports them."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "upd_t_sched@x.com",
+            "password": "StrongPassword123!",
+            "full_name": "Upd T Sched",
+        },
+    )
+    org_resp = await client.post(
+        "/api/v1/organizations",
+        json={"name": "Org Upd T Sched", "slug": "org-upd-t-sched"},
+    )
+    org_id = org_resp.json()["id"]
+    proj_resp = await client.post(
+        "/api/v1/projects",
+        json={
+            "name": "Proj Upd T Sched",
+            "organization_id": org_id,
+            "start_date": "2024-01-01",
+        },
+    )
+    proj_id = proj_resp.json()["id"]
+
+    ids = []
+    for name in ["A", "B", "C", "Other"]:
+        t_resp = await client.post(
+            f"/api/v1/projects/{proj_id}/tasks",
+            json={"name": name, "start_date": "2024-01-01", "duration": 480},
+        )
+        ids.append(t_resp.json()["id"])
+    a, b, c, other = ids
+    for pred, succ in [(a, b), (b, c)]:
+        await client.post(
+            f"/api/v1/projects/{proj_id}/dependencies",
+            json={"predecessor_id": pred, "successor_id": succ, "type": "FS"},
+        )
+
+    resp = await client.patch(
+        f"/api/v1/projects/{proj_id}/tasks/{a}", json={"duration": 1440}
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["finish_date"] == "2024-01-04"
+
+    moved = {t["id"]: t for t in data["rescheduled"]}
+    assert set(moved) == {a, b, c}
+    assert moved[b]["start_date"] == "2024-01-04"
+    assert moved[c]["start_date"] == "2024-01-05"
+    assert moved[c]["finish_date"] == "2024-01-06"
+
+    resp = await client.get(f"/api/v1/projects/{proj_id}/tasks/{c}")
+    assert resp.json()["start_date"] == "2024-01-05"
+    resp = await client.get(f"/api/v1/projects/{proj_id}/tasks/{other}")
+    assert resp.json()["start_date"] == "2024-01-01"
 
 
 @pytest.mark.asyncio
@@ -797,6 +916,72 @@ async def test_delete_task_success_owner(client: AsyncClient):
     assert resp2.status_code == 404
 
 
+@pytest.mark.asyncio
+async def test_delete_task_subtree(client: AsyncClient):
+    """Delete — summary task — removes the whole subtree and its links."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "del_t_tree@x.com",
+            "password": "StrongPassword123!",
+            "full_name": "Del T Tree",
+        },
+    )
+    org_resp = await client.post(
+        "/api/v1/organizations", json={"name": "Org Del Tree", "slug": "org-del-tree"}
+    )
+    proj_resp = await client.post(
+        "/api/v1/projects",
+        json={
+            "name": "Proj Del Tree",
+            "organization_id": org_resp.json()["id"],
+            "start_date": "2024-01-01",
+        },
+    )
+    proj_id = proj_resp.json()["id"]
+
+    async def create(name, parent_id=None):
+        resp = await client.post(
+            f"/api/v1/projects/{proj_id}/tasks",
+            json={
+                "name": name,
+                "start_date": "2024-01-01",
+                "duration": 480,
+                "parent_task_id": parent_id,
+            },
+        )
+        return resp.json()["id"]
+
+    root = await create("Root")
+    child = await create("Child", root)
+    grandchild = await create("Grandchild", child)
+    outside = await create("Outside")
+
+    await client.post(
+        f"/api/v1/projects/{proj_id}/dependencies",
+        json={"predecessor_id": grandchild, "successor_id": outside},
+    )
+    r_resp = await client.post(
+        f"/api/v1/projects/{proj_id}/resources", json={"name": "Res", "type": "WORK"}
+    )
+    await client.post(
+        f"/api/v1/projects/{proj_id}/tasks/{grandchild}/assignments",
+        json={
+            "resource_id": r_resp.json()["id"],
+            "start_date": "2024-01-01",
+            "finish_date": "2024-01-02",
+        },
+    )
+
+    resp = await client.delete(f"/api/v1/projects/{proj_id}/tasks/{root}")
+    assert resp.status_code == 204
+
+    resp = await client.get(f"/api/v1/projects/{proj_id}/tasks")
+    assert [t["id"] for t in resp.json()["items"]] == [outside]
+    resp = await client.get(f"/api/v1/projects/{proj_id}/dependencies")
+    assert resp.json()["items"] == []
+
+
 @pytest.mark.asyncio
 async def test_delete_task_success_manager(
     client: AsyncClient, session: AsyncSession, setup_roles
@@ -951,3 +1136,325 @@ async def test_delete_task_viewer_forbidden(
 
     resp = await client.delete(f"/api/v1/projects/{proj_id}/tasks/{task_id}")
     assert resp.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_list_task_columns(client: AsyncClient):
+    """Columns — returns one array per requested field, in task order."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "cols_t@x.com",
+            "password": "StrongPassword123!",
+            "full_name": "Cols T",
+        },
+    )
+    org_resp = await client.post(
+        "/api/v1/organizations", json={"name": "Org Cols", "slug": "org-cols"}
+    )
+    proj_resp = await client.post(
+        "/api/v1/projects",
+        json={
+            "name": "Proj Cols",
+            "organization_id": org_resp.json()["id"],
+            "start_date": "2024-01-01",
+        },
+    )
+    proj_id = proj_resp.json()["id"]
+    ids = []
+    for i in range(3):
+        resp = await client.post(
+            f"/api/v1/projects/{proj_id}/tasks",
+            json={"name": f"Task {i}", "start_date": "2024-01-01", "duration": 480},
+        )
+        ids.append(resp.json()["id"])
+
+    resp = await client.get(
+        f"/api/v1/projects/{proj_id}/tasks/columns",
+        params={"fields": "id,name,start_date,percent_complete"},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 3
+    assert set(body["columns"]) == {"id", "name", "start_date", "percent_complete"}
+    assert body["columns"]["id"] == ids
+    assert body["columns"]["name"] == ["Task 0", "Task 1", "Task 2"]
+    assert body["columns"]["start_date"] == ["2024-01-01"] * 3
+
+    # Values match the row-oriented endpoint
+    rows = (await client.get(f"/api/v1/projects/{proj_id}/tasks")).json()["items"]
+    assert body["columns"]["percent_complete"] == [t["percent_complete"] for t in rows]
+
+    # Cursor pages
+    resp = await client.get(
+        f"/api/v1/projects/{proj_id}/tasks/columns",
+        params={"fields": "name", "cursor": "", "per_page": 2},
+    )
+    first = resp.json()
+    resp = await client.get(
+        f"/api/v1/projects/{proj_id}/tasks/columns",
+        params={"fields": "name", "cursor": first["next_cursor"], "per_page": 2},
+    )
+    second = resp.json()
+    assert first["columns"]["name"] + second["columns"]["name"] == [
+        "Task 0",
+        "Task 1",
+        "Task 2",
+    ]
+    assert second["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_list_task_columns_unknown_field(client: AsyncClient):
+    """Columns — unknown or internal field — returns 400."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "cols_bad@x.com",
+            "password": "StrongPassword123!",
+            "full_name": "Cols Bad",
+        },
+    )
+    org_resp = await client.post(
+        "/api/v1/organizations", json={"name": "Org Cols Bad", "slug": "org-cols-bad"}
+    )
+    proj_resp = await client.post(
+        "/api/v1/projects",
+        json={
+            "name": "Proj Cols Bad",
+            "organization_id": org_resp.json()["id"],
+            "start_date": "2024-01-01",
+        },
+    )
+    proj_id = proj_resp.json()["id"]
+
+    resp = await client.get(
+        f"/api/v1/projects/{proj_id}/tasks/columns", params={"fields": "id,bcws"}
+    )
+    assert resp.status_code == 400
+    assert "bcws" in resp.json()["detail"]
+
+
+async def _setup_batch_project(client: AsyncClient, slug: str) -> str:
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": f"{slug}@x.com",
+            "password": "StrongPassword123!",
+            "full_name": "Batch Owner",
+        },
+    )
+    org_resp = await client.post(
+        "/api/v1/organizations", json={"name": f"Org {slug}", "slug": slug}
+    )
+    proj_resp = await client.post(
+        "/api/v1/projects",
+        json={
+            "name": f"Proj {slug}",
+            "organization_id": org_resp.json()["id"],
+            "start_date": "2024-01-01",
+        },
+    )
+    return proj_resp.json()["id"]
+
+
+def _create_op(name: str, **extra) -> dict:
+    return {
+        "op": "create",
+        "name": name,
+        "start_date": "2024-01-01",
+        "duration": 480,
+        **extra,
+    }
+
+
+@pytest.mark.asyncio
+async def test_task_batch_creates_tree(client: AsyncClient):
+    """Batch — nested creates get WBS codes and order in one request."""
+    proj_id = await _setup_batch_project(client, "batch-tree")
+
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks/batch",
+        json={
+            "operations": [
+                _create_op("Phase 1", ref="p1"),
+                _create_op("Design", parent_ref="p1"),
+                _create_op("Build", parent_ref="p1"),
+                _create_op("Phase 2"),
+            ]
+        },
+    )
+    assert resp.status_code == 200
+    created = resp.json()["created"]
+    assert [(t["name"], t["wbs_code"], t["order_index"]) for t in created] == [
+        ("Phase 1", "1", 1),
+        ("Design", "1.1", 2),
+        ("Build", "1.2", 3),
+        ("Phase 2", "2", 4),
+    ]
+    assert created[0]["is_summary"] is True
+    assert created[1]["parent_task_id"] == created[0]["id"]
+    assert created[1]["outline_level"] == 2
+
+
+@pytest.mark.asyncio
+async def test_task_batch_move_update_delete(client: AsyncClient):
+    """Batch — moves, updates and deletes renumber the outline once."""
+    proj_id = await _setup_batch_project(client, "batch-mixed")
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks/batch",
+        json={
+            "operations": [
+                _create_op("A", ref="a"),
+                _create_op("A1", parent_ref="a"),
+                _create_op("B"),
+                _create_op("C"),
+            ]
+        },
+    )
+    a, a1, b, c = (t["id"] for t in resp.json()["created"])
+
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks/batch",
+        json={
+            "operations": [
+                {"op": "move", "id": c, "parent_task_id": None, "before_id": a},
+                {"op": "update", "id": b, "name": "B renamed", "parent_task_id": c},
+                {"op": "delete", "id": a},
+            ]
+        },
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert set(body["deleted"]) == {a, a1}
+    assert body["updated"][0]["name"] == "B renamed"
+    assert body["updated"][0]["wbs_code"] == "1.1"
+
+    resp = await client.get(f"/api/v1/projects/{proj_id}/tasks")
+    tasks = [(t["id"], t["wbs_code"], t["order_index"]) for t in resp.json()["items"]]
+    assert tasks == [(c, "1", 1), (b, "1.1", 2)]
+
+
+@pytest.mark.asyncio
+async def test_task_batch_is_atomic(client: AsyncClient):
+    """Batch — a bad operation rolls back the whole batch."""
+    proj_id = await _setup_batch_project(client, "batch-atomic")
+
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks/batch",
+        json={
+            "operations": [
+                _create_op("Kept?"),
+                {"op": "delete", "id": str(uuid.uuid4())},
+            ]
+        },
+    )
+    assert resp.status_code == 400
+
+    resp = await client.get(f"/api/v1/projects/{proj_id}/tasks")
+    assert resp.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_task_batch_move_under_descendant(client: AsyncClient):
+    """Batch — moving a task under its own child — returns 400."""
+    proj_id = await _setup_batch_project(client, "batch-loop")
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks/batch",
+        json={
+            "operations": [_create_op("A", ref="a"), _create_op("A1", parent_ref="a")]
+        },
+    )
+    a, a1 = (t["id"] for t in resp.json()["created"])
+
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks/batch",
+        json={"operations": [{"op": "move", "id": a, "parent_task_id": a1}]},
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_indent_outdent_task(client: AsyncClient):
+    """Indent/outdent — renumbers WBS codes and returns the changed tasks."""
+    proj_id = await _setup_batch_project(client, "indent-outdent")
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks/batch",
+        json={"operations": [_create_op("A"), _create_op("B"), _create_op("C")]},
+    )
+    a, b, c = (t["id"] for t in resp.json()["created"])
+
+    resp = await client.post(f"/api/v1/projects/{proj_id}/tasks/{b}/indent")
+    assert resp.status_code == 200
+    changes = {row["id"]: row for row in resp.json()}
+    assert set(changes) == {a, b, c}
+    assert changes[b]["parent_task_id"] == a
+    assert changes[b]["wbs_code"] == "1.1"
+    assert changes[a]["is_summary"] is True
+    assert changes[c]["wbs_code"] == "2"
+
+    resp = await client.post(f"/api/v1/projects/{proj_id}/tasks/{a}/indent")
+    assert resp.status_code == 400
+
+    resp = await client.post(f"/api/v1/projects/{proj_id}/tasks/{b}/outdent")
+    assert resp.status_code == 200
+    resp = await client.get(f"/api/v1/projects/{proj_id}/tasks")
+    assert [(t["id"], t["wbs_code"]) for t in resp.json()["items"]] == [
+        (a, "1"),
+        (b, "2"),
+        (c, "3"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_delete_task_renumbers_outline(client: AsyncClient):
+    """Delete — later tasks close the gap in WBS codes and order."""
+    proj_id = await _setup_batch_project(client, "delete-renumber")
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks/batch",
+        json={"operations": [_create_op("A"), _create_op("B"), _create_op("C")]},
+    )
+    a, b, c = (t["id"] for t in resp.json()["created"])
+
+    await client.delete(f"/api/v1/projects/{proj_id}/tasks/{a}")
+    resp = await client.get(f"/api/v1/projects/{proj_id}/tasks")
+    items = resp.json()["items"]
+    assert [(t["id"], t["wbs_code"], t["order_index"]) for t in items] == [
+        (b, "1", 1),
+        (c, "2", 2),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_summary_task_rolls_up_children(client: AsyncClient):
+    """Rollup — summary dates and progress follow edits to its children."""
+    proj_id = await _setup_batch_project(client, "rollup")
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks/batch",
+        json={
+            "operations": [
+                _create_op("Phase", ref="p"),
+                _create_op("Design", parent_ref="p", duration=480),
+                _create_op(
+                    "Build", parent_ref="p", start_date="2024-01-03", duration=1440
+                ),
+            ]
+        },
+    )
+    phase, design, build = resp.json()["created"]
+    assert phase["start_date"] == design["start_date"]
+    assert phase["finish_date"] == build["finish_date"]
+
+    resp = await client.patch(
+        f"/api/v1/projects/{proj_id}/tasks/{build['id']}",
+        json={"percent_complete": "50"},
+    )
+    assert resp.status_code == 200
+    resp = await client.get(f"/api/v1/projects/{proj_id}/tasks/{phase['id']}")
+    # Weighted by duration: 50% of 1440 over 1920 minutes
+    assert Decimal(resp.json()["percent_complete"]) == Decimal("37.50")
+
+    await client.delete(f"/api/v1/projects/{proj_id}/tasks/{design['id']}")
+    resp = await client.get(f"/api/v1/projects/{proj_id}/tasks/{phase['id']}")
+    assert resp.json()["start_date"] == build["start_date"]
+    assert Decimal(resp.json()["percent_complete"]) == Decimal("50.00")
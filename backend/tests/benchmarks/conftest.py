@@ -0,0 +1,104 @@
+"""
+Shared builders for benchmark tests.
+
+Benchmarks are marked `benchmark` and left out of the default run, since
+their wall-clock budgets depend on the machine; run them with
+`pytest -m benchmark`. They exist to catch order-of-magnitude regressions,
+not to measure exact speed.
+"""
+
+import random
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.dependency import Dependency
+from app.models.organization import Organization
+from app.models.project import Project
+from app.models.role import Role
+from app.models.task import Task
+from app.models.user import User
+
+
+def random_dag(size: int, max_preds: int = 2, window: int = 50, seed: int = 7):
+    """Edges (pred, succ) of a layered DAG where preds come from a recent window."""
+    rng = random.Random(seed)
+    edges = []
+    for succ in range(1, size):
+        lo = max(0, succ - window)
+        for pred in rng.sample(range(lo, succ), min(max_preds, succ - lo)):
+            edges.append((pred, succ))
+    return edges
+
+
+@pytest.fixture
+async def bench_project(session: AsyncSession) -> Project:
+    """An empty project owned by a throwaway user."""
+    role = Role(name=f"bench-{uuid.uuid4().hex[:8]}", scope="system")
+    session.add(role)
+    await session.flush()
+    user = User(
+        email=f"bench-{uuid.uuid4().hex[:8]}@x.com",
+        full_name="Bench",
+        system_role_id=role.id,
+    )
+    session.add(user)
+    await session.flush()
+    org = Organization(name="Bench Org", slug=f"bench-{uuid.uuid4().hex[:8]}")
+    session.add(org)
+    await session.flush()
+    project = Project(
+        owner_id=user.id,
+        organization_id=org.id,
+        name="Bench",
+        start_date=date(2024, 1, 1),
+        settings={},
+    )
+    session.add(project)
+    await session.commit()
+    return project
+
+
+async def insert_task_graph(
+    session: AsyncSession,
+    project: Project,
+    size: int,
+    edges: list[tuple[int, int]],
+) -> list[uuid.UUID]:
+    """Bulk insert `size` flat tasks and FS dependencies. Returns task ids."""
+    ids = [uuid.uuid4() for _ in range(size)]
+    start = project.start_date
+    await session.execute(
+        insert(Task),
+        [
+            {
+                "id": ids[i],
+                "project_id": project.id,
+                "wbs_code": str(i + 1),
+                "order_index": i + 1,
+                "name": f"Task {i + 1}",
+                "start_date": start,
+                "finish_date": start + timedelta(days=1),
+                "duration": 480 * (1 + i % 5),
+            }
+            for i in range(size)
+        ],
+    )
+    if edges:
+        await session.execute(
+            insert(Dependency),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "project_id": project.id,
+                    "predecessor_id": ids[p],
+                    "successor_id": ids[s],
+                }
+                for p, s in edges
+            ],
+        )
+    await session.commit()
+    return ids
@@ -0,0 +1,73 @@
+import statistics
+import time
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+pytestmark = pytest.mark.benchmark
+
+REQUESTS = 200
+
+
+async def _setup_project(client: AsyncClient) -> str:
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "bench-access@x.com",
+            "password": "StrongPassword123!",
+            "full_name": "Bench Access",
+        },
+    )
+    org_resp = await client.post(
+        "/api/v1/organizations",
+        json={"name": "Bench Access", "slug": "bench-access"},
+    )
+    proj_resp = await client.post(
+        "/api/v1/projects",
+        json={
+            "name": "Bench Access",
+            "organization_id": org_resp.json()["id"],
+            "start_date": "2024-01-01",
+        },
+    )
+    proj_id = proj_resp.json()["id"]
+    for i in range(20):
+        await client.post(
+            f"/api/v1/projects/{proj_id}/tasks",
+            json={"name": f"T{i}", "start_date": "2024-01-01", "duration": 480},
+        )
+    return proj_id
+
+
+async def test_list_tasks_latency(client: AsyncClient, connection: AsyncConnection):
+    """GET /tasks — one access query, then count and page; p50/p99 latency."""
+    proj_id = await _setup_project(client)
+
+    selects = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    event.listen(connection.sync_connection, "before_cursor_execute", _count)
+    try:
+        resp = await client.get(f"/api/v1/projects/{proj_id}/tasks")
+    finally:
+        event.remove(connection.sync_connection, "before_cursor_execute", _count)
+    assert resp.status_code == 200
+    # Access check (user + project + role) is a single statement
+    assert len(selects) == 3, selects
+
+    timings = []
+    for _ in range(REQUESTS):
+        started = time.perf_counter()
+        await client.get(f"/api/v1/projects/{proj_id}/tasks")
+        timings.append(time.perf_counter() - started)
+
+    timings.sort()
+    p50 = statistics.median(timings)
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    assert p50 < 0.05, f"p50 {p50:.3f}s"
+    assert p99 < 0.2, f"p99 {p99:.3f}s"
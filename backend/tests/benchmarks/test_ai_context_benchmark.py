@@ -0,0 +1,37 @@
+import time
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.project import Project
+from app.service.ai_context_service import build_context
+from tests.benchmarks.conftest import insert_task_graph
+
+pytestmark = pytest.mark.benchmark
+
+TASKS = 10_000
+BUDGET = 4_000
+
+
+async def test_context_10k_tasks(session: AsyncSession, bench_project: Project):
+    """Context — stream and rank 10k tasks, then reuse the snapshot."""
+    await insert_task_graph(session, bench_project, TASKS, [])
+
+    started = time.perf_counter()
+    context = await build_context(session, bench_project, budget=BUDGET)
+    elapsed = time.perf_counter() - started
+
+    assert context.task_count == TASKS
+    assert 0 < context.included_count < TASKS
+    assert context.tokens <= BUDGET
+    assert elapsed < 1.0, f"Building the context took {elapsed:.3f}s"
+
+    started = time.perf_counter()
+    context = await build_context(
+        session, bench_project, "What is left on Task 9999?", budget=BUDGET
+    )
+    elapsed = time.perf_counter() - started
+
+    assert context.mentioned_count == 1
+    assert "9999 Task 9999" in context.text
+    assert elapsed < 0.1, f"Reusing the snapshot took {elapsed:.3f}s"
@@ -0,0 +1,56 @@
+import time
+import uuid
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.assignment import Assignment
+from app.models.project import Project
+from app.models.resource import Resource
+from app.service.baseline_service import save_baseline
+from tests.benchmarks.conftest import insert_task_graph
+
+pytestmark = pytest.mark.benchmark
+
+TASKS = 20_000
+RESOURCES = 200
+
+
+async def test_save_baseline_20k_tasks(session: AsyncSession, bench_project: Project):
+    """Service — baseline of 20k tasks and 40k assignments, saved twice."""
+    task_ids = await insert_task_graph(session, bench_project, TASKS, [])
+    resource_ids = [uuid.uuid4() for _ in range(RESOURCES)]
+    await session.execute(
+        insert(Resource),
+        [
+            {"id": rid, "project_id": bench_project.id, "name": f"R{r}"}
+            for r, rid in enumerate(resource_ids)
+        ],
+    )
+    start = bench_project.start_date
+    await session.execute(
+        insert(Assignment),
+        [
+            {
+                "id": uuid.uuid4(),
+                "task_id": task_id,
+                "resource_id": resource_ids[(i + offset) % RESOURCES],
+                "start_date": start,
+                "finish_date": start,
+            }
+            for i, task_id in enumerate(task_ids)
+            for offset in (0, 1)
+        ],
+    )
+    await session.commit()
+
+    # The second save overwrites through ON CONFLICT
+    for _ in range(2):
+        started = time.perf_counter()
+        summary = await save_baseline(session, bench_project, 0)
+        elapsed = time.perf_counter() - started
+
+        assert summary.task_count == TASKS
+        assert summary.assignment_count == 2 * TASKS
+        assert elapsed < 3.0, f"Saving a baseline took {elapsed:.3f}s"
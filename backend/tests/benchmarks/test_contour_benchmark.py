@@ -0,0 +1,41 @@
+import random
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from app.service.contour_service import (
+    CONTOUR_SHAPES,
+    ContourWork,
+    WorkingDays,
+    timephase,
+)
+from app.service.schedule_service import DayTimeline
+
+pytestmark = pytest.mark.benchmark
+
+ASSIGNMENTS = 10_000
+
+
+def test_timephase_10k_assignments():
+    """Engine — spreading 10k contoured assignments over two years."""
+    rng = random.Random(5)
+    origin = date(2024, 1, 1)
+    contours = list(CONTOUR_SHAPES)
+    assignments = []
+    for _ in range(ASSIGNMENTS):
+        start = origin + timedelta(days=rng.randrange(650))
+        finish = start + timedelta(days=rng.randrange(1, 60))
+        work = 480 * rng.randrange(1, 40)
+        contour = rng.choice(contours)
+        assignments.append(ContourWork(1, work, start, finish, contour, None))
+
+    started = time.perf_counter()
+    days = WorkingDays(DayTimeline(origin, 480), origin, origin + timedelta(days=730))
+    phased = timephase(days, assignments)
+    elapsed = time.perf_counter() - started
+
+    assert len(phased) == ASSIGNMENTS
+    total = sum(a.work for a in assignments)
+    assert sum(sum(work) for _, work in phased) == pytest.approx(total)
+    assert elapsed < 1.0, f"Timephasing took {elapsed:.3f}s"
@@ -0,0 +1,145 @@
+import random
+import time
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.assignment import Assignment
+from app.models.enums import CostAccrual, RateTable, ResourceType
+from app.models.project import Project
+from app.models.resource import Resource
+from app.models.resource_rate import ResourceRate
+from app.service.contour_service import CONTOUR_SHAPES, WorkingDays
+from app.service.cost_service import (
+    CostInput,
+    Rate,
+    RateIndex,
+    assignment_costs,
+    recalculate_costs,
+)
+from app.service.schedule_service import DayTimeline
+from tests.benchmarks.conftest import insert_task_graph
+
+pytestmark = pytest.mark.benchmark
+
+TASKS = 5_000
+ASSIGNMENTS = 10_000
+RESOURCES = 500
+TABLES = (RateTable.A, RateTable.B, RateTable.C, RateTable.D)
+
+
+def _rate_rows(resource_ids, origin, seed: int = 3):
+    """Four rate changes a year on every table of every resource."""
+    rng = random.Random(seed)
+    return [
+        (rid, table, origin + timedelta(days=91 * q), rng.randrange(20, 150), 0)
+        for rid in resource_ids
+        for table in TABLES
+        for q in range(4)
+    ]
+
+
+def _assignments(resource_ids, origin, seed: int = 9):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(ASSIGNMENTS):
+        start = origin + timedelta(days=rng.randrange(330))
+        rows.append(
+            CostInput(
+                resource_id=rng.choice(resource_ids),
+                resource_type=ResourceType.WORK,
+                accrue_at=rng.choice(list(CostAccrual)),
+                rate_table=rng.choice(TABLES),
+                units=1.0,
+                work=0 if i % 2 else 480 * rng.randrange(1, 20),
+                cost=0,
+                start_date=start,
+                finish_date=start + timedelta(days=rng.randrange(1, 30)),
+                work_contour=rng.choice(list(CONTOUR_SHAPES)),
+                contour_data=None,
+            )
+        )
+    return rows
+
+
+def test_cost_10k_assignments():
+    """Engine — timephased cost of 10k assignments over four rate tables."""
+    resource_ids = [uuid.uuid4() for _ in range(RESOURCES)]
+    origin = date(2024, 1, 1)
+    assignments = _assignments(resource_ids, origin)
+
+    started = time.perf_counter()
+    rates = RateIndex(
+        {rid: Rate(50.0, 0.0) for rid in resource_ids},
+        _rate_rows(resource_ids, origin),
+    )
+    days = WorkingDays(DayTimeline(origin, 480), origin, origin + timedelta(days=400))
+    phased = assignment_costs(days, rates, assignments)
+    elapsed = time.perf_counter() - started
+
+    assert len(phased) == ASSIGNMENTS
+    assert all(sum(costs) > 0 for _, costs in phased)
+    assert elapsed < 0.5, f"Costing took {elapsed:.3f}s"
+
+
+async def test_recalculate_costs_10k_assignments(
+    session: AsyncSession, bench_project: Project
+):
+    """Service — load, cost and write a 5k-task, 10k-assignment project."""
+    task_ids = await insert_task_graph(session, bench_project, TASKS, [])
+    resource_ids = [uuid.uuid4() for _ in range(RESOURCES)]
+    origin = bench_project.start_date
+    await session.execute(
+        insert(Resource),
+        [
+            {
+                "id": rid,
+                "project_id": bench_project.id,
+                "name": f"R{r}",
+                "standard_rate": 50,
+            }
+            for r, rid in enumerate(resource_ids)
+        ],
+    )
+    await session.execute(
+        insert(ResourceRate),
+        [
+            {
+                "id": uuid.uuid4(),
+                "resource_id": rid,
+                "rate_table": table,
+                "effective_date": effective,
+                "standard_rate": rate,
+            }
+            for rid, table, effective, rate, _ in _rate_rows(resource_ids, origin)
+        ],
+    )
+    # Two resources per task
+    await session.execute(
+        insert(Assignment),
+        [
+            {
+                "id": uuid.uuid4(),
+                "task_id": task_ids[i // 2],
+                "resource_id": resource_ids[(i // 2 + i % 2 * 7) % RESOURCES],
+                "rate_table": row.rate_table,
+                "work": row.work,
+                "work_contour": row.work_contour,
+                "start_date": row.start_date,
+                "finish_date": row.finish_date,
+            }
+            for i, row in enumerate(_assignments(resource_ids, origin))
+        ],
+    )
+    await session.commit()
+
+    started = time.perf_counter()
+    summary = await recalculate_costs(session, bench_project)
+    elapsed = time.perf_counter() - started
+
+    assert summary.assignment_count == ASSIGNMENTS
+    assert len(summary.changed_task_ids) == TASKS
+    assert elapsed < 2.0, f"Recalculating costs took {elapsed:.3f}s"
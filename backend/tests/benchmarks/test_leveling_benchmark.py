@@ -0,0 +1,93 @@
+import random
+import time
+import uuid
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.assignment import Assignment
+from app.models.project import Project
+from app.models.resource import Resource
+from app.service.leveling_service import CapacityTimeline, level, level_project
+from app.service.schedule_service import ASAP, FS, ScheduleGraph, compute_schedule
+from tests.benchmarks.conftest import insert_task_graph, random_dag
+
+pytestmark = pytest.mark.benchmark
+
+TASKS = 5_000
+RESOURCES = 500
+
+
+def _demands(seed: int = 11) -> list[list[tuple[int, int]]]:
+    """One or two resources per task, full or half time."""
+    rng = random.Random(seed)
+    return [
+        [(r, rng.choice((50, 100))) for r in rng.sample(range(RESOURCES), 1 + i % 2)]
+        for i in range(TASKS)
+    ]
+
+
+def test_level_5k_tasks_500_resources():
+    """Engine — serial leveling of 5k tasks over 500 resources."""
+    graph = ScheduleGraph.build(
+        ids=list(range(TASKS)),
+        duration=[480 * (1 + i % 5) for i in range(TASKS)],
+        anchor=[0] * TASKS,
+        constraint=[ASAP] * TASKS,
+        constraint_at=[0] * TASKS,
+        pinned=[False] * TASKS,
+        edges=[(p, s, FS, 0) for p, s in random_dag(TASKS)],
+    )
+    cpm = compute_schedule(graph)
+    demands = _demands()
+
+    for within_slack in (True, False):
+        resources = [CapacityTimeline(100) for _ in range(RESOURCES)]
+        started = time.perf_counter()
+        result = level(graph, cpm, [500] * TASKS, demands, resources, 480, within_slack)
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 1.0, f"Leveling took {elapsed:.3f}s"
+        if not within_slack:
+            assert result.unresolved == []
+            assert not any(timeline.overloaded() for timeline in resources)
+
+
+async def test_level_project_5k_tasks(session: AsyncSession, bench_project: Project):
+    """Service — load, level and diff a 5k-task, 500-resource project."""
+    task_ids = await insert_task_graph(session, bench_project, TASKS, random_dag(TASKS))
+    resource_ids = [uuid.uuid4() for _ in range(RESOURCES)]
+    await session.execute(
+        insert(Resource),
+        [
+            {"id": rid, "project_id": bench_project.id, "name": f"R{r}"}
+            for r, rid in enumerate(resource_ids)
+        ],
+    )
+    start = bench_project.start_date
+    await session.execute(
+        insert(Assignment),
+        [
+            {
+                "id": uuid.uuid4(),
+                "task_id": task_ids[i],
+                "resource_id": resource_ids[r],
+                "units": units / 100,
+                "start_date": start,
+                "finish_date": start,
+            }
+            for i, demand in enumerate(_demands())
+            for r, units in demand
+        ],
+    )
+    await session.commit()
+
+    started = time.perf_counter()
+    summary = await level_project(session, bench_project, within_slack=False)
+    elapsed = time.perf_counter() - started
+
+    assert summary.task_count == TASKS
+    assert summary.resource_count == RESOURCES
+    assert summary.overallocations == []
+    assert elapsed < 3.0, f"Leveling a project took {elapsed:.3f}s"
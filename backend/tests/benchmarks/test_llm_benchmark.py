@@ -0,0 +1,63 @@
+import asyncio
+import random
+import time
+
+import pytest
+
+from app.core import llm
+from app.core.llm import LLMRequest, Message, get_gateway
+
+pytestmark = pytest.mark.benchmark
+
+CALLS = 2_000
+PROMPTS = 200
+WAVE = 50  # Within LLM_MAX_QUEUE
+LATENCY = 0.01  # Seconds per stub provider call
+
+
+def _estimate(task: int) -> LLMRequest:
+    return LLMRequest(
+        messages=(Message("user", f"Estimate the duration of task {task}"),),
+        temperature=0,
+    )
+
+
+async def test_gateway_cache_hit_rate(stub_llm):
+    """2k estimation calls over 200 prompts make 200 provider calls."""
+    stub_llm.delay = LATENCY
+    gateway = get_gateway()
+    rng = random.Random(5)
+    tasks = [rng.randrange(PROMPTS) for _ in range(CALLS)]
+
+    started = time.perf_counter()
+    # Arrive in waves, so later ones find cached or in-flight replies
+    for i in range(0, CALLS, WAVE):
+        wave = tasks[i : i + WAVE]
+        await asyncio.gather(*(gateway.complete(_estimate(t)) for t in wave))
+    elapsed = time.perf_counter() - started
+
+    stats = gateway.stats()
+    assert stub_llm.calls == len(set(tasks))
+    assert stats.cache_hits + stats.coalesced + stub_llm.calls == CALLS
+    assert elapsed < 2.0, f"Gateway took {elapsed:.3f}s"
+
+
+async def test_gateway_throughput(stub_llm, monkeypatch):
+    """Distinct calls run LLM_MAX_CONCURRENCY at a time, never more."""
+    stub_llm.delay = LATENCY
+    gateway = get_gateway()
+    calls = 40 * llm.settings.LLM_MAX_CONCURRENCY
+    monkeypatch.setattr(llm.settings, "LLM_MAX_QUEUE", calls)
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            gateway.complete(LLMRequest(messages=(Message("user", f"Q{i}"),)))
+            for i in range(calls)
+        )
+    )
+    elapsed = time.perf_counter() - started
+
+    assert stub_llm.peak == llm.settings.LLM_MAX_CONCURRENCY
+    # 40 rounds of LATENCY, plus overhead
+    assert elapsed < 40 * LATENCY * 3, f"Gateway took {elapsed:.3f}s"
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import security
+
+LOGINS = 16
+
+
+async def _loop_lag(stop: asyncio.Event, lags: list[float]) -> None:
+    """Record how late a 5 ms sleep wakes up, i.e. how long the loop was blocked."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.005)
+        lags.append(time.perf_counter() - started - 0.005)
+
+
+@pytest.mark.benchmark
+async def test_login_wave_does_not_block_loop():
+    """A burst of bcrypt verifications leaves the event loop responsive."""
+    hashed = await security.hash_password("StrongPassword123!")
+
+    stop = asyncio.Event()
+    lags = []
+    probe = asyncio.create_task(_loop_lag(stop, lags))
+    results = await asyncio.gather(
+        *(security.verify_password("StrongPassword123!", hashed) for _ in range(LOGINS))
+    )
+    stop.set()
+    await probe
+
+    assert all(results)
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99) - 1]
+    stats = security.password_pool_stats()
+    # One inline bcrypt call alone would block the loop for 100 ms or more
+    assert p99 < 0.05, f"loop lag p99 {p99:.3f}s"
+    assert stats.waiting == 0
+    assert stats.running == 0
+
+
+async def test_password_queue_full_rejects(monkeypatch):
+    """Past PASSWORD_HASH_MAX_QUEUE waiting calls, hashing returns 503."""
+    monkeypatch.setattr(security.settings, "PASSWORD_HASH_MAX_QUEUE", 0)
+    rejected = security.password_pool_stats().rejected
+
+    with pytest.raises(HTTPException) as exc:
+        await security.hash_password("StrongPassword123!")
+    assert exc.value.status_code == 503
+    assert security.password_pool_stats().rejected == rejected + 1
+
+
+async def test_cancelled_queued_calls_free_their_place(monkeypatch):
+    """Callers that leave while queued do not keep counting as waiting."""
+    monkeypatch.setattr(security.settings, "PASSWORD_HASH_WORKERS", 1)
+    monkeypatch.setattr(security.settings, "PASSWORD_HASH_MAX_QUEUE", 4)
+    monkeypatch.setattr(security, "_password_pool", security._PasswordPool())
+    release = threading.Event()
+
+    busy = asyncio.create_task(security._password_pool.run(release.wait))
+    await asyncio.sleep(0.01)
+    queued = [
+        asyncio.create_task(security.hash_password("StrongPassword123!"))
+        for _ in range(4)
+    ]
+    await asyncio.sleep(0.01)
+    assert security.password_pool_stats().waiting == 4
+    for task in queued:
+        task.cancel()
+    await asyncio.gather(*queued, return_exceptions=True)
+    release.set()
+    await busy
+
+    stats = security.password_pool_stats()
+    assert (stats.waiting, stats.running) == (0, 0)
+    hashed = await security.hash_password("StrongPassword123!")
+    assert await security.verify_password("StrongPassword123!", hashed)
@@ -0,0 +1,67 @@
+import time
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.project import Project
+from app.models.task import Task
+from app.service.schedule_service import (
+    ASAP,
+    FS,
+    ScheduleGraph,
+    compute_schedule,
+    reschedule_project,
+)
+from tests.benchmarks.conftest import insert_task_graph, random_dag
+
+pytestmark = pytest.mark.benchmark
+
+SIZE = 20_000
+
+
+def test_cpm_passes_20k_tasks():
+    """Engine — forward/backward passes over 20k tasks stay well under a second."""
+    edges = random_dag(SIZE)
+    graph = ScheduleGraph.build(
+        ids=list(range(SIZE)),
+        duration=[480 * (1 + i % 5) for i in range(SIZE)],
+        anchor=[0] * SIZE,
+        constraint=[ASAP] * SIZE,
+        constraint_at=[0] * SIZE,
+        pinned=[False] * SIZE,
+        edges=[(p, s, FS, 0) for p, s in edges],
+    )
+
+    started = time.perf_counter()
+    result = compute_schedule(graph)
+    elapsed = time.perf_counter() - started
+
+    assert result.finish > 0
+    assert elapsed < 0.5, f"CPM passes took {elapsed:.3f}s"
+
+
+async def test_reschedule_project_20k_tasks(
+    session: AsyncSession, bench_project: Project
+):
+    """Service — load, schedule and bulk-write a 20k-task project."""
+    await insert_task_graph(session, bench_project, SIZE, random_dag(SIZE))
+
+    started = time.perf_counter()
+    summary = await reschedule_project(session, bench_project)
+    elapsed = time.perf_counter() - started
+
+    assert summary.task_count == SIZE
+    critical = await session.scalar(
+        select(func.count()).where(
+            Task.project_id == bench_project.id, Task.is_critical.is_(True)
+        )
+    )
+    assert critical == summary.critical_count
+    # First run rewrites every row; later runs only write what changed
+    assert elapsed < 1.5, f"Full reschedule took {elapsed:.3f}s"
+
+    started = time.perf_counter()
+    await reschedule_project(session, bench_project)
+    elapsed = time.perf_counter() - started
+    assert elapsed < 1, f"No-op reschedule took {elapsed:.3f}s"
@@ -0,0 +1,90 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from tests.api.v1.conftest import setup_project
+
+pytestmark = pytest.mark.benchmark
+
+WIDE = 2000
+# wbs_code is VARCHAR(50), which caps the outline at 24 levels ("1.1.…")
+DEEP = 24
+BRANCH = 40
+
+
+def _create(name: str, **extra) -> dict:
+    return {
+        "op": "create",
+        "name": name,
+        "start_date": "2024-01-01",
+        "duration": 480,
+        **extra,
+    }
+
+
+async def _delete_root(
+    client: AsyncClient,
+    connection: AsyncConnection,
+    proj_id: str,
+    root_id: str,
+) -> list[str]:
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(connection.sync_connection, "before_cursor_execute", _record)
+    try:
+        resp = await client.delete(f"/api/v1/projects/{proj_id}/tasks/{root_id}")
+    finally:
+        event.remove(connection.sync_connection, "before_cursor_execute", _record)
+    assert resp.status_code == 204
+    return statements
+
+
+async def test_delete_wide_subtree(client: AsyncClient, connection: AsyncConnection):
+    """DELETE a summary with 2,000 children — statement count stays constant."""
+    proj_id = await setup_project(client, "bench-del-wide")
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks/batch",
+        json={
+            "operations": [
+                _create("Root", ref="root"),
+                *(_create(f"T{i}", parent_ref="root") for i in range(WIDE)),
+            ]
+        },
+    )
+    root_id = resp.json()["created"][0]["id"]
+
+    statements = await _delete_root(client, connection, proj_id, root_id)
+    # Access check, lock, subtree, 3 deletes/updates (+ savepoint bookkeeping)
+    assert len(statements) < 15, statements
+
+    resp = await client.get(f"/api/v1/projects/{proj_id}/tasks")
+    assert resp.json()["total"] == 0
+
+
+async def test_delete_deep_subtree(client: AsyncClient, connection: AsyncConnection):
+    """DELETE the top of a 24-level chain with leaves on every level."""
+    proj_id = await setup_project(client, "bench-del-deep")
+    operations = [_create("L0", ref="0")]
+    for level in range(1, DEEP):
+        operations.append(
+            _create(f"L{level}", ref=str(level), parent_ref=str(level - 1))
+        )
+        operations += [
+            _create(f"L{level}.{i}", parent_ref=str(level - 1)) for i in range(BRANCH)
+        ]
+    resp = await client.post(
+        f"/api/v1/projects/{proj_id}/tasks/batch", json={"operations": operations}
+    )
+    created = resp.json()["created"]
+    assert max(t["outline_level"] for t in created) == DEEP
+    root_id = created[0]["id"]
+
+    statements = await _delete_root(client, connection, proj_id, root_id)
+    assert len(statements) < 15, statements
+
+    resp = await client.get(f"/api/v1/projects/{proj_id}/tasks")
+    assert resp.json()["total"] == 0
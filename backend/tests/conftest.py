@@ -1,6 +1,10 @@
+import asyncio
+import json
+import re
 from collections.abc import AsyncGenerator
 from unittest.mock import AsyncMock, MagicMock
 
+import httpx
 import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import (
@@ -12,6 +16,7 @@ from sqlalchemy.ext.asyncio import (
 
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.llm import LLMGateway
 from app.main import app
 
 # ---------------------------------------------------------------------------
@@ -47,6 +52,18 @@ def disable_rate_limiter():
     app.state.limiter.enabled = False
 
 
+@pytest.fixture(autouse=True)
+def _disable_access_cache(monkeypatch):
+    """Keep tests off Redis; cache tests install their own fake client."""
+    monkeypatch.setattr("app.core.cache._get_redis", lambda: None)
+
+
+@pytest.fixture(autouse=True)
+def _isolate_ai_usage(monkeypatch):
+    """Each test starts with an empty AI usage buffer."""
+    monkeypatch.setattr("app.service.ai_usage_service._buffer", [])
+
+
 @pytest.fixture(autouse=True)
 def _mock_mail_globally(monkeypatch):
     """
@@ -68,24 +85,29 @@ def _mock_mail_globally(monkeypatch):
 async def client(
     connection: AsyncConnection,
     transaction: AsyncTransaction,
+    monkeypatch,
 ) -> AsyncGenerator[AsyncClient]:
     """
     Test client that uses a savepoint-wrapped session.
 
     Any db.commit() inside service code only commits a savepoint.
-    After the test, the outer transaction is rolled back.
+    After the test, the outer transaction is rolled back. Sessions that
+    services open themselves (after the response) share the connection too.
     """
 
-    async def _override_get_db() -> AsyncGenerator[AsyncSession]:
-        session = AsyncSession(
+    def _session() -> AsyncSession:
+        return AsyncSession(
             bind=connection,
             join_transaction_mode="create_savepoint",
             expire_on_commit=False,
         )
-        async with session:
+
+    async def _override_get_db() -> AsyncGenerator[AsyncSession]:
+        async with _session() as session:
             yield session
 
     app.dependency_overrides[get_db] = _override_get_db
+    monkeypatch.setattr("app.service.ai_chat_service.AsyncSessionLocal", _session)
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
@@ -113,3 +135,88 @@ async def session(
     )
     async with session:
         yield session
+
+
+# ---------------------------------------------------------------------------
+# LLM stub — a local stand-in for the Anthropic messages API, so the gateway
+# and AI endpoints run offline
+# ---------------------------------------------------------------------------
+
+
+class StubLLM:
+    """
+    Replies "echo: <last user message>" after `delay` seconds, streamed one
+    word per event when asked. Tokens are counted as words.
+    """
+
+    def __init__(self) -> None:
+        self.delay = 0.0
+        self.status_code = 200
+        self.calls = 0
+        self.running = 0
+        self.peak = 0  # Most calls handled at once
+        self.requests: list[dict] = []
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        body = json.loads(request.content)
+        self.requests.append(body)
+        if self.status_code != 200:
+            return httpx.Response(self.status_code, json={"type": "error"})
+
+        prompt = body["messages"][-1]["content"]
+        text = f"echo: {prompt}"
+        usage = {"input_tokens": len(prompt.split()), "output_tokens": 0}
+        if not body.get("stream"):
+            return httpx.Response(
+                200,
+                json={
+                    "model": body["model"],
+                    "content": [{"type": "text", "text": text}],
+                    "stop_reason": "end_turn",
+                    "usage": {**usage, "output_tokens": len(text.split())},
+                },
+            )
+        events = [
+            {
+                "type": "message_start",
+                "message": {"model": body["model"], "content": [], "usage": usage},
+            },
+            *(
+                {"type": "content_block_delta", "delta": {"text": word}}
+                for word in re.findall(r"\S+\s*", text)
+            ),
+            {
+                "type": "message_delta",
+                "delta": {"stop_reason": "end_turn"},
+                "usage": {"output_tokens": len(text.split())},
+            },
+            {"type": "message_stop"},
+        ]
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/event-stream"},
+            text="".join(
+                f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+                for event in events
+            ),
+        )
+
+
+@pytest.fixture
+async def stub_llm(monkeypatch) -> AsyncGenerator[StubLLM]:
+    """Route the LLM gateway to a StubLLM for the test."""
+    stub = StubLLM()
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "anthropic")
+    monkeypatch.setattr(settings, "ANTHROPIC_API_KEY", "test-key")
+    gateway = LLMGateway(transport=httpx.MockTransport(stub.handle))
+    monkeypatch.setattr("app.core.llm._gateway", gateway)
+    yield stub
+    await gateway.aclose()
@@ -0,0 +1,61 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from app.core.llm import LLMRequest, Message
+from app.service.ai_chat_service import SSE_BUFFER_CHUNKS, ChatTurn
+
+WORDS = 500
+
+
+def _turn(question: str) -> ChatTurn:
+    request = LLMRequest(messages=(Message("user", question),))
+    return ChatTurn(SimpleNamespace(id=None), question, request, context=None)
+
+
+def _deltas(events: list[bytes]) -> list[str]:
+    return [
+        json.loads(event.decode().split("data: ", 1)[1])["text"]
+        for event in events
+        if event.startswith(b"event: delta")
+    ]
+
+
+async def test_slow_client_gets_merged_chunks(stub_llm):
+    """A client slower than the provider gets fewer, larger chunks."""
+    question = " ".join(f"w{i}" for i in range(WORDS))
+    turn = _turn(question)
+
+    events = []
+    async for event in turn.events():
+        events.append(event)
+        await asyncio.sleep(0.001)  # Slow reader
+
+    deltas = _deltas(events)
+    assert "".join(deltas) == f"echo: {question}"
+    assert len(deltas) < WORDS / 2
+    assert events[-1].startswith(b"event: done")
+    assert turn.finish_reason == "end_turn"
+
+
+async def test_fast_client_gets_every_chunk(stub_llm):
+    turn = _turn("one two three")
+    deltas = _deltas([event async for event in turn.events()])
+    assert deltas == ["echo: ", "one ", "two ", "three"]
+    assert len(deltas) <= SSE_BUFFER_CHUNKS
+
+
+async def test_disconnect_cancels_reply(stub_llm):
+    """A client that goes away cancels the provider call."""
+    stub_llm.delay = 0.05
+    turn = _turn("Hello")
+    events = turn.events()
+
+    assert (await anext(events)).startswith(b"event: start")
+    reader = asyncio.create_task(anext(events))
+    await asyncio.sleep(0.01)
+    reader.cancel()
+    await asyncio.sleep(0.1)
+
+    assert turn.response is None
+    assert turn.finish_reason == "cancelled"
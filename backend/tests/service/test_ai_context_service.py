@@ -0,0 +1,127 @@
+from datetime import date
+from types import SimpleNamespace
+
+from app.service.ai_context_service import (
+    SnapshotBuilder,
+    estimate_tokens,
+    mentioned,
+    pack,
+)
+
+AS_OF = date(2024, 3, 1)
+PROJECT = SimpleNamespace(
+    name="Bridge",
+    status="ACTIVE",
+    start_date=date(2024, 1, 1),
+    finish_date=date(2024, 12, 31),
+)
+
+
+def _task(wbs: str, name: str, **overrides):
+    values = {
+        "wbs_code": wbs,
+        "name": name,
+        "outline_level": wbs.count(".") + 1,
+        "start_date": date(2024, 6, 1),
+        "finish_date": date(2024, 6, 10),
+        "duration": 480,
+        "percent_complete": 0,
+        "is_critical": False,
+        "is_milestone": False,
+        "is_summary": False,
+    }
+    return SimpleNamespace(**{**values, **overrides})
+
+
+def _snapshot(tasks, version: int = 1):
+    builder = SnapshotBuilder(PROJECT, AS_OF)
+    builder.add(tasks)
+    return builder.snapshot(version)
+
+
+def test_summary_header():
+    """Header counts completed, in-progress, overdue and critical tasks."""
+    snapshot = _snapshot(
+        [
+            _task("1", "Design", percent_complete=100, finish_date=date(2024, 2, 1)),
+            _task("2", "Build", percent_complete=50, finish_date=date(2024, 2, 20)),
+            _task("3", "Test", is_critical=True),
+        ]
+    )
+    assert "Project: Bridge (ACTIVE)" in snapshot.header
+    assert (
+        "Tasks: 3 total, 1 completed, 1 in progress, 1 overdue, 1 critical"
+        in snapshot.header
+    )
+    assert "Progress: 50%" in snapshot.header
+
+
+def test_ranks_overdue_then_critical():
+    """Lines are ranked by relevance, in outline order within a score."""
+    snapshot = _snapshot(
+        [
+            _task("1", "Idle"),
+            _task(
+                "2", "Late", start_date=date(2024, 1, 20), finish_date=date(2024, 2, 1)
+            ),
+            _task("3", "Key", is_critical=True),
+            _task("4", "Done", percent_complete=100, is_critical=True),
+        ]
+    )
+    assert [line.wbs_code for line in snapshot.lines] == ["2", "3", "4", "1"]
+    assert snapshot.lines[0].text == "2 Late [2024-01-20..2024-02-01] 0% overdue"
+
+
+def test_mentions_by_name_and_wbs():
+    snapshot = _snapshot(
+        [
+            _task("1", "Foundation"),
+            _task("1.1", "Pour"),
+            _task("2", "Roof"),
+            _task("3", "Roof deck"),
+        ]
+    )
+    assert mentioned(snapshot, "How is the FOUNDATION going?") == {0}
+    assert mentioned(snapshot, "Is 1.1 late?") == {1}
+    assert mentioned(snapshot, "what about task 2") == {2}
+    # Names match whole words only
+    assert mentioned(snapshot, "Is the roof decking done?") == {2}
+    # Bare numbers are not WBS codes
+    assert mentioned(snapshot, "2 days left on the pipes") == set()
+
+
+def test_pack_within_budget():
+    """Only the most relevant lines fit; they print in outline order."""
+    tasks = [_task(str(i + 1), f"Task {i + 1}") for i in range(200)]
+    tasks[150].is_critical = True
+    tasks[20].finish_date = date(2024, 2, 1)
+    snapshot = _snapshot(tasks)
+
+    context = pack(snapshot, budget=120)
+    assert context.tokens <= 120
+    assert context.task_count == 200
+    lines = context.text.splitlines()
+    assert lines[4] == f"Tasks ({context.included_count} of 200, most relevant):"
+    included = [line.split()[0] for line in lines[5:-1]]
+    assert "21" in included and "151" in included
+    assert included == sorted(included, key=int)
+    assert lines[-1] == f"({200 - context.included_count} more tasks not shown)"
+
+
+def test_pack_puts_mentions_first():
+    tasks = [_task(str(i + 1), f"Task {i + 1}", is_critical=True) for i in range(200)]
+    tasks.append(_task("201", "Landscaping"))
+    snapshot = _snapshot(tasks)
+
+    context = pack(snapshot, "When does landscaping start?", budget=100)
+    assert context.mentioned_count == 1
+    assert "201 Landscaping" in context.text
+    assert "201 Landscaping" not in pack(snapshot, budget=100).text
+
+
+def test_pack_everything_when_it_fits():
+    snapshot = _snapshot([_task("1", "Only")])
+    context = pack(snapshot, budget=1000)
+    assert context.included_count == 1
+    assert "not shown" not in context.text
+    assert context.tokens == estimate_tokens(context.text)
@@ -0,0 +1,86 @@
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.service import ai_usage_service
+from app.service.ai_usage_service import (
+    ORGANIZATION,
+    USER,
+    check_quota,
+    estimate_cost,
+    flush,
+    monthly_tokens,
+    record,
+)
+
+
+def _db(stored: int | None = None) -> SimpleNamespace:
+    """A session whose monthly rollup holds `stored` tokens."""
+    return SimpleNamespace(
+        scalar=AsyncMock(return_value=stored),
+        execute=AsyncMock(),
+        commit=AsyncMock(),
+    )
+
+
+def test_estimate_cost():
+    assert estimate_cost("claude-sonnet-4-5-20250929", 1_000_000, 1_000_000) == 18
+    assert estimate_cost("gpt-4o-mini", 1_000_000, 0) == Decimal("0.15")
+    assert estimate_cost("gpt-4o", 1_000_000, 0) == Decimal("2.5")
+    assert estimate_cost("local-model", 1000, 1000) == 0
+
+
+async def test_unflushed_usage_counts_toward_quota(monkeypatch):
+    monkeypatch.setattr(ai_usage_service.settings, "AI_MONTHLY_TOKENS_PER_USER", 0)
+    monkeypatch.setattr(
+        ai_usage_service.settings, "AI_MONTHLY_TOKENS_PER_ORGANIZATION", 100
+    )
+    user, colleague, org = uuid4(), uuid4(), uuid4()
+    db = _db(stored=40)
+
+    await check_quota(db, user, org)
+    await record(colleague, org, "chat", "gpt-4o", 50, 10)
+
+    assert await monthly_tokens(db, ORGANIZATION, org) == 100
+    assert await monthly_tokens(db, USER, user) == 40
+    # A colleague's usage counts against the whole organization
+    with pytest.raises(HTTPException) as exc:
+        await check_quota(db, user, org)
+    assert exc.value.status_code == 429
+
+
+async def test_flush_aggregates_batch():
+    user, org = uuid4(), uuid4()
+    for _ in range(3):
+        await record(user, org, "chat", "gpt-4o", 100, 20)
+    await record(user, None, "estimation", "gpt-4o", 10, 1)
+    db = _db()
+
+    assert await flush(db) == 4
+    assert ai_usage_service.buffered() == 0
+    (_, calls), daily, monthly = (call.args for call in db.execute.await_args_list)
+    assert sorted((row["feature"], row["tokens_in"]) for row in calls) == [
+        ("chat", 300),
+        ("estimation", 10),
+    ]
+    # One upsert row per user and organization in each rollup
+    for [stmt] in (daily, monthly):
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        assert sorted(v for k, v in params.items() if k.startswith("calls")) == [3, 4]
+    db.commit.assert_awaited_once()
+    assert await flush(db) == 0
+
+
+async def test_failed_flush_keeps_events():
+    await record(uuid4(), None, "chat", "gpt-4o", 1, 1)
+    db = _db()
+    db.execute.side_effect = RuntimeError("connection lost")
+
+    with pytest.raises(RuntimeError):
+        await flush(db)
+    assert ai_usage_service.buffered() == 1
@@ -0,0 +1,99 @@
+from datetime import date
+
+import pytest
+
+from app.service.calendar_service import compile_calendar, day_minutes
+
+NINE_TO_FIVE = {
+    "start": "09:00",
+    "end": "17:00",
+    "breaks": [{"start": "12:00", "end": "13:00"}],
+}
+# Sunday=0, Monday-Friday working, 7h per day
+STANDARD_WEEK = [None] + [NINE_TO_FIVE] * 5 + [None]
+
+MONDAY = date(2026, 3, 2)
+
+
+def _calendar(exceptions=(), base_exceptions=None):
+    chain = [(STANDARD_WEEK, list(exceptions))]
+    if base_exceptions is not None:
+        chain.insert(0, (STANDARD_WEEK, list(base_exceptions)))
+    return compile_calendar(chain, anchor=MONDAY)
+
+
+def test_day_minutes_subtracts_breaks():
+    assert day_minutes(NINE_TO_FIVE) == 420
+    assert day_minutes(None) == 0
+
+
+def test_offsets_skip_weekends():
+    cal = _calendar()
+    assert cal.diff_minutes(MONDAY, date(2026, 3, 9)) == 5 * 420
+    # Saturday and Sunday hold no work, so they share Monday's offset
+    assert cal.offset_of(date(2026, 3, 7)) == cal.offset_of(date(2026, 3, 9))
+
+
+def test_add_minutes_finishes_on_next_working_day():
+    cal = _calendar()
+    friday = date(2026, 3, 6)
+    assert cal.add_minutes(MONDAY, 420) == date(2026, 3, 3)
+    assert cal.add_minutes(friday, 420) == date(2026, 3, 9)
+    assert cal.add_minutes(friday, 210) == date(2026, 3, 9)
+    assert cal.add_minutes(friday, 0) == friday
+
+
+def test_start_date_skips_non_working_days():
+    cal = _calendar()
+    timeline = cal.timeline(MONDAY)
+    assert timeline.start_date_at(4 * 420) == date(2026, 3, 6)
+    assert timeline.start_date_at(5 * 420) == date(2026, 3, 9)
+
+
+def test_holiday_exception():
+    """A non-working exception range removes those days."""
+    cal = _calendar([(date(2026, 3, 3), date(2026, 3, 4), False, None, None)])
+    assert cal.add_minutes(MONDAY, 2 * 420) == date(2026, 3, 6)
+
+
+def test_working_exception_uses_custom_hours():
+    saturday = date(2026, 3, 7)
+    half_day = {"start": "09:00", "end": "13:00"}
+    cal = _calendar([(saturday, saturday, True, half_day, None)])
+    assert cal.minutes_on(saturday) == 240
+    assert cal.diff_minutes(MONDAY, date(2026, 3, 9)) == 5 * 420 + 240
+
+
+def test_yearly_recurrence_applies_from_its_first_year():
+    christmas = (
+        date(2026, 12, 25),
+        date(2026, 12, 25),
+        False,
+        None,
+        {"type": "yearly", "month": 12, "day": 25},
+    )
+    cal = _calendar([christmas])
+    assert cal.minutes_on(date(2025, 12, 25)) == 420
+    assert cal.minutes_on(date(2026, 12, 25)) == 0
+    assert cal.minutes_on(date(2031, 12, 25)) == 0
+
+
+def test_derived_calendar_inherits_and_overrides_base_exceptions():
+    day = date(2026, 3, 4)
+    base = [(day, day, False, None, None)]
+    derived = [(day, day, True, None, None)]
+    assert _calendar(base_exceptions=base).minutes_on(day) == 0
+    assert _calendar(derived, base_exceptions=base).minutes_on(day) == 420
+
+
+def test_index_extends_in_both_directions():
+    cal = _calendar()
+    far = date(2040, 1, 2)
+    back = date(2010, 1, 4)
+    assert cal.start_date_at(cal.offset_of(far)) == far
+    assert cal.start_date_at(cal.offset_of(back)) == back
+
+
+def test_calendar_without_working_time_is_rejected():
+    with pytest.raises(ValueError):
+        compile_calendar([([None] * 7, [])], anchor=MONDAY)
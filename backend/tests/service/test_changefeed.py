@@ -0,0 +1,73 @@
+import asyncio
+from uuid import uuid4
+
+from app.core import changefeed
+from app.core.changefeed import ChangeHub, Subscriber
+
+
+def _frame(version: int, **tasks) -> dict:
+    return {
+        "type": "changes",
+        "project_id": "p",
+        "version": version,
+        "changes": {"task": tasks},
+    }
+
+
+def test_burst_coalesces_into_one_frame():
+    subscriber = Subscriber(uuid4())
+    subscriber.push(_frame(1, a={"name": "Dig"}, b={"duration": 480}))
+    subscriber.push(_frame(2, a={"name": "Dig deeper", "duration": 960}))
+    subscriber.push(_frame(3, b=None))
+
+    assert subscriber.pending == _frame(
+        3, a={"name": "Dig deeper", "duration": 960}, b=None
+    )
+
+
+def test_frames_are_not_shared_between_subscribers():
+    first, second = Subscriber(uuid4()), Subscriber(uuid4())
+    frame = _frame(1, a={"name": "Dig"})
+    first.push(frame)
+    second.push(frame)
+    first.push(_frame(2, a={"name": "Pour"}))
+
+    assert second.pending["changes"]["task"]["a"] == {"name": "Dig"}
+    assert frame["changes"]["task"]["a"] == {"name": "Dig"}
+
+
+def test_large_backlog_becomes_resync(monkeypatch):
+    monkeypatch.setattr(changefeed, "MAX_PENDING_ROWS", 3)
+    subscriber = Subscriber(uuid4())
+    subscriber.push(_frame(1, a={}, b={}))
+    subscriber.push(_frame(2, c={}, d={}))
+    subscriber.push(_frame(3, e={}))
+
+    assert subscriber.pending == {"type": "resync", "project_id": "p", "version": 3}
+
+
+async def test_slow_subscriber_does_not_hold_back_others():
+    hub = ChangeHub()
+    project_id = uuid4()
+    fast = await hub.subscribe(project_id)
+    slow = await hub.subscribe(project_id)
+
+    received = []
+
+    async def read():
+        for _ in range(3):
+            received.append(await fast.next())
+
+    reader = asyncio.create_task(read())
+    for version in (1, 2, 3):
+        hub.deliver(project_id, _frame(version, a={"percent_complete": version}))
+        await asyncio.sleep(0)
+    await reader
+
+    assert [frame["version"] for frame in received] == [1, 2, 3]
+    # The slow one never read: it holds one merged frame
+    assert (await slow.next()) == _frame(3, a={"percent_complete": 3})
+
+    await hub.unsubscribe(fast)
+    await hub.unsubscribe(slow)
+    assert hub.stats() == {"projects": 0, "connections": 0}
@@ -0,0 +1,116 @@
+from datetime import date
+
+import pytest
+
+from app.models.enums import WorkContour
+from app.service.contour_service import (
+    CONTOUR_SHAPES,
+    ContourWork,
+    WorkingDays,
+    timephase,
+    weights,
+)
+from app.service.schedule_service import DayTimeline
+
+
+class WeekdayTimeline:
+    """480 working minutes Monday to Friday."""
+
+    def offset_of(self, day: date) -> int:
+        monday = date(2024, 1, 1)
+        weeks, rest = divmod((day - monday).days, 7)
+        return (weeks * 5 + min(rest, 5)) * 480
+
+
+@pytest.mark.parametrize("contour", list(CONTOUR_SHAPES))
+@pytest.mark.parametrize("days", [1, 3, 10, 37])
+def test_weights_sum_to_one(contour, days):
+    table = weights(contour, days)
+    assert len(table) == days
+    assert sum(table) == pytest.approx(1.0)
+    assert all(weight >= 0 for weight in table)
+
+
+def test_flat_is_even():
+    assert weights(WorkContour.FLAT, 4) == pytest.approx([0.25] * 4)
+
+
+def test_shapes_lean_the_right_way():
+    back = weights(WorkContour.BACK_LOADED, 10)
+    assert back[0] < back[-1]
+    assert weights(WorkContour.FRONT_LOADED, 10) == pytest.approx(back[::-1])
+
+    bell = weights(WorkContour.BELL, 9)
+    assert max(bell) == bell[4]
+    assert bell == pytest.approx(bell[::-1])
+
+
+def test_custom_contour_uses_its_weights():
+    data = {"weights": [1, 2, 1]}
+    assert weights(WorkContour.CONTOURED, 3, data) == pytest.approx([0.25, 0.5, 0.25])
+    assert weights(WorkContour.CONTOURED, 6, data) == pytest.approx(
+        [0.125, 0.125, 0.25, 0.25, 0.125, 0.125]
+    )
+
+
+def test_custom_contour_without_weights_is_flat():
+    flat = weights(WorkContour.FLAT, 5)
+    assert weights(WorkContour.CONTOURED, 5) == flat
+    assert weights(WorkContour.CONTOURED, 5, {"weights": [0, 0]}) == flat
+    # Custom weights only apply to CONTOURED assignments
+    assert weights(WorkContour.BELL, 5, {"weights": [1]}) == weights(
+        WorkContour.BELL, 5
+    )
+
+
+def test_working_days_skip_weekends():
+    days = WorkingDays(WeekdayTimeline(), date(2024, 1, 1), date(2024, 1, 15))
+    assert days.minutes[:7] == [480] * 5 + [0, 0]
+    assert days.working == [0, 1, 2, 3, 4, 7, 8, 9, 10, 11]
+    # Thursday to the next Tuesday (exclusive): Thu, Fri, Mon
+    assert days.span(date(2024, 1, 4), date(2024, 1, 9)) == (3, 6, 1440)
+    # A same-day finish still covers the start day
+    assert days.span(date(2024, 1, 2), date(2024, 1, 2)) == (1, 2, 480)
+    assert days.position(date(2024, 1, 6)) == 5
+
+
+def test_timephase_spreads_work_over_working_days():
+    days = WorkingDays(WeekdayTimeline(), date(2024, 1, 1), date(2024, 1, 15))
+    phased = timephase(
+        days,
+        [
+            # Fixed work, back loaded over Thu, Fri, Mon
+            ContourWork(1, 900, date(2024, 1, 4), date(2024, 1, 9), "FLAT", None),
+            # No work: half time over every working minute
+            ContourWork(0.5, 0, date(2024, 1, 1), date(2024, 1, 3), "FLAT", None),
+            # Weekend only
+            ContourWork(1, 480, date(2024, 1, 6), date(2024, 1, 8), "FLAT", None),
+            # Custom contour: a quarter of the work in the first half
+            ContourWork(
+                1,
+                400,
+                date(2024, 1, 1),
+                date(2024, 1, 5),
+                "CONTOURED",
+                {"weights": [1, 3]},
+            ),
+        ],
+    )
+    assert phased[0][0] == 3
+    assert phased[0][1] == pytest.approx([300, 300, 300])
+    assert phased[1] == (0, pytest.approx([240, 240]))
+    assert phased[2] == (5, [])
+    assert phased[3][1] == pytest.approx([50, 50, 150, 150])
+
+
+def test_timephase_with_day_timeline():
+    timeline = DayTimeline(date(2024, 1, 1), 480)
+    days = WorkingDays(timeline, date(2024, 1, 1), date(2024, 2, 1))
+    [(lo, work)] = timephase(
+        days,
+        [ContourWork(1, 0, date(2024, 1, 11), date(2024, 1, 21), "BACK_LOADED", None)],
+    )
+    assert lo == 10
+    assert len(work) == 10
+    assert sum(work) == pytest.approx(4800)
+    assert work[0] < work[-1]
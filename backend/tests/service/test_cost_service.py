@@ -0,0 +1,141 @@
+import uuid
+from datetime import date
+
+import pytest
+
+from app.models.enums import CostAccrual, RateTable, ResourceType, WorkContour
+from app.service.contour_service import WorkingDays
+from app.service.cost_service import (
+    CostInput,
+    Rate,
+    RateIndex,
+    accrue,
+    assignment_costs,
+    fixed_costs,
+)
+from app.service.schedule_service import DayTimeline
+
+ANN = uuid.uuid4()
+ORIGIN = date(2024, 1, 1)
+
+
+def _days(until: date = date(2024, 2, 1)) -> WorkingDays:
+    return WorkingDays(DayTimeline(ORIGIN, 480), ORIGIN, until)
+
+
+def _input(**overrides) -> CostInput:
+    values = {
+        "resource_id": ANN,
+        "resource_type": ResourceType.WORK,
+        "accrue_at": CostAccrual.PRORATED,
+        "rate_table": RateTable.A,
+        "units": 1.0,
+        "work": 0,
+        "cost": 0,
+        "start_date": date(2024, 1, 1),
+        "finish_date": date(2024, 1, 5),
+        "work_contour": WorkContour.FLAT,
+        "contour_data": None,
+    }
+    return CostInput(**{**values, **overrides})
+
+
+def test_rate_index_resolves_by_effective_date():
+    rates = RateIndex(
+        {ANN: Rate(40.0, 5.0)},
+        [
+            (ANN, RateTable.B, date(2024, 3, 1), 70, 0),
+            (ANN, RateTable.B, date(2024, 1, 10), 60, 0),
+        ],
+    )
+    assert rates.rate_at(ANN, RateTable.A, date(2024, 6, 1)) == Rate(40.0, 5.0)
+    assert rates.rate_at(ANN, RateTable.B, date(2024, 1, 9)) == Rate(40.0, 5.0)
+    assert rates.rate_at(ANN, RateTable.B, date(2024, 1, 10)) == Rate(60.0, 0.0)
+    assert rates.rate_at(ANN, RateTable.B, date(2024, 4, 1)) == Rate(70.0, 0.0)
+    assert rates.rate_at(uuid.uuid4(), RateTable.A, ORIGIN) == Rate(0.0, 0.0)
+
+
+def test_work_cost_follows_rate_changes():
+    rates = RateIndex(
+        {ANN: Rate(10.0, 25.0)},
+        [(ANN, RateTable.B, date(2024, 1, 3), 20, 0)],
+    )
+    [(lo, costs)] = assignment_costs(_days(), rates, [_input(rate_table=RateTable.B)])
+    # 8 hours a day; table B starts at 20/h on the third day
+    assert lo == 0
+    assert costs == pytest.approx([80 + 25, 80, 160, 160])
+
+
+def test_contour_and_fixed_work():
+    rates = RateIndex({ANN: Rate(60.0, 0.0)}, [])
+    [(_, costs)] = assignment_costs(
+        _days(),
+        rates,
+        [
+            _input(
+                work=600,
+                work_contour=WorkContour.CONTOURED,
+                contour_data={"weights": [3, 1]},
+            )
+        ],
+    )
+    # 10 hours at 60, three quarters in the first half
+    assert sum(costs) == pytest.approx(600)
+    assert costs == pytest.approx([225, 225, 75, 75])
+
+
+@pytest.mark.parametrize(
+    ("accrual", "expected"),
+    [
+        (CostAccrual.START, [320, 0, 0, 0]),
+        (CostAccrual.END, [0, 0, 0, 320]),
+        (CostAccrual.PRORATED, [80, 80, 80, 80]),
+    ],
+)
+def test_accrual(accrual, expected):
+    rates = RateIndex({ANN: Rate(10.0, 0.0)}, [])
+    [(_, costs)] = assignment_costs(_days(), rates, [_input(accrue_at=accrual)])
+    assert costs == pytest.approx(expected)
+
+
+def test_material_and_cost_resources():
+    rates = RateIndex({ANN: Rate(12.5, 3.0)}, [])
+    material, cost = assignment_costs(
+        _days(),
+        rates,
+        [
+            _input(resource_type=ResourceType.MATERIAL, units=4.0),
+            _input(resource_type=ResourceType.COST, cost=200),
+        ],
+    )
+    # 4 units at 12.5 plus 3 per use
+    assert sum(material[1]) == pytest.approx(53)
+    assert cost[1] == pytest.approx([50, 50, 50, 50])
+
+
+def test_no_working_days_only_costs_per_use():
+    class Weekdays:
+        def offset_of(self, day):
+            weeks, rest = divmod((day - ORIGIN).days, 7)
+            return (weeks * 5 + min(rest, 5)) * 480
+
+    days = WorkingDays(Weekdays(), ORIGIN, date(2024, 1, 15))
+    rates = RateIndex({ANN: Rate(10.0, 7.0)}, [])
+    [weekend] = assignment_costs(
+        days,
+        rates,
+        [_input(start_date=date(2024, 1, 6), finish_date=date(2024, 1, 8))],
+    )
+    assert weekend == (5, [7.0])
+
+
+def test_fixed_costs_accrue():
+    days = _days()
+    assert accrue(90, 3, CostAccrual.PRORATED) == [30, 30, 30]
+    assert fixed_costs(
+        days,
+        [
+            (100, CostAccrual.END, date(2024, 1, 2), date(2024, 1, 4)),
+            (0, CostAccrual.START, date(2024, 1, 2), date(2024, 1, 4)),
+        ],
+    ) == [(1, [0.0, 100.0]), (1, [])]
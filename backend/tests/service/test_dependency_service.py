@@ -0,0 +1,16 @@
+from app.service.dependency_service import find_cycle
+
+
+def test_find_cycle_acyclic():
+    assert find_cycle([(1, 2), (2, 3), (1, 3)]) == []
+    assert find_cycle([]) == []
+
+
+def test_find_cycle_reports_tasks_on_the_loop():
+    cycle = find_cycle([(1, 2), (2, 3), (3, 1), (0, 1)])
+    assert set(cycle) == {1, 2, 3}
+
+
+def test_find_cycle_includes_tasks_behind_the_loop():
+    """Tasks downstream of a cycle can never be ordered either."""
+    assert set(find_cycle([(1, 2), (2, 1), (2, 4)])) == {1, 2, 4}
@@ -0,0 +1,141 @@
+import uuid
+from collections import namedtuple
+from datetime import date
+from decimal import Decimal
+
+from app.models.enums import CostAccrual, WorkContour
+from app.service.contour_service import WorkingDays
+from app.service.evm_service import (
+    EarnedValue,
+    earned_value,
+    indices,
+    project_total,
+)
+from app.service.schedule_service import DayTimeline
+
+TaskRow = namedtuple(
+    "TaskRow",
+    "id parent_task_id percent_complete fixed_cost fixed_cost_accrual "
+    "baseline_cost baseline_start baseline_finish",
+)
+AssignmentRow = namedtuple(
+    "AssignmentRow",
+    "task_id accrue_at work_contour contour_data cost actual_cost work actual_work "
+    "percent_work_complete percent_complete baseline_cost baseline_start "
+    "baseline_finish",
+)
+
+ORIGIN = date(2024, 1, 1)
+
+
+def _days() -> WorkingDays:
+    return WorkingDays(DayTimeline(ORIGIN, 480), ORIGIN, date(2024, 2, 1))
+
+
+def _d(value) -> Decimal:
+    return Decimal(value).quantize(Decimal("0.01"))
+
+
+def test_indices():
+    value = EarnedValue(_d(1000), _d(500), _d(400), _d(500))
+    spi, cpi, eac, vac = indices(value)
+    assert spi == Decimal("0.8")
+    assert cpi == Decimal("0.8")
+    assert eac == _d(1250)
+    assert vac == _d(-250)
+
+
+def test_indices_before_any_progress():
+    spi, cpi, eac, vac = indices(EarnedValue(_d(1000), _d(0), _d(0), _d(0)))
+    assert (spi, cpi) == (None, None)
+    assert (eac, vac) == (_d(1000), _d(0))
+
+
+def test_earned_value_rolls_up():
+    summary, build, deploy = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    tasks = [
+        TaskRow(summary, None, _d(0), _d(0), CostAccrual.PRORATED, None, None, None),
+        # Baseline 1000: 800 of assignment work plus 200 fixed, paid at the end
+        TaskRow(
+            build,
+            summary,
+            _d(40),
+            _d(200),
+            CostAccrual.END,
+            _d(1000),
+            date(2024, 1, 1),
+            date(2024, 1, 6),
+        ),
+        # No baseline; fixed cost paid up front
+        TaskRow(deploy, summary, _d(100), _d(50), CostAccrual.START, None, None, None),
+    ]
+    assignments = [
+        AssignmentRow(
+            build,
+            CostAccrual.PRORATED,
+            WorkContour.FLAT,
+            None,
+            _d(900),
+            _d(0),
+            2400,
+            960,
+            _d(0),
+            _d(40),
+            _d(800),
+            date(2024, 1, 1),
+            date(2024, 1, 6),
+        )
+    ]
+
+    values = earned_value(_days(), date(2024, 1, 2), tasks, assignments)
+
+    # Two of five baseline days; 40% of 900 spent so far
+    assert values[build] == EarnedValue(_d(1000), _d(320), _d(400), _d(360))
+    assert values[deploy] == EarnedValue(_d(0), _d(0), _d(0), _d(50))
+    assert values[summary] == EarnedValue(_d(1000), _d(320), _d(400), _d(410))
+    assert project_total(tasks, values) == values[summary]
+
+    # Past the baseline finish everything is scheduled, fixed cost included
+    values = earned_value(_days(), date(2024, 1, 20), tasks, assignments)
+    assert values[build].bcws == _d(1000)
+
+
+def test_summary_adds_its_own_fixed_cost():
+    summary, child = uuid.uuid4(), uuid.uuid4()
+    week = (date(2024, 1, 1), date(2024, 1, 6))
+    tasks = [
+        # Baseline 300: the child's 200 plus 100 of its own
+        TaskRow(summary, None, _d(50), _d(100), CostAccrual.START, _d(300), *week),
+        TaskRow(child, summary, _d(50), _d(200), CostAccrual.END, _d(200), *week),
+    ]
+
+    values = earned_value(_days(), date(2024, 1, 2), tasks, [])
+
+    assert values[child] == EarnedValue(_d(200), _d(0), _d(100), _d(0))
+    assert values[summary] == EarnedValue(_d(300), _d(100), _d(150), _d(100))
+
+
+def test_recorded_actual_cost_wins():
+    task_id = uuid.uuid4()
+    tasks = [
+        TaskRow(task_id, None, _d(50), _d(0), CostAccrual.PRORATED, None, None, None)
+    ]
+    row = AssignmentRow(
+        task_id,
+        CostAccrual.PRORATED,
+        WorkContour.FLAT,
+        None,
+        _d(900),
+        _d(123),
+        0,
+        0,
+        _d(0),
+        _d(50),
+        None,
+        None,
+        None,
+    )
+    assert earned_value(_days(), ORIGIN, tasks, [row])[task_id].acwp == _d(123)
+    # Otherwise the task's percent complete stands in for work done
+    row = row._replace(actual_cost=_d(0))
+    assert earned_value(_days(), ORIGIN, tasks, [row])[task_id].acwp == _d(450)
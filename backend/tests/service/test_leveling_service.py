@@ -0,0 +1,114 @@
+from app.service.leveling_service import CapacityTimeline, level
+from app.service.schedule_service import ASAP, FS, MSO, ScheduleGraph, compute_schedule
+
+DAY = 480
+
+
+def _level(durations, edges, demands, max_units, priority=None, **kwargs):
+    n = len(durations)
+    constraints = kwargs.pop("constraints", {})
+    graph = ScheduleGraph.build(
+        ids=list(range(n)),
+        duration=list(durations),
+        anchor=[0] * n,
+        constraint=[constraints.get(i, (ASAP, 0))[0] for i in range(n)],
+        constraint_at=[constraints.get(i, (ASAP, 0))[1] for i in range(n)],
+        pinned=[False] * n,
+        edges=[(p, s, FS, 0) for p, s in edges],
+    )
+    periods = kwargs.pop("periods", [])
+    resources = [CapacityTimeline(units, periods) for units in max_units]
+    result = level(
+        graph,
+        compute_schedule(graph),
+        priority or [500] * n,
+        demands,
+        resources,
+        DAY,
+        **kwargs,
+    )
+    return result, resources
+
+
+def test_overallocation_delays_later_task():
+    """Two full-time tasks on one resource run one after the other."""
+    result, resources = _level(
+        [DAY, DAY], [], [[(0, 100)], [(0, 100)]], [100], within_slack=False
+    )
+    assert sorted(result.early_start) == [0, DAY]
+    assert result.unresolved == []
+    assert resources[0].overloaded() == []
+
+
+def test_part_time_assignments_share_a_resource():
+    """Units that add up to max units fit side by side."""
+    result, _ = _level([DAY, DAY], [], [[(0, 50)], [(0, 50)]], [100])
+    assert result.early_start == [0, 0]
+
+
+def test_priority_decides_who_waits():
+    """The higher-priority task keeps its start."""
+    result, _ = _level(
+        [DAY, DAY],
+        [],
+        [[(0, 100)], [(0, 100)]],
+        [100],
+        priority=[100, 900],
+        within_slack=False,
+    )
+    assert result.early_start == [DAY, 0]
+
+
+def test_within_slack_keeps_the_finish():
+    """Only tasks with slack move; the rest are reported as unresolved."""
+    # 0 -> 1 is the critical chain (2 days); 2 has one day of slack
+    result, _ = _level(
+        [DAY, DAY, DAY],
+        [(0, 1)],
+        [[(0, 100)], [], [(0, 100)]],
+        [100],
+    )
+    assert result.early_start == [0, DAY, DAY]
+    assert result.unresolved == []
+
+    # Both tasks are critical and compete for the same day
+    result, resources = _level([DAY, DAY], [], [[(0, 100)], [(0, 100)]], [100])
+    assert result.early_start == [0, 0]
+    assert len(result.unresolved) == 1
+    assert resources[0].overloaded() == [(0, 1, 200)]
+
+
+def test_delay_moves_successors():
+    """A delayed task pushes its successors along the links."""
+    result, _ = _level(
+        [DAY, DAY, DAY],
+        [(1, 2)],
+        [[(0, 100)], [(0, 100)], []],
+        [100],
+        priority=[900, 100, 500],
+        within_slack=False,
+    )
+    assert result.early_start == [0, DAY, 2 * DAY]
+
+
+def test_must_start_on_is_not_delayed():
+    """Constrained tasks keep their dates even when overallocated."""
+    result, _ = _level(
+        [DAY, DAY],
+        [],
+        [[(0, 100)], [(0, 100)]],
+        [100],
+        priority=[900, 100],
+        constraints={1: (MSO, 0)},
+        within_slack=False,
+    )
+    assert result.early_start[1] == 0
+    assert result.unresolved == [1]
+
+
+def test_availability_period_blocks_slots():
+    """No work is booked while the resource is unavailable."""
+    result, _ = _level(
+        [DAY], [], [[(0, 100)]], [100], periods=[(0, 3, 0)], within_slack=False
+    )
+    assert result.early_start == [3 * DAY]
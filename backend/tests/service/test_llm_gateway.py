@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import llm
+from app.core.llm import LLMRequest, Message, OpenAIProvider, get_gateway
+
+
+def _ask(text: str, **overrides) -> LLMRequest:
+    return LLMRequest(messages=(Message("user", text),), **overrides)
+
+
+async def test_complete(stub_llm):
+    response = await get_gateway().complete(_ask("How late is the build?"))
+
+    assert response.text == "echo: How late is the build?"
+    assert (response.tokens_in, response.tokens_out) == (5, 6)
+    assert response.finish_reason == "end_turn"
+    assert response.cached is False
+    [body] = stub_llm.requests
+    assert body["model"] == llm.settings.ANTHROPIC_MODEL
+    assert body["stream"] is False
+
+
+async def test_identical_calls_in_flight_are_coalesced(stub_llm):
+    """Ten identical calls at once make one provider call."""
+    stub_llm.delay = 0.05
+    gateway = get_gateway()
+
+    responses = await asyncio.gather(
+        *(gateway.complete(_ask("Summarize the project")) for _ in range(10))
+    )
+
+    assert stub_llm.calls == 1
+    assert {r.text for r in responses} == {"echo: Summarize the project"}
+    assert gateway.stats().coalesced == 9
+
+
+async def test_deterministic_calls_are_cached(stub_llm):
+    """temperature=0 replies are reused for exactly the same request."""
+    gateway = get_gateway()
+    first = await gateway.complete(_ask("Estimate: pour slab", temperature=0))
+    second = await gateway.complete(_ask("Estimate: pour slab", temperature=0))
+
+    assert stub_llm.calls == 1
+    assert second.cached is True
+    assert second.text == first.text
+    assert gateway.stats().cache_hits == 1
+
+    # Case and whitespace are part of the request
+    other = await gateway.complete(_ask("estimate:  Pour slab", temperature=0))
+    assert stub_llm.calls == 2
+    assert other.cached is False
+
+    # Sampled replies are never reused
+    await gateway.complete(_ask("Estimate: pour slab"))
+    await gateway.complete(_ask("Estimate: pour slab"))
+    assert stub_llm.calls == 4
+
+
+async def test_stream(stub_llm):
+    chunks = [chunk async for chunk in get_gateway().stream(_ask("Any risks?"))]
+
+    *text, last = chunks
+    assert [chunk.text for chunk in text] == ["echo: ", "Any ", "risks?"]
+    assert last.text == ""
+    assert last.response.text == "echo: Any risks?"
+    assert (last.response.tokens_in, last.response.tokens_out) == (2, 3)
+    assert last.response.finish_reason == "end_turn"
+
+
+async def test_concurrency_limit(stub_llm, monkeypatch):
+    monkeypatch.setattr(llm.settings, "LLM_MAX_CONCURRENCY", 2)
+    stub_llm.delay = 0.01
+    gateway = get_gateway()
+
+    await asyncio.gather(*(gateway.complete(_ask(f"Task {i}")) for i in range(8)))
+
+    assert stub_llm.calls == 8
+    assert stub_llm.peak == 2
+
+
+async def test_queue_full_rejects(stub_llm, monkeypatch):
+    monkeypatch.setattr(llm.settings, "LLM_MAX_QUEUE", 0)
+
+    with pytest.raises(HTTPException) as exc:
+        await get_gateway().complete(_ask("Hello"))
+    assert exc.value.status_code == 503
+    assert get_gateway().stats().rejected == 1
+
+
+async def test_provider_error(stub_llm):
+    stub_llm.status_code = 529
+
+    with pytest.raises(HTTPException) as exc:
+        await get_gateway().complete(_ask("Hello"))
+    assert exc.value.status_code == 502
+    assert get_gateway().stats().errors == 1
+
+
+async def test_provider_not_configured(stub_llm, monkeypatch):
+    monkeypatch.setattr(llm.settings, "ANTHROPIC_API_KEY", None)
+
+    with pytest.raises(HTTPException) as exc:
+        await get_gateway().complete(_ask("Hello"))
+    assert exc.value.status_code == 503
+    assert stub_llm.calls == 0
+
+
+def test_openai_format():
+    provider = OpenAIProvider()
+    body = provider.payload(_ask("Hi", system="Be brief"), "gpt-4o", stream=True)
+    assert body["messages"][0] == {"role": "system", "content": "Be brief"}
+    assert body["stream_options"] == {"include_usage": True}
+
+    delta = provider.parse(
+        {
+            "model": "gpt-4o",
+            "choices": [{"message": {"content": "Hello"}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 3, "completion_tokens": 1},
+        }
+    )
+    assert delta == ("Hello", "gpt-4o", 3, 1, "stop")
+    chunk = provider.parse_event({"choices": [{"delta": {"content": "He"}}]})
+    assert chunk.text == "He"
+    usage = provider.parse_event(
+        {"choices": [], "usage": {"prompt_tokens": 3, "completion_tokens": 1}}
+    )
+    assert (usage.tokens_in, usage.tokens_out) == (3, 1)
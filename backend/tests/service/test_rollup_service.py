@@ -0,0 +1,84 @@
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+from app.service.rollup_service import _children_first, roll_up
+
+
+def _row(parent=None, start=1, finish=1, duration=480, percent="0", **extra):
+    return {
+        "id": uuid4(),
+        "parent_task_id": parent,
+        "start_date": date(2024, 1, start),
+        "finish_date": date(2024, 1, finish),
+        "duration": duration,
+        "fixed_cost": Decimal("0"),
+        "total_cost": Decimal("0"),
+        "percent_complete": Decimal(percent),
+        "work": 0,
+        "actual_work": 0,
+        "bcws": Decimal("0"),
+        "bcwp": Decimal("0"),
+        "acwp": Decimal("0"),
+        **extra,
+    }
+
+
+def _tree(*rows):
+    by_id = {row["id"]: row for row in rows}
+    children = {}
+    for row in rows:
+        if row["parent_task_id"]:
+            children.setdefault(row["parent_task_id"], []).append(row["id"])
+    parents = {row["id"]: row["parent_task_id"] for row in rows}
+    return by_id, children, _children_first(parents, set(children))
+
+
+def test_roll_up_nested_summaries():
+    top = _row(fixed_cost=Decimal("100"))
+    mid = _row(parent=top["id"])
+    a = _row(parent=mid["id"], start=2, finish=3, work=480, total_cost=Decimal("50"))
+    b = _row(parent=mid["id"], start=4, finish=9, work=960, total_cost=Decimal("25"))
+    c = _row(parent=top["id"], start=1, finish=1, work=60)
+    rows, children, order = _tree(top, mid, a, b, c)
+
+    changed = roll_up(rows, children, order)
+
+    assert {row["id"] for row in changed} == {top["id"], mid["id"]}
+    assert mid["start_date"] == date(2024, 1, 2)
+    assert mid["finish_date"] == date(2024, 1, 9)
+    assert mid["work"] == 1440
+    assert top["start_date"] == date(2024, 1, 1)
+    assert top["finish_date"] == date(2024, 1, 9)
+    assert top["work"] == 1500
+    # Own fixed cost plus the children's totals
+    assert top["total_cost"] == Decimal("175")
+
+
+def test_roll_up_percent_weighted_by_duration():
+    top = _row()
+    a = _row(parent=top["id"], duration=480, percent="100")
+    b = _row(parent=top["id"], duration=1440, percent="0")
+    rows, children, order = _tree(top, a, b)
+
+    roll_up(rows, children, order)
+    assert top["percent_complete"] == Decimal("25.00")
+
+
+def test_roll_up_percent_of_milestones_is_a_plain_mean():
+    top = _row()
+    a = _row(parent=top["id"], duration=0, percent="100")
+    b = _row(parent=top["id"], duration=0, percent="0")
+    rows, children, order = _tree(top, a, b)
+
+    roll_up(rows, children, order)
+    assert top["percent_complete"] == Decimal("50.00")
+
+
+def test_roll_up_reports_only_changes():
+    top = _row()
+    a = _row(parent=top["id"], start=2, finish=5)
+    rows, children, order = _tree(top, a)
+
+    assert len(roll_up(rows, children, order)) == 1
+    assert roll_up(rows, children, order) == []
@@ -0,0 +1,142 @@
+import pytest
+
+from app.service.schedule_service import (
+    ALAP,
+    ASAP,
+    FF,
+    FNLT,
+    FS,
+    MSO,
+    SF,
+    SNET,
+    SS,
+    DependencyCycleError,
+    ScheduleGraph,
+    compute_schedule,
+    propagate,
+)
+
+
+def _graph(durations, edges, constraints=None, anchors=None):
+    n = len(durations)
+    constraints = constraints or {}
+    kinds = [constraints.get(i, (ASAP, 0))[0] for i in range(n)]
+    at = [constraints.get(i, (ASAP, 0))[1] for i in range(n)]
+    return ScheduleGraph.build(
+        ids=list(range(n)),
+        duration=list(durations),
+        anchor=list(anchors or [0] * n),
+        constraint=kinds,
+        constraint_at=at,
+        pinned=[False] * n,
+        edges=edges,
+    )
+
+
+def test_finish_to_start_chain():
+    """FS chain — each task starts when the previous one finishes."""
+    result = compute_schedule(_graph([480, 960, 480], [(0, 1, FS, 0), (1, 2, FS, 0)]))
+    assert result.early_start == [0, 480, 1440]
+    assert result.finish == 1920
+    assert result.total_slack == [0, 0, 0]
+
+
+def test_link_types_with_lag():
+    """SS, FF and SF links honour lag and lead."""
+    ss = compute_schedule(_graph([960, 480], [(0, 1, SS, 240)]))
+    assert ss.early_start[1] == 240
+
+    ff = compute_schedule(_graph([960, 480], [(0, 1, FF, 0)]))
+    assert ff.early_finish[1] == 960
+
+    sf = compute_schedule(_graph([960, 480], [(0, 1, SF, 480)]))
+    assert sf.early_finish[1] == 480
+
+    lead = compute_schedule(_graph([960, 480], [(0, 1, FS, -480)]))
+    assert lead.early_start[1] == 480
+
+
+def test_slack_and_critical_path():
+    """Parallel branch — short branch has slack, long branch is critical."""
+    # 0 -> 1 (long) -> 3, 0 -> 2 (short) -> 3
+    edges = [(0, 1, FS, 0), (0, 2, FS, 0), (1, 3, FS, 0), (2, 3, FS, 0)]
+    result = compute_schedule(_graph([480, 1440, 480, 480], edges))
+
+    assert result.total_slack[2] == 960
+    assert result.free_slack[2] == 960
+    assert [result.is_critical(i) for i in range(4)] == [True, True, False, True]
+
+
+def test_constraints():
+    """SNET and MSO push the early start; FNLT limits the late finish."""
+    result = compute_schedule(
+        _graph([480, 480], [(0, 1, FS, 0)], constraints={1: (SNET, 1440)})
+    )
+    assert result.early_start[1] == 1440
+    assert result.free_slack[0] == 960
+
+    result = compute_schedule(_graph([480], [], constraints={0: (MSO, 960)}))
+    assert result.early_start[0] == 960
+
+    result = compute_schedule(
+        _graph([480, 480], [(0, 1, FS, 0)], constraints={0: (FNLT, 240)})
+    )
+    assert result.total_slack[0] < 0
+
+
+def test_alap_moves_to_late_dates():
+    """ALAP task — scheduled at its late start."""
+    # 0 (long) and 1 (short, ALAP) both feed 2
+    edges = [(0, 2, FS, 0), (1, 2, FS, 0)]
+    result = compute_schedule(
+        _graph([1440, 480, 480], edges, constraints={1: (ALAP, 0)})
+    )
+    assert result.early_start[1] == 960
+    assert result.total_slack[1] == 960
+
+
+def test_unlinked_tasks_keep_anchor():
+    """Task without predecessors starts at its own anchor."""
+    result = compute_schedule(_graph([480, 480], [], anchors=[0, 2400]))
+    assert result.early_start == [0, 2400]
+    assert result.finish == 2880
+
+
+def test_cycle_raises():
+    """Cycle — raises DependencyCycleError naming the tasks in it."""
+    edges = [(0, 1, FS, 0), (1, 2, FS, 0), (2, 1, FS, 0)]
+    with pytest.raises(DependencyCycleError) as exc:
+        compute_schedule(_graph([480, 480, 480], edges))
+    assert set(exc.value.task_ids) == {1, 2}
+
+
+def test_propagate_moves_downstream_only():
+    """Incremental — only successors of the changed task are recomputed."""
+    # 0 -> 1 -> 2, and 3 -> 4 unrelated
+    graph = _graph(
+        [960, 480, 480, 480, 480], [(0, 1, FS, 0), (1, 2, FS, 0), (3, 4, FS, 0)]
+    )
+    es = [0, 480, 960, 0, 480]
+    ef = [960, 960, 1440, 480, 960]
+
+    moved = propagate(graph, es, ef, [0])
+
+    assert moved == [0, 1, 2]
+    assert es[:3] == [0, 960, 1440]
+    assert es[3:] == [0, 480]
+
+
+def test_propagate_stops_when_dates_settle():
+    """Incremental — a successor held by a constraint stops the wave."""
+    graph = _graph(
+        [960, 480, 480],
+        [(0, 1, FS, 0), (1, 2, FS, 0)],
+        constraints={1: (SNET, 2400)},
+    )
+    es = [0, 2400, 2880]
+    ef = [960, 2880, 3360]
+
+    moved = propagate(graph, es, ef, [0])
+
+    assert moved == [0]
+    assert es == [0, 2400, 2880]
@@ -0,0 +1,133 @@
+import time
+from uuid import uuid4
+
+import pytest
+
+from app.service.wbs_service import Outline, OutlineNode
+
+
+def _outline(*specs):
+    """Outline from (name, parent name) pairs given in display order."""
+    ids = {name: uuid4() for name, _ in specs}
+    nodes = [
+        OutlineNode(ids[name], ids.get(parent), i, "", 0, False)
+        for i, (name, parent) in enumerate(specs, 1)
+    ]
+    outline = Outline(nodes)
+    outline.renumber(everything=True)
+    return outline, ids
+
+
+def _codes(outline, ids):
+    names = {task_id: name for name, task_id in ids.items()}
+    return {
+        names[node.id]: (node.order_index, node.wbs_code, node.outline_level)
+        for node in outline.nodes.values()
+    }
+
+
+def test_renumber_preorder():
+    outline, ids = _outline(("a", None), ("b", None), ("a1", "a"), ("a2", "a"))
+    assert _codes(outline, ids) == {
+        "a": (1, "1", 1),
+        "a1": (2, "1.1", 2),
+        "a2": (3, "1.2", 2),
+        "b": (4, "2", 1),
+    }
+    assert outline.nodes[ids["a"]].is_summary
+    assert not outline.nodes[ids["b"]].is_summary
+
+
+def test_renumber_reports_only_changed_rows():
+    outline, ids = _outline(("a", None), ("b", None), ("c", None))
+    assert outline.renumber() == []
+
+    outline.move(ids["c"], None, before_id=ids["b"])
+    changed = {node.id for node in outline.renumber()}
+    assert changed == {ids["b"], ids["c"]}
+
+
+def test_insert_and_remove_subtree():
+    outline, ids = _outline(("a", None), ("a1", "a"), ("a1x", "a1"), ("b", None))
+    new_id = uuid4()
+    outline.insert(new_id, ids["b"])
+
+    removed = outline.remove(ids["a"])
+    assert set(removed) == {ids["a"], ids["a1"], ids["a1x"]}
+    outline.renumber()
+    assert outline.nodes[ids["b"]].wbs_code == "1"
+    assert outline.nodes[ids["b"]].is_summary
+    assert outline.nodes[new_id].wbs_code == "1.1"
+    assert outline.nodes[new_id].order_index == 2
+
+
+def test_move_under_own_subtree_rejected():
+    outline, ids = _outline(("a", None), ("a1", "a"))
+    with pytest.raises(ValueError):
+        outline.move(ids["a"], ids["a1"])
+
+
+def test_indent_and_outdent_keep_display_order():
+    outline, ids = _outline(("a", None), ("b", None), ("c", None), ("d", None))
+
+    outline.indent(ids["b"])
+    outline.indent(ids["c"])
+    outline.renumber()
+    assert _codes(outline, ids) == {
+        "a": (1, "1", 1),
+        "b": (2, "1.1", 2),
+        "c": (3, "1.2", 2),
+        "d": (4, "2", 1),
+    }
+
+    # Outdenting b takes c along as its child
+    outline.outdent(ids["b"])
+    outline.renumber()
+    assert _codes(outline, ids) == {
+        "a": (1, "1", 1),
+        "b": (2, "2", 1),
+        "c": (3, "2.1", 2),
+        "d": (4, "3", 1),
+    }
+    assert not outline.nodes[ids["a"]].is_summary
+    assert outline.nodes[ids["b"]].is_summary
+
+
+def test_indent_first_task_rejected():
+    outline, ids = _outline(("a", None), ("b", None))
+    with pytest.raises(ValueError):
+        outline.indent(ids["a"])
+    with pytest.raises(ValueError):
+        outline.outdent(ids["a"])
+
+
+def test_renumber_skips_untouched_branches():
+    """Only the edited branch is rewritten when no order_index shifts."""
+    outline, ids = _outline(
+        ("a", None),
+        ("a1", "a"),
+        ("a2", "a"),
+        ("b", None),
+        ("b1", "b"),
+        ("b2", "b"),
+    )
+    outline.move(ids["b2"], ids["b"], before_id=ids["b1"])
+    changed = {node.id for node in outline.renumber()}
+    assert changed == {ids["b1"], ids["b2"]}
+
+
+def test_renumber_10k_tasks_touches_only_shifted_rows():
+    """A move near the end of a 10k-task outline rewrites a handful of rows."""
+    specs = []
+    for phase in range(100):
+        specs.append((f"p{phase}", None))
+        specs += [(f"p{phase}.{i}", f"p{phase}") for i in range(99)]
+    outline, ids = _outline(*specs)
+
+    started = time.perf_counter()
+    outline.move(ids["p99.98"], ids["p99"], before_id=ids["p99.0"])
+    changed = outline.renumber()
+    elapsed = time.perf_counter() - started
+
+    assert len(changed) == 99
+    assert elapsed < 0.05, f"renumber took {elapsed:.3f}s"